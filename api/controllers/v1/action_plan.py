@@ -20,7 +20,9 @@ An :ref:`Action Plan <action_plan_definition>` specifies a flow of
 :ref:`Actions <action_definition>` that should be executed in order to satisfy
 a given :ref:`Goal <goal_definition>`. It also contains an estimated
 :ref:`global efficacy <efficacy_definition>` alongside a set of
-:ref:`efficacy indicators <efficacy_indicator_definition>`.
+:ref:`efficacy indicators <efficacy_indicator_definition>`, and the expected
+time it takes to execute, which is the duration of its critical path (i.e. its
+longest chain of dependent :ref:`Actions <action_definition>`).
 
 An :ref:`Action Plan <action_plan_definition>` is generated by Watcher when an
 :ref:`Audit <audit_definition>` is successful which implies that the
@@ -224,6 +226,12 @@ class ActionPlan(base.APIBase):
     global_efficacy = wtypes.wsattr(types.jsontype, readonly=True)
     """The global efficacy of this action plan"""
 
+    expected_makespan = wtypes.wsattr(float, readonly=True)
+    """The expected execution time (in seconds) of this action plan"""
+
+    critical_path = wtypes.wsattr([types.uuid], readonly=True)
+    """The UUIDs of the longest chain of dependent actions of this plan"""
+
     state = wtypes.text
     """This action plan state"""
 
@@ -255,7 +263,8 @@ class ActionPlan(base.APIBase):
         if not expand:
             action_plan.unset_fields_except(
                 ['uuid', 'state', 'efficacy_indicators', 'global_efficacy',
-                 'updated_at', 'audit_uuid', 'strategy_uuid', 'strategy_name'])
+                 'expected_makespan', 'updated_at', 'audit_uuid',
+                 'strategy_uuid', 'strategy_name'])
 
         action_plan.links = [
             link.Link.make_link(
@@ -489,6 +498,7 @@ class ActionPlansController(rest.RestController):
 
         launch_action_plan = False
         cancel_action_plan = False
+        cancel_ongoing_action_plan = False
 
         # transitions that are allowed via PATCH
         allowed_patch_transitions = [
@@ -518,6 +528,8 @@ class ActionPlansController(rest.RestController):
                 launch_action_plan = True
             if action_plan.state == ap_objects.State.CANCELLED:
                 cancel_action_plan = True
+            if action_plan.state == ap_objects.State.CANCELLING:
+                cancel_ongoing_action_plan = True
 
         # Update only the fields that have changed
         for field in objects.ActionPlan.fields:
@@ -552,6 +564,13 @@ class ActionPlansController(rest.RestController):
             applier_client.launch_action_plan(pecan.request.context,
                                               action_plan.uuid)
 
+        # NOTE: push the cancellation of an ongoing action plan to the
+        # appliers, so that they stop its actions right away
+        if cancel_ongoing_action_plan:
+            applier_client = rpcapi.ApplierAPI()
+            applier_client.cancel_action_plan(pecan.request.context,
+                                              action_plan.uuid)
+
         action_plan_to_update = objects.ActionPlan.get_by_uuid(
             pecan.request.context,
             action_plan_uuid)
@@ -22,6 +22,7 @@ from oslo_config import cfg
 from oslo_log import log
 
 from watcher.applier.action_plan import default
+from watcher.applier.workflow_engine import base
 
 LOG = log.getLogger(__name__)
 CONF = cfg.CONF
@@ -48,3 +49,8 @@ class TriggerActionPlan(object):
         self.executor.submit(self.do_launch_action_plan, context,
                              action_plan_uuid)
         return action_plan_uuid
+
+    def cancel_action_plan(self, context, action_plan_uuid):
+        if base.ActionPlanWatchers().cancel(action_plan_uuid):
+            LOG.debug("Cancel ActionPlan %s", action_plan_uuid)
+        return action_plan_uuid
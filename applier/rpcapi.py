@@ -39,6 +39,14 @@ class ApplierAPI(service.Service):
         self.conductor_client.cast(
             context, 'launch_action_plan', action_plan_uuid=action_plan_uuid)
 
+    def cancel_action_plan(self, context, action_plan_uuid=None):
+        if not utils.is_uuid_like(action_plan_uuid):
+            raise exception.InvalidUuidOrName(name=action_plan_uuid)
+
+        # NOTE: the action plan is executed by any of the appliers
+        self.conductor_client.prepare(fanout=True).cast(
+            context, 'cancel_action_plan', action_plan_uuid=action_plan_uuid)
+
 
 class ApplierAPIManager(service_manager.ServiceManager):
 
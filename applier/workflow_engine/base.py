@@ -17,11 +17,14 @@
 #
 
 import abc
+import collections
 import six
+import threading
 import time
 
 import eventlet
 
+from oslo_config import cfg
 from oslo_log import log
 from taskflow import task as flow_task
 
@@ -29,17 +32,145 @@ from watcher.applier.actions import factory
 from watcher.common import clients
 from watcher.common import exception
 from watcher.common.loader import loadable
+from watcher.common import service
 from watcher import notifications
 from watcher import objects
 from watcher.objects import fields
 
 
 LOG = log.getLogger(__name__)
+CONF = cfg.CONF
 
 CANCEL_STATE = [objects.action_plan.State.CANCELLING,
                 objects.action_plan.State.CANCELLED]
 
 
+class ActionPlanWatcher(object):
+    """State of an action plan, shared by its actions
+
+    Before being started or reverted, the actions check the state of their
+    action plan as cached here rather than reading it from the database.
+
+    The running actions wait for their completion or for the cancellation of
+    their action plan on a single condition. It is notified as soon as an
+    action completes or the cancellation is pushed to the applier through
+    RPC. In case the cancellation is not pushed, the state of the action plan
+    is also read from the database, at most once every
+    ``[watcher_applier] action_plan_refresh_interval`` seconds whatever the
+    number of running actions.
+
+    :param context: the request context
+    :param action_plan_id: the ID of the watched action plan
+    """
+
+    def __init__(self, context, action_plan_id):
+        self.context = context
+        self.action_plan_id = action_plan_id
+        self._condition = threading.Condition()
+        self.uuid = None
+        self.state = None
+        self.refreshed_at = 0.0
+        self.reads = 0
+        self.refresh()
+
+    @property
+    def interval(self):
+        return CONF.watcher_applier.action_plan_refresh_interval
+
+    @property
+    def cancelled(self):
+        return self.state in CANCEL_STATE
+
+    def refresh(self):
+        """Read the state of the action plan from the database"""
+        # The database is read without holding the condition so that the
+        # actions completing or the cancellation do not wait for it
+        action_plan = objects.ActionPlan.get_by_id(
+            self.context, self.action_plan_id)
+        with self._condition:
+            self.refreshed_at = time.time()
+            self.reads += 1
+            self.uuid = action_plan.uuid
+            if self.cancelled and action_plan.state not in CANCEL_STATE:
+                # The cancellation was pushed while reading the database
+                return
+            self.state = action_plan.state
+            self._condition.notify_all()
+
+    def refresh_if_stale(self):
+        """Read the state of the action plan if it was read too long ago"""
+        with self._condition:
+            if time.time() - self.refreshed_at < self.interval:
+                return
+            # Only a single action reads the database at a time
+            self.refreshed_at = time.time()
+        self.refresh()
+
+    def set_state(self, state):
+        with self._condition:
+            self.state = state
+            self._condition.notify_all()
+
+    def cancel(self):
+        """Wake up the running actions, the action plan being cancelled"""
+        LOG.info("Action plan %s is being cancelled", self.uuid)
+        self.set_state(objects.action_plan.State.CANCELLING)
+
+    def notify(self):
+        """Wake up the running actions, one of them being completed"""
+        with self._condition:
+            self._condition.notify_all()
+
+    def wait(self, is_completed):
+        """Wait for an action to complete or its action plan to be cancelled
+
+        :param is_completed: callable telling whether the action completed
+        :return: whether the action plan is cancelled
+        """
+        while True:
+            with self._condition:
+                if is_completed() or self.cancelled:
+                    return self.cancelled
+                self._condition.wait(self.interval)
+            self.refresh_if_stale()
+
+    def get_stats(self):
+        return collections.OrderedDict([
+            ("state", self.state),
+            ("reads", self.reads),
+        ])
+
+
+@six.add_metaclass(service.Singleton)
+class ActionPlanWatchers(object):
+    """Watchers of the action plans executed by this applier, by UUID"""
+
+    def __init__(self):
+        self._watchers = {}
+        self._lock = threading.Lock()
+
+    def register(self, watcher):
+        with self._lock:
+            self._watchers[watcher.uuid] = watcher
+
+    def unregister(self, watcher):
+        with self._lock:
+            if self._watchers.get(watcher.uuid) is watcher:
+                del self._watchers[watcher.uuid]
+
+    def cancel(self, action_plan_uuid):
+        """Cancel an action plan if it is executed by this applier
+
+        :return: whether the action plan is executed by this applier
+        """
+        with self._lock:
+            watcher = self._watchers.get(action_plan_uuid)
+        if watcher is None:
+            return False
+        watcher.cancel()
+        return True
+
+
 @six.add_metaclass(abc.ABCMeta)
 class BaseWorkFlowEngine(loadable.Loadable):
 
@@ -57,6 +188,8 @@ class BaseWorkFlowEngine(loadable.Loadable):
         self._applier_manager = applier_manager
         self._action_factory = factory.ActionFactory()
         self._osc = None
+        self._action_plan_watchers = {}
+        self._watchers_lock = threading.Lock()
 
     @classmethod
     def get_config_opts(cls):
@@ -85,6 +218,30 @@ class BaseWorkFlowEngine(loadable.Loadable):
     def action_factory(self):
         return self._action_factory
 
+    def get_action_plan_watcher(self, action_plan_id):
+        """Get the watcher of an action plan, shared by its actions
+
+        :param action_plan_id: the ID of the action plan
+        :rtype: :py:class:`ActionPlanWatcher` instance
+        """
+        with self._watchers_lock:
+            watcher = self._action_plan_watchers.get(action_plan_id)
+            if watcher is None:
+                watcher = ActionPlanWatcher(self.context, action_plan_id)
+                self._action_plan_watchers[action_plan_id] = watcher
+                ActionPlanWatchers().register(watcher)
+            return watcher
+
+    def release_action_plan_watchers(self):
+        with self._watchers_lock:
+            watchers = list(self._action_plan_watchers.values())
+            self._action_plan_watchers.clear()
+        for watcher in watchers:
+            ActionPlanWatchers().unregister(watcher)
+            LOG.info("Action plan %(uuid)s: its state was read %(reads)d "
+                     "times from the database",
+                     dict(uuid=watcher.uuid, reads=watcher.reads))
+
     def notify(self, action, state):
         db_action = objects.Action.get_by_uuid(self.context, action.uuid,
                                                eager=True)
@@ -145,10 +302,11 @@ class BaseTaskFlowActionContainer(flow_task.Task):
             # NOTE(adisky): check the state of action plan before starting
             # next action, if action plan is cancelled raise the exceptions
             # so that taskflow does not schedule further actions.
-            action_plan = objects.ActionPlan.get_by_id(
-                self.engine.context, self._db_action.action_plan_id)
-            if action_plan.state in CANCEL_STATE:
-                raise exception.ActionPlanCancelled(uuid=action_plan.uuid)
+            watcher = self.engine.get_action_plan_watcher(
+                self._db_action.action_plan_id)
+            watcher.refresh_if_stale()
+            if watcher.cancelled:
+                raise exception.ActionPlanCancelled(uuid=watcher.uuid)
             self.do_pre_execute()
             notifications.action.send_execution_notification(
                 self.engine.context, self._db_action,
@@ -189,18 +347,12 @@ class BaseTaskFlowActionContainer(flow_task.Task):
         # NOTE: spawn a new thread for action execution, so that if action plan
         # is cancelled workflow engine will not wait to finish action execution
         et = eventlet.spawn(_do_execute_action, *args, **kwargs)
-        # NOTE: check for the state of action plan periodically,so that if
-        # action is finished or action plan is cancelled we can exit from here.
-        while True:
-            action_object = objects.Action.get_by_uuid(
-                self.engine.context, self._db_action.uuid, eager=True)
-            action_plan_object = objects.ActionPlan.get_by_id(
-                self.engine.context, action_object.action_plan_id)
-            if (action_object.state in [objects.action.State.SUCCEEDED,
-               objects.action.State.FAILED] or
-               action_plan_object.state in CANCEL_STATE):
-                break
-            time.sleep(1)
+        # NOTE: wait for the action to finish or for the action plan to be
+        # cancelled, whichever comes first, so that we can exit from here.
+        watcher = self.engine.get_action_plan_watcher(
+            self._db_action.action_plan_id)
+        et.link(lambda thread: watcher.notify())
+        cancelled = watcher.wait(lambda: et.dead)
         try:
             # NOTE: kill the action execution thread, if action plan is
             # cancelled for all other cases wait for the result from action
@@ -208,7 +360,7 @@ class BaseTaskFlowActionContainer(flow_task.Task):
             # Not all actions support abort operations, kill only those action
             # which support abort operations
             abort = self.action.check_abort()
-            if (action_plan_object.state in CANCEL_STATE and abort):
+            if cancelled and abort:
                 et.kill()
             et.wait()
 
@@ -216,7 +368,7 @@ class BaseTaskFlowActionContainer(flow_task.Task):
             # taskflow will call revert for the action,
             # we will redirect it to abort.
         except eventlet.greenlet.GreenletExit:
-            raise exception.ActionPlanCancelled(uuid=action_plan_object.uuid)
+            raise exception.ActionPlanCancelled(uuid=watcher.uuid)
 
         except Exception as e:
             LOG.exception(e)
@@ -235,12 +387,16 @@ class BaseTaskFlowActionContainer(flow_task.Task):
                 priority=fields.NotificationPriority.ERROR)
 
     def revert(self, *args, **kwargs):
-        action_plan = objects.ActionPlan.get_by_id(
-            self.engine.context, self._db_action.action_plan_id, eager=True)
+        watcher = self.engine.get_action_plan_watcher(
+            self._db_action.action_plan_id)
+        # NOTE: reverting an action of a cancelled action plan would undo it
+        # instead of aborting it, so the state of the action plan is read
+        # from the database rather than taken from the cache
+        watcher.refresh()
         # NOTE: check if revert cause by cancel action plan or
         # some other exception occured during action plan execution
         # if due to some other exception keep the flow intact.
-        if action_plan.state not in CANCEL_STATE:
+        if not watcher.cancelled:
             self.do_revert()
             return
 
@@ -103,6 +103,9 @@ class DefaultWorkFlowEngine(base.BaseWorkFlowEngine):
         except Exception as e:
             raise exception.WorkflowExecutionException(error=e)
 
+        finally:
+            self.release_action_plan_watchers()
+
 
 class TaskFlowActionContainer(base.BaseTaskFlowActionContainer):
     def __init__(self, db_action, engine):
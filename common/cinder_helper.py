@@ -15,6 +15,7 @@
 import time
 
 from oslo_log import log
+from oslo_utils import timeutils
 
 from cinderclient import exceptions as cinder_exception
 from cinderclient.v2.volumes import Volume
@@ -67,8 +68,27 @@ class CinderHelper(object):
             raise exception.PoolNotFound(name=name)
 
     def get_volume_list(self):
+        """List the volumes of all the tenants"""
         return self.cinder.volumes.list(search_opts={'all_tenants': True})
 
+    @staticmethod
+    def is_volume_changed_since(volume, since):
+        """Whether a volume was updated since the given time
+
+        Unlike Nova, Cinder cannot list the resources changed since a given
+        time (the ``changes-since`` filter is not a volume filter), hence the
+        comparison of the update time of the volumes on the client side.
+
+        :param since: naive UTC time
+        :type since: :py:class:`~datetime.datetime`
+        """
+        updated_at = (getattr(volume, 'updated_at', None) or
+                      getattr(volume, 'created_at', None))
+        if not updated_at:
+            return True
+        return timeutils.normalize_time(
+            timeutils.parse_isotime(updated_at)) >= since
+
     def get_volume_type_list(self):
         return self.cinder.volume_types.list()
 
@@ -10,33 +10,178 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import collections
+import functools
+import threading
+
 from ceilometerclient import client as ceclient
 from cinderclient import client as ciclient
 from glanceclient import client as glclient
 from gnocchiclient import client as gnclient
 from ironicclient import client as irclient
 from keystoneauth1 import loading as ka_loading
+from keystoneauth1 import session as ka_session
 from keystoneclient import client as keyclient
 from monascaclient import client as monclient
 from neutronclient.neutron import client as netclient
 from novaclient import client as nvclient
+from oslo_log import log
+from oslo_service import service
+from oslo_utils import timeutils
+import requests
+import six
 
 from watcher.common import exception
 
 from watcher import conf
 
+LOG = log.getLogger(__name__)
 CONF = conf.CONF
 
 _CLIENTS_AUTH_GROUP = 'watcher_clients_auth'
 
 
+@six.add_metaclass(service.Singleton)
+class ClientPool(object):
+    """Keystone session and clients shared by the whole process
+
+    The session keeps its HTTP connections alive in a pool of
+    ``[watcher_clients_auth] connection_pool_size`` connections per host, and
+    its token is renewed ``[watcher_clients_auth] token_refresh_margin``
+    seconds before it expires, so that no request waits for a new token.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._session = None
+        self._clients = {}
+        self._refresh_timer = None
+        self.sessions_created = 0
+        self.tokens_created = 0
+        self.clients_created = 0
+
+    @property
+    def pool_size(self):
+        return CONF.watcher_clients_auth.connection_pool_size
+
+    @property
+    def refresh_margin(self):
+        return CONF.watcher_clients_auth.token_refresh_margin
+
+    def get_session(self):
+        with self._lock:
+            if self._session is None:
+                self._session = self._create_session()
+            return self._session
+
+    def _create_session(self):
+        auth = ka_loading.load_auth_from_conf_options(CONF,
+                                                      _CLIENTS_AUTH_GROUP)
+        http_session = requests.Session()
+        for scheme in ('http://', 'https://'):
+            http_session.mount(scheme, ka_session.TCPKeepAliveAdapter(
+                pool_connections=self.pool_size,
+                pool_maxsize=self.pool_size))
+        sess = ka_loading.load_session_from_conf_options(CONF,
+                                                         _CLIENTS_AUTH_GROUP,
+                                                         auth=auth,
+                                                         session=http_session)
+        if hasattr(auth, 'get_auth_ref'):
+            # Every new token goes through get_auth_ref, whether it is
+            # fetched on demand by keystoneauth or renewed by the pool
+            auth.get_auth_ref = self._on_new_token(sess, auth.get_auth_ref)
+        self.sessions_created += 1
+        return sess
+
+    def _on_new_token(self, sess, get_auth_ref):
+        def wrapper(*args, **kwargs):
+            auth_ref = get_auth_ref(*args, **kwargs)
+            with self._lock:
+                self.tokens_created += 1
+                if sess is self._session:
+                    self._schedule_refresh(auth_ref)
+            return auth_ref
+        return wrapper
+
+    def _schedule_refresh(self, auth_ref):
+        if self._refresh_timer is not None:
+            self._refresh_timer.cancel()
+            self._refresh_timer = None
+        expires = getattr(auth_ref, 'expires', None)
+        if not self.refresh_margin or expires is None:
+            return
+        delay = timeutils.delta_seconds(
+            timeutils.utcnow(), timeutils.normalize_time(expires))
+        self._refresh_timer = threading.Timer(
+            max(delay - self.refresh_margin, 0), self.refresh_token)
+        self._refresh_timer.daemon = True
+        self._refresh_timer.start()
+
+    def refresh_token(self):
+        """Renew the token of the session before it expires"""
+        with self._lock:
+            sess = self._session
+            self._refresh_timer = None
+        if sess is None:
+            return
+        try:
+            # The token in use stays valid until it is replaced
+            sess.auth.auth_ref = sess.auth.get_auth_ref(sess)
+        except Exception as exc:
+            # keystoneauth fetches a new token on demand anyway
+            LOG.warning("Failed to renew the token of the clients: %s", exc)
+
+    def get_client(self, key, factory):
+        """Get a shared client, creating it on first use
+
+        :param key: the service and the options of the client
+        :param factory: the callable creating the client
+        """
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = self._clients[key] = factory()
+                self.clients_created += 1
+            return client
+
+    def invalidate(self):
+        """Drop the clients and the token, e.g. once rejected
+
+        The session and its connections are kept.
+        """
+        with self._lock:
+            self._clients.clear()
+            if self._refresh_timer is not None:
+                self._refresh_timer.cancel()
+                self._refresh_timer = None
+            if self._session is not None:
+                self._session.invalidate()
+
+    def get_stats(self):
+        return collections.OrderedDict([
+            ("sessions_created", self.sessions_created),
+            ("tokens_created", self.tokens_created),
+            ("clients_created", self.clients_created),
+            ("clients", len(self._clients)),
+        ])
+
+
 class OpenStackClients(object):
-    """Convenience class to create and cache client instances."""
+    """Convenience class to create and cache client instances.
+
+    The session and the clients are shared with the other instances through
+    the :py:class:`ClientPool`.
+    """
 
     def __init__(self):
-        self.reset_clients()
+        self._clear_clients()
 
     def reset_clients(self):
+        """Recreate the clients and get a new token, e.g. once rejected"""
+        ClientPool().invalidate()
+        self._clear_clients()
+
+    def _clear_clients(self):
         self._session = None
         self._keystone = None
         self._nova = None
@@ -49,12 +194,10 @@ class OpenStackClients(object):
         self._ironic = None
 
     def _get_keystone_session(self):
-        auth = ka_loading.load_auth_from_conf_options(CONF,
-                                                      _CLIENTS_AUTH_GROUP)
-        sess = ka_loading.load_session_from_conf_options(CONF,
-                                                         _CLIENTS_AUTH_GROUP,
-                                                         auth=auth)
-        return sess
+        return ClientPool().get_session()
+
+    def _get_shared_client(self, key, factory):
+        return ClientPool().get_client(key, factory)
 
     @property
     def auth_url(self):
@@ -72,7 +215,9 @@ class OpenStackClients(object):
     @exception.wrap_keystone_exception
     def keystone(self):
         if not self._keystone:
-            self._keystone = keyclient.Client(session=self.session)
+            self._keystone = self._get_shared_client(
+                ('keystone',),
+                functools.partial(keyclient.Client, session=self.session))
 
         return self._keystone
 
@@ -83,9 +228,11 @@ class OpenStackClients(object):
 
         novaclient_version = self._get_client_option('nova', 'api_version')
         nova_endpoint_type = self._get_client_option('nova', 'endpoint_type')
-        self._nova = nvclient.Client(novaclient_version,
-                                     endpoint_type=nova_endpoint_type,
-                                     session=self.session)
+        self._nova = self._get_shared_client(
+            ('nova', novaclient_version, nova_endpoint_type),
+            functools.partial(nvclient.Client, novaclient_version,
+                              endpoint_type=nova_endpoint_type,
+                              session=self.session))
         return self._nova
 
     @exception.wrap_keystone_exception
@@ -96,9 +243,11 @@ class OpenStackClients(object):
         glanceclient_version = self._get_client_option('glance', 'api_version')
         glance_endpoint_type = self._get_client_option('glance',
                                                        'endpoint_type')
-        self._glance = glclient.Client(glanceclient_version,
-                                       interface=glance_endpoint_type,
-                                       session=self.session)
+        self._glance = self._get_shared_client(
+            ('glance', glanceclient_version, glance_endpoint_type),
+            functools.partial(glclient.Client, glanceclient_version,
+                              interface=glance_endpoint_type,
+                              session=self.session))
         return self._glance
 
     @exception.wrap_keystone_exception
@@ -110,9 +259,11 @@ class OpenStackClients(object):
                                                         'api_version')
         gnocchiclient_interface = self._get_client_option('gnocchi',
                                                           'endpoint_type')
-        self._gnocchi = gnclient.Client(gnocchiclient_version,
-                                        interface=gnocchiclient_interface,
-                                        session=self.session)
+        self._gnocchi = self._get_shared_client(
+            ('gnocchi', gnocchiclient_version, gnocchiclient_interface),
+            functools.partial(gnclient.Client, gnocchiclient_version,
+                              interface=gnocchiclient_interface,
+                              session=self.session))
         return self._gnocchi
 
     @exception.wrap_keystone_exception
@@ -123,9 +274,11 @@ class OpenStackClients(object):
         cinderclient_version = self._get_client_option('cinder', 'api_version')
         cinder_endpoint_type = self._get_client_option('cinder',
                                                        'endpoint_type')
-        self._cinder = ciclient.Client(cinderclient_version,
-                                       endpoint_type=cinder_endpoint_type,
-                                       session=self.session)
+        self._cinder = self._get_shared_client(
+            ('cinder', cinderclient_version, cinder_endpoint_type),
+            functools.partial(ciclient.Client, cinderclient_version,
+                              endpoint_type=cinder_endpoint_type,
+                              session=self.session))
         return self._cinder
 
     @exception.wrap_keystone_exception
@@ -137,10 +290,12 @@ class OpenStackClients(object):
                                                            'api_version')
         ceilometer_endpoint_type = self._get_client_option('ceilometer',
                                                            'endpoint_type')
-        self._ceilometer = ceclient.get_client(
-            ceilometerclient_version,
-            endpoint_type=ceilometer_endpoint_type,
-            session=self.session)
+        self._ceilometer = self._get_shared_client(
+            ('ceilometer', ceilometerclient_version,
+             ceilometer_endpoint_type),
+            functools.partial(ceclient.get_client, ceilometerclient_version,
+                              endpoint_type=ceilometer_endpoint_type,
+                              session=self.session))
         return self._ceilometer
 
     @exception.wrap_keystone_exception
@@ -152,6 +307,7 @@ class OpenStackClients(object):
             'monasca', 'api_version')
         monascaclient_interface = self._get_client_option(
             'monasca', 'interface')
+        # The client is not shared as it holds on to the token
         token = self.session.get_token()
         watcher_clients_auth_config = CONF.get(_CLIENTS_AUTH_GROUP)
         service_type = 'monitoring'
@@ -185,10 +341,16 @@ class OpenStackClients(object):
         neutron_endpoint_type = self._get_client_option('neutron',
                                                         'endpoint_type')
 
-        self._neutron = netclient.Client(neutronclient_version,
-                                         endpoint_type=neutron_endpoint_type,
-                                         session=self.session)
-        self._neutron.format = 'json'
+        def create_client():
+            client = netclient.Client(neutronclient_version,
+                                      endpoint_type=neutron_endpoint_type,
+                                      session=self.session)
+            client.format = 'json'
+            return client
+
+        self._neutron = self._get_shared_client(
+            ('neutron', neutronclient_version, neutron_endpoint_type),
+            create_client)
         return self._neutron
 
     @exception.wrap_keystone_exception
@@ -198,7 +360,9 @@ class OpenStackClients(object):
 
         ironicclient_version = self._get_client_option('ironic', 'api_version')
         endpoint_type = self._get_client_option('ironic', 'endpoint_type')
-        self._ironic = irclient.get_client(ironicclient_version,
-                                           ironic_url=endpoint_type,
-                                           session=self.session)
+        self._ironic = self._get_shared_client(
+            ('ironic', ironicclient_version, endpoint_type),
+            functools.partial(irclient.get_client, ironicclient_version,
+                              ironic_url=endpoint_type,
+                              session=self.session))
         return self._ironic
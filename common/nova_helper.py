@@ -64,15 +64,40 @@ class NovaHelper(object):
             LOG.exception(exc)
             raise exception.ComputeNodeNotFound(name=node_hostname)
 
-    def get_instance_list(self):
-        return self.nova.servers.list(search_opts={'all_tenants': True})
+    def get_instance_list(self, marker=None, limit=-1, changes_since=None):
+        """List the instances of all the tenants
+
+        :param marker: ID of the instance after which to start the listing
+        :param limit: maximum number of instances to list, -1 to list them
+                      all by walking through all the pages
+        :param changes_since: only list the instances which changed since
+                              this time, including the deleted ones
+        :type changes_since: :py:class:`~datetime.datetime`
+        """
+        search_opts = {'all_tenants': True}
+        if changes_since is not None:
+            search_opts['changes-since'] = changes_since.isoformat()
+        return self.nova.servers.list(search_opts=search_opts,
+                                      marker=marker, limit=limit)
+
+    def get_instance_id_list(self):
+        """List the IDs of the instances of all the tenants"""
+        return [instance.id for instance in self.nova.servers.list(
+            detailed=False, search_opts={'all_tenants': True}, limit=-1)]
 
     def get_service(self, service_id):
         return self.nova.services.find(id=service_id)
 
+    def get_service_list(self):
+        return self.nova.services.list(binary='nova-compute')
+
     def get_flavor(self, flavor_id):
         return self.nova.flavors.get(flavor_id)
 
+    def get_flavor_list(self):
+        # Both the public and the private flavors
+        return self.nova.flavors.list(is_public=None)
+
     def get_aggregate_list(self):
         return self.nova.aggregates.list()
 
@@ -41,6 +41,13 @@ APPLIER_MANAGER_OPTS = [
                default='taskflow',
                required=True,
                help='Select the engine to use to execute the workflow'),
+    cfg.IntOpt('action_plan_refresh_interval',
+               default=10,
+               min=1,
+               help='Interval (in seconds) at which the state of the action '
+                    'plans being executed is read from the database, in '
+                    'case their cancellation was not pushed to the '
+                    'applier.'),
 ]
 
 
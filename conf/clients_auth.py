@@ -17,15 +17,31 @@
 # limitations under the License.
 
 from keystoneauth1 import loading as ka_loading
+from oslo_config import cfg
 
 WATCHER_CLIENTS_AUTH = 'watcher_clients_auth'
 
+CLIENT_POOL_OPTS = [
+    cfg.IntOpt('connection_pool_size',
+               default=10,
+               min=1,
+               help='Number of HTTP connections kept alive per host by the '
+                    'keystone session shared by the OpenStack clients.'),
+    cfg.IntOpt('token_refresh_margin',
+               default=300,
+               min=0,
+               help='Number of seconds before its expiry at which the token '
+                    'of the shared keystone session is renewed. 0 disables '
+                    'the renewal ahead of expiry.'),
+]
+
 
 def register_opts(conf):
     ka_loading.register_session_conf_options(conf, WATCHER_CLIENTS_AUTH)
     ka_loading.register_auth_conf_options(conf, WATCHER_CLIENTS_AUTH)
+    conf.register_opts(CLIENT_POOL_OPTS, group=WATCHER_CLIENTS_AUTH)
 
 
 def list_opts():
     return [('watcher_clients_auth', ka_loading.get_session_conf_options() +
-            ka_loading.get_auth_common_conf_options())]
+            ka_loading.get_auth_common_conf_options() + CLIENT_POOL_OPTS)]
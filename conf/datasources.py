@@ -0,0 +1,80 @@
+# -*- encoding: utf-8 -*-
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from oslo_config import cfg
+from oslo_config import types
+
+watcher_datasources = cfg.OptGroup(name='watcher_datasources',
+                                   title='Configuration Options for the '
+                                         'datasources')
+
+WATCHER_DATASOURCES_OPTS = [
+    cfg.IntOpt('metric_cache_ttl',
+               default=300,
+               min=0,
+               help='Time (in seconds) during which an aggregated metric '
+                    'value fetched from a datasource is reused across '
+                    'strategies and audits. 0 disables the metric cache.'),
+    cfg.IntOpt('metric_cache_size',
+               default=100000,
+               min=0,
+               help='Maximum number of aggregated metric values kept in the '
+                    'metric cache. The least recently used values are '
+                    'evicted first. 0 disables the metric cache.'),
+    cfg.Opt('max_concurrency',
+            type=types.Dict(value_type=types.Integer(min=1)),
+            default={'ceilometer': 16, 'gnocchi': 16, 'monasca': 16},
+            help='Maximum number of metric requests sent in parallel to '
+                 'each datasource, shared by all the strategies running '
+                 'in the process. Mapping of datasource name to number of '
+                 'requests, e.g. "gnocchi:32,ceilometer:8".'),
+    cfg.IntOpt('default_max_concurrency',
+               default=16,
+               min=1,
+               help='Maximum number of metric requests sent in parallel to '
+                    'a datasource which is not listed in max_concurrency.'),
+    cfg.IntOpt('request_timeout',
+               default=60,
+               min=0,
+               help='Time (in seconds) after which a metric request sent to '
+                    'a datasource is abandoned and its value considered as '
+                    'missing. 0 means no timeout.'),
+    cfg.ListOpt('datasources',
+                default=['gnocchi', 'ceilometer', 'monasca'],
+                help='Datasources queried by the datasource manager, in '
+                     'order of preference. A metric is fetched from the '
+                     'first datasource providing it.'),
+    cfg.FloatOpt('max_latency',
+                 default=10.0,
+                 min=0,
+                 help='Time (in seconds) above which a datasource answering '
+                      'a metric request is considered as slow. A slow or '
+                      'failing datasource is queried after the other ones '
+                      'during failover_backoff seconds.'),
+    cfg.IntOpt('failover_backoff',
+               default=60,
+               min=0,
+               help='Time (in seconds) during which a slow or failing '
+                    'datasource is queried after the other ones.'),
+]
+
+
+def register_opts(conf):
+    conf.register_group(watcher_datasources)
+    conf.register_opts(WATCHER_DATASOURCES_OPTS, group=watcher_datasources)
+
+
+def list_opts():
+    return [('watcher_datasources', WATCHER_DATASOURCES_OPTS)]
@@ -18,6 +18,7 @@
 
 from oslo_config import cfg
 
+from watcher.conf import paths
 
 watcher_decision_engine = cfg.OptGroup(name='watcher_decision_engine',
                                        title='Defines the parameters of '
@@ -42,6 +43,39 @@ WATCHER_DECISION_ENGINE_OPTS = [
                required=True,
                help='The maximum number of threads that can be used to '
                     'execute strategies'),
+    cfg.IntOpt('max_audits_per_goal',
+               default=0,
+               min=0,
+               help='The maximum number of audits which can be executed '
+                    'concurrently for the same goal. Set to 0 for no other '
+                    'limit than max_workers.'),
+    cfg.IntOpt('max_audits_per_strategy',
+               default=0,
+               min=0,
+               help='The maximum number of audits which can be executed '
+                    'concurrently with the same strategy. Set to 0 for no '
+                    'other limit than max_workers.'),
+    cfg.ListOpt('process_strategies',
+                default=[],
+                help='The names of the strategies to execute in a pool of '
+                     'worker processes rather than in the threads of the '
+                     'decision engine, e.g. the CPU-bound ones such as '
+                     'vm_workload_consolidation. The scoped compute and '
+                     'storage models are shipped to the worker process in '
+                     'the msgpack format.'),
+    cfg.IntOpt('strategy_processes',
+               default=0,
+               min=0,
+               help='The number of worker processes executing the '
+                    'strategies listed in process_strategies. Set to 0 to '
+                    'use one process per CPU.'),
+    cfg.IntOpt('strategy_process_timeout',
+               default=3600,
+               min=0,
+               help='Time (in seconds) after which the worker process '
+                    'executing a strategy listed in process_strategies is '
+                    'terminated, failing the audit. Set to 0 to wait for '
+                    'the worker process indefinitely.'),
     cfg.IntOpt('action_plan_expiry',
                default=24,
                help='An expiry timespan(hours). Watcher invalidates any '
@@ -50,7 +84,37 @@ WATCHER_DECISION_ENGINE_OPTS = [
                     ' is older that the current time.'),
     cfg.IntOpt('check_periodic_interval',
                default=30 * 60,
-               help='Interval (in seconds) for checking action plan expiry.')
+               help='Interval (in seconds) for checking action plan expiry.'),
+    cfg.StrOpt('model_snapshot_dir',
+               default=paths.state_path_def('cluster_data_models'),
+               help='Directory where the cluster data models are saved '
+                    'after each synchronization, so that they can be '
+                    'reloaded and patched with the latest changes upon '
+                    'restart instead of being rebuilt from scratch. Leave '
+                    'empty to disable.'),
+    cfg.IntOpt('model_snapshot_max_age',
+               default=24 * 3600,
+               min=0,
+               help='Maximum age (in seconds) of a saved cluster data '
+                    'model. An older snapshot is discarded upon restart and '
+                    'the model is rebuilt from scratch instead, as patching '
+                    'it would take longer and let it drift further from '
+                    'the cluster. Set to 0 to always reload the snapshot.'),
+    cfg.FloatOpt('notification_batch_window',
+                 default=1.0,
+                 min=0,
+                 help='Time (in seconds) during which the notifications '
+                      'updating the cluster data models are buffered before '
+                      'being applied in a single batch. Only the last '
+                      'notification received about each resource is '
+                      'applied. Set to 0 to apply each notification as soon '
+                      'as it is received.'),
+    cfg.IntOpt('notification_batch_size',
+               default=1000,
+               min=1,
+               help='Number of buffered resources from which the pending '
+                    'notifications are applied without waiting for the end '
+                    'of the batch window.'),
 ]
 
 WATCHER_CONTINUOUS_OPTS = [
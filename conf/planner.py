@@ -28,7 +28,33 @@ WATCHER_PLANNER_OPTS = {
     cfg.StrOpt('planner',
                default=default_planner,
                required=True,
-               help='The selected planner used to schedule the actions')
+               help='The selected planner used to schedule the actions'),
+    cfg.DictOpt('action_durations',
+                default={
+                    'nop': 0,
+                    'sleep': 1,
+                    'change_nova_service_state': 5,
+                    'migrate': 30,
+                    'resize': 120,
+                    'volume_migrate': 300,
+                    'change_node_power_state': 300,
+                    'turn_host_to_acpi_s3_state': 60,
+                },
+                help='Expected duration (in seconds) of the actions, by '
+                     'action type. The duration of a migration is '
+                     'increased by the time it takes to transfer the memory '
+                     '(live migration) or the disk (cold migration) of its '
+                     'instance. The duration of a sleep is its own.'),
+    cfg.IntOpt('default_action_duration',
+               default=60,
+               min=0,
+               help='Expected duration (in seconds) of the actions whose '
+                    'type is missing from action_durations'),
+    cfg.IntOpt('migration_bandwidth',
+               default=100,
+               min=1,
+               help='Expected bandwidth (in MB/s) at which the instances '
+                    'are migrated'),
 }
 
 
@@ -1,14 +1,154 @@
 
 import abc
+
 import six
 
-from watcher.common import clients 
-from monascaclient import exc
+from watcher.common import clients
+from watcher.common import exception
+from watcher.common.loader import loadable
+from watcher.datasource import fetcher
+
+
+def fetch_concurrently(datasource, fetch, resource_ids, metrics):
+    """Concurrently call ``fetch(resource_id, metric)`` for each pair
 
+    :param datasource: name of the datasource the metrics come from
+    :param fetch: callable returning the value of a metric for a resource
+    :param resource_ids: ids of the resources to fetch the metrics for
+    :param metrics: names of the metrics to fetch
+    :return: a dict of dicts so that ``result[resource_id][metric]`` is the
+             value returned by ``fetch`` (None if it failed)
+    """
+    values = fetcher.MetricFetcher(
+        datasource, lambda request: fetch(*request)).fetch(
+            (resource_id, metric)
+            for resource_id in resource_ids for metric in metrics)
+    result = {resource_id: {} for resource_id in resource_ids}
+    for (resource_id, metric), value in values.items():
+        result[resource_id][metric] = value
+    return result
 
 
 @six.add_metaclass(abc.ABCMeta)
-class BaseDriver(object):
-    def __init__(self, osc=None):
-        self.osc = osc if osc else clients.OpenstackClients()
-        
+class BaseDriver(loadable.Loadable):
+    """Base class of the datasource backends
+
+    A backend exposes the metrics of a datasource under the canonical names
+    of :py:attr:`METRIC_MAP` so that strategies do not depend on the naming
+    of a given datasource. Backends are loaded as ``watcher_datasources``
+    entry points by the :py:class:`~.DataSourceManager`.
+    """
+
+    # Name of the datasource, which is also the name of its entry point
+    NAME = None
+
+    # Canonical metric names mapped to the name of the metric in the
+    # datasource, or None when the datasource does not provide it
+    METRIC_MAP = dict(
+        host_cpu_usage=None,
+        host_outlet_temp=None,
+        host_inlet_temp=None,
+        host_airflow=None,
+        host_power=None,
+        instance_cpu_usage=None,
+        instance_ram_usage=None,
+        instance_ram_allocated=None,
+        instance_root_disk_size=None,
+        instance_l3_cache_usage=None,
+    )
+
+    # Canonical aggregates mapped to the name of the aggregate in the
+    # datasource
+    AGGREGATE_MAP = dict(mean='mean', min='min', max='max', count='count')
+
+    def __init__(self, config, osc=None):
+        """:param osc: an OpenStackClients instance"""
+        super(BaseDriver, self).__init__(config)
+        self.osc = osc if osc else clients.OpenStackClients()
+
+    @classmethod
+    def get_config_opts(cls):
+        return []
+
+    def has_metric(self, metric):
+        return self.METRIC_MAP.get(metric) is not None
+
+    def get_metric_name(self, metric):
+        """Name of a canonical metric in the datasource
+
+        :param metric: canonical name of the metric
+        :raises: :py:class:`~.NoSuchMetric` if the datasource does not
+                 provide the metric
+        """
+        if not self.has_metric(metric):
+            raise exception.NoSuchMetric()
+        return self.METRIC_MAP[metric]
+
+    def get_aggregate_name(self, aggregate):
+        return self.AGGREGATE_MAP.get(aggregate, aggregate)
+
+    @abc.abstractmethod
+    def statistic_aggregation(self, resource_id, metric, period,
+                              aggregate='mean', granularity=300):
+        """Aggregate the measures of a metric over the last period
+
+        :param resource_id: id of the host or instance
+        :param metric: canonical name of the metric, see
+                       :py:attr:`METRIC_MAP`
+        :param period: time (in seconds) over which measures are aggregated
+        :param aggregate: one of the canonical aggregates of
+                          :py:attr:`AGGREGATE_MAP`
+        :param granularity: time (in seconds) between two measures, for the
+                            datasources which store pre-aggregated series
+        :return: the aggregated value, None if there is no data
+        """
+        raise NotImplementedError
+
+    def statistic_aggregation_bulk(self, resource_ids, metrics, period,
+                                   aggregate='mean', granularity=300):
+        """Aggregate the measures of several metrics of several resources
+
+        The metrics are fetched concurrently, one resource at a time. The
+        backends override it to use the bulk queries of their datasource.
+
+        :param resource_ids: ids of the hosts or instances
+        :param metrics: canonical names of the metrics
+        :return: a dict of dicts so that ``result[resource_id][metric]`` is
+                 the aggregated value (None if there is no data)
+
+        See :py:meth:`statistic_aggregation` for the other parameters.
+        """
+        def fetch(resource_id, metric):
+            return self.statistic_aggregation(
+                resource_id, metric, period, aggregate=aggregate,
+                granularity=granularity)
+
+        return fetch_concurrently(self.NAME, fetch, resource_ids, metrics)
+
+    def _get_metric_names(self, metrics):
+        """Canonical metric names indexed by their name in the datasource"""
+        return {self.get_metric_name(metric): metric for metric in metrics}
+
+    @staticmethod
+    def _to_canonical(values, metric_names):
+        """Rename the metrics of bulk results to their canonical names"""
+        return {resource_id: {metric_names[name]: value
+                              for name, value in resource_values.items()}
+                for resource_id, resource_values in values.items()}
+
+
+# Metrics published by Ceilometer, whether they are read from the Ceilometer
+# API or from Gnocchi
+CEILOMETER_METRIC_MAP = dict(
+    BaseDriver.METRIC_MAP,
+    host_cpu_usage='compute.node.cpu.percent',
+    host_outlet_temp='hardware.ipmi.node.outlet_temperature',
+    host_inlet_temp='hardware.ipmi.node.temperature',
+    host_airflow='hardware.ipmi.node.airflow',
+    host_power='hardware.ipmi.node.power',
+    instance_cpu_usage='cpu_util',
+    instance_ram_usage='memory.usage',
+    instance_ram_allocated='memory',
+    instance_root_disk_size='disk.root.size',
+    instance_l3_cache_usage='cpu_l3_cache',
+)
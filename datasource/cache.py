@@ -0,0 +1,207 @@
+# -*- encoding: utf-8 -*-
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Process-wide cache of the aggregated metric values fetched from the
+datasources.
+
+Strategies executed by continuous audits repeatedly query the same
+aggregation windows. Each value is therefore cached for
+``[watcher_datasources] metric_cache_ttl`` seconds under a key made of the
+resource, the metric, the aggregate, the granularity and the bucket of the
+aggregation window, so that it is shared by all the strategies and audits
+running within the decision engine. The datasource is part of the key as the
+datasources may share metric and aggregate names.
+
+Missing values (``None``) are never cached: the fetchers return ``None`` on
+errors and timeouts, which would otherwise hide the metric until the entry
+expires.
+"""
+
+import calendar
+import collections
+import threading
+import time
+
+from oslo_config import cfg
+from oslo_utils import timeutils
+import six
+
+from watcher.common import service
+
+CONF = cfg.CONF
+
+_MISSING = object()
+
+
+def make_key(datasource, resource_id, metric, aggregate, granularity=None,
+             period=None, stop_time=None, bucket_size=None):
+    """Build the cache key of an aggregated metric value
+
+    The end of the aggregation window is rounded down to the granularity
+    (or ``bucket_size`` if no granularity is given) so that queries issued
+    within the same time bucket share the same key.
+
+    :param datasource: name of the datasource the metric is fetched from
+    :param resource_id: id of the resource the metric is related to
+    :param metric: name of the metric
+    :param aggregate: name of the aggregation function
+    :param granularity: granularity (in seconds) of the measures
+    :param period: length (in seconds) of the aggregation window
+    :param stop_time: end of the aggregation window (defaults to now)
+    :param bucket_size: size (in seconds) of the time buckets used when no
+                        granularity is given (defaults to the cache TTL)
+    :return: a hashable key
+    """
+    stop_time = stop_time or timeutils.utcnow()
+    timestamp = calendar.timegm(stop_time.utctimetuple())
+    bucket_size = int(
+        granularity or bucket_size or CONF.watcher_datasources.metric_cache_ttl
+        or 1)
+    window_bucket = (period, timestamp // bucket_size)
+    return (datasource, resource_id, metric, aggregate, granularity,
+            window_bucket)
+
+
+@six.add_metaclass(service.Singleton)
+class MetricCache(object):
+    """TTL-bounded LRU cache of aggregated metric values
+
+    The TTL and the size of the cache are read from the configuration on
+    each lookup, so that they can be changed without restarting the service.
+    """
+
+    def __init__(self):
+        # Cached values by key, least recently used first, as
+        # (time of insertion, value)
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def ttl(self):
+        return CONF.watcher_datasources.metric_cache_ttl
+
+    @property
+    def max_size(self):
+        return CONF.watcher_datasources.metric_cache_size
+
+    @property
+    def enabled(self):
+        return self.ttl > 0 and self.max_size > 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, default=None):
+        """Get the cached value of a key
+
+        :return: the cached value or ``default`` if there is none or if it
+                 has expired
+        """
+        value = self._get(key)
+        return default if value is _MISSING else value
+
+    def _get(self, key):
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None or entry[0] + self.ttl < time.time():
+                self.misses += 1
+                return _MISSING
+            # Re-insert the entry to mark it as the most recently used one
+            self._entries[key] = entry
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, value):
+        if not self.enabled or value is None:
+            return
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (time.time(), value)
+            max_size = self.max_size
+            while len(self._entries) > max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_fetch(self, key, fetch):
+        """Get the cached value of a key, fetching it if needed
+
+        :param key: a key built with :py:func:`make_key`
+        :param fetch: callable returning the value to cache, ``None`` values
+                      not being cached
+        :return: the cached or freshly fetched value
+        """
+        if not self.enabled:
+            return fetch()
+
+        value = self._get(key)
+        if value is _MISSING:
+            value = fetch()
+            self.set(key, value)
+        return value
+
+    def get_or_fetch_many(self, keys, fetch_many):
+        """Get the cached values of several keys, fetching the missing ones
+
+        :param keys: dict mapping the resource ids to their cache key
+        :param fetch_many: callable taking the list of the resource ids
+                           missing from the cache and returning a dict
+                           mapping them to their value, ``None`` values
+                           not being cached
+        :return: a dict mapping each resource id to its value
+        """
+        if not self.enabled:
+            return fetch_many(list(keys))
+
+        result = {}
+        missing = []
+        for resource_id, key in keys.items():
+            value = self._get(key)
+            if value is _MISSING:
+                missing.append(resource_id)
+            else:
+                result[resource_id] = value
+
+        if missing:
+            fetched = fetch_many(missing)
+            for resource_id in missing:
+                value = fetched.get(resource_id)
+                self.set(keys[resource_id], value)
+                result[resource_id] = value
+
+        return result
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self):
+        """Usage statistics of the cache
+
+        :return: dict with the size, capacity, TTL, hit, miss and eviction
+                 counters of the cache
+        """
+        with self._lock:
+            return collections.OrderedDict([
+                ('size', len(self._entries)),
+                ('max_size', self.max_size),
+                ('ttl', self.ttl),
+                ('hits', self.hits),
+                ('misses', self.misses),
+                ('evictions', self.evictions),
+            ])
@@ -19,11 +19,16 @@
 import datetime
 
 from ceilometerclient import exc
+from oslo_log import log
 from oslo_utils import timeutils
 
 from watcher._i18n import _
 from watcher.common import clients
 from watcher.common import exception
+from watcher.datasource import base
+from watcher.datasource import cache
+
+LOG = log.getLogger(__name__)
 
 
 class CeilometerHelper(object):
@@ -31,6 +36,7 @@ class CeilometerHelper(object):
         """:param osc: an OpenStackClients instance"""
         self.osc = osc if osc else clients.OpenStackClients()
         self.ceilometer = self.osc.ceilometer()
+        self.cache = cache.MetricCache()
 
     @staticmethod
     def format_query(user_id, tenant_id, resource_id,
@@ -145,6 +151,14 @@ class CeilometerHelper(object):
         :return: Return the latest statistical data, None if no data.
         """
 
+        key = cache.make_key('ceilometer', resource_id, meter_name,
+                             aggregate, period=int(period))
+        return self.cache.get_or_fetch(
+            key, lambda: self._statistic_aggregation(
+                resource_id, meter_name, period, aggregate))
+
+    def _statistic_aggregation(self, resource_id, meter_name, period,
+                               aggregate):
         end_time = datetime.datetime.utcnow()
         start_time = end_time - datetime.timedelta(seconds=int(period))
         query = self.build_query(
@@ -161,6 +175,78 @@ class CeilometerHelper(object):
             item_value = statistic[-1]._info.get('aggregate').get(aggregate)
         return item_value
 
+    def statistic_aggregation_bulk(self,
+                                   resource_ids,
+                                   metrics,
+                                   period,
+                                   aggregate='avg'):
+        """Representing statistic aggregates of several resources at once
+
+        The statistics of all the resources are retrieved with a single
+        query grouped by resource per meter. If this query fails, the
+        statistics are fetched concurrently for each resource.
+
+        :param resource_ids: ids of resources to list statistics for.
+        :param metrics: Names of meters to list statistics for.
+        :param period: Period in seconds over which to group samples.
+        :param aggregate: Available aggregates are: count, cardinality,
+                           min, max, sum, stddev, avg. Defaults to avg.
+        :return: a dict of dicts so that ``result[resource_id][metric]`` is
+                 the latest statistical data (None if no data)
+        """
+        result = {resource_id: {} for resource_id in resource_ids}
+        for meter_name in metrics:
+            keys = {resource_id: cache.make_key(
+                'ceilometer', resource_id, meter_name, aggregate,
+                period=int(period))
+                for resource_id in resource_ids}
+            values = self.cache.get_or_fetch_many(
+                keys, lambda ids: self._aggregate_by_resource(
+                    ids, meter_name, period, aggregate))
+            for resource_id, value in values.items():
+                result[resource_id][meter_name] = value
+
+        return result
+
+    def _aggregate_by_resource(self, resource_ids, meter_name, period,
+                               aggregate):
+        end_time = datetime.datetime.utcnow()
+        start_time = end_time - datetime.timedelta(seconds=int(period))
+        query = self.build_query(start_time=start_time, end_time=end_time)
+        try:
+            statistics = self.query_retry(
+                f=self.ceilometer.statistics.list,
+                meter_name=meter_name,
+                q=query,
+                period=period,
+                groupby=['resource_id'],
+                aggregates=[{'func': aggregate}])
+        except Exception as e:
+            LOG.warning("Could not group the %(meter)s statistics by "
+                        "resource, falling back to one query per "
+                        "resource: %(error)s",
+                        dict(meter=meter_name, error=e))
+
+            def fetch(resource_id, meter_name):
+                return self._statistic_aggregation(
+                    resource_id, meter_name, period, aggregate)
+
+            values = base.fetch_concurrently(
+                'ceilometer', fetch, resource_ids, [meter_name])
+            return {resource_id: value[meter_name]
+                    for resource_id, value in values.items()}
+
+        # Statistics are sorted by period so the latest one of each
+        # resource is kept
+        values = dict.fromkeys(resource_ids)
+        for statistic in statistics:
+            groupby = statistic._info.get('groupby') or {}
+            resource_id = groupby.get('resource_id')
+            if resource_id in values:
+                values[resource_id] = statistic._info.get(
+                    'aggregate').get(aggregate)
+        return values
+
     def get_last_sample_values(self, resource_id, meter_name, limit=1):
         samples = self.query_sample(
             meter_name=meter_name,
@@ -182,3 +268,41 @@ class CeilometerHelper(object):
             return samples[-1]._info['counter_volume']
         else:
             return False
+
+
+class CeilometerDriver(base.BaseDriver):
+    """Ceilometer backend of the :py:class:`~.DataSourceManager`"""
+
+    NAME = 'ceilometer'
+
+    METRIC_MAP = base.CEILOMETER_METRIC_MAP
+
+    AGGREGATE_MAP = dict(mean='avg', min='min', max='max', count='count')
+
+    def __init__(self, config, osc=None):
+        super(CeilometerDriver, self).__init__(config, osc)
+        self._helper = None
+
+    @property
+    def helper(self):
+        if self._helper is None:
+            self._helper = CeilometerHelper(osc=self.osc)
+        return self._helper
+
+    def statistic_aggregation(self, resource_id, metric, period,
+                              aggregate='mean', granularity=300):
+        return self.helper.statistic_aggregation(
+            resource_id=resource_id,
+            meter_name=self.get_metric_name(metric),
+            period=period,
+            aggregate=self.get_aggregate_name(aggregate))
+
+    def statistic_aggregation_bulk(self, resource_ids, metrics, period,
+                                   aggregate='mean', granularity=300):
+        metric_names = self._get_metric_names(metrics)
+        values = self.helper.statistic_aggregation_bulk(
+            resource_ids=resource_ids,
+            metrics=list(metric_names),
+            period=period,
+            aggregate=self.get_aggregate_name(aggregate))
+        return self._to_canonical(values, metric_names)
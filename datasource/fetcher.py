@@ -0,0 +1,189 @@
+# -*- encoding: utf-8 -*-
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import threading
+import time
+
+from concurrent import futures
+from oslo_config import cfg
+from oslo_log import log
+
+LOG = log.getLogger(__name__)
+
+CONF = cfg.CONF
+
+
+class _Slot(object):
+    """Slot of a request within the concurrency limit of its datasource
+
+    The slot is released once, either when the request completes or when it
+    is abandoned, so that the requests left hanging by a slow datasource do
+    not use up the limit.
+    """
+
+    def __init__(self, semaphore):
+        self._semaphore = semaphore
+        self._lock = threading.Lock()
+        self._held = False
+
+    def acquire(self):
+        self._semaphore.acquire()
+        with self._lock:
+            self._held = True
+
+    def release(self):
+        with self._lock:
+            if not self._held:
+                return
+            self._held = False
+        self._semaphore.release()
+
+
+class MetricFetcher(object):
+    """Concurrently fetch metrics from a datasource
+
+    The number of requests in flight towards a given datasource is bounded
+    process-wide by the ``[watcher_datasources]/max_concurrency`` option so
+    that several strategies running at the same time cannot overload it.
+    A request which takes longer than ``[watcher_datasources]/
+    request_timeout`` seconds is abandoned, releasing its slot, and its value
+    reported as None.
+
+    Requests fetching values themselves from the same datasource, e.g. the
+    fallback of a bulk query, fetch them one by one within their own slot
+    instead of waiting for other slots.
+    """
+
+    _semaphores = {}
+    _semaphores_lock = threading.Lock()
+    # Datasources whose slot is held by the current thread
+    _local = threading.local()
+
+    def __init__(self, datasource, fetch, timeout=None):
+        """Metric fetcher
+
+        :param datasource: name of the datasource the metrics come from
+        :param fetch: callable returning the value for a given request
+        :param timeout: time (in seconds) after which a request is abandoned,
+                        defaults to ``[watcher_datasources]/request_timeout``
+        """
+        self.datasource = datasource
+        self._fetch = fetch
+        if timeout is None:
+            timeout = CONF.watcher_datasources.request_timeout
+        self.timeout = timeout
+
+    @staticmethod
+    def get_max_concurrency(datasource):
+        return CONF.watcher_datasources.max_concurrency.get(
+            datasource, CONF.watcher_datasources.default_max_concurrency)
+
+    @classmethod
+    def get_semaphore(cls, datasource):
+        with cls._semaphores_lock:
+            if datasource not in cls._semaphores:
+                cls._semaphores[datasource] = threading.BoundedSemaphore(
+                    cls.get_max_concurrency(datasource))
+            return cls._semaphores[datasource]
+
+    @classmethod
+    def _get_held_datasources(cls):
+        if not hasattr(cls._local, 'datasources'):
+            cls._local.datasources = set()
+        return cls._local.datasources
+
+    def _run(self, slot, started_at, request):
+        slot.acquire()
+        held_datasources = self._get_held_datasources()
+        held_datasources.add(self.datasource)
+        try:
+            started_at[request] = time.time()
+            return self._fetch(request)
+        finally:
+            held_datasources.discard(self.datasource)
+            slot.release()
+
+    def _fetch_in_held_slot(self, result):
+        for request in result:
+            try:
+                result[request] = self._fetch(request)
+            except Exception as e:
+                LOG.exception(e)
+        return result
+
+    def _wait_timeout(self, pending, started_at):
+        if not self.timeout:
+            return None
+        now = time.time()
+        remaining = [started_at[request] + self.timeout - now
+                     for request in pending if request in started_at]
+        return max(0, min(remaining)) if remaining else self.timeout
+
+    def fetch(self, requests):
+        """Fetch the value of each request
+
+        :param requests: hashable requests given one by one to ``fetch``,
+                         e.g. ``(resource_id, metric)`` tuples
+        :return: a dict mapping each request to its value, None if the
+                 request failed or timed out
+        """
+        result = {}
+        for request in requests:
+            result.setdefault(request, None)
+        if not result:
+            return result
+        if self.datasource in self._get_held_datasources():
+            return self._fetch_in_held_slot(result)
+
+        semaphore = self.get_semaphore(self.datasource)
+        slots = {request: _Slot(semaphore) for request in result}
+        started_at = {}
+        max_workers = min(len(result), self.get_max_concurrency(
+            self.datasource))
+        executor = futures.ThreadPoolExecutor(max_workers=max_workers)
+        try:
+            pending = {executor.submit(self._run, slots[request],
+                                       started_at, request): request
+                       for request in result}
+            while pending:
+                done, _ = futures.wait(
+                    pending, timeout=self._wait_timeout(
+                        pending.values(), started_at),
+                    return_when=futures.FIRST_COMPLETED)
+                for job in done:
+                    request = pending.pop(job)
+                    try:
+                        result[request] = job.result()
+                    except Exception as e:
+                        LOG.exception(e)
+                if not self.timeout:
+                    continue
+                now = time.time()
+                for job, request in list(pending.items()):
+                    if (request in started_at and
+                            now - started_at[request] >= self.timeout):
+                        LOG.warning("Request %(request)s to %(datasource)s "
+                                    "timed out after %(timeout)s seconds",
+                                    dict(request=request,
+                                         datasource=self.datasource,
+                                         timeout=self.timeout))
+                        del pending[job]
+                        slots[request].release()
+        finally:
+            # Do not block on abandoned requests, their thread ends when
+            # the datasource eventually answers
+            executor.shutdown(wait=False)
+        return result
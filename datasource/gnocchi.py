@@ -17,6 +17,7 @@
 # limitations under the License.
 
 from datetime import datetime
+from datetime import timedelta
 import time
 
 from oslo_config import cfg
@@ -25,6 +26,8 @@ from oslo_log import log
 from watcher.common import clients
 from watcher.common import exception
 from watcher.common import utils as common_utils
+from watcher.datasource import base
+from watcher.datasource import cache
 
 CONF = cfg.CONF
 LOG = log.getLogger(__name__)
@@ -36,6 +39,7 @@ class GnocchiHelper(object):
         """:param osc: an OpenStackClients instance"""
         self.osc = osc if osc else clients.OpenStackClients()
         self.gnocchi = self.osc.gnocchi()
+        self.cache = cache.MetricCache()
 
     def query_retry(self, f, *args, **kwargs):
         for i in range(CONF.gnocchi_client.query_max_retries):
@@ -73,6 +77,19 @@ class GnocchiHelper(object):
             raise exception.InvalidParameter(parameter='stop_time',
                                              parameter_type=datetime)
 
+        period = None
+        if start_time is not None and stop_time is not None:
+            period = int((stop_time - start_time).total_seconds())
+        key = cache.make_key('gnocchi', resource_id, metric, aggregation,
+                             granularity, period=period, stop_time=stop_time)
+
+        return self.cache.get_or_fetch(
+            key, lambda: self._statistic_aggregation(
+                resource_id, metric, granularity, start_time, stop_time,
+                aggregation))
+
+    def _statistic_aggregation(self, resource_id, metric, granularity,
+                               start_time, stop_time, aggregation):
         if not common_utils.is_uuid_like(resource_id):
             kwargs = dict(query={"=": {"original_resource_id": resource_id}},
                           limit=1)
@@ -102,3 +119,120 @@ class GnocchiHelper(object):
             # return value of latest measure
             # measure has structure [time, granularity, value]
             return statistics[-1][2]
+
+    def statistic_aggregation_bulk(self,
+                                   resource_ids,
+                                   metrics,
+                                   period,
+                                   aggregate='mean',
+                                   granularity=300):
+        """Representing statistic aggregates of several resources at once
+
+        The measures of all the resources are retrieved with a single call
+        to the Gnocchi aggregates API per metric. If this API is not
+        available, the measures are fetched concurrently for each resource.
+
+        :param resource_ids: ids of resources to list statistics for
+        :param metrics: metric names of which we want the statistics
+        :param period: time interval (in seconds) up to now over which the
+                       measures are aggregated
+        :param aggregate: Should be chosen in accordance with policy
+                          aggregations
+        :param granularity: frequency of marking metric point, in seconds
+        :return: a dict of dicts so that ``result[resource_id][metric]`` is
+                 the value of the aggregated metric (None if no data)
+        """
+        stop_time = datetime.utcnow()
+        start_time = stop_time - timedelta(seconds=int(period))
+
+        result = {resource_id: {} for resource_id in resource_ids}
+        for metric in metrics:
+            keys = {resource_id: cache.make_key(
+                'gnocchi', resource_id, metric, aggregate, granularity,
+                period=int(period), stop_time=stop_time)
+                for resource_id in resource_ids}
+            values = self.cache.get_or_fetch_many(
+                keys, lambda ids: self._aggregate_by_resource(
+                    ids, metric, granularity, start_time, stop_time,
+                    aggregate))
+            for resource_id, value in values.items():
+                result[resource_id][metric] = value
+
+        return result
+
+    def _aggregate_by_resource(self, resource_ids, metric, granularity,
+                               start_time, stop_time, aggregation):
+        try:
+            groups = self.gnocchi.metric.aggregation(
+                metrics=metric,
+                query={"in": {"original_resource_id": list(resource_ids)}},
+                start=start_time,
+                stop=stop_time,
+                granularity=granularity,
+                aggregation=aggregation,
+                needed_overlap=0,
+                groupby=["original_resource_id"])
+        except Exception as e:
+            LOG.warning("Could not aggregate the %(metric)s measures of "
+                        "several resources at once, falling back to one "
+                        "query per resource: %(error)s",
+                        dict(metric=metric, error=e))
+
+            def fetch(resource_id, metric):
+                return self._statistic_aggregation(
+                    resource_id, metric, granularity, start_time, stop_time,
+                    aggregation)
+
+            values = base.fetch_concurrently(
+                'gnocchi', fetch, resource_ids, [metric])
+            return {resource_id: value[metric]
+                    for resource_id, value in values.items()}
+
+        values = dict.fromkeys(resource_ids)
+        for group in groups:
+            resource_id = group['group']['original_resource_id']
+            if resource_id in values and group['measures']:
+                # measure has structure [time, granularity, value]
+                values[resource_id] = group['measures'][-1][2]
+        return values
+
+
+class GnocchiDriver(base.BaseDriver):
+    """Gnocchi backend of the :py:class:`~.DataSourceManager`"""
+
+    NAME = 'gnocchi'
+
+    METRIC_MAP = base.CEILOMETER_METRIC_MAP
+
+    def __init__(self, config, osc=None):
+        super(GnocchiDriver, self).__init__(config, osc)
+        self._helper = None
+
+    @property
+    def helper(self):
+        if self._helper is None:
+            self._helper = GnocchiHelper(osc=self.osc)
+        return self._helper
+
+    def statistic_aggregation(self, resource_id, metric, period,
+                              aggregate='mean', granularity=300):
+        stop_time = datetime.utcnow()
+        start_time = stop_time - timedelta(seconds=int(period))
+        return self.helper.statistic_aggregation(
+            resource_id=resource_id,
+            metric=self.get_metric_name(metric),
+            granularity=granularity,
+            start_time=start_time,
+            stop_time=stop_time,
+            aggregation=self.get_aggregate_name(aggregate))
+
+    def statistic_aggregation_bulk(self, resource_ids, metrics, period,
+                                   aggregate='mean', granularity=300):
+        metric_names = self._get_metric_names(metrics)
+        values = self.helper.statistic_aggregation_bulk(
+            resource_ids=resource_ids,
+            metrics=list(metric_names),
+            period=period,
+            aggregate=self.get_aggregate_name(aggregate),
+            granularity=granularity)
+        return self._to_canonical(values, metric_names)
@@ -0,0 +1,190 @@
+# -*- encoding: utf-8 -*-
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import collections
+import threading
+import time
+
+from oslo_config import cfg
+from oslo_log import log
+
+from watcher.common import exception
+from watcher.decision_engine.loading import default
+
+CONF = cfg.CONF
+LOG = log.getLogger(__name__)
+
+
+class DataSourceManager(object):
+    """Query metrics from the datasource backends
+
+    Backends are ``watcher_datasources`` entry points implementing
+    :py:class:`~.BaseDriver`. A metric is fetched from the first backend of
+    ``[watcher_datasources]/datasources`` providing it. A backend which
+    fails, or answers slower than ``[watcher_datasources]/max_latency``
+    seconds, is queried after the other ones during
+    ``[watcher_datasources]/failover_backoff`` seconds.
+    """
+
+    def __init__(self, datasources=None, osc=None):
+        """Datasource manager
+
+        :param datasources: names of the backends in order of preference,
+                            defaults to ``[watcher_datasources]/datasources``
+        :param osc: an OpenStackClients instance
+        """
+        self.datasource_loader = default.DefaultDataSourceLoader()
+        self.datasources = (datasources if datasources is not None
+                            else CONF.watcher_datasources.datasources)
+        self.osc = osc
+        self._backends = None
+        self._lock = threading.Lock()
+        self._degraded_until = {}
+        self._latencies = {}
+
+    def get_backends(self):
+        """Loaded backends, in order of preference"""
+        if self._backends is None:
+            backends = collections.OrderedDict()
+            available_datasources = self.datasource_loader.list_available()
+            for name in self.datasources:
+                if name not in available_datasources:
+                    LOG.warning("Datasource %s is not available", name)
+                    continue
+                backends[name] = self.datasource_loader.load(
+                    name, osc=self.osc)
+            self._backends = backends
+
+        return self._backends
+
+    @property
+    def metric_map(self):
+        """Canonical metric names mapped to their name in each backend"""
+        return collections.OrderedDict(
+            (name, backend.METRIC_MAP)
+            for name, backend in self.get_backends().items())
+
+    def get_latency(self, name):
+        """Last measured response time (in seconds) of a backend"""
+        return self._latencies.get(name)
+
+    def is_degraded(self, name):
+        return self._degraded_until.get(name, 0) > time.time()
+
+    def _record_success(self, name, latency):
+        with self._lock:
+            self._latencies[name] = latency
+            if latency > CONF.watcher_datasources.max_latency:
+                LOG.warning("Datasource %(name)s answered in %(latency).2f "
+                            "seconds, querying the other datasources first",
+                            dict(name=name, latency=latency))
+                self._degrade(name)
+
+    def _record_failure(self, name, error):
+        with self._lock:
+            LOG.warning("Datasource %(name)s failed, querying the other "
+                        "datasources first: %(error)s",
+                        dict(name=name, error=error))
+            self._degrade(name)
+
+    def _degrade(self, name):
+        self._degraded_until[name] = (
+            time.time() + CONF.watcher_datasources.failover_backoff)
+
+    def get_backends_for(self, metrics):
+        """Backends providing all the given metrics, in the failover order
+
+        :param metrics: canonical names of the metrics
+        :return: list of :py:class:`~.BaseDriver`, the healthy backends
+                 first, each group in order of preference
+        """
+        backends = [backend for backend in self.get_backends().values()
+                    if all(backend.has_metric(metric) for metric in metrics)]
+        # The sort is stable, so the order of preference is kept
+        return sorted(backends,
+                      key=lambda backend: self.is_degraded(backend.NAME))
+
+    def get_backend(self, metrics):
+        """Preferred backend providing all the given metrics
+
+        :param metrics: canonical names of the metrics
+        :raises: :py:class:`~.NoSuchMetric` if no backend provides them
+        """
+        backends = self.get_backends_for(metrics)
+        if not backends:
+            raise exception.NoSuchMetric()
+        return backends[0]
+
+    def statistic_aggregation(self, resource_id, metric, period,
+                              aggregate='mean', granularity=300):
+        """Aggregate a metric, failing over to the next backends if needed
+
+        See :py:meth:`~.BaseDriver.statistic_aggregation` for the
+        parameters.
+
+        :raises: :py:class:`~.NoSuchMetric` if no backend provides the
+                 metric, :py:class:`~.DataSourceNotAvailable` if all the
+                 backends providing it failed
+        """
+        backends = self.get_backends_for([metric])
+        if not backends:
+            raise exception.NoSuchMetric()
+
+        for backend in backends:
+            start_time = time.time()
+            try:
+                value = backend.statistic_aggregation(
+                    resource_id, metric, period, aggregate=aggregate,
+                    granularity=granularity)
+            except Exception as e:
+                self._record_failure(backend.NAME, e)
+                continue
+            self._record_success(backend.NAME, time.time() - start_time)
+            return value
+
+        raise exception.DataSourceNotAvailable(metric=metric)
+
+    def statistic_aggregation_bulk(self, resource_ids, metrics, period,
+                                   aggregate='mean', granularity=300):
+        """Aggregate several metrics of several resources at once
+
+        All the metrics are fetched from the same backend, failing over to
+        the next backends providing all of them if it raises.
+
+        See :py:meth:`~.BaseDriver.statistic_aggregation_bulk` for the
+        parameters.
+
+        :return: a dict of dicts so that ``result[resource_id][metric]`` is
+                 the aggregated value (None if there is no data)
+        :raises: :py:class:`~.NoSuchMetric` if no backend provides all the
+                 metrics, :py:class:`~.DataSourceNotAvailable` if all the
+                 backends providing them failed
+        """
+        backends = self.get_backends_for(metrics)
+        if not backends:
+            raise exception.NoSuchMetric()
+
+        for backend in backends:
+            try:
+                # The duration of a bulk query depends on the number of
+                # resources, so it is not compared to max_latency
+                return backend.statistic_aggregation_bulk(
+                    resource_ids, metrics, period, aggregate=aggregate,
+                    granularity=granularity)
+            except Exception as e:
+                self._record_failure(backend.NAME, e)
+
+        raise exception.DataSourceNotAvailable(metric=', '.join(metrics))
@@ -19,8 +19,13 @@
 import datetime
 
 from monascaclient import exc
+from oslo_log import log
 
 from watcher.common import clients
+from watcher.datasource import base
+from watcher.datasource import cache
+
+LOG = log.getLogger(__name__)
 
 
 class MonascaHelper(object):
@@ -29,6 +34,7 @@ class MonascaHelper(object):
         """:param osc: an OpenStackClients instance"""
         self.osc = osc if osc else clients.OpenStackClients()
         self.monasca = self.osc.monasca()
+        self.cache = cache.MetricCache()
 
     def query_retry(self, f, *args, **kwargs):
         try:
@@ -122,3 +128,149 @@ class MonascaHelper(object):
             f=self.monasca.metrics.list_statistics, **kwargs)
 
         return statistics
+
+    @staticmethod
+    def _average_statistics(statistics, aggregate):
+        """Average the aggregated values of a list of statistics rows"""
+        values = []
+        for stat in statistics:
+            col_idx = stat['columns'].index(aggregate)
+            values.extend(row[col_idx] for row in stat['statistics'])
+        if not values:
+            return None
+        return float(sum(values)) / len(values)
+
+    def statistic_aggregation_bulk(self,
+                                   resource_ids,
+                                   metrics,
+                                   period,
+                                   aggregate='avg',
+                                   dimension='resource_id'):
+        """Representing statistic aggregates of several resources at once
+
+        The statistics of all the resources are retrieved with a single
+        query grouped by ``dimension`` per metric. If this query fails, the
+        statistics are fetched concurrently for each resource.
+
+        :param resource_ids: values of ``dimension`` identifying the
+                             resources to list statistics for
+        :param metrics: meter names of which we want the statistics
+        :param period: Sampling `period`: In seconds.
+        :param aggregate: Should be either 'avg', 'count', 'min' or 'max'
+        :param dimension: dimension identifying the resources, e.g.
+                          'resource_id' for instances and 'hostname' for
+                          compute nodes
+        :return: a dict of dicts so that ``result[resource_id][metric]`` is
+                 the average of the aggregated values (None if no data)
+        """
+
+        result = {resource_id: {} for resource_id in resource_ids}
+        for meter_name in metrics:
+            keys = {resource_id: cache.make_key(
+                'monasca', (dimension, resource_id), meter_name, aggregate,
+                period=int(period))
+                for resource_id in resource_ids}
+            values = self.cache.get_or_fetch_many(
+                keys, lambda ids: self._aggregate_by_dimension(
+                    ids, meter_name, period, aggregate, dimension))
+            for resource_id, value in values.items():
+                result[resource_id][meter_name] = value
+
+        return result
+
+    def _aggregate_by_dimension(self, resource_ids, meter_name, period,
+                                aggregate, dimension):
+        try:
+            statistics = self.statistic_aggregation(
+                meter_name=meter_name,
+                dimensions=None,
+                period=period,
+                aggregate=aggregate,
+                group_by=dimension)
+        except Exception as e:
+            LOG.warning("Could not group the %(meter)s statistics by "
+                        "%(dimension)s, falling back to one query per "
+                        "resource: %(error)s",
+                        dict(meter=meter_name, dimension=dimension,
+                             error=e))
+
+            def fetch(resource_id, meter_name):
+                return self._average_statistics(
+                    self.statistic_aggregation(
+                        meter_name=meter_name,
+                        dimensions={dimension: resource_id},
+                        period=period,
+                        aggregate=aggregate),
+                    aggregate)
+
+            values = base.fetch_concurrently(
+                'monasca', fetch, resource_ids, [meter_name])
+            return {resource_id: value[meter_name]
+                    for resource_id, value in values.items()}
+
+        wanted = set(resource_ids)
+        grouped = {}
+        for stat in statistics:
+            resource_id = stat['dimensions'].get(dimension)
+            if resource_id in wanted:
+                grouped.setdefault(resource_id, []).append(stat)
+        return {resource_id: self._average_statistics(
+                grouped.get(resource_id, []), aggregate)
+                for resource_id in resource_ids}
+
+
+class MonascaDriver(base.BaseDriver):
+    """Monasca backend of the :py:class:`~.DataSourceManager`"""
+
+    NAME = 'monasca'
+
+    METRIC_MAP = dict(
+        base.BaseDriver.METRIC_MAP,
+        host_cpu_usage='cpu.percent',
+        instance_cpu_usage='vm.cpu.utilization_perc',
+    )
+
+    AGGREGATE_MAP = dict(mean='avg', min='min', max='max', count='count')
+
+    def __init__(self, config, osc=None):
+        super(MonascaDriver, self).__init__(config, osc)
+        self._helper = None
+
+    @property
+    def helper(self):
+        if self._helper is None:
+            self._helper = MonascaHelper(osc=self.osc)
+        return self._helper
+
+    @staticmethod
+    def _get_dimension(metric):
+        # Hosts and instances are identified by different dimensions
+        return 'hostname' if metric.startswith('host_') else 'resource_id'
+
+    def statistic_aggregation(self, resource_id, metric, period,
+                              aggregate='mean', granularity=300):
+        dimension = self._get_dimension(metric)
+        aggregate = self.get_aggregate_name(aggregate)
+        statistics = self.helper.statistic_aggregation(
+            meter_name=self.get_metric_name(metric),
+            dimensions={dimension: resource_id},
+            period=period,
+            aggregate=aggregate)
+        return self.helper._average_statistics(statistics, aggregate)
+
+    def statistic_aggregation_bulk(self, resource_ids, metrics, period,
+                                   aggregate='mean', granularity=300):
+        result = {resource_id: {} for resource_id in resource_ids}
+        for metric in metrics:
+            metric_names = self._get_metric_names([metric])
+            values = self._to_canonical(
+                self.helper.statistic_aggregation_bulk(
+                    resource_ids=resource_ids,
+                    metrics=list(metric_names),
+                    period=period,
+                    aggregate=self.get_aggregate_name(aggregate),
+                    dimension=self._get_dimension(metric)),
+                metric_names)
+            for resource_id, resource_values in values.items():
+                result[resource_id].update(resource_values)
+        return result
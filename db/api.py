@@ -467,6 +467,16 @@ class BaseConnection(object):
         :raises: :py:class:`~.ActionAlreadyExists`
         """
 
+    @abc.abstractmethod
+    def create_actions(self, values_list):
+        """Create several new actions within a single transaction.
+
+        :param values_list: A list of dicts, each one as expected by
+                            :py:meth:`create_action`.
+        :returns: The list of the actions, in the same order.
+        :raises: :py:class:`~.ActionAlreadyExists`
+        """
+
     @abc.abstractmethod
     def get_action_by_id(self, context, action_id, eager=False):
         """Return a action.
@@ -640,6 +650,16 @@ class BaseConnection(object):
         :raises: :py:class:`~.EfficacyIndicatorAlreadyExists`
         """
 
+    @abc.abstractmethod
+    def create_efficacy_indicators(self, values_list):
+        """Create several new efficacy indicators within a single transaction.
+
+        :param values_list: A list of dicts, each one as expected by
+                            :py:meth:`create_efficacy_indicator`.
+        :returns: The list of the efficacy indicators, in the same order.
+        :raises: :py:class:`~.EfficacyIndicatorAlreadyExists`
+        """
+
     @abc.abstractmethod
     def get_efficacy_indicator_by_id(self, context, efficacy_indicator_id,
                                      eager=False):
@@ -0,0 +1,27 @@
+"""Add the expected makespan and critical path of the action plans
+
+Revision ID: 4b16194c56bc
+Revises: d09a5945e4a0
+Create Date: 2017-08-02 10:12:47.381204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from watcher.db.sqlalchemy import models
+
+# revision identifiers, used by Alembic.
+revision = '4b16194c56bc'
+down_revision = 'd09a5945e4a0'
+
+
+def upgrade():
+    op.add_column('action_plans',
+                  sa.Column('expected_makespan', sa.Float(), nullable=True))
+    op.add_column('action_plans',
+                  sa.Column('critical_path', models.JSONEncodedList(),
+                            nullable=True))
+
+
+def downgrade():
+    op.drop_column('action_plans', 'critical_path')
+    op.drop_column('action_plans', 'expected_makespan')
@@ -255,6 +255,20 @@ class Connection(api.BaseConnection):
         obj.save()
         return obj
 
+    def _create_all(self, model, values_list):
+        relationships = self._get_relationships(model)
+        objs = []
+        for values in values_list:
+            obj = model()
+            obj.update({k: v for k, v in values.items()
+                        if k not in relationships})
+            objs.append(obj)
+
+        session = get_session()
+        with session.begin():
+            session.add_all(objs)
+        return objs
+
     def _get(self, context, model, fieldname, value, eager):
         query = model_query(model)
         if eager:
@@ -753,6 +767,21 @@ class Connection(api.BaseConnection):
             raise exception.ActionAlreadyExists(uuid=values['uuid'])
         return action
 
+    def create_actions(self, values_list):
+        # ensure defaults are present for new actions
+        for values in values_list:
+            if not values.get('uuid'):
+                values['uuid'] = utils.generate_uuid()
+
+            if values.get('state') is None:
+                values['state'] = objects.action.State.PENDING
+
+        try:
+            actions = self._create_all(models.Action, values_list)
+        except db_exc.DBDuplicateEntry as exc:
+            raise exception.ActionAlreadyExists(uuid=exc.value)
+        return actions
+
     def _get_action(self, context, fieldname, value, eager):
         try:
             return self._get(context, model=models.Action,
@@ -924,6 +953,19 @@ class Connection(api.BaseConnection):
             raise exception.EfficacyIndicatorAlreadyExists(uuid=values['uuid'])
         return efficacy_indicator
 
+    def create_efficacy_indicators(self, values_list):
+        # ensure defaults are present for new efficacy indicators
+        for values in values_list:
+            if not values.get('uuid'):
+                values['uuid'] = utils.generate_uuid()
+
+        try:
+            efficacy_indicators = self._create_all(
+                models.EfficacyIndicator, values_list)
+        except db_exc.DBDuplicateEntry as exc:
+            raise exception.EfficacyIndicatorAlreadyExists(uuid=exc.value)
+        return efficacy_indicators
+
     def _get_efficacy_indicator(self, context, fieldname, value, eager):
         try:
             return self._get(context, model=models.EfficacyIndicator,
@@ -20,10 +20,13 @@
 
 import datetime
 from dateutil import tz
+import threading
 
 from apscheduler.jobstores import memory
 from croniter import croniter
+from oslo_log import log
 
+from watcher.applier import rpcapi
 from watcher.common import context
 from watcher.common import scheduling
 from watcher.common import utils
@@ -31,13 +34,21 @@ from watcher import conf
 from watcher.db.sqlalchemy import api as sq_api
 from watcher.db.sqlalchemy import job_store
 from watcher.decision_engine.audit import base
+from watcher.decision_engine.audit import scheduler
 from watcher import objects
 
 
 CONF = conf.CONF
+LOG = log.getLogger(__name__)
 
 
 class ContinuousAuditHandler(base.AuditHandler):
+
+    # UUIDs of the continuous audits whose run is waiting for its turn or
+    # being executed by the audit scheduler
+    _pending_runs = set()
+    _pending_runs_lock = threading.Lock()
+
     def __init__(self):
         super(ContinuousAuditHandler, self).__init__()
         self._scheduler = None
@@ -80,9 +91,13 @@ class ContinuousAuditHandler(base.AuditHandler):
                               'state': objects.action_plan.State.RECOMMENDED}
             action_plans = objects.ActionPlan.list(
                 request_context, filters=a_plan_filters, eager=True)
+            applier_client = rpcapi.ApplierAPI()
             for plan in action_plans:
                 plan.state = objects.action_plan.State.CANCELLED
                 plan.save()
+                # NOTE: the action plan may have been launched in the
+                # meantime, push its cancellation to the appliers
+                applier_client.cancel_action_plan(request_context, plan.uuid)
         return solution
 
     def _next_cron_time(self, audit):
@@ -90,22 +105,47 @@ class ContinuousAuditHandler(base.AuditHandler):
             return croniter(audit.interval, datetime.datetime.utcnow()
                             ).get_next(datetime.datetime)
 
+    def _execute_run(self, audit, request_context):
+        try:
+            self.execute(audit, request_context)
+        finally:
+            if utils.is_int_like(audit.interval):
+                audit.next_run_time = (
+                    datetime.datetime.utcnow() +
+                    datetime.timedelta(seconds=int(audit.interval)))
+            else:
+                audit.next_run_time = self._next_cron_time(audit)
+            audit.save()
+            with self._pending_runs_lock:
+                self._pending_runs.discard(audit.uuid)
+
     @classmethod
     def execute_audit(cls, audit, request_context):
+        """Hand a run of a continuous audit over to the audit scheduler
+
+        The run waits for its turn among the other audits without holding
+        the thread of the job, and is skipped if the previous run of the
+        audit is not over yet.
+
+        :return: a future of the run, or None if it is skipped
+        """
         self = cls()
-        if not self._is_audit_inactive(audit):
-            try:
-                self.execute(audit, request_context)
-            except Exception:
-                raise
-            finally:
-                if utils.is_int_like(audit.interval):
-                    audit.next_run_time = (
-                        datetime.datetime.utcnow() +
-                        datetime.timedelta(seconds=int(audit.interval)))
-                else:
-                    audit.next_run_time = self._next_cron_time(audit)
-                audit.save()
+        if self._is_audit_inactive(audit):
+            return None
+        with cls._pending_runs_lock:
+            if audit.uuid in cls._pending_runs:
+                LOG.warning("The previous run of audit %s is not over yet: "
+                            "skipping this one", audit.uuid)
+                return None
+            cls._pending_runs.add(audit.uuid)
+        try:
+            return scheduler.AuditScheduler().submit(
+                audit, self._execute_run, audit, request_context,
+                priority=scheduler.PRIORITY_CONTINUOUS)
+        except Exception:
+            with cls._pending_runs_lock:
+                cls._pending_runs.discard(audit.uuid)
+            raise
 
     def _add_job(self, trigger, audit, audit_context, **trigger_args):
         time_var = 'next_run_time' if trigger_args.get(
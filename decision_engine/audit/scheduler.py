@@ -0,0 +1,188 @@
+# -*- encoding: utf-8 -*-
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Scheduling of the audit executions of the decision engine.
+
+Both the one-shot audits triggered through the API and the runs of the
+continuous audits go through the :py:class:`AuditScheduler`. It runs them on
+a single pool of ``[watcher_decision_engine] max_workers`` threads, highest
+priority first. It also caps the number of audits running concurrently for
+the same goal and for the same strategy, so that audits working on different
+goals or with different strategies do not wait behind each other. The audits
+without any strategy are limited as the default strategy of their goal, which
+they are executed with.
+"""
+
+import collections
+import heapq
+import itertools
+import threading
+
+from concurrent import futures
+from oslo_config import cfg
+from oslo_log import log
+import six
+
+from watcher.common import service
+from watcher.decision_engine.strategy.selection import default
+
+LOG = log.getLogger(__name__)
+CONF = cfg.CONF
+
+# The one-shot audits are run before the continuous ones, as they are
+# triggered by a user waiting for their action plan
+PRIORITY_ONESHOT = 0
+PRIORITY_CONTINUOUS = 10
+
+
+class AuditJob(object):
+    """An audit execution waiting for, or holding, a worker"""
+
+    def __init__(self, audit, fn, args, kwargs, priority):
+        self.audit = audit
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.priority = priority
+        self.future = futures.Future()
+        self.goal = audit.goal_id
+        self.strategy = self.get_strategy_name(audit)
+
+    @staticmethod
+    def get_strategy_name(audit):
+        """Name of the strategy the audit is to be executed with
+
+        :return: the name of the strategy, or None if it cannot be selected,
+                 in which case the execution of the audit reports it
+        """
+        if audit.strategy_id is not None:
+            return audit.strategy.name
+        try:
+            return default.DefaultStrategySelector(
+                audit.goal.name).get_strategy_name()
+        except Exception as exc:
+            LOG.warning("Could not select the strategy of audit %(audit)s: "
+                        "%(error)s", dict(audit=audit.uuid, error=exc))
+            return None
+
+
+@six.add_metaclass(service.Singleton)
+class AuditScheduler(object):
+    """Run the audits on a pool of workers with concurrency limits"""
+
+    def __init__(self):
+        self.max_workers = CONF.watcher_decision_engine.max_workers
+        self._executor = futures.ThreadPoolExecutor(
+            max_workers=self.max_workers)
+        self._lock = threading.Lock()
+        # Heap of the waiting jobs, as (priority, sequence number, job)
+        self._queue = []
+        self._sequence = itertools.count()
+        self._running = 0
+        self._running_by_goal = collections.Counter()
+        self._running_by_strategy = collections.Counter()
+        self.executed = 0
+
+    @property
+    def max_audits_per_goal(self):
+        return CONF.watcher_decision_engine.max_audits_per_goal
+
+    @property
+    def max_audits_per_strategy(self):
+        return CONF.watcher_decision_engine.max_audits_per_strategy
+
+    @property
+    def depth(self):
+        """Number of audits waiting for a worker"""
+        return len(self._queue)
+
+    @property
+    def running(self):
+        """Number of audits being run"""
+        return self._running
+
+    def submit(self, audit, fn, *args, **kwargs):
+        """Schedule the execution of an audit
+
+        :param audit: the :py:class:`~.objects.Audit` to execute, loaded
+                      with its goal and strategy
+        :param fn: the callable executing the audit
+        :param priority: the priority of the execution, the lower the sooner
+                         (one of the ``PRIORITY_*`` constants)
+        :return: a future of the result of ``fn(*args, **kwargs)``
+        """
+        priority = kwargs.pop('priority', PRIORITY_ONESHOT)
+        job = AuditJob(audit, fn, args, kwargs, priority)
+        with self._lock:
+            heapq.heappush(self._queue, (priority, next(self._sequence), job))
+        self._dispatch()
+        return job.future
+
+    def _is_blocked(self, job):
+        if (self.max_audits_per_goal and job.goal is not None and
+                self._running_by_goal[job.goal] >= self.max_audits_per_goal):
+            return True
+        if (self.max_audits_per_strategy and job.strategy is not None and
+                self._running_by_strategy[job.strategy] >=
+                self.max_audits_per_strategy):
+            return True
+        return False
+
+    def _dispatch(self):
+        """Hand the waiting jobs which can be started over to the workers"""
+        ready = []
+        with self._lock:
+            blocked = []
+            while self._queue and self._running < self.max_workers:
+                entry = heapq.heappop(self._queue)
+                job = entry[-1]
+                if self._is_blocked(job):
+                    blocked.append(entry)
+                    continue
+                self._running += 1
+                self._running_by_goal[job.goal] += 1
+                self._running_by_strategy[job.strategy] += 1
+                ready.append(job)
+            for entry in blocked:
+                heapq.heappush(self._queue, entry)
+
+        for job in ready:
+            self._executor.submit(self._run, job)
+
+    def _run(self, job):
+        try:
+            if job.future.set_running_or_notify_cancel():
+                LOG.debug("Executing audit %s", job.audit.uuid)
+                try:
+                    result = job.fn(*job.args, **job.kwargs)
+                except Exception as exc:
+                    job.future.set_exception(exc)
+                else:
+                    job.future.set_result(result)
+        finally:
+            with self._lock:
+                self._running -= 1
+                self._running_by_goal[job.goal] -= 1
+                self._running_by_strategy[job.strategy] -= 1
+                self.executed += 1
+            self._dispatch()
+
+    def get_stats(self):
+        return collections.OrderedDict([
+            ("running", self.running),
+            ("waiting", self.depth),
+            ("executed", self.executed),
+        ])
@@ -19,12 +19,23 @@
 from oslo_reports import guru_meditation_report as gmr
 
 from watcher._i18n import _
+from watcher.common import clients
+from watcher.datasource import cache
+from watcher.decision_engine.audit import scheduler
 from watcher.decision_engine.model.collector import manager
 
 
 def register_gmr_plugins():
     """Register GMR plugins that are specific to watcher-decision-engine."""
     gmr.TextGuruMeditation.register_section(_('CDMCs'), show_models)
+    gmr.TextGuruMeditation.register_section(
+        _('Metric cache'), show_metric_cache)
+    gmr.TextGuruMeditation.register_section(
+        _('Notification buffers'), show_notification_buffers)
+    gmr.TextGuruMeditation.register_section(
+        _('Audit scheduler'), show_audit_scheduler)
+    gmr.TextGuruMeditation.register_section(
+        _('OpenStack clients'), show_clients)
 
 
 def show_models():
@@ -46,3 +57,50 @@ def show_models():
         output.append(cdmc_struct)
 
     return "\n".join(output)
+
+
+def show_metric_cache():
+    """Create a formatted output of the metric cache statistics
+
+    Mainly used as a Guru Meditation Report (GMR) plugin
+    """
+    stats = cache.MetricCache().get_stats()
+    return "\n".join(
+        "%s = %s" % (name, value) for name, value in stats.items())
+
+
+def show_notification_buffers():
+    """Create a formatted output of the notification buffer statistics
+
+    Mainly used as a Guru Meditation Report (GMR) plugin
+    """
+    mgr = manager.CollectorManager()
+
+    output = []
+    for name, cdmc in mgr.get_collectors().items():
+        stats = cdmc.notification_buffer.get_stats()
+        output.append(name)
+        output.extend(
+            "  %s = %s" % (stat, value) for stat, value in stats.items())
+
+    return "\n".join(output)
+
+
+def show_audit_scheduler():
+    """Create a formatted output of the audit scheduler statistics
+
+    Mainly used as a Guru Meditation Report (GMR) plugin
+    """
+    stats = scheduler.AuditScheduler().get_stats()
+    return "\n".join(
+        "%s = %s" % (name, value) for name, value in stats.items())
+
+
+def show_clients():
+    """Create a formatted output of the shared OpenStack clients statistics
+
+    Mainly used as a Guru Meditation Report (GMR) plugin
+    """
+    stats = clients.ClientPool().get_stats()
+    return "\n".join(
+        "%s = %s" % (name, value) for name, value in stats.items())
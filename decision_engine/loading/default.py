@@ -59,3 +59,9 @@ class DefaultScoringContainerLoader(default.DefaultLoader):
     def __init__(self):
         super(DefaultScoringContainerLoader, self).__init__(
             namespace='watcher_scoring_engine_containers')
+
+
+class DefaultDataSourceLoader(default.DefaultLoader):
+    def __init__(self):
+        super(DefaultDataSourceLoader, self).__init__(
+            namespace='watcher_datasources')
@@ -23,6 +23,7 @@ from oslo_log import log
 
 from watcher.decision_engine.audit import continuous as c_handler
 from watcher.decision_engine.audit import oneshot as o_handler
+from watcher.decision_engine.audit import scheduler
 
 from watcher import objects
 
@@ -34,22 +35,27 @@ class AuditEndpoint(object):
 
     def __init__(self, messaging):
         self._messaging = messaging
-        self._executor = futures.ThreadPoolExecutor(
-            max_workers=CONF.watcher_decision_engine.max_workers)
+        self._scheduler = scheduler.AuditScheduler()
+        # The triggered audits are loaded apart from the workers of the
+        # scheduler, not to wait behind the audits they run
+        self._loader = futures.ThreadPoolExecutor(max_workers=1)
         self._oneshot_handler = o_handler.OneShotAuditHandler()
         self._continuous_handler = c_handler.ContinuousAuditHandler().start()
 
     @property
-    def executor(self):
-        return self._executor
+    def scheduler(self):
+        return self._scheduler
 
     def do_trigger_audit(self, context, audit_uuid):
         audit = objects.Audit.get_by_uuid(context, audit_uuid, eager=True)
-        self._oneshot_handler.execute(audit, context)
+        # Once its goal and strategy are known, the audit waits for its turn
+        # among the other audits of the same goal and strategy
+        self.scheduler.submit(audit, self._oneshot_handler.execute,
+                              audit, context,
+                              priority=scheduler.PRIORITY_ONESHOT)
 
     def trigger_audit(self, context, audit_uuid):
         LOG.debug("Trigger audit %s" % audit_uuid)
-        self.executor.submit(self.do_trigger_audit,
-                             context,
-                             audit_uuid)
+        # The audit is loaded by the loader rather than by the RPC thread
+        self._loader.submit(self.do_trigger_audit, context, audit_uuid)
         return audit_uuid
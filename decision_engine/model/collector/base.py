@@ -105,17 +105,26 @@ strategies.
 
 import abc
 import copy
+import datetime
+import os
 import threading
+import zlib
 
 from oslo_config import cfg
 from oslo_log import log
+from oslo_serialization import msgpackutils
+from oslo_utils import fileutils
+from oslo_utils import timeutils
 import six
 
 from watcher.common import clients
 from watcher.common.loader import loadable
+from watcher import conf
 from watcher.decision_engine.model import model_root
+from watcher.decision_engine.model.notification import batching
 
 LOG = log.getLogger(__name__)
+CONF = conf.CONF
 
 
 @six.add_metaclass(abc.ABCMeta)
@@ -123,17 +132,28 @@ class BaseClusterDataModelCollector(loadable.LoadableSingleton):
 
     STALE_MODEL = model_root.ModelRoot(stale=True)
 
+    # Margin taken on the time of the last synchronization when listing the
+    # changes, so that the clock skew between the services doesn't make the
+    # delta sync miss any of them
+    DELTA_SYNC_MARGIN = datetime.timedelta(seconds=60)
+
     def __init__(self, config, osc=None):
         super(BaseClusterDataModelCollector, self).__init__(config)
         self.osc = osc if osc else clients.OpenStackClients()
         self._cluster_data_model = None
+        # Time at which the model was last synchronized with the cluster
+        self._synchronized_at = None
         self.lock = threading.RLock()
+        self.notification_buffer = batching.NotificationBuffer(self)
 
     @property
     def cluster_data_model(self):
         if self._cluster_data_model is None:
             self.lock.acquire()
-            self._cluster_data_model = self.execute()
+            if not self.load_snapshot():
+                started_at = timeutils.utcnow()
+                self._cluster_data_model = self.execute()
+                self._synchronized_at = started_at
             self.lock.release()
 
         return self._cluster_data_model
@@ -142,6 +162,7 @@ class BaseClusterDataModelCollector(loadable.LoadableSingleton):
     def cluster_data_model(self, model):
         self.lock.acquire()
         self._cluster_data_model = model
+        self._synchronized_at = None
         self.lock.release()
 
     @abc.abstractproperty
@@ -161,6 +182,21 @@ class BaseClusterDataModelCollector(loadable.LoadableSingleton):
         """Build a cluster data model"""
         raise NotImplementedError()
 
+    def execute_delta(self, model, since):
+        """Patch a cluster data model with the changes of the cluster
+
+        Collectors able to list the resources which changed since a given
+        time override this method so that the model doesn't have to be
+        rebuilt on every synchronization.
+
+        :param model: the cluster data model to patch in place
+        :param since: time of the last synchronization of the model
+        :type since: :py:class:`~datetime.datetime`
+        :return: False if the model drifted from the cluster, in which case
+                 it has to be rebuilt, True otherwise
+        """
+        return False
+
     @classmethod
     def get_config_opts(cls):
         return [
@@ -169,17 +205,127 @@ class BaseClusterDataModelCollector(loadable.LoadableSingleton):
                 default=3600,
                 help='The time interval (in seconds) between each '
                      'synchronization of the model'),
+            cfg.BoolOpt(
+                'delta_sync',
+                default=True,
+                help='Only fetch the resources which changed since the last '
+                     'synchronization and patch the model with them. The '
+                     'model is still fully rebuilt on startup, when it is '
+                     'stale and when it is detected to have drifted from '
+                     'the cluster.'),
+            cfg.BoolOpt(
+                'copy_on_write',
+                default=True,
+                help='Hand out copy-on-write snapshots of the model to the '
+                     'strategies instead of deep copies. Only the resources '
+                     'which are modified afterwards get copied.'),
         ]
 
     def get_latest_cluster_data_model(self):
+        if self.config.get('copy_on_write', True):
+            LOG.debug("Creating snapshot")
+            return self.cluster_data_model.snapshot()
+
         LOG.debug("Creating copy")
-        LOG.debug(self.cluster_data_model.to_xml())
         return copy.deepcopy(self.cluster_data_model)
 
     def synchronize(self):
         """Synchronize the cluster data model
 
-        Whenever called this synchronization will perform a drop-in replacement
-        with the existing cluster data model
+        If the delta sync is enabled, the existing cluster data model gets
+        patched with the changes made since the last synchronization.
+        Otherwise, or if that is not possible, this synchronization will
+        perform a drop-in replacement with the existing cluster data model.
         """
+        started_at = timeutils.utcnow()
+        if self._cluster_data_model is None:
+            # Pick up from the model saved before the last restart
+            self.load_snapshot()
+        model = self._cluster_data_model
+        since = self._synchronized_at
+        if self.config.get('delta_sync', True) and model and since:
+            try:
+                if self.execute_delta(model, since - self.DELTA_SYNC_MARGIN):
+                    self._synchronized_at = started_at
+                    self.save_snapshot()
+                    return
+                LOG.info("The cluster data model drifted from the cluster: "
+                         "rebuilding it")
+            except Exception as exc:
+                LOG.exception(exc)
+                LOG.warning("The cluster data model could not be patched: "
+                            "rebuilding it")
+
         self.cluster_data_model = self.execute()
+        self._synchronized_at = started_at
+        self.save_snapshot()
+
+    @property
+    def snapshot_path(self):
+        """Path of the file the cluster data model is saved to, if any"""
+        if not CONF.watcher_decision_engine.model_snapshot_dir:
+            return None
+        return os.path.join(CONF.watcher_decision_engine.model_snapshot_dir,
+                            "%s.model" % self.__class__.__name__)
+
+    def save_snapshot(self):
+        """Save the cluster data model to disk
+
+        The model is serialized with msgpack along with the time of its last
+        synchronization and compressed, then atomically replaces the previous
+        snapshot.
+        """
+        path = self.snapshot_path
+        model = self._cluster_data_model
+        if path is None or not model:
+            return
+        try:
+            data = zlib.compress(msgpackutils.dumps(
+                {"synchronized_at": self._synchronized_at,
+                 "model_type": model.__class__.__name__,
+                 "model": model.to_msgpack()}))
+            fileutils.ensure_tree(os.path.dirname(path))
+            with open(path + ".tmp", "wb") as snapshot_file:
+                snapshot_file.write(data)
+            os.rename(path + ".tmp", path)
+            LOG.debug("Cluster data model saved to %s", path)
+        except Exception as exc:
+            LOG.exception(exc)
+            LOG.warning("The cluster data model could not be saved to %s",
+                        path)
+
+    def load_snapshot(self):
+        """Load the cluster data model saved to disk
+
+        Snapshots older than the ``model_snapshot_max_age`` option are
+        discarded so that the model gets rebuilt from scratch instead.
+
+        :return: True if a cluster data model was loaded, False otherwise
+        """
+        path = self.snapshot_path
+        if path is None or not os.path.exists(path):
+            return False
+        try:
+            with open(path, "rb") as snapshot_file:
+                snapshot = msgpackutils.loads(
+                    zlib.decompress(snapshot_file.read()))
+            max_age = CONF.watcher_decision_engine.model_snapshot_max_age
+            synchronized_at = snapshot["synchronized_at"]
+            if max_age and (synchronized_at is None or
+                            timeutils.is_older_than(synchronized_at,
+                                                    max_age)):
+                LOG.info("The cluster data model saved to %s is older than "
+                         "%d seconds: discarding it", path, max_age)
+                return False
+            model_cls = getattr(model_root, snapshot["model_type"])
+            model = model_cls.from_msgpack(snapshot["model"])
+        except Exception as exc:
+            LOG.exception(exc)
+            LOG.warning("The cluster data model could not be loaded from %s",
+                        path)
+            return False
+
+        LOG.debug("Cluster data model loaded from %s", path)
+        self.cluster_data_model = model
+        self._synchronized_at = synchronized_at
+        return True
@@ -61,6 +61,14 @@ class CinderClusterDataModelCollector(base.BaseClusterDataModelCollector):
         builder = ModelBuilder(self.osc)
         return builder.execute()
 
+    def execute_delta(self, model, since):
+        """Patch the storage cluster data model with the cluster changes"""
+        LOG.debug("Patching the Cinder cluster data model with the changes "
+                  "made since %s", since)
+
+        builder = ModelBuilder(self.osc, model=model)
+        return builder.execute_delta(since)
+
 
 class ModelBuilder(object):
     """Build the graph-based model
@@ -69,9 +77,10 @@ class ModelBuilder(object):
     - Storage-related knowledge (Cinder)
 
     """
-    def __init__(self, osc):
+    def __init__(self, osc, model=None):
         self.osc = osc
-        self.model = model_root.StorageModelRoot()
+        self.model = (model if model is not None
+                      else model_root.StorageModelRoot())
         self.cinder = osc.cinder()
         self.cinder_helper = cinder_helper.CinderHelper(osc=self.osc)
 
@@ -160,18 +169,21 @@ class ModelBuilder(object):
     def _add_virtual_storage(self):
         volumes = self.cinder_helper.get_volume_list()
         for vol in volumes:
-            volume = self._build_volume_node(vol)
-            self.model.add_volume(volume)
-            pool_name = getattr(vol, 'os-vol-host-attr:host')
-            if pool_name is None:
-                # The volume is not attached to any pool
-                continue
-            try:
-                pool = self.model.get_pool_by_pool_name(
-                    pool_name)
-                self.model.map_volume(volume, pool)
-            except exception.PoolNotFound:
-                continue
+            self._add_volume(vol)
+
+    def _add_volume(self, vol):
+        volume = self._build_volume_node(vol)
+        self.model.add_volume(volume)
+        pool_name = getattr(vol, 'os-vol-host-attr:host')
+        if pool_name is None:
+            # The volume is not attached to any pool
+            return
+        try:
+            pool = self.model.get_pool_by_pool_name(
+                pool_name)
+            self.model.map_volume(volume, pool)
+        except exception.PoolNotFound:
+            return
 
     def _build_volume_node(self, volume):
         """Build an volume node
@@ -207,3 +219,59 @@ class ModelBuilder(object):
         self._add_physical_layer()
         self._add_virtual_layer()
         return self.model
+
+    def execute_delta(self, since):
+        """Patch the graph with the changes made since the given time
+
+        All the storage nodes, pools and volumes are listed again. The nodes
+        and the pools are updated in place, the volumes updated since then
+        are replaced in the graph and the missing ones are deleted from it.
+        The graph is only locked while being patched, once Cinder has
+        answered.
+
+        :param since: time from which to list the changes
+        :type since: :py:class:`~datetime.datetime`
+        :return: False if the storage nodes or the pools of the cluster don't
+                 match those of the graph anymore, in which case it has to
+                 be rebuilt, True otherwise
+        """
+        storage_nodes = self.cinder_helper.get_storage_node_list()
+        pools = self.cinder_helper.get_storage_pool_list()
+        if (set(node.host for node in storage_nodes) !=
+                set(self.model.get_all_storage_nodes()) or
+                set(pool.name for pool in pools) !=
+                set(self.model.get_all_pools())):
+            return False
+        volumes = self.cinder_helper.get_volume_list()
+
+        with self.model.batch_update():
+            for node in storage_nodes:
+                # The volume type of the backend is kept as is
+                self.model.materialize(node.host).update({
+                    "zone": node.zone,
+                    "state": node.state,
+                    "status": node.status})
+            for pool in pools:
+                self.model.materialize(pool.name).update(
+                    self._build_storage_pool(pool).as_dict())
+
+            known_volumes = self.model.get_all_volumes()
+            for uuid in set(known_volumes) - set(vol.id for vol in volumes):
+                self._delete_volume(known_volumes[uuid])
+            for vol in volumes:
+                if vol.id in known_volumes:
+                    if not self.cinder_helper.is_volume_changed_since(
+                            vol, since):
+                        continue
+                    # The volume is rebuilt from scratch, along with its
+                    # mapping to its pool
+                    self._delete_volume(known_volumes[vol.id])
+                self._add_volume(vol)
+        return True
+
+    def _delete_volume(self, volume):
+        try:
+            self.model.delete_volume(volume)
+        except exception.VolumeNotFound:
+            # Already deleted upon notification
+            pass
@@ -19,6 +19,7 @@
 
 from watcher.common import utils
 from watcher.decision_engine.loading import default
+from watcher.decision_engine.model.notification import filtering
 
 
 class CollectorManager(object):
@@ -43,8 +44,11 @@ class CollectorManager(object):
         if self._notification_endpoints is None:
             endpoints = []
             for collector in self.get_collectors().values():
-                endpoints.extend(collector.notification_endpoints)
-            self._notification_endpoints = endpoints
+                endpoints.extend(collector.notification_buffer.wrap(
+                    collector.notification_endpoints))
+            # All the collectors share the same notification topics
+            self._notification_endpoints = [
+                filtering.NotificationDispatchIndex(endpoints)]
 
         return self._notification_endpoints
 
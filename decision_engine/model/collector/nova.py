@@ -13,6 +13,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from concurrent import futures
+
+from oslo_config import cfg
 from oslo_log import log
 
 from watcher.common import exception
@@ -35,6 +38,7 @@ class NovaClusterDataModelCollector(base.BaseClusterDataModelCollector):
 
     def __init__(self, config, osc=None):
         super(NovaClusterDataModelCollector, self).__init__(config, osc)
+        self.node_resolver = nova.ComputeNodeResolver(self)
 
     @property
     def notification_endpoints(self):
@@ -56,13 +60,46 @@ class NovaClusterDataModelCollector(base.BaseClusterDataModelCollector):
             nova.LegacyLiveMigratedEnd(self),
         ]
 
+    @classmethod
+    def get_config_opts(cls):
+        return super(NovaClusterDataModelCollector, cls).get_config_opts() + [
+            cfg.IntOpt(
+                'instance_page_size',
+                default=1000,
+                min=1,
+                help='The number of instances to list per request when '
+                     'building the model. The next page is fetched while '
+                     'the instances of the current one are being added to '
+                     'the model.'),
+            cfg.FloatOpt(
+                'node_resolution_interval',
+                default=1.0,
+                min=0,
+                help='The minimum time (in seconds) between two lookups in '
+                     'Nova of the compute nodes that notifications refer to '
+                     'but which are missing from the model. In the '
+                     'meantime, these nodes are represented in the model by '
+                     'disabled placeholders without any capacity.'),
+        ]
+
     def execute(self):
         """Build the compute cluster data model"""
         LOG.debug("Building latest Nova cluster data model")
 
-        builder = ModelBuilder(self.osc)
+        builder = ModelBuilder(
+            self.osc, page_size=self.config.get('instance_page_size', 1000))
         return builder.execute()
 
+    def execute_delta(self, model, since):
+        """Patch the compute cluster data model with the cluster changes"""
+        LOG.debug("Patching the Nova cluster data model with the changes "
+                  "made since %s", since)
+
+        builder = ModelBuilder(
+            self.osc, page_size=self.config.get('instance_page_size', 1000),
+            model=model)
+        return builder.execute_delta(since)
+
 
 class ModelBuilder(object):
     """Build the graph-based model
@@ -82,21 +119,29 @@ class ModelBuilder(object):
     re-scheduled for Pike. In the meantime, all the associated code has been
     commented out.
     """
-    def __init__(self, osc):
+    def __init__(self, osc, page_size=1000, model=None):
         self.osc = osc
-        self.model = model_root.ModelRoot()
+        self.page_size = page_size
+        self.model = model if model is not None else model_root.ModelRoot()
         self.nova = osc.nova()
         self.nova_helper = nova_helper.NovaHelper(osc=self.osc)
+        # Nova services and flavors by ID
+        self.services = {}
+        self.flavors = {}
         # self.neutron = osc.neutron()
         # self.cinder = osc.cinder()
 
-    def _add_physical_layer(self):
+    def _add_physical_layer(self, compute_nodes=None):
         """Add the physical layer of the graph.
 
         This includes components which represent actual infrastructure
         hardware.
+
+        :param compute_nodes: the Nova hypervisors, listed if not given
         """
-        for cnode in self.nova_helper.get_compute_node_list():
+        if compute_nodes is None:
+            compute_nodes = self.nova_helper.get_compute_node_list()
+        for cnode in compute_nodes:
             self.add_compute_node(cnode)
 
     def add_compute_node(self, node):
@@ -130,7 +175,9 @@ class ModelBuilder(object):
         :type node: :py:class:`~novaclient.v2.hypervisors.Hypervisor`
         """
         # build up the compute node.
-        compute_service = self.nova_helper.get_service(node.service["id"])
+        compute_service = self.services.get(node.service["id"])
+        if compute_service is None:
+            compute_service = self.nova_helper.get_service(node.service["id"])
         node_attributes = {
             "id": node.id,
             "uuid": compute_service.host,
@@ -198,29 +245,76 @@ class ModelBuilder(object):
         # self._add_virtual_network()
         # self._add_virtual_storage()
 
-    def _add_virtual_servers(self):
-        all_instances = self.nova_helper.get_instance_list()
-        for inst in all_instances:
-            # Add Node
-            instance = self._build_instance_node(inst)
-            self.model.add_instance(instance)
-            #pdb.set_trace()
-            # Get the cnode_name uuid.
-            cnode_uuid = getattr(inst, "OS-EXT-SRV-ATTR:host")
-            #pdb.set_trace()
-            if cnode_uuid is None:
-                # The instance is not attached to any Compute node
-                continue
-            try:
-                # Nova compute node
-                # cnode = self.nova_helper.get_compute_node_by_hostname(
-                #     cnode_uuid)
-                compute_node = self.model.get_node_by_uuid(
-                    cnode_uuid)
-                # Connect the instance to its compute node
-                self.model.map_instance(instance, compute_node)
-            except exception.ComputeNodeNotFound:
-                continue
+    def _get_instance_pages(self, first_page=None, changes_since=None):
+        """Yield the instances page by page
+
+        Nova paginates the instances with a marker, i.e. the ID of the last
+        instance of the previous page, so the pages can only be listed one
+        after the other. Each page is nonetheless fetched in the background
+        while the previous one is being processed. As Nova caps the size of
+        the pages to its ``[api] max_limit``, which may be lower than the page
+        size, the pages are listed until an empty one is returned.
+
+        :param first_page: future of the first page, listed if not given
+        :param changes_since: only list the instances which changed since
+                              this time
+        """
+        filters = {}
+        if changes_since is not None:
+            filters['changes_since'] = changes_since
+        with futures.ThreadPoolExecutor(max_workers=1) as executor:
+            page = first_page or executor.submit(
+                self.nova_helper.get_instance_list, limit=self.page_size,
+                **filters)
+            while page is not None:
+                instances = page.result()
+                page = None
+                if instances:
+                    page = executor.submit(
+                        self.nova_helper.get_instance_list,
+                        marker=instances[-1].id, limit=self.page_size,
+                        **filters)
+                yield instances
+
+    def _add_virtual_servers(self, instance_pages=None):
+        if instance_pages is None:
+            instance_pages = self._get_instance_pages()
+        for instances in instance_pages:
+            for inst in instances:
+                self._add_virtual_server(inst)
+
+    def _add_virtual_server(self, inst):
+        # Add Node
+        instance = self._build_instance_node(inst)
+        self.model.add_instance(instance)
+        # Get the cnode_name uuid.
+        cnode_uuid = getattr(inst, "OS-EXT-SRV-ATTR:host")
+        if cnode_uuid is None:
+            # The instance is not attached to any Compute node
+            return
+        try:
+            # Nova compute node
+            compute_node = self.model.get_node_by_uuid(cnode_uuid)
+            # Connect the instance to its compute node
+            self.model.map_instance(instance, compute_node)
+        except exception.ComputeNodeNotFound:
+            return
+
+    def _delete_virtual_server(self, uuid):
+        try:
+            self.model.delete_instance(self.model.get_instance_by_uuid(uuid))
+        except exception.InstanceNotFound:
+            # Already deleted upon notification
+            pass
+
+    def _patch_virtual_server(self, inst, known_instances):
+        if inst.id in known_instances:
+            # The instance is rebuilt from scratch, along with its mapping
+            # to its compute node
+            self._delete_virtual_server(inst.id)
+        vm_state = getattr(inst, "OS-EXT-STS:vm_state")
+        if vm_state != element.InstanceState.DELETED.value:
+            self._add_virtual_server(inst)
 
     def _build_instance_node(self, instance):
         """Build an instance node
@@ -230,7 +324,7 @@ class ModelBuilder(object):
         :param instance: Nova VM object.
         :return: A instance node for the graph.
         """
-        flavor = self.nova_helper.get_flavor(instance.flavor["id"])
+        flavor = self.get_flavor(instance)
         instance_attributes = {
             "uuid": instance.id,
             "human_id": instance.human_id,
@@ -248,6 +342,21 @@ class ModelBuilder(object):
         # node_attributes["attributes"] = instance_attributes
         return element.Instance(**instance_attributes)
 
+    def get_flavor(self, instance):
+        """Get the flavor of a Nova instance
+
+        The flavor is looked up in the flavors prefetched when building the
+        model, and only fetched from Nova for the flavors which were not
+        listed, such as the deleted ones.
+
+        :param instance: Nova VM object.
+        :return: The flavor of the instance
+        """
+        flavor_id = instance.flavor["id"]
+        if flavor_id not in self.flavors:
+            self.flavors[flavor_id] = self.nova_helper.get_flavor(flavor_id)
+        return self.flavors[flavor_id]
+
     # def _add_virtual_storage(self):
     #     try:
     #         volumes = self.cinder.volumes.list()
@@ -368,6 +477,78 @@ class ModelBuilder(object):
         The graph is populated along 2 layers: virtual and physical. As each
         new layer is built connections are made back to previous layers.
         """
-        self._add_physical_layer()
-        self._add_virtual_layer()
+        with futures.ThreadPoolExecutor(max_workers=4) as executor:
+            # List the instances while the rest of the data is being listed
+            # and the physical layer is being built
+            first_page = executor.submit(
+                self.nova_helper.get_instance_list, limit=self.page_size)
+            services = executor.submit(self.nova_helper.get_service_list)
+            flavors = executor.submit(self.nova_helper.get_flavor_list)
+            compute_nodes = executor.submit(
+                self.nova_helper.get_compute_node_list)
+
+            self.services = {service.id: service
+                             for service in services.result()}
+            self.flavors = {flavor.id: flavor for flavor in flavors.result()}
+            self._add_physical_layer(compute_nodes.result())
+            self._add_virtual_servers(self._get_instance_pages(first_page))
         return self.model
+
+    def execute_delta(self, since):
+        """Patch the graph with the changes made since the given time
+
+        All the compute nodes are listed again as the hypervisors cannot be
+        filtered on their update time, and are updated in place. As for the
+        instances, only those which changed since then are listed, including
+        the deleted ones, and are replaced in the graph. The instances Nova
+        no longer returns at all, e.g. once archived or purged, are found out
+        from the list of the IDs of all the instances.
+
+        The graph is patched under its write lock, so that the snapshots
+        taken meanwhile never miss the instances being replaced.
+
+        :param since: time from which to list the changes
+        :type since: :py:class:`~datetime.datetime`
+        :return: False if the compute nodes of the cluster don't match those
+                 of the graph anymore, in which case it has to be rebuilt,
+                 True otherwise
+        """
+        with futures.ThreadPoolExecutor(max_workers=5) as executor:
+            first_page = executor.submit(
+                self.nova_helper.get_instance_list, limit=self.page_size,
+                changes_since=since)
+            instance_ids = executor.submit(
+                self.nova_helper.get_instance_id_list)
+            services = executor.submit(self.nova_helper.get_service_list)
+            flavors = executor.submit(self.nova_helper.get_flavor_list)
+            compute_nodes = executor.submit(
+                self.nova_helper.get_compute_node_list)
+
+            self.services = {service.id: service
+                             for service in services.result()}
+            self.flavors = {flavor.id: flavor for flavor in flavors.result()}
+            compute_nodes = [self.build_compute_node(cnode)
+                             for cnode in compute_nodes.result()]
+            if (set(node.uuid for node in compute_nodes) !=
+                    set(self.model.get_all_compute_nodes())):
+                return False
+
+            changed_instances = [
+                inst for instances in self._get_instance_pages(
+                    first_page, changes_since=since)
+                for inst in instances]
+            instance_ids = set(instance_ids.result())
+
+        with self.model.batch_update():
+            for compute_node in compute_nodes:
+                self.model.materialize(compute_node.uuid).update(
+                    compute_node.as_dict())
+            known_instances = self.model.get_all_instances()
+            for uuid in set(known_instances) - instance_ids:
+                self._delete_virtual_server(uuid)
+            for inst in changed_instances:
+                if inst.id not in instance_ids:
+                    # Deleted while listing the changes
+                    continue
+                self._patch_virtual_server(inst, known_instances)
+        return True
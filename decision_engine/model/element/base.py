@@ -18,20 +18,51 @@
 
 import abc
 import collections
+import copy
 
 from lxml import etree
 from oslo_log import log
 import six
 
+from watcher._i18n import _
 from watcher.objects import base
 from watcher.objects import fields as wfields
 
 LOG = log.getLogger(__name__)
 
+_NOT_SPECIFIED = object()
 
-@six.add_metaclass(abc.ABCMeta)
-class Element(base.WatcherObject, base.WatcherObjectDictCompat,
-              base.WatcherComparableObject):
+
+class ElementMeta(abc.ABCMeta):
+    """Metaclass storing the fields of the elements in slots
+
+    The fields of each element class are merged with the ones of its parent
+    classes, and the fields it introduces get a slot of their own, so that
+    the elements do not need an instance dictionary.
+    """
+
+    def __new__(mcs, name, bases, namespace):
+        inherited_fields = {}
+        for parent in reversed(bases):
+            inherited_fields.update(getattr(parent, 'fields', {}))
+        fields = dict(inherited_fields)
+        fields.update(namespace.get('fields', {}))
+        namespace['fields'] = fields
+        namespace['__slots__'] = tuple(
+            sorted(set(fields) - set(inherited_fields)))
+        return super(ElementMeta, mcs).__new__(mcs, name, bases, namespace)
+
+
+@six.add_metaclass(ElementMeta)
+class Element(object):
+    """Compact element of the cluster data model
+
+    Elements are plain slotted records: their field values are coerced like
+    the ones of versioned objects, but they carry neither a context nor any
+    change tracking. They keep the dict-compatible API of the versioned
+    objects, and can be converted to and from versioned object primitives
+    with :py:meth:`obj_to_primitive` and :py:meth:`obj_from_primitive`.
+    """
 
     # Initial version
     VERSION = '1.0'
@@ -45,7 +76,127 @@ class Element(base.WatcherObject, base.WatcherObjectDictCompat,
             if (name not in kwargs and not field.nullable and
                     field.default != wfields.UnspecifiedDefault):
                 kwargs[name] = field.default
-        super(Element, self).__init__(context, **kwargs)
+        self.update(kwargs)
+
+    def __setattr__(self, name, value):
+        field = self.fields.get(name)
+        if field is not None:
+            value = field.coerce(self, name, value)
+        super(Element, self).__setattr__(name, value)
+
+    def __getattr__(self, name):
+        # Only called for the unset fields or the unknown attributes
+        if name in self.fields:
+            raise NotImplementedError(
+                _("Cannot load '%s' in the base class") % name)
+        raise AttributeError(
+            "'%s' object has no attribute '%s'" % (
+                self.obj_name(), name))
+
+    def __deepcopy__(self, memo):
+        clone = self.__class__.__new__(self.__class__)
+        memo[id(self)] = clone
+        for name, value in self.items():
+            object.__setattr__(clone, name, copy.deepcopy(value, memo))
+        return clone
+
+    def __eq__(self, other):
+        if not isinstance(other, Element):
+            return NotImplemented
+        return (self.__class__ is other.__class__ and
+                self.as_dict() == other.as_dict())
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    __hash__ = object.__hash__
+
+    def __repr__(self):
+        return '%s(%s)' % (self.obj_name(), ','.join(
+            '%s=%r' % (name, self[name]) if name in self
+            else '%s=<?>' % name
+            for name in sorted(self.fields)))
+
+    @classmethod
+    def obj_name(cls):
+        return cls.__name__
+
+    def obj_attr_is_set(self, name):
+        try:
+            object.__getattribute__(self, name)
+        except AttributeError:
+            return False
+        return name in self.fields
+
+    # Dict compatibility
+
+    def __iter__(self):
+        for name in self.fields:
+            if self.obj_attr_is_set(name):
+                yield name
+
+    def __contains__(self, name):
+        return self.obj_attr_is_set(name)
+
+    def __getitem__(self, name):
+        return getattr(self, name)
+
+    def __setitem__(self, name, value):
+        setattr(self, name, value)
+
+    def keys(self):
+        return list(self)
+
+    def values(self):
+        return [getattr(self, name) for name in self]
+
+    def items(self):
+        return [(name, getattr(self, name)) for name in self]
+
+    def get(self, key, value=_NOT_SPECIFIED):
+        if key not in self.fields:
+            raise AttributeError(
+                "'%s' object has no attribute '%s'" % (
+                    self.obj_name(), key))
+        if value is not _NOT_SPECIFIED and key not in self:
+            return value
+        return getattr(self, key)
+
+    def update(self, updates):
+        """Update the fields of the element
+
+        Unlike versioned objects, the elements can only hold their fields,
+        so the keys which are not fields of the element are ignored.
+        """
+        for name, value in updates.items():
+            if name in self.fields:
+                setattr(self, name, value)
+
+    def as_dict(self):
+        return dict(self.items())
+
+    # Conversion to and from versioned object primitives
+
+    def obj_to_primitive(self):
+        namespace = base.WatcherObject.OBJ_SERIAL_NAMESPACE
+        return {
+            '%s.name' % namespace: self.obj_name(),
+            '%s.namespace' % namespace:
+                base.WatcherObject.OBJ_PROJECT_NAMESPACE,
+            '%s.version' % namespace: self.VERSION,
+            '%s.data' % namespace: {
+                name: self.fields[name].to_primitive(self, name, value)
+                for name, value in self.items()},
+        }
+
+    @classmethod
+    def obj_from_primitive(cls, primitive):
+        namespace = base.WatcherObject.OBJ_SERIAL_NAMESPACE
+        data = primitive['%s.data' % namespace]
+        return cls(**{
+            name: cls.fields[name].from_primitive(None, name, value)
+            for name, value in data.items()})
 
     @abc.abstractmethod
     def accept(self, visitor):
@@ -17,7 +17,6 @@
 import enum
 
 from watcher.decision_engine.model.element import compute_resource
-from watcher.objects import base
 from watcher.objects import fields as wfields
 
 
@@ -38,7 +37,6 @@ class InstanceState(enum.Enum):
     ERROR = 'error'
 
 
-@base.WatcherObjectRegistry.register_if(False)
 class Instance(compute_resource.ComputeResource):
 
     fields = {
@@ -18,7 +18,6 @@ import enum
 
 from watcher.decision_engine.model.element import compute_resource
 from watcher.decision_engine.model.element import storage_resource
-from watcher.objects import base
 from watcher.objects import fields as wfields
 
 
@@ -29,7 +28,6 @@ class ServiceState(enum.Enum):
     DISABLED = 'disabled'
 
 
-@base.WatcherObjectRegistry.register_if(False)
 class ComputeNode(compute_resource.ComputeResource):
 
     fields = {
@@ -48,7 +46,6 @@ class ComputeNode(compute_resource.ComputeResource):
         raise NotImplementedError()
 
 
-@base.WatcherObjectRegistry.register_if(False)
 class StorageNode(storage_resource.StorageResource):
 
     fields = {
@@ -63,7 +60,6 @@ class StorageNode(storage_resource.StorageResource):
         raise NotImplementedError()
 
 
-@base.WatcherObjectRegistry.register_if(False)
 class Pool(storage_resource.StorageResource):
 
     fields = {
@@ -14,15 +14,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import abc
-
-import six
-
 from watcher.decision_engine.model.element import base
 from watcher.objects import fields as wfields
 
 
-@six.add_metaclass(abc.ABCMeta)
 class StorageResource(base.Element):
 
     VERSION = '1.0'
@@ -17,7 +17,6 @@
 import enum
 
 from watcher.decision_engine.model.element import storage_resource
-from watcher.objects import base
 from watcher.objects import fields as wfields
 
 
@@ -37,7 +36,6 @@ class VolumeState(enum.Enum):
     ERROR_EXTENDING = 'error_extending'
 
 
-@base.WatcherObjectRegistry.register_if(False)
 class Volume(storage_resource.StorageResource):
 
     fields = {
@@ -16,10 +16,15 @@
 Openstack implementation of the cluster graph.
 """
 
+import copy
+import functools
+
+import eventlet
 from lxml import etree
 import networkx as nx
 from oslo_concurrency import lockutils
 from oslo_log import log
+from oslo_serialization import msgpackutils
 import six
 import pdb
 from watcher._i18n import _
@@ -29,13 +34,240 @@ from watcher.decision_engine.model import element
 
 LOG = log.getLogger(__name__)
 
+# Version of the layout of the models serialized with msgpack
+MSGPACK_FORMAT_VERSION = 1
 
-class ModelRoot(nx.DiGraph, base.Model):
-    """Cluster graph for an Openstack cluster."""
+
+class ReaderWriterLock(lockutils.ReaderWriterLock):
+    """Readers-writer lock telling green threads apart
+
+    Once eventlet has monkey patched the threads, threading.current_thread()
+    no longer identifies the green threads, so the owners of the lock are
+    identified by their greenlet instead.
+    """
+
+    def __init__(self):
+        super(ReaderWriterLock, self).__init__()
+        if eventlet.patcher.is_monkey_patched('thread'):
+            self._current_thread = eventlet.getcurrent
+
+
+def read_locked(func):
+    """Run the decorated model method under the read lock of the model"""
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        with self._lock.read_lock():
+            return func(self, *args, **kwargs)
+    return wrapper
+
+
+def write_locked(func):
+    """Run the decorated model method under the write lock of the model"""
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        with self._lock.write_lock():
+            return func(self, *args, **kwargs)
+    return wrapper
+
+
+def _to_columns(elements, element_cls):
+    """Lay out elements with one array of values per field
+
+    :return: dict holding the number of elements, the values of each field
+             and, for each field not set on all the elements, the indexes
+             of the elements it is not set on
+    """
+    columns = {}
+    unset = {}
+    for name in element_cls.fields:
+        values = []
+        for index, elt in enumerate(elements):
+            try:
+                values.append(object.__getattribute__(elt, name))
+            except AttributeError:
+                values.append(None)
+                unset.setdefault(name, []).append(index)
+        columns[name] = values
+    return {"count": len(elements), "columns": columns, "unset": unset}
+
+
+def _from_columns(data, element_cls):
+    """Rebuild the elements laid out by :py:func:`_to_columns`"""
+    columns = {name: values for name, values in data["columns"].items()
+               if name in element_cls.fields}
+    unset = {name: set(indexes) for name, indexes in data["unset"].items()}
+    elements = []
+    for index in range(data["count"]):
+        elt = element_cls.__new__(element_cls)
+        for name, values in columns.items():
+            if name not in unset or index not in unset[name]:
+                setattr(elt, name, values[index])
+        elements.append(elt)
+    return elements
+
+
+class CopyOnWriteDiGraph(nx.DiGraph):
+    """Directed graph which can share its content with its snapshots
+
+    Taking a snapshot only copies the top-level node and adjacency mappings.
+    The elements themselves as well as the per-node adjacency mappings are
+    shared between the graph and its snapshots until one of them modifies
+    them, in which case only the modified entries are materialised (i.e.
+    privately copied) by the graph being modified.
+
+    Each graph has its own readers-writer lock, so that reads on a graph
+    never wait for one another, nor for the writes on its snapshots.
+    """
+
+    def __init__(self):
+        super(CopyOnWriteDiGraph, self).__init__()
+        self._lock = ReaderWriterLock()
+        # Keys whose element (resp. adjacency) is shared with another graph
+        self._shared_elements = set()
+        self._shared_adjacency = set()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # Locks cannot be copied: the copy gets its own one
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = ReaderWriterLock()
+
+    def batch_update(self):
+        """Hold the write lock of the model across several updates
+
+        Usage::
+
+            with model.batch_update():
+                model.add_instance(instance)
+                model.map_instance(instance, node)
+        """
+        return self._lock.write_lock()
+
+    def _share_with(self, other):
+        other.graph = dict(self.graph)
+        other.node = dict(self.node)
+        other.succ = other.adj = other.edge = dict(self.succ)
+        other.pred = dict(self.pred)
+
+        self._shared_elements = set(self.node)
+        self._shared_adjacency = set(self.node)
+        other._shared_elements = set(self.node)
+        other._shared_adjacency = set(self.node)
+
+    def _materialize_element(self, n):
+        if n in self._shared_elements:
+            self.node[n] = copy.deepcopy(self.node[n])
+            self._shared_elements.discard(n)
+        return self.node[n]
+
+    def _materialize_adjacency(self, *nodes):
+        for n in nodes:
+            if n in self._shared_adjacency:
+                self.succ[n] = dict(self.succ[n])
+                self.pred[n] = dict(self.pred[n])
+                self._shared_adjacency.discard(n)
+
+    def add_node(self, n, attr_dict=None, **attr):
+        if n in self.node:
+            # The existing element is going to be updated in place
+            self._materialize_element(n)
+        super(CopyOnWriteDiGraph, self).add_node(n, attr_dict, **attr)
+
+    def remove_node(self, n):
+        if n in self.node:
+            self._materialize_adjacency(
+                *(list(self.succ[n]) + list(self.pred[n])))
+        super(CopyOnWriteDiGraph, self).remove_node(n)
+        self._shared_elements.discard(n)
+        self._shared_adjacency.discard(n)
+
+    def add_edge(self, u, v, attr_dict=None, **attr):
+        self._materialize_adjacency(
+            *[n for n in (u, v) if n in self.node])
+        super(CopyOnWriteDiGraph, self).add_edge(u, v, attr_dict, **attr)
+
+    def remove_edge(self, u, v):
+        self._materialize_adjacency(
+            *[n for n in (u, v) if n in self.node])
+        super(CopyOnWriteDiGraph, self).remove_edge(u, v)
+
+
+class ModelRoot(CopyOnWriteDiGraph, base.Model):
+    """Cluster graph for an Openstack cluster.
+
+    Compute nodes and instances are indexed by UUID, and instances are also
+    indexed by state and by metadata key. As for the copy-on-write
+    snapshots, the state and metadata indexes rely on the elements being
+    retrieved through :py:meth:`materialize` before being updated in place.
+    The mapping of the instances to their compute node is given by the
+    adjacency of the graph, where an edge goes from each mapped instance to
+    its node.
+    """
 
     def __init__(self, stale=False):
         super(ModelRoot, self).__init__()
         self.stale = stale
+        self._compute_nodes = {}
+        self._instances = {}
+        self._instances_by_state = {}
+        self._instances_by_metadata_key = {}
+        # State and metadata keys under which each instance is indexed
+        self._indexed_instances = {}
+        # Instances which may have changed since they were last indexed
+        self._unindexed_instances = set()
+
+    def _share_with(self, other):
+        super(ModelRoot, self)._share_with(other)
+        other._compute_nodes = dict(self._compute_nodes)
+        other._instances = dict(self._instances)
+        other._instances_by_state = {
+            state: set(uuids)
+            for state, uuids in self._instances_by_state.items()}
+        other._instances_by_metadata_key = {
+            key: set(uuids)
+            for key, uuids in self._instances_by_metadata_key.items()}
+        other._indexed_instances = dict(self._indexed_instances)
+        other._unindexed_instances = set(self._unindexed_instances)
+
+    def _materialize_element(self, n):
+        materialized = super(ModelRoot, self)._materialize_element(n)
+        if n in self._compute_nodes:
+            self._compute_nodes[n] = materialized
+        elif n in self._instances:
+            self._instances[n] = materialized
+            # The instance is about to be updated in place
+            self._unindexed_instances.add(n)
+        return materialized
+
+    def _unindex_instance(self, uuid):
+        state, metadata_keys = self._indexed_instances.pop(
+            uuid, (None, ()))
+        if state is not None:
+            self._instances_by_state[state].discard(uuid)
+        for key in metadata_keys:
+            self._instances_by_metadata_key[key].discard(uuid)
+
+    def _refresh_indexes(self):
+        for uuid in self._unindexed_instances:
+            self._unindex_instance(uuid)
+            instance = self._instances.get(uuid)
+            if instance is None:
+                continue
+            metadata = (instance.metadata
+                        if instance.obj_attr_is_set('metadata') else None)
+            metadata_keys = (tuple(metadata)
+                             if isinstance(metadata, dict) else ())
+            self._instances_by_state.setdefault(
+                instance.state, set()).add(uuid)
+            for key in metadata_keys:
+                self._instances_by_metadata_key.setdefault(
+                    key, set()).add(uuid)
+            self._indexed_instances[uuid] = (instance.state, metadata_keys)
+        self._unindexed_instances.clear()
 
     def __nonzero__(self):
         return not self.stale
@@ -54,12 +286,13 @@ class ModelRoot(nx.DiGraph, base.Model):
             raise exception.IllegalArgumentException(
                 message=_("'obj' argument type is not valid"))
 
-    @lockutils.synchronized("model_root")
+    @write_locked
     def add_node(self, node):
         self.assert_node(node)
         super(ModelRoot, self).add_node(node.uuid, node)
+        self._compute_nodes[node.uuid] = self.node[node.uuid]
 
-    @lockutils.synchronized("model_root")
+    @write_locked
     def remove_node(self, node):
         self.assert_node(node)
         try:
@@ -67,8 +300,9 @@ class ModelRoot(nx.DiGraph, base.Model):
         except nx.NetworkXError as exc:
             LOG.exception(exc)
             raise exception.ComputeNodeNotFound(name=node.uuid)
+        self._compute_nodes.pop(node.uuid, None)
 
-    @lockutils.synchronized("model_root")
+    @write_locked
     def add_instance(self, instance):
         self.assert_instance(instance)
         try:
@@ -76,13 +310,17 @@ class ModelRoot(nx.DiGraph, base.Model):
         except nx.NetworkXError as exc:
             LOG.exception(exc)
             raise exception.InstanceNotFound(name=instance.uuid)
+        self._instances[instance.uuid] = self.node[instance.uuid]
+        self._unindexed_instances.add(instance.uuid)
 
-    @lockutils.synchronized("model_root")
+    @write_locked
     def remove_instance(self, instance):
         self.assert_instance(instance)
         super(ModelRoot, self).remove_node(instance.uuid)
+        self._instances.pop(instance.uuid, None)
+        self._unindexed_instances.add(instance.uuid)
 
-    @lockutils.synchronized("model_root")
+    @write_locked
     def map_instance(self, instance, node):
         """Map a newly created instance to a node
 
@@ -101,7 +339,7 @@ class ModelRoot(nx.DiGraph, base.Model):
 
         self.add_edge(instance.uuid, node.uuid)
 
-    @lockutils.synchronized("model_root")
+    @write_locked
     def unmap_instance(self, instance, node):
         if isinstance(instance, six.string_types):
             instance = self.get_instance_by_uuid(instance)
@@ -114,7 +352,34 @@ class ModelRoot(nx.DiGraph, base.Model):
         self.assert_instance(instance)
         self.remove_instance(instance)
 
-    @lockutils.synchronized("model_root")
+    @write_locked
+    def snapshot(self):
+        """Take a copy-on-write snapshot of the model
+
+        The returned model shares its compute nodes and instances with this
+        one: only the resources either model modifies afterwards get copied.
+
+        :return: A snapshot of this model
+        :rtype: :py:class:`~.ModelRoot` instance
+        """
+        snapshot = ModelRoot(stale=self.stale)
+        self._share_with(snapshot)
+        return snapshot
+
+    @write_locked
+    def materialize(self, uuid):
+        """Get a private copy of a compute node or an instance to update
+
+        Elements are shared with the snapshots of this model, so they should
+        always be retrieved with this method before being updated in place.
+
+        :param uuid: UUID of the compute node or of the instance
+        :return: The :py:class:`~.ComputeNode` or :py:class:`~.Instance` object
+        """
+        self._get_by_uuid(uuid)
+        return self._materialize_element(uuid)
+
+    @write_locked
     def migrate_instance(self, instance, source_node, destination_node):
         """Migrate single instance from source_node to destination_node
 
@@ -136,23 +401,24 @@ class ModelRoot(nx.DiGraph, base.Model):
         self.add_edge(instance.uuid, destination_node.uuid)
         return True
 
-    @lockutils.synchronized("model_root")
+    @read_locked
     def get_all_compute_nodes(self):
-        return {uuid: cn for uuid, cn in self.nodes(data=True)
-                if isinstance(cn, element.ComputeNode)}
+        return dict(self._compute_nodes)
 
-    @lockutils.synchronized("model_root")
+    @read_locked
     def get_node_by_uuid(self, uuid):
         try:
-            return self._get_by_uuid(uuid)
-        except exception.ComputeResourceNotFound:
+            return self._compute_nodes[uuid]
+        except KeyError:
+            LOG.error("Compute node %s not found", uuid)
             raise exception.ComputeNodeNotFound(name=uuid)
 
-    @lockutils.synchronized("model_root")
+    @read_locked
     def get_instance_by_uuid(self, uuid):
         try:
-            return self._get_by_uuid(uuid)
-        except exception.ComputeResourceNotFound:
+            return self._instances[uuid]
+        except KeyError:
+            LOG.error("Instance %s not found", uuid)
             raise exception.InstanceNotFound(name=uuid)
 
     def _get_by_uuid(self, uuid):
@@ -162,31 +428,55 @@ class ModelRoot(nx.DiGraph, base.Model):
             LOG.exception(exc)
             raise exception.ComputeResourceNotFound(name=uuid)
 
-    @lockutils.synchronized("model_root")
-    def get_node_by_instance_uuid(self, instance_uuid):
-        #pdb.set_trace()
-        instance = self._get_by_uuid(instance_uuid)
-        for node_uuid in self.neighbors(instance.uuid):
-            node = self._get_by_uuid(node_uuid)
-            if isinstance(node, element.ComputeNode):
-                return node
-        raise exception.ComputeNodeNotFound(name=instance_uuid)
+    def _get_instance_node(self, instance_uuid):
+        for node_uuid in self.succ[instance_uuid]:
+            if node_uuid in self._compute_nodes:
+                return self._compute_nodes[node_uuid]
+        return None
 
-    @lockutils.synchronized("model_root")
+    @read_locked
+    def get_node_by_instance_uuid(self, instance_uuid):
+        if instance_uuid not in self._instances:
+            raise exception.ComputeResourceNotFound(name=instance_uuid)
+        node = self._get_instance_node(instance_uuid)
+        if node is None:
+            raise exception.ComputeNodeNotFound(name=instance_uuid)
+        return node
+
+    @read_locked
     def get_all_instances(self):
-        return {uuid: inst for uuid, inst in self.nodes(data=True)
-                if isinstance(inst, element.Instance)}
+        return dict(self._instances)
+
+    # Write-locked as the lookup refreshes the instance indexes
+    @write_locked
+    def get_instances_by_state(self, state):
+        """Get the instances in a given state
+
+        :param state: one of the :py:class:`~.InstanceState` values
+        :return: dict of :py:class:`~.Instance` objects by UUID
+        """
+        self._refresh_indexes()
+        return {uuid: self._instances[uuid]
+                for uuid in self._instances_by_state.get(state, ())}
+
+    # Write-locked as the lookup refreshes the instance indexes
+    @write_locked
+    def get_instances_by_metadata_key(self, key):
+        """Get the instances whose metadata contain a given key
 
-    @lockutils.synchronized("model_root")
+        :param key: metadata key
+        :return: dict of :py:class:`~.Instance` objects by UUID
+        """
+        self._refresh_indexes()
+        return {uuid: self._instances[uuid]
+                for uuid in self._instances_by_metadata_key.get(key, ())}
+
+    @read_locked
     def get_node_instances(self, node):
         self.assert_node(node)
-        node_instances = []
-        for instance_uuid in self.predecessors(node.uuid):
-            instance = self._get_by_uuid(instance_uuid)
-            if isinstance(instance, element.Instance):
-                node_instances.append(instance)
-
-        return node_instances
+        return [self._instances[instance_uuid]
+                for instance_uuid in self.pred[node.uuid]
+                if instance_uuid in self._instances]
 
     def to_string(self):
         return self.to_xml()
@@ -209,9 +499,7 @@ class ModelRoot(nx.DiGraph, base.Model):
         # Build unmapped instance tree (i.e. not assigned to any compute node)
         for instance in sorted(self.get_all_instances().values(),
                                key=lambda inst: inst.uuid):
-            try:
-                self.get_node_by_instance_uuid(instance.uuid)
-            except (exception.InstanceNotFound, exception.ComputeNodeNotFound):
+            if self._get_instance_node(instance.uuid) is None:
                 root.append(instance.as_xml_element())
 
         return etree.tostring(root, pretty_print=True).decode('utf-8')
@@ -238,6 +526,53 @@ class ModelRoot(nx.DiGraph, base.Model):
 
         return model
 
+    @read_locked
+    def to_msgpack(self):
+        """Serialize the model in a compact binary format
+
+        The compute nodes and the instances are laid out field by field and
+        each instance refers to the compute node it is mapped to, if any, by
+        its index.
+
+        :return: the model serialized with msgpack
+        :rtype: bytes
+        """
+        nodes = list(self._compute_nodes.values())
+        node_indexes = {node.uuid: index for index, node in enumerate(nodes)}
+        instances = list(self._instances.values())
+        mapping = []
+        for instance in instances:
+            node = self._get_instance_node(instance.uuid)
+            mapping.append(-1 if node is None else node_indexes[node.uuid])
+
+        return msgpackutils.dumps({
+            "version": MSGPACK_FORMAT_VERSION,
+            "stale": self.stale,
+            "compute_nodes": _to_columns(nodes, element.ComputeNode),
+            "instances": _to_columns(instances, element.Instance),
+            "instance_mapping": mapping,
+        })
+
+    @classmethod
+    def from_msgpack(cls, data):
+        """Deserialize a model serialized by :py:meth:`to_msgpack`"""
+        data = msgpackutils.loads(data)
+        model = cls(stale=data["stale"])
+        nodes = _from_columns(data["compute_nodes"], element.ComputeNode)
+        instances = _from_columns(data["instances"], element.Instance)
+
+        # Taking the lock once spares taking it again for every element
+        with model.batch_update():
+            for node in nodes:
+                model.add_node(node)
+            for instance, node_index in zip(
+                    instances, data["instance_mapping"]):
+                model.add_instance(instance)
+                if node_index >= 0:
+                    model.map_instance(instance, nodes[node_index])
+
+        return model
+
     @classmethod
     def is_isomorphic(cls, G1, G2):
         def node_match(node1, node2):
@@ -246,7 +581,7 @@ class ModelRoot(nx.DiGraph, base.Model):
             G1, G2, node_match=node_match)
 
 
-class StorageModelRoot(nx.DiGraph, base.Model):
+class StorageModelRoot(CopyOnWriteDiGraph, base.Model):
     """Cluster graph for an Openstack cluster."""
 
     def __init__(self, stale=False):
@@ -276,17 +611,17 @@ class StorageModelRoot(nx.DiGraph, base.Model):
             raise exception.IllegalArgumentException(
                 message=_("'obj' argument type is not valid: %s") % type(obj))
 
-    @lockutils.synchronized("storage_model")
+    @write_locked
     def add_node(self, node):
         self.assert_node(node)
         super(StorageModelRoot, self).add_node(node.host, node)
 
-    @lockutils.synchronized("storage_model")
+    @write_locked
     def add_pool(self, pool):
         self.assert_pool(pool)
         super(StorageModelRoot, self).add_node(pool.name, pool)
 
-    @lockutils.synchronized("storage_model")
+    @write_locked
     def remove_node(self, node):
         self.assert_node(node)
         try:
@@ -295,7 +630,7 @@ class StorageModelRoot(nx.DiGraph, base.Model):
             LOG.exception(exc)
             raise exception.StorageNodeNotFound(name=node.host)
 
-    @lockutils.synchronized("storage_model")
+    @write_locked
     def remove_pool(self, pool):
         self.assert_pool(pool)
         try:
@@ -304,7 +639,7 @@ class StorageModelRoot(nx.DiGraph, base.Model):
             LOG.exception(exc)
             raise exception.PoolNotFound(name=pool.name)
 
-    @lockutils.synchronized("storage_model")
+    @write_locked
     def map_pool(self, pool, node):
         """Map a newly created pool to a node
 
@@ -320,7 +655,7 @@ class StorageModelRoot(nx.DiGraph, base.Model):
 
         self.add_edge(pool.name, node.host)
 
-    @lockutils.synchronized("storage_model")
+    @write_locked
     def unmap_pool(self, pool, node):
         """Unmap a pool from a node
 
@@ -334,12 +669,12 @@ class StorageModelRoot(nx.DiGraph, base.Model):
 
         self.remove_edge(pool.name, node.host)
 
-    @lockutils.synchronized("storage_model")
+    @write_locked
     def add_volume(self, volume):
         self.assert_volume(volume)
         super(StorageModelRoot, self).add_node(volume.uuid, volume)
 
-    @lockutils.synchronized("storage_model")
+    @write_locked
     def remove_volume(self, volume):
         self.assert_volume(volume)
         try:
@@ -348,7 +683,7 @@ class StorageModelRoot(nx.DiGraph, base.Model):
             LOG.exception(exc)
             raise exception.VolumeNotFound(name=volume.uuid)
 
-    @lockutils.synchronized("storage_model")
+    @write_locked
     def map_volume(self, volume, pool):
         """Map a newly created volume to a pool
 
@@ -364,7 +699,7 @@ class StorageModelRoot(nx.DiGraph, base.Model):
 
         self.add_edge(volume.uuid, pool.name)
 
-    @lockutils.synchronized("storage_model")
+    @write_locked
     def unmap_volume(self, volume, pool):
         """Unmap a volume from a pool
 
@@ -382,12 +717,46 @@ class StorageModelRoot(nx.DiGraph, base.Model):
         self.assert_volume(volume)
         self.remove_volume(volume)
 
-    @lockutils.synchronized("storage_model")
+    @write_locked
+    def snapshot(self):
+        """Take a copy-on-write snapshot of the model
+
+        The returned model shares its storage nodes, pools and volumes with
+        this one: only the resources either model modifies afterwards get
+        copied.
+
+        :return: A snapshot of this model
+        :rtype: :py:class:`~.StorageModelRoot` instance
+        """
+        snapshot = StorageModelRoot(stale=self.stale)
+        self._share_with(snapshot)
+        return snapshot
+
+    @write_locked
+    def materialize(self, name):
+        """Get a private copy of a storage node, pool or volume to update
+
+        Elements are shared with the snapshots of this model, so they should
+        always be retrieved with this method before being updated in place.
+
+        :param name: host of the node, name of the pool or UUID of the volume
+        :return: The :py:class:`~.StorageNode`, :py:class:`~.Pool` or
+                 :py:class:`~.Volume` object
+        """
+        self._get_by_name(name)
+        return self._materialize_element(name)
+
+    @read_locked
     def get_all_storage_nodes(self):
         return {host: cn for host, cn in self.nodes(data=True)
                 if isinstance(cn, element.StorageNode)}
 
-    @lockutils.synchronized("storage_model")
+    @read_locked
+    def get_all_pools(self):
+        return {name: pool for name, pool in self.nodes(data=True)
+                if isinstance(pool, element.Pool)}
+
+    @read_locked
     def get_node_by_name(self, name):
         """Get a node by node name
 
@@ -398,14 +767,14 @@ class StorageModelRoot(nx.DiGraph, base.Model):
         except exception.StorageResourceNotFound:
             raise exception.StorageNodeNotFound(name=name)
 
-    @lockutils.synchronized("storage_model")
+    @read_locked
     def get_pool_by_pool_name(self, name):
         try:
             return self._get_by_name(name)
         except exception.StorageResourceNotFound:
             raise exception.PoolNotFound(name=name)
 
-    @lockutils.synchronized("storage_model")
+    @read_locked
     def get_volume_by_uuid(self, uuid):
         try:
             return self._get_by_uuid(uuid)
@@ -426,7 +795,7 @@ class StorageModelRoot(nx.DiGraph, base.Model):
             LOG.exception(exc)
             raise exception.StorageResourceNotFound(name=name)
 
-    @lockutils.synchronized("storage_model")
+    @read_locked
     def get_node_by_pool_name(self, pool_name):
         pool = self._get_by_name(pool_name)
         for node_name in self.neighbors(pool.name):
@@ -435,7 +804,7 @@ class StorageModelRoot(nx.DiGraph, base.Model):
                 return node
         raise exception.StorageNodeNotFound(name=pool_name)
 
-    @lockutils.synchronized("storage_model")
+    @read_locked
     def get_node_pools(self, node):
         self.assert_node(node)
         node_pools = []
@@ -446,7 +815,7 @@ class StorageModelRoot(nx.DiGraph, base.Model):
 
         return node_pools
 
-    @lockutils.synchronized("storage_model")
+    @read_locked
     def get_pool_by_volume(self, volume):
         self.assert_volume(volume)
         volume = self._get_by_uuid(volume.uuid)
@@ -456,12 +825,12 @@ class StorageModelRoot(nx.DiGraph, base.Model):
                 return pool
         raise exception.PoolNotFound(name=volume.uuid)
 
-    @lockutils.synchronized("storage_model")
+    @read_locked
     def get_all_volumes(self):
         return {name: vol for name, vol in self.nodes(data=True)
                 if isinstance(vol, element.Volume)}
 
-    @lockutils.synchronized("storage_model")
+    @read_locked
     def get_pool_volumes(self, pool):
         self.assert_pool(pool)
         volumes = []
@@ -537,6 +906,76 @@ class StorageModelRoot(nx.DiGraph, base.Model):
 
         return model
 
+    def _get_successor(self, name, element_cls):
+        for successor in self.succ[name]:
+            if isinstance(self.node[successor], element_cls):
+                return successor
+        return None
+
+    @read_locked
+    def to_msgpack(self):
+        """Serialize the model in a compact binary format
+
+        The storage nodes, the pools and the volumes are laid out field by
+        field. Each pool refers to the storage node it is mapped to, if any,
+        by its index, and so does each volume with its pool.
+
+        :return: the model serialized with msgpack
+        :rtype: bytes
+        """
+        nodes, pools, volumes = [], [], []
+        for elt in self.node.values():
+            if isinstance(elt, element.StorageNode):
+                nodes.append(elt)
+            elif isinstance(elt, element.Pool):
+                pools.append(elt)
+            elif isinstance(elt, element.Volume):
+                volumes.append(elt)
+        node_indexes = {node.host: index for index, node in enumerate(nodes)}
+        pool_indexes = {pool.name: index for index, pool in enumerate(pools)}
+        pool_mapping = [
+            node_indexes.get(
+                self._get_successor(pool.name, element.StorageNode), -1)
+            for pool in pools]
+        volume_mapping = [
+            pool_indexes.get(
+                self._get_successor(volume.uuid, element.Pool), -1)
+            for volume in volumes]
+
+        return msgpackutils.dumps({
+            "version": MSGPACK_FORMAT_VERSION,
+            "stale": self.stale,
+            "storage_nodes": _to_columns(nodes, element.StorageNode),
+            "pools": _to_columns(pools, element.Pool),
+            "volumes": _to_columns(volumes, element.Volume),
+            "pool_mapping": pool_mapping,
+            "volume_mapping": volume_mapping,
+        })
+
+    @classmethod
+    def from_msgpack(cls, data):
+        """Deserialize a model serialized by :py:meth:`to_msgpack`"""
+        data = msgpackutils.loads(data)
+        model = cls(stale=data["stale"])
+        nodes = _from_columns(data["storage_nodes"], element.StorageNode)
+        pools = _from_columns(data["pools"], element.Pool)
+        volumes = _from_columns(data["volumes"], element.Volume)
+
+        # Taking the lock once spares taking it again for every element
+        with model.batch_update():
+            for node in nodes:
+                model.add_node(node)
+            for pool, node_index in zip(pools, data["pool_mapping"]):
+                model.add_pool(pool)
+                if node_index >= 0:
+                    model.map_pool(pool, nodes[node_index])
+            for volume, pool_index in zip(volumes, data["volume_mapping"]):
+                model.add_volume(volume)
+                if pool_index >= 0:
+                    model.map_volume(volume, pools[pool_index])
+
+        return model
+
     @classmethod
     def is_isomorphic(cls, G1, G2):
         return nx.algorithms.isomorphism.isomorph.is_isomorphic(
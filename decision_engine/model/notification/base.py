@@ -36,3 +36,27 @@ class NotificationEndpoint(object):
     @property
     def cluster_data_model(self):
         return self.collector.cluster_data_model
+
+    def get_resource_key(self, payload):
+        """Key of the resource a notification is about
+
+        Buffered notifications of this endpoint sharing the same key are
+        coalesced so that only the last one is applied.
+
+        :param payload: the payload of the notification
+        :return: a hashable key, or None if the notification cannot be
+                 coalesced with any other one
+        """
+        return None
+
+    def prefetch(self, ctxt, publisher_id, event_type, payload, metadata):
+        """Query the APIs ahead of the processing of a notification
+
+        Buffered notifications are applied while holding the lock of the
+        model, so the endpoints querying an API to process them should do
+        it here, before the lock is taken, and keep the results until
+        :py:meth:`clear_prefetched` is called.
+        """
+
+    def clear_prefetched(self):
+        """Discard the results of the queries made by :py:meth:`prefetch`"""
@@ -0,0 +1,223 @@
+# -*- encoding: utf-8 -*-
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Buffered ingestion of the notifications updating a cluster data model.
+
+Instead of being applied as soon as they are received, the notifications are
+held for ``[watcher_decision_engine] notification_batch_window`` seconds.
+Over that window, only the last notification of each endpoint received about
+each resource is kept, as it carries its latest state, and the remaining ones
+are then applied to the model in a single batch, holding the lock of the model
+once. The endpoints query the APIs they need before the lock is taken.
+"""
+
+import collections
+import threading
+import time
+
+from oslo_config import cfg
+from oslo_log import log
+
+LOG = log.getLogger(__name__)
+CONF = cfg.CONF
+
+
+class NotificationBuffer(object):
+    """Buffer coalescing the notifications of a cluster data model collector
+
+    :param collector: the collector whose model the notifications update
+    """
+
+    def __init__(self, collector):
+        self.collector = collector
+        # Pending notifications by endpoint and resource key, oldest first,
+        # as (time of reception, endpoint, notification arguments)
+        self._pending = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._timer = None
+        self.received = 0
+        self.coalesced = 0
+        self.applied = 0
+        self.last_batch_size = 0
+        self.last_batch_lag = 0.0
+
+    @property
+    def window(self):
+        return CONF.watcher_decision_engine.notification_batch_window
+
+    @property
+    def max_size(self):
+        return CONF.watcher_decision_engine.notification_batch_size
+
+    @property
+    def enabled(self):
+        return self.window > 0
+
+    @property
+    def depth(self):
+        """Number of notifications waiting to be applied"""
+        return len(self._pending)
+
+    @property
+    def lag(self):
+        """Time (in seconds) the oldest pending notification has waited"""
+        with self._lock:
+            if not self._pending:
+                return 0.0
+            received_at = next(iter(self._pending.values()))[0]
+        return time.time() - received_at
+
+    def wrap(self, endpoints):
+        """Wrap endpoints so that their notifications go through the buffer
+
+        :param endpoints: the notification endpoints of the collector
+        :return: the endpoints to hand over to the notification listener
+        """
+        if not self.enabled:
+            return list(endpoints)
+        return [BufferedNotificationEndpoint(self, endpoint)
+                for endpoint in endpoints]
+
+    def put(self, endpoint, *args):
+        """Buffer a notification
+
+        :param endpoint: the endpoint the notification is dispatched to
+        :param args: the arguments to call the ``info`` method of the
+                     endpoint with
+        """
+        payload = args[3]
+        try:
+            key = endpoint.get_resource_key(payload)
+        except KeyError:
+            # Malformed payload: the endpoint reports it when applying it
+            key = None
+        if key is None:
+            # The notification cannot be coalesced with any other one
+            key = object()
+        else:
+            # Different events about a resource cannot replace each other
+            key = (endpoint, key)
+
+        with self._lock:
+            self.received += 1
+            previous = self._pending.pop(key, None)
+            if previous is not None:
+                self.coalesced += 1
+            self._pending[key] = (time.time(), endpoint, args)
+            full = len(self._pending) >= self.max_size
+            if not full:
+                self._schedule_flush()
+
+        if full:
+            self.flush()
+
+    def _schedule_flush(self):
+        # Called with self._lock held
+        if self._timer is None:
+            self._timer = threading.Timer(self.window, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _requeue(self, pending):
+        """Put back the notifications of a batch which could not be applied
+
+        The notifications received in the meantime take precedence over
+        the ones about the same resources, as they are more recent.
+        """
+        with self._lock:
+            for key in self._pending:
+                pending.pop(key, None)
+            pending.update(self._pending)
+            self._pending = pending
+            self._schedule_flush()
+
+    def flush(self):
+        """Apply the pending notifications to the model in a single batch"""
+        with self._flush_lock:
+            with self._lock:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                pending, self._pending = (
+                    self._pending, collections.OrderedDict())
+            if not pending:
+                return
+
+            oldest_received_at = next(iter(pending.values()))[0]
+            endpoints = set(endpoint for _, endpoint, _ in pending.values())
+            try:
+                # The API calls are made before locking the model so that
+                # the readers of the model do not wait for them
+                for _, endpoint, args in pending.values():
+                    try:
+                        endpoint.prefetch(*args)
+                    except Exception as exc:
+                        LOG.exception(exc)
+                with self.collector.cluster_data_model.batch_update():
+                    for _, endpoint, args in pending.values():
+                        try:
+                            endpoint.info(*args)
+                        except Exception as exc:
+                            LOG.exception(exc)
+            except Exception as exc:
+                LOG.exception(exc)
+                LOG.warning("The batch of %(size)d notifications could not "
+                            "be applied: retrying in %(window)s seconds",
+                            dict(size=len(pending), window=self.window))
+                self._requeue(pending)
+                return
+            finally:
+                for endpoint in endpoints:
+                    endpoint.clear_prefetched()
+
+            self.applied += len(pending)
+            self.last_batch_size = len(pending)
+            self.last_batch_lag = time.time() - oldest_received_at
+            LOG.debug("Applied a batch of %(size)d notifications in "
+                      "%(lag).3f seconds", dict(size=self.last_batch_size,
+                                                lag=self.last_batch_lag))
+
+    def get_stats(self):
+        return collections.OrderedDict([
+            ("depth", self.depth),
+            ("lag", self.lag),
+            ("received", self.received),
+            ("coalesced", self.coalesced),
+            ("applied", self.applied),
+            ("last_batch_size", self.last_batch_size),
+            ("last_batch_lag", self.last_batch_lag),
+        ])
+
+
+class BufferedNotificationEndpoint(object):
+    """Notification endpoint handing its notifications over to a buffer
+
+    :param buffer: the :py:class:`NotificationBuffer` to buffer to
+    :param endpoint: the wrapped notification endpoint
+    """
+
+    def __init__(self, buffer, endpoint):
+        self.buffer = buffer
+        self.endpoint = endpoint
+
+    @property
+    def filter_rule(self):
+        return self.endpoint.filter_rule
+
+    def info(self, ctxt, publisher_id, event_type, payload, metadata):
+        self.buffer.put(
+            self.endpoint, ctxt, publisher_id, event_type, payload, metadata)
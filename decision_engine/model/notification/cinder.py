@@ -31,6 +31,9 @@ class CinderNotification(base.NotificationEndpoint):
     def __init__(self, collector):
         super(CinderNotification, self).__init__(collector)
         self._cinder = None
+        # Results (or errors) of the Cinder API queries made ahead of the
+        # processing of the buffered notifications, by queried resource
+        self._prefetched = {}
 
     @property
     def cinder(self):
@@ -38,6 +41,57 @@ class CinderNotification(base.NotificationEndpoint):
             self._cinder = cinder_helper.CinderHelper()
         return self._cinder
 
+    def _prefetch(self, key, query, *args):
+        if key in self._prefetched:
+            return
+        try:
+            self._prefetched[key] = query(*args)
+        except Exception as exc:
+            self._prefetched[key] = exc
+
+    def _query(self, key, query, *args):
+        """Query the Cinder API, unless the result was prefetched"""
+        try:
+            result = self._prefetched[key]
+        except KeyError:
+            return query(*args)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def _query_storage_node(self, name):
+        node = self.cinder.get_storage_node_by_name(name)
+        volume_type = self.cinder.get_volume_type_by_backendname(
+            # name is formatted as host@backendname
+            name.split('@')[1])
+        return node, volume_type
+
+    def prefetch_pool(self, pool_name, refresh=False):
+        """Query the storage pool and node to create or update
+
+        :param pool_name: the name of the storage pool
+        :param refresh: whether to query the pool even if it is known
+        """
+        if not pool_name:
+            return
+        if not refresh:
+            try:
+                self.cluster_data_model.get_pool_by_pool_name(pool_name)
+            except exception.PoolNotFound:
+                refresh = True
+        if refresh:
+            self._prefetch(('pool', pool_name),
+                           self.cinder.get_storage_pool_by_name, pool_name)
+        node_name = pool_name.split("#")[0]
+        try:
+            self.cluster_data_model.get_node_by_name(node_name)
+        except exception.StorageNodeNotFound:
+            self._prefetch(('node', node_name),
+                           self._query_storage_node, node_name)
+
+    def clear_prefetched(self):
+        self._prefetched.clear()
+
     def update_pool(self, pool, data):
         """Update the storage pool using the notification data."""
         pool.update({
@@ -57,7 +111,8 @@ class CinderNotification(base.NotificationEndpoint):
         """Update the storage pool using the API data."""
         if not pool:
             return
-        _pool = self.cinder.get_storage_pool_by_name(pool.name)
+        _pool = self._query(('pool', pool.name),
+                            self.cinder.get_storage_pool_by_name, pool.name)
         pool.update({
             "total_volumes": _pool.total_volumes,
             "total_capacity_gb": _pool.total_capacity_gb,
@@ -73,10 +128,8 @@ class CinderNotification(base.NotificationEndpoint):
     def create_storage_node(self, name):
         """Create the storage node by querying the Cinder API."""
         try:
-            _node = self.cinder.get_storage_node_by_name(name)
-            _volume_type = self.cinder.get_volume_type_by_backendname(
-                # name is formatted as host@backendname
-                name.split('@')[1])
+            _node, _volume_type = self._query(
+                ('node', name), self._query_storage_node, name)
             storage_node = element.StorageNode(
                 host=_node.host,
                 zone=_node.zone,
@@ -95,7 +148,10 @@ class CinderNotification(base.NotificationEndpoint):
             LOG.debug("Storage node name not provided: skipping")
             return
         try:
-            return self.cluster_data_model.get_node_by_name(name)
+            node = self.cluster_data_model.get_node_by_name(name)
+            # The node may be shared with the snapshots handed out to the
+            # strategies so we get our own copy of it to update
+            return self.cluster_data_model.materialize(node.host)
         except exception.StorageNodeNotFound:
             # The node didn't exist yet so we create a new node object
             node = self.create_storage_node(name)
@@ -107,7 +163,9 @@ class CinderNotification(base.NotificationEndpoint):
     def create_pool(self, pool_name):
         """Create the storage pool by querying the Cinder API."""
         try:
-            _pool = self.cinder.get_storage_pool_by_name(pool_name)
+            _pool = self._query(('pool', pool_name),
+                                self.cinder.get_storage_pool_by_name,
+                                pool_name)
             pool = element.Pool(
                 name=_pool.name,
                 total_volumes=_pool.total_volumes,
@@ -126,7 +184,8 @@ class CinderNotification(base.NotificationEndpoint):
             LOG.debug("Pool name not provided: skipping")
             return
         try:
-            return self.cluster_data_model.get_pool_by_pool_name(name)
+            self.cluster_data_model.get_pool_by_pool_name(name)
+            return self.cluster_data_model.materialize(name)
         except exception.PoolNotFound:
             # The pool didn't exist yet so we create a new pool object
             pool = self.create_pool(name)
@@ -144,7 +203,8 @@ class CinderNotification(base.NotificationEndpoint):
                         "volume %(volume)s",
                         dict(pool=pool_name, volume=volume_id))
         try:
-            return self.cluster_data_model.get_volume_by_uuid(volume_id)
+            self.cluster_data_model.get_volume_by_uuid(volume_id)
+            return self.cluster_data_model.materialize(volume_id)
         except exception.VolumeNotFound:
             # The volume didn't exist yet so we create a new volume object
             volume = element.Volume(uuid=volume_id)
@@ -251,6 +311,12 @@ class CapacityNotificationEndpoint(CinderNotification):
             event_type='capacity.pool',
         )
 
+    def get_resource_key(self, payload):
+        return ('pool', payload['name_to_id'])
+
+    def prefetch(self, ctxt, publisher_id, event_type, payload, metadata):
+        self.prefetch_pool(payload['name_to_id'])
+
     def info(self, ctxt, publisher_id, event_type, payload, metadata):
         ctxt.request_id = metadata['message_id']
         ctxt.project_domain = event_type
@@ -271,6 +337,13 @@ class CapacityNotificationEndpoint(CinderNotification):
 class VolumeNotificationEndpoint(CinderNotification):
     publisher_id_regex = r'^volume.*'
 
+    def get_resource_key(self, payload):
+        return ('volume', payload['volume_id'])
+
+    def prefetch(self, ctxt, publisher_id, event_type, payload, metadata):
+        # The pool is refreshed through the API once the volume is updated
+        self.prefetch_pool(payload['host'], refresh=True)
+
 
 class VolumeCreateEnd(VolumeNotificationEndpoint):
 
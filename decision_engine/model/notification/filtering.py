@@ -18,9 +18,16 @@
 
 import re
 
+from oslo_log import log
 import oslo_messaging as om
 import six
 
+LOG = log.getLogger(__name__)
+
+
+def _never(data):
+    return False
+
 
 class NotificationFilter(om.NotificationFilter):
     """Notification Endpoint base class
@@ -46,6 +53,24 @@ class NotificationFilter(om.NotificationFilter):
             do_something(payload)
     """
 
+    def __init__(self, context=None, publisher_id=None, event_type=None,
+                 metadata=None, payload=None):
+        super(NotificationFilter, self).__init__(
+            context=context, publisher_id=publisher_id,
+            event_type=event_type, metadata=metadata, payload=payload)
+        self._event_type_mismatch = self._compile(self._regex_event_type)
+        # Mismatch functions by position of the field they check in the
+        # arguments of match(), the most selective fields coming first
+        compiled = (
+            (2, self._event_type_mismatch),
+            (1, self._compile(self._regex_publisher_id)),
+            (4, self._compile(self._regexs_payload)),
+            (0, self._compile(self._regexs_context)),
+            (3, self._compile(self._regexs_metadata)),
+        )
+        self._mismatches = [(index, mismatch) for index, mismatch in compiled
+                            if mismatch is not _never]
+
     def _build_regex_dict(self, regex_list):
         if regex_list is None:
             return {}
@@ -64,25 +89,100 @@ class NotificationFilter(om.NotificationFilter):
 
         return regex_mapping
 
-    def _check_for_mismatch(self, data, regex):
-        if isinstance(regex, dict):
-            mismatch_results = [
-                k not in data or not self._check_for_mismatch(data[k], v)
-                for k, v in regex.items()
-            ]
-            if not mismatch_results:
-                return False
+    def _compile(self, regex):
+        """Compile a filter tree into a mismatch function
 
-            return all(mismatch_results)
+        The returned function tells whether the given data mismatches the
+        filter tree, without having to walk the tree again.
+        """
+        if isinstance(regex, dict):
+            if not regex:
+                return _never
+            checks = [(key, self._compile(value))
+                      for key, value in regex.items()]
+
+            def mismatch(data):
+                # Same as all(k not in data or not mismatch(data[k]), ...)
+                for key, check in checks:
+                    if key in data and check(data[key]):
+                        return False
+                return True
+
+            return mismatch
         elif callable(regex):
             # The filter is a callable that should return True
             # if there is a mismatch
-            return regex(data)
-        elif regex is not None and data is None:
-            return True
-        elif (regex is not None and
-              isinstance(data, six.string_types) and
-              not regex.match(data)):
-            return True
-
-        return False
+            return regex
+        elif regex is None:
+            return _never
+
+        match = regex.match
+
+        def mismatch(data):
+            if data is None:
+                return True
+            return isinstance(data, six.string_types) and not match(data)
+
+        return mismatch
+
+    def match_event_type(self, event_type):
+        """Whether notifications of the given event type may match"""
+        return not self._event_type_mismatch(event_type)
+
+    def match(self, context, publisher_id, event_type, metadata, payload):
+        fields = (context, publisher_id, event_type, metadata, payload)
+        for index, mismatch in self._mismatches:
+            if mismatch(fields[index]):
+                return False
+        return True
+
+
+class NotificationDispatchIndex(object):
+    """Notification endpoint dispatching to the endpoints it indexes
+
+    Handed over to the notification listener in place of the endpoints it
+    indexes, it only evaluates the filters of the endpoints that accept the
+    event type of the incoming notification. These candidate endpoints are
+    looked up once per event type. An endpoint failing to handle a
+    notification does not prevent the next ones from receiving it.
+
+    :param endpoints: the notification endpoints to dispatch to
+    """
+
+    # Maximum number of event types whose candidate endpoints are kept
+    MAX_EVENT_TYPES = 1024
+
+    def __init__(self, endpoints):
+        self.endpoints = list(endpoints)
+        # The filters are read once, as done by the notification listener
+        self._screens = [
+            (getattr(endpoint, 'filter_rule', None), endpoint)
+            for endpoint in self.endpoints if hasattr(endpoint, 'info')]
+        self._candidates = {}
+
+    def get_candidates(self, event_type):
+        """Endpoints (with their filter) that may handle the event type"""
+        candidates = self._candidates.get(event_type)
+        if candidates is None:
+            candidates = tuple(
+                (screen, endpoint) for screen, endpoint in self._screens
+                if not hasattr(screen, 'match_event_type') or
+                screen.match_event_type(event_type))
+            if len(self._candidates) < self.MAX_EVENT_TYPES:
+                self._candidates[event_type] = candidates
+        return candidates
+
+    def info(self, ctxt, publisher_id, event_type, payload, metadata):
+        for screen, endpoint in self.get_candidates(event_type):
+            if screen and not screen.match(
+                    ctxt, publisher_id, event_type, metadata, payload):
+                continue
+            try:
+                result = endpoint.info(
+                    ctxt, publisher_id, event_type, payload, metadata)
+            except Exception as exc:
+                # Do not deprive the other endpoints of the notification
+                LOG.exception(exc)
+                continue
+            if result == om.NotificationResult.REQUEUE:
+                return result
@@ -16,6 +16,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import collections
+import threading
+import time
+
 from oslo_log import log
 from watcher.common import exception
 from watcher.common import nova_helper
@@ -26,6 +30,20 @@ from watcher.decision_engine.model.notification import filtering
 LOG = log.getLogger(__name__)
 
 
+def get_compute_node_fields(compute_node):
+    """Fields of the model compute node built from a Nova hypervisor"""
+    return {
+        'id': compute_node.id,
+        'hostname': compute_node.hypervisor_hostname,
+        'state': compute_node.state,
+        'status': compute_node.status,
+        'memory': compute_node.memory_mb,
+        'vcpus': compute_node.vcpus,
+        'disk': compute_node.free_disk_gb,
+        'disk_capacity': compute_node.local_gb,
+    }
+
+
 class NovaNotification(base.NotificationEndpoint):
 
     def __init__(self, collector):
@@ -38,6 +56,11 @@ class NovaNotification(base.NotificationEndpoint):
             self._nova = nova_helper.NovaHelper()
         return self._nova
 
+    @property
+    def node_resolver(self):
+        """Resolver of the unknown compute nodes, if the collector has one"""
+        return getattr(self.collector, 'node_resolver', None)
+
     def get_or_create_instance(self, instance_uuid, node_uuid=None):
         try:
             if node_uuid:
@@ -47,8 +70,10 @@ class NovaNotification(base.NotificationEndpoint):
                         "instance %(instance)s",
                         dict(node=node_uuid, instance=instance_uuid))
         try:
-            instance = self.cluster_data_model.get_instance_by_uuid(
-                instance_uuid)
+            self.cluster_data_model.get_instance_by_uuid(instance_uuid)
+            # The instance may be shared with the snapshots handed out to
+            # the strategies so we get our own copy of it to update
+            instance = self.cluster_data_model.materialize(instance_uuid)
         except exception.InstanceNotFound:
             # The instance didn't exist yet so we create a new instance object
             LOG.debug("New instance created: %s", instance_uuid)
@@ -134,16 +159,7 @@ class NovaNotification(base.NotificationEndpoint):
         try:
             _node = self.nova.get_compute_node_by_hostname(node_hostname)
             node = element.ComputeNode(
-                id=_node.id,
-                uuid=node_hostname,
-                hostname=_node.hypervisor_hostname,
-                state=_node.state,
-                status=_node.status,
-                memory=_node.memory_mb,
-                vcpus=_node.vcpus,
-                disk=_node.free_disk_gb,
-                disk_capacity=_node.local_gb,
-            )
+                uuid=node_hostname, **get_compute_node_fields(_node))
             return node
         except Exception as exc:
             LOG.exception(exc)
@@ -157,8 +173,13 @@ class NovaNotification(base.NotificationEndpoint):
             LOG.debug("Compute node UUID not provided: skipping")
             return
         try:
-            return self.cluster_data_model.get_node_by_uuid(uuid)
+            self.cluster_data_model.get_node_by_uuid(uuid)
+            return self.cluster_data_model.materialize(uuid)
         except exception.ComputeNodeNotFound:
+            if self.node_resolver is not None:
+                # The node is looked up in the background rather than
+                # blocking the processing of the notifications on Nova
+                return self.node_resolver.add_placeholder(uuid)
             # The node didn't exist yet so we create a new node object
             node = self.create_compute_node(uuid)
             LOG.debug("New compute node created: %s", uuid)
@@ -203,13 +224,178 @@ class NovaNotification(base.NotificationEndpoint):
             LOG.info("Instance %s already deleted", instance.uuid)
 
 
+class ComputeNodeResolver(object):
+    """Background resolver of the compute nodes unknown to the model
+
+    A placeholder, without any capacity and disabled, is added to the model
+    in place of each unknown compute node, which is then queued to be looked
+    up in Nova by a background thread. A node queued several times is looked
+    up once, the nodes queued together are looked up with a single listing
+    of the hypervisors, and successive lookups are spaced by
+    ``node_resolution_interval`` seconds.
+
+    As done when the nodes were looked up synchronously, a node Nova cannot
+    find is removed from the model, its instances being left unmapped. The
+    nodes whose lookup failed, e.g. as Nova could not be reached, are queued
+    again to be looked up after the next interval.
+
+    :param collector: the Nova collector whose model the nodes belong to
+    """
+
+    def __init__(self, collector):
+        self.collector = collector
+        self._nova = None
+        # Hostnames waiting to be looked up, oldest first
+        self._pending = collections.OrderedDict()
+        # Model the placeholder of each unresolved node was added to
+        self._placeholders = {}
+        self._lock = threading.Lock()
+        self._worker = None
+        self._last_lookup_at = 0.0
+        self.lookups = 0
+        self.resolved = 0
+        self.failed = 0
+
+    @property
+    def interval(self):
+        return self.collector.config.get('node_resolution_interval', 1.0)
+
+    @property
+    def nova(self):
+        if self._nova is None:
+            self._nova = nova_helper.NovaHelper(osc=self.collector.osc)
+        return self._nova
+
+    @property
+    def depth(self):
+        """Number of compute nodes waiting to be looked up"""
+        return len(self._pending)
+
+    def add_placeholder(self, hostname):
+        """Add a placeholder of an unknown node to the model and queue it
+
+        :param hostname: the UUID of the node, i.e. its service host name
+        :return: the placeholder node
+        """
+        model = self.collector.cluster_data_model
+        node = element.ComputeNode(
+            id=0, uuid=hostname, hostname=hostname,
+            state=element.ServiceState.OFFLINE.value,
+            status=element.ServiceState.DISABLED.value,
+            memory=0, vcpus=0, disk=0, disk_capacity=0)
+        model.add_node(node)
+        LOG.debug("Placeholder of compute node %s created", hostname)
+
+        with self._lock:
+            self._placeholders[hostname] = model
+            self._pending[hostname] = None
+            if self._worker is None:
+                self._start_worker()
+        return node
+
+    def _start_worker(self):
+        self._worker = threading.Thread(target=self._run)
+        self._worker.daemon = True
+        self._worker.start()
+
+    def _run(self):
+        while True:
+            with self._lock:
+                if not self._pending:
+                    self._worker = None
+                    return
+                delay = self._last_lookup_at + self.interval - time.time()
+            if delay > 0:
+                time.sleep(delay)
+            try:
+                self.resolve_pending()
+            except Exception as exc:
+                LOG.exception(exc)
+
+    def _lookup(self, hostnames):
+        """Look the given nodes up in Nova
+
+        :return: the Nova hypervisors found, by hostname
+        """
+        self.lookups += 1
+        if len(hostnames) == 1:
+            try:
+                return {hostnames[0]: self.nova.get_compute_node_by_hostname(
+                    hostnames[0])}
+            except exception.ComputeNodeNotFound:
+                return {}
+
+        compute_nodes = {}
+        for compute_node in self.nova.get_compute_node_list():
+            compute_nodes[compute_node.hypervisor_hostname] = compute_node
+            service = getattr(compute_node, 'service', None) or {}
+            if service.get('host'):
+                compute_nodes.setdefault(service['host'], compute_node)
+        return compute_nodes
+
+    def resolve_pending(self):
+        """Look the queued nodes up and update their placeholders"""
+        with self._lock:
+            hostnames = list(self._pending)
+            self._pending = collections.OrderedDict()
+            self._last_lookup_at = time.time()
+        if not hostnames:
+            return
+
+        try:
+            compute_nodes = self._lookup(hostnames)
+        except Exception as exc:
+            LOG.exception(exc)
+            LOG.warning("Could not look up compute nodes %s: retrying in "
+                        "%s seconds", ', '.join(hostnames), self.interval)
+            with self._lock:
+                # Queued ahead of the nodes added meanwhile
+                pending = collections.OrderedDict.fromkeys(hostnames)
+                pending.update(self._pending)
+                self._pending = pending
+                if self._worker is None:
+                    self._start_worker()
+            return
+
+        model = self.collector.cluster_data_model
+        with model.batch_update():
+            for hostname in hostnames:
+                with self._lock:
+                    placeholder_model = self._placeholders.pop(hostname, None)
+                if placeholder_model is not model:
+                    # The model was synchronized with the cluster meanwhile
+                    continue
+                try:
+                    model.get_node_by_uuid(hostname)
+                except exception.ComputeNodeNotFound:
+                    continue
+
+                compute_node = compute_nodes.get(hostname)
+                if compute_node is None:
+                    LOG.warning("Could not find compute node %s: removing "
+                                "it from the model", hostname)
+                    model.remove_node(model.get_node_by_uuid(hostname))
+                    self.failed += 1
+                else:
+                    node = model.materialize(hostname)
+                    node.update(get_compute_node_fields(compute_node))
+                    LOG.debug("Compute node %s resolved", hostname)
+                    self.resolved += 1
+
+
 class VersionedNotificationEndpoint(NovaNotification):
     publisher_id_regex = r'^nova-compute.*'
 
+    def get_resource_key(self, payload):
+        return ('instance', payload['nova_object.data']['uuid'])
+
 
 class UnversionedNotificationEndpoint(NovaNotification):
     publisher_id_regex = r'^compute.*'
 
+    def get_resource_key(self, payload):
+        return ('instance', payload['instance_id'])
+
 
 class ServiceUpdated(VersionedNotificationEndpoint):
 
@@ -221,6 +407,9 @@ class ServiceUpdated(VersionedNotificationEndpoint):
             event_type='service.update',
         )
 
+    def get_resource_key(self, payload):
+        return ('compute_node', payload['nova_object.data']['host'])
+
     def info(self, ctxt, publisher_id, event_type, payload, metadata):
         ctxt.request_id = metadata['message_id']
         ctxt.project_domain = event_type
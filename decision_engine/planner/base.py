@@ -47,8 +47,12 @@ See :doc:`../architecture` for more details on this component.
 import abc
 import six
 
+from oslo_log import log
+
 from watcher.common.loader import loadable
 
+LOG = log.getLogger(__name__)
+
 
 @six.add_metaclass(abc.ABCMeta)
 class BasePlanner(loadable.Loadable):
@@ -76,3 +80,20 @@ class BasePlanner(loadable.Loadable):
         """
         # example: directed acyclic graph
         raise NotImplementedError()
+
+    def estimate_action_plan(self, action_plan, actions, duration_model):
+        """Set the expected makespan and critical path of an action plan
+
+        The action plan is to be saved by the caller.
+
+        :param action_plan: the :py:class:`~.objects.ActionPlan` to estimate
+        :param actions: the :py:class:`~.objects.Action` of the action plan
+        :param duration_model: the :py:class:`~.ActionDurationModel` giving
+                               the expected duration of the actions
+        """
+        makespan, critical_path = duration_model.get_critical_path(actions)
+        action_plan.expected_makespan = makespan
+        action_plan.critical_path = critical_path
+        LOG.debug("The action plan %(uuid)s is expected to be executed in "
+                  "%(makespan)s seconds",
+                  dict(uuid=action_plan.uuid, makespan=makespan))
@@ -0,0 +1,156 @@
+# -*- encoding: utf-8 -*-
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Estimation of the time it takes to execute an action plan.
+
+The expected duration of each action is given by its type (see
+``[watcher_planner] action_durations``), the migrations taking in addition
+the time to transfer the memory or the disk of their instance, as found in
+the compute model the strategy worked on.
+
+As the actions whose parents have completed are executed in parallel, the
+expected makespan of the action plan is the duration of its critical path,
+i.e. its longest chain of dependent actions.
+"""
+
+import collections
+
+from oslo_config import cfg
+from oslo_log import log
+
+from watcher.applier.actions import base as baction
+from watcher.decision_engine.model import model_root
+
+LOG = log.getLogger(__name__)
+CONF = cfg.CONF
+
+
+class ActionDurationModel(object):
+    """Model of the expected duration of the actions
+
+    :param compute_model: the compute model the actions apply to, if any
+    :type compute_model: :py:class:`~.ModelRoot` instance
+    """
+
+    def __init__(self, compute_model=None):
+        self._instances = {}
+        if isinstance(compute_model, model_root.ModelRoot):
+            self._instances = compute_model.get_all_instances()
+
+    @classmethod
+    def from_solution(cls, solution):
+        """Build the duration model of the actions of a solution
+
+        The compute model the strategy worked on is reused as is. If the
+        strategy did not work on any, the actions are estimated by type
+        rather than building one for the occasion.
+        """
+        return cls(getattr(solution.strategy, '_compute_model', None))
+
+    @property
+    def durations(self):
+        return CONF.watcher_planner.action_durations
+
+    def _get_transfer_size(self, parameters):
+        """Size (in MB) of the data transferred by a migration"""
+        instance = self._instances.get(
+            parameters.get(baction.BaseAction.RESOURCE_ID))
+        if instance is None:
+            return 0
+        if parameters.get('migration_type') == 'cold':
+            return instance.disk * 1024
+        return instance.memory
+
+    def estimate(self, action):
+        """Expected duration (in seconds) of an action
+
+        :param action: the :py:class:`~.objects.Action` to estimate
+        """
+        parameters = action.input_parameters or {}
+        if action.action_type == 'sleep' and 'duration' in parameters:
+            return float(parameters['duration'])
+
+        duration = float(self.durations.get(
+            action.action_type, CONF.watcher_planner.default_action_duration))
+        if action.action_type == 'migrate':
+            duration += (float(self._get_transfer_size(parameters)) /
+                         CONF.watcher_planner.migration_bandwidth)
+        return duration
+
+    def sort_longest_first(self, actions):
+        """Sort actions by descending expected duration
+
+        Among the actions which can be run in parallel, starting the longest
+        ones first shortens the execution of the action plan.
+        """
+        return sorted(actions, key=self.estimate, reverse=True)
+
+    def get_critical_path(self, actions):
+        """Critical path of a set of actions
+
+        :param actions: the :py:class:`~.objects.Action` of an action plan,
+                        linked to each other by their parents
+        :return: the expected makespan (in seconds) of the actions and the
+                 UUIDs of the actions of their critical path, in execution
+                 order
+        """
+        if not actions:
+            return 0.0, []
+
+        by_uuid = collections.OrderedDict(
+            (action.uuid, action) for action in actions)
+        children = collections.defaultdict(list)
+        waiting = {}
+        for uuid, action in by_uuid.items():
+            parents = [parent for parent in action.parents or []
+                       if parent in by_uuid]
+            waiting[uuid] = len(parents)
+            for parent in parents:
+                children[parent].append(uuid)
+
+        # Expected completion time of each action, and its parent completing
+        # last, visiting the actions in topological order
+        completion = {}
+        previous = {}
+        ready = collections.deque(
+            uuid for uuid, count in waiting.items() if not count)
+        while ready:
+            uuid = ready.popleft()
+            start = 0.0
+            parents = [parent for parent in by_uuid[uuid].parents or []
+                       if parent in completion]
+            if parents:
+                previous[uuid] = max(parents, key=completion.get)
+                start = completion[previous[uuid]]
+            completion[uuid] = start + self.estimate(by_uuid[uuid])
+            for child in children[uuid]:
+                waiting[child] -= 1
+                if not waiting[child]:
+                    ready.append(child)
+
+        if len(completion) != len(by_uuid):
+            LOG.warning("The dependencies of the actions are cyclic, their "
+                        "makespan cannot be estimated")
+            return None, []
+
+        uuid = max(completion, key=completion.get)
+        makespan = completion[uuid]
+        critical_path = [uuid]
+        while uuid in previous:
+            uuid = previous[uuid]
+            critical_path.append(uuid)
+        critical_path.reverse()
+        return makespan, critical_path
@@ -0,0 +1,172 @@
+# -*- encoding: utf-8 -*-
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import networkx as nx
+from oslo_config import cfg
+from oslo_log import log
+
+from watcher.applier.actions import base as baction
+from watcher.decision_engine.planner import weight
+
+LOG = log.getLogger(__name__)
+
+
+class ResourceClaims(object):
+    """Accesses of the actions scheduled so far to a resource
+
+    An action either holds the resource exclusively, or shares it with the
+    other actions scheduled since the last exclusive one.
+    """
+
+    def __init__(self):
+        self.exclusive = None
+        self.shared = []
+
+
+class ResourceAwarePlanner(weight.WeightPlanner):
+    """Resource aware planner implementation
+
+    Unlike the weight planner, this planner does not chain the actions layer
+    by layer: an action only depends on the actions scheduled before it (in
+    descending weight order) which work on the same resources, i.e.:
+
+    - the same instance or volume,
+    - the source or destination node of a migration, which is held
+      exclusively while the state of its service or its power state changes.
+
+    The actions holding no resource (such as ``nop`` or ``sleep``) depend on
+    all the actions scheduled before them and the following actions depend on
+    them.
+
+    Independent migrations are thus run as soon as they can, within two caps:
+    the number of migrations running concurrently from or to the same node
+    (``max_host_concurrency``) and between the same two nodes
+    (``max_link_concurrency``).
+    """
+
+    # Action types changing the state of the node given as their resource
+    node_action_types = (
+        'change_nova_service_state',
+        'change_node_power_state',
+        'turn_host_to_acpi_s3_state',
+    )
+
+    migration_action_types = (
+        'migrate',
+    )
+
+    @classmethod
+    def get_config_opts(cls):
+        return [
+            cfg.DictOpt(
+                'weights',
+                help="These weights are used to order the actions. An action "
+                     "only waits for the actions having a higher weight which "
+                     "work on the same resources.",
+                default=cls.action_weights),
+            cfg.IntOpt(
+                'max_host_concurrency',
+                default=2,
+                min=0,
+                help="Maximum number of migrations running concurrently from "
+                     "or to the same node. 0 means unlimited."),
+            cfg.IntOpt(
+                'max_link_concurrency',
+                default=1,
+                min=0,
+                help="Maximum number of migrations running concurrently "
+                     "between the same two nodes. 0 means unlimited."),
+        ]
+
+    def get_claims(self, action):
+        """Resources accessed by an action
+
+        :param action: the :py:class:`~.objects.Action` to schedule
+        :return: list of (resource key, exclusive, concurrency cap) tuples
+        """
+        parameters = action.input_parameters or {}
+        resource_id = parameters.get(baction.BaseAction.RESOURCE_ID)
+        if resource_id is None:
+            return []
+
+        if action.action_type in self.node_action_types:
+            return [(('node', resource_id), True, 0)]
+
+        claims = [(('resource', resource_id), True, 0)]
+        if action.action_type in self.migration_action_types:
+            nodes = [parameters.get(name) for name in
+                     ('source_node', 'destination_node')]
+            nodes = sorted(set(node for node in nodes if node))
+            claims.extend((('node', node), False,
+                           self.config.max_host_concurrency)
+                          for node in nodes)
+            if len(nodes) == 2:
+                claims.append((('link', frozenset(nodes)), False,
+                               self.config.max_link_concurrency))
+        return claims
+
+    def compute_action_graph(self, sorted_weighted_actions):
+        action_graph = nx.DiGraph()
+        # Claims by resource key, and actions scheduled since the last
+        # action holding no resource, which acts as a barrier
+        claims = {}
+        barrier = None
+        since_barrier = []
+
+        for _, actions in sorted_weighted_actions:
+            for action in actions:
+                action_graph.add_node(action)
+                resource_claims = self.get_claims(action)
+
+                if not resource_claims:
+                    parents = [a for a in since_barrier
+                               if not action_graph.out_degree(a)]
+                    if not since_barrier and barrier is not None:
+                        parents = [barrier]
+                    barrier = action
+                    since_barrier = []
+                    claims = {}
+                else:
+                    parents = []
+                    for key, exclusive, cap in resource_claims:
+                        claim = claims.setdefault(key, ResourceClaims())
+                        if exclusive:
+                            parents.extend(claim.shared or
+                                           [claim.exclusive])
+                            claim.exclusive = action
+                            claim.shared = []
+                        else:
+                            parents.append(claim.exclusive)
+                            if cap and len(claim.shared) >= cap:
+                                # The actions sharing the resource are run
+                                # in at most ``cap`` lanes
+                                parents.append(claim.shared[-cap])
+                            claim.shared.append(action)
+                    if all(parent is None for parent in parents):
+                        # Otherwise, the parents depend on the barrier
+                        parents.append(barrier)
+                    since_barrier.append(action)
+
+                for parent in parents:
+                    if (parent is None or parent is action or
+                            action_graph.has_edge(parent, action)):
+                        continue
+                    action_graph.add_edge(parent, action)
+                    action.parents.append(parent.uuid)
+
+        LOG.debug("Scheduled %(actions)d actions with %(edges)d "
+                  "dependencies", dict(actions=action_graph.number_of_nodes(),
+                                       edges=action_graph.number_of_edges()))
+        return action_graph
@@ -23,6 +23,7 @@ from oslo_log import log
 
 from watcher.common import utils
 from watcher.decision_engine.planner import base
+from watcher.decision_engine.planner import duration
 from watcher import objects
 
 LOG = log.getLogger(__name__)
@@ -144,8 +145,9 @@ class WeightPlanner(base.BasePlanner):
         LOG.debug('Creating an action plan for the audit uuid: %s', audit_id)
         action_plan = self.create_action_plan(context, audit_id, solution)
 
+        duration_model = duration.ActionDurationModel.from_solution(solution)
         sorted_weighted_actions = self.get_sorted_actions_by_weight(
-            context, action_plan, solution)
+            context, action_plan, solution, duration_model)
         action_graph = self.compute_action_graph(sorted_weighted_actions)
 
         self._create_efficacy_indicators(
@@ -154,12 +156,16 @@ class WeightPlanner(base.BasePlanner):
         if len(action_graph.nodes()) == 0:
             LOG.warning("The action plan is empty")
             action_plan.state = objects.action_plan.State.SUCCEEDED
-            action_plan.save()
+
+        self.estimate_action_plan(
+            action_plan, list(action_graph.nodes()), duration_model)
+        action_plan.save()
 
         self.create_scheduled_actions(action_graph)
         return action_plan
 
-    def get_sorted_actions_by_weight(self, context, action_plan, solution):
+    def get_sorted_actions_by_weight(self, context, action_plan, solution,
+                                     duration_model=None):
         # We need to make them immutable to add them to the graph
         action_objects = list([
             objects.Action(
@@ -173,17 +179,27 @@ class WeightPlanner(base.BasePlanner):
             action_weight = self.config.weights[action.action_type]
             weighted_actions[action_weight].append(action)
 
+        # The actions of a same weight are scheduled longest first
+        if duration_model is None:
+            duration_model = duration.ActionDurationModel.from_solution(
+                solution)
+        for action_weight, actions in weighted_actions.items():
+            weighted_actions[action_weight] = (
+                duration_model.sort_longest_first(actions))
+
         return reversed(sorted(weighted_actions.items(), key=lambda x: x[0]))
 
     def create_scheduled_actions(self, graph):
-        for action in graph.nodes():
-            LOG.debug("Creating the %s in the Watcher database",
-                      action.action_type)
-            try:
-                action.create()
-            except Exception as exc:
-                LOG.exception(exc)
-                raise
+        actions = list(graph.nodes())
+        if not actions:
+            return
+        LOG.debug("Creating %d actions in the Watcher database",
+                  len(actions))
+        try:
+            objects.Action.create_all(actions[0].obj_context, actions)
+        except Exception as exc:
+            LOG.exception(exc)
+            raise
 
     def create_action_plan(self, context, audit_id, solution):
         strategy = objects.Strategy.get_by_name(
@@ -213,9 +229,7 @@ class WeightPlanner(base.BasePlanner):
                 'value': indicator.value,
                 'action_plan_id': action_plan_id,
             }
-            new_efficacy_indicator = objects.EfficacyIndicator(
-                context, **efficacy_indicator_dict)
-            new_efficacy_indicator.create()
-
-            efficacy_indicators.append(new_efficacy_indicator)
-        return efficacy_indicators
+            efficacy_indicators.append(objects.EfficacyIndicator(
+                context, **efficacy_indicator_dict))
+        return objects.EfficacyIndicator.create_all(
+            context, efficacy_indicators)
@@ -15,6 +15,7 @@
 #
 
 import abc
+import collections
 
 from oslo_config import cfg
 from oslo_log import log
@@ -24,6 +25,7 @@ from watcher.common import exception
 from watcher.common import nova_helper
 from watcher.common import utils
 from watcher.decision_engine.planner import base
+from watcher.decision_engine.planner import duration
 from watcher import objects
 
 LOG = log.getLogger(__name__)
@@ -119,6 +121,8 @@ class WorkloadStabilizationPlanner(base.BasePlanner):
             action_plan.save()
         else:
             resource_action_map = {}
+            # NOTE: the actions are created all at once, once scheduled
+            new_actions = collections.OrderedDict()
             scheduled_actions = [x[1] for x in scheduled]
             for action in scheduled_actions:
                 a_type = action['action_type']
@@ -128,12 +132,12 @@ class WorkloadStabilizationPlanner(base.BasePlanner):
                     if not plugin_action:
                         raise exception.UnsupportedActionType(
                             action_type=action.get("action_type"))
-                    db_action = self._create_action(context, action)
+                    new_action = self._make_action(context, action)
                     parents = plugin_action.validate_parents(
                         resource_action_map, action)
                     if parents:
-                        db_action.parents = parents
-                        db_action.save()
+                        new_action.parents = parents
+                    new_actions[new_action.uuid] = new_action
                 # if we have an action that will make host unreachable, we need
                 # to complete all actions (resize and migration type)
                 # related to the host.
@@ -151,9 +155,8 @@ class WorkloadStabilizationPlanner(base.BasePlanner):
                         migrate_actions = [x[0] for x in host_actions
                                            if x[1] == 'migrate']
                         resize_migration_parents = [
-                            x.parents for x in
-                            [objects.Action.get_by_uuid(context, resize_action)
-                             for resize_action in resize_actions]]
+                            new_actions[resize_action].parents or []
+                            for resize_action in resize_actions]
                         # resize_migration_parents should be one level list
                         resize_migration_parents = [
                             parent for sublist in resize_migration_parents
@@ -163,9 +166,14 @@ class WorkloadStabilizationPlanner(base.BasePlanner):
                         action_parents.extend([uuid for uuid in
                                               migrate_actions if uuid not in
                                               resize_migration_parents])
-                    db_action = self._create_action(context, action)
-                    db_action.parents = action_parents
-                    db_action.save()
+                    new_action = self._make_action(context, action)
+                    new_action.parents = action_parents
+                    new_actions[new_action.uuid] = new_action
+            self.estimate_action_plan(
+                action_plan, list(new_actions.values()),
+                duration.ActionDurationModel.from_solution(solution))
+            action_plan.save()
+            self._create_actions(context, list(new_actions.values()))
 
         return action_plan
 
@@ -197,22 +205,19 @@ class WorkloadStabilizationPlanner(base.BasePlanner):
                 'value': indicator.value,
                 'action_plan_id': action_plan_id,
             }
-            new_efficacy_indicator = objects.EfficacyIndicator(
-                context, **efficacy_indicator_dict)
-            new_efficacy_indicator.create()
+            efficacy_indicators.append(objects.EfficacyIndicator(
+                context, **efficacy_indicator_dict))
+        return objects.EfficacyIndicator.create_all(
+            context, efficacy_indicators)
 
-            efficacy_indicators.append(new_efficacy_indicator)
-        return efficacy_indicators
+    def _make_action(self, context, _action):
+        return objects.Action(context, **_action)
 
-    def _create_action(self, context, _action):
+    def _create_actions(self, context, actions):
         try:
-            LOG.debug("Creating the %s in the Watcher database",
-                      _action.get("action_type"))
-
-            new_action = objects.Action(context, **_action)
-            new_action.create()
-
-            return new_action
+            LOG.debug("Creating %d actions in the Watcher database",
+                      len(actions))
+            return objects.Action.create_all(context, actions)
         except Exception as exc:
             LOG.exception(exc)
             raise
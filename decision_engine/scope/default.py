@@ -210,14 +210,23 @@ class DefaultScope(base.BaseScope):
             self, instance_metadata, cluster_model, instances_to_remove):
         metadata_dict = {
             key: val for d in instance_metadata for key, val in d.items()}
-        instances = cluster_model.get_all_instances()
+        if not metadata_dict:
+            return
+        # Only the instances having all the given metadata keys are candidates
+        instances = None
+        for key in metadata_dict:
+            key_instances = cluster_model.get_instances_by_metadata_key(key)
+            if instances is None:
+                instances = key_instances
+            else:
+                instances = {uuid: instance
+                             for uuid, instance in instances.items()
+                             if uuid in key_instances}
         for uuid, instance in instances.items():
             metadata = instance.metadata
-            common_metadata = set(metadata_dict) & set(metadata)
-            if common_metadata and len(common_metadata) == len(metadata_dict):
-                for key, value in metadata_dict.items():
-                    if str(value).lower() == str(metadata.get(key)).lower():
-                        instances_to_remove.add(uuid)
+            for key, value in metadata_dict.items():
+                if str(value).lower() == str(metadata.get(key)).lower():
+                    instances_to_remove.add(uuid)
 
     def get_scoped_model(self, cluster_model):
         """Leave only nodes and instances proposed in the audit scope"""
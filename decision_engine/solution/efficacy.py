@@ -64,6 +64,11 @@ class Efficacy(object):
         self._indicators_mapping = IndicatorsMap()
         self.global_efficacy = None
 
+    @property
+    def indicators_mapping(self):
+        """The values of the efficacy indicators by name"""
+        return self._indicators_mapping
+
     def set_efficacy_indicators(self, **indicators_map):
         """Set the efficacy indicators
 
@@ -13,16 +13,19 @@
 # implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+from oslo_config import cfg
 from oslo_log import log
 
 from watcher.common import clients
 from watcher.common import utils
 from watcher.decision_engine.strategy.context import base
+from watcher.decision_engine.strategy.context import process
 from watcher.decision_engine.strategy.selection import default
 
 from watcher import objects
 
 LOG = log.getLogger(__name__)
+CONF = cfg.CONF
 
 
 class DefaultStrategyContext(base.StrategyContext):
@@ -65,4 +68,7 @@ class DefaultStrategyContext(base.StrategyContext):
             name: value for name, value in audit.parameters.items()
         })
 
+        if (selected_strategy.name in
+                CONF.watcher_decision_engine.process_strategies):
+            return process.StrategyProcessExecutor().execute(selected_strategy)
         return selected_strategy.execute()
@@ -0,0 +1,201 @@
+# -*- encoding: utf-8 -*-
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Execution of the strategies in worker processes.
+
+Within the decision engine, the strategies share the interpreter (and its
+GIL) with the RPC and notification handling, which CPU-bound strategies
+starve. The strategies listed in ``[watcher_decision_engine]
+process_strategies`` are therefore each executed in a worker process started
+for the occasion.
+
+The worker processes are started with the ``forkserver`` method, or the
+``spawn`` one where it is not available, rather than forked from the decision
+engine, whose threads may hold locks at the time of the fork. Being started
+afresh, they load the configuration files and directory of the decision
+engine. A worker still running after ``[watcher_decision_engine]
+strategy_process_timeout`` seconds is terminated.
+
+The scoped compute and storage models the strategy works on are handed over to
+the worker in the msgpack format, so that the worker does not touch the model
+objects of the decision engine. Only the actions and the efficacy indicators
+of the solution are sent back, the solution being then completed in the
+decision engine.
+
+.. note::
+
+    The worker processes are not pooled as the pools of the standard
+    library deadlock once eventlet has monkey patched the threads. The
+    decision engine waits for the results of the workers with ``select``,
+    which eventlet makes cooperative.
+"""
+
+import multiprocessing
+import select
+import threading
+
+from oslo_config import cfg
+from oslo_log import log
+import six
+
+from watcher._i18n import _
+from watcher.common import exception
+from watcher.common import service
+from watcher.decision_engine.loading import default as loading
+from watcher.decision_engine.model import model_root
+
+LOG = log.getLogger(__name__)
+CONF = cfg.CONF
+
+
+def execute_strategy(strategy_name, input_parameters, audit_scope,
+                     compute_model, storage_model=None):
+    """Execute a strategy, within a worker process
+
+    :param strategy_name: the name of the strategy to execute
+    :param input_parameters: the input parameters of the strategy
+    :param audit_scope: the scope of the audit
+    :param compute_model: the scoped compute model, in the msgpack format
+    :param storage_model: the scoped storage model, in the msgpack format,
+                          or None if the decision engine has none
+    :return: the actions of the solution and the values of its efficacy
+             indicators by name
+    """
+    strategy = loading.DefaultStrategyLoader().load(strategy_name)
+    strategy.audit_scope = audit_scope
+    strategy.input_parameters.update(input_parameters)
+    strategy.compute_model = model_root.ModelRoot.from_msgpack(compute_model)
+    if storage_model is not None:
+        strategy.storage_model = model_root.StorageModelRoot.from_msgpack(
+            storage_model)
+
+    solution = strategy.execute()
+    return solution.actions, dict(solution.efficacy.indicators_mapping)
+
+
+def _get_context():
+    """Multiprocessing context the worker processes are started with"""
+    if not hasattr(multiprocessing, 'get_context'):
+        # Python 2 can only fork the worker processes
+        return multiprocessing
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('forkserver')
+    return multiprocessing.get_context('spawn')
+
+
+def _get_config_args():
+    """Command line arguments loading the configuration of the service"""
+    args = []
+    for config_file in CONF.config_file or []:
+        args.extend(['--config-file', config_file])
+    if CONF.config_dir:
+        args.extend(['--config-dir', CONF.config_dir])
+    return args
+
+
+def _get_storage_model(strategy):
+    """Scoped storage model of a strategy, in the msgpack format"""
+    try:
+        return strategy.storage_model.to_msgpack()
+    except Exception as exc:
+        # The strategy may not work on the storage model: should it do, it
+        # fails in the worker process as it would in the decision engine
+        LOG.debug("No storage model to hand over to the worker process of "
+                  "strategy %(strategy)s: %(error)s",
+                  dict(strategy=strategy.name, error=exc))
+        return None
+
+
+def _run_worker(connection, config_args, *args):
+    """Entry point of the worker processes"""
+    try:
+        # The configuration files listed explicitly replace the default ones
+        CONF(config_args, project='python-watcher', default_config_files=[])
+        result = (True, execute_strategy(*args))
+    except Exception as exc:
+        LOG.exception(exc)
+        result = (False, six.text_type(exc))
+    connection.send(result)
+    connection.close()
+
+
+@six.add_metaclass(service.Singleton)
+class StrategyProcessExecutor(object):
+    """Executor of the strategies in worker processes"""
+
+    def __init__(self):
+        self._slots = threading.BoundedSemaphore(self.max_processes)
+        self.executed = 0
+
+    @property
+    def max_processes(self):
+        """Maximum number of worker processes running concurrently"""
+        return (CONF.watcher_decision_engine.strategy_processes or
+                multiprocessing.cpu_count())
+
+    def execute(self, strategy):
+        """Execute a strategy in a worker process
+
+        :param strategy: the strategy to execute, in the decision engine
+        :type strategy: :py:class:`~.BaseStrategy` instance
+        :return: the solution of the strategy
+        :rtype: :py:class:`~.BaseSolution` instance
+        """
+        # The scoped models are built here as they come from the collectors
+        compute_model = strategy.compute_model.to_msgpack()
+        storage_model = _get_storage_model(strategy)
+
+        timeout = CONF.watcher_decision_engine.strategy_process_timeout
+        context = _get_context()
+        with self._slots:
+            LOG.debug("Executing strategy %s in a worker process",
+                      strategy.name)
+            reader, writer = context.Pipe(duplex=False)
+            worker = context.Process(
+                target=_run_worker,
+                args=(writer, _get_config_args(), strategy.name,
+                      dict(strategy.input_parameters), strategy.audit_scope,
+                      compute_model, storage_model))
+            worker.daemon = True
+            worker.start()
+            writer.close()
+            try:
+                if select.select([reader], [], [], timeout or None)[0]:
+                    succeeded, result = reader.recv()
+                else:
+                    LOG.warning("Terminating the worker process of strategy "
+                                "%s after %d seconds", strategy.name, timeout)
+                    worker.terminate()
+                    succeeded, result = False, _(
+                        "The worker process timed out")
+            except EOFError:
+                succeeded, result = False, _("The worker process died")
+            finally:
+                reader.close()
+                worker.join()
+            self.executed += 1
+
+        if not succeeded:
+            raise exception.WatcherException(
+                _("Strategy %(strategy)s failed in its worker process: "
+                  "%(error)s") % dict(strategy=strategy.name, error=result))
+
+        actions, indicators = result
+        solution = strategy.solution
+        solution.actions.extend(actions)
+        solution.set_efficacy_indicators(**indicators)
+        solution.compute_global_efficacy()
+        return solution
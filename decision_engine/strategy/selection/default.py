@@ -39,6 +39,29 @@ class DefaultStrategySelector(base.BaseSelector):
         self.osc = osc
         self.strategy_loader = default.DefaultStrategyLoader()
 
+    def get_strategy_name(self):
+        """Name of the strategy to select
+
+        :raises: :py:class:`~.NoAvailableStrategyForGoal` if no strategy
+                 achieves the goal
+        :returns: the name of the strategy
+        """
+        if self.strategy_name:
+            return self.strategy_name
+
+        available_strategies = self.strategy_loader.list_available()
+        available_strategies_for_goal = list(
+            key for key, strat in available_strategies.items()
+            if strat.get_goal_name() == self.goal_name)
+
+        if not available_strategies_for_goal:
+            raise exception.NoAvailableStrategyForGoal(goal=self.goal_name)
+
+        # TODO(v-francoise): We should do some more work here to select
+        # a strategy out of a given goal instead of just choosing the
+        # 1st one
+        return available_strategies_for_goal[0]
+
     def select(self):
         """Selects a strategy
 
@@ -47,22 +70,7 @@ class DefaultStrategySelector(base.BaseSelector):
         """
         strategy_to_load = None
         try:
-            if self.strategy_name:
-                strategy_to_load = self.strategy_name
-            else:
-                available_strategies = self.strategy_loader.list_available()
-                available_strategies_for_goal = list(
-                    key for key, strat in available_strategies.items()
-                    if strat.get_goal_name() == self.goal_name)
-
-                if not available_strategies_for_goal:
-                    raise exception.NoAvailableStrategyForGoal(
-                        goal=self.goal_name)
-
-                # TODO(v-francoise): We should do some more work here to select
-                # a strategy out of a given goal instead of just choosing the
-                # 1st one
-                strategy_to_load = available_strategies_for_goal[0]
+            strategy_to_load = self.get_strategy_name()
             return self.strategy_loader.load(strategy_to_load, osc=self.osc)
         except exception.NoAvailableStrategyForGoal:
             raise
@@ -46,6 +46,7 @@ from watcher.common import context
 from watcher.common import exception
 from watcher.common.loader import loadable
 from watcher.common import utils
+from watcher.datasource import manager as ds_manager
 from watcher.decision_engine.loading import default as loading
 from watcher.decision_engine.model.collector import manager
 from watcher.decision_engine.scope import default as default_scope
@@ -81,6 +82,7 @@ class BaseStrategy(loadable.Loadable):
         self._solution = default.DefaultSolution(goal=self.goal, strategy=self)
         self._osc = osc
         self._collector_manager = None
+        self._datasource_manager = None
         self._compute_model = None
         self._storage_model = None
         self._input_parameters = utils.Struct()
@@ -172,6 +174,19 @@ class BaseStrategy(loadable.Loadable):
             self._collector_manager = manager.CollectorManager()
         return self._collector_manager
 
+    @property
+    def datasource_manager(self):
+        """Datasource manager querying the metrics of the strategy
+
+        The datasources are taken from the ``datasources`` option of the
+        strategy if it has one, from ``[watcher_datasources]/datasources``
+        otherwise.
+        """
+        if self._datasource_manager is None:
+            self._datasource_manager = ds_manager.DataSourceManager(
+                datasources=self.config.get('datasources'), osc=self.osc)
+        return self._datasource_manager
+
     @property
     def compute_model(self):
         """Cluster data model
@@ -193,6 +208,10 @@ class BaseStrategy(loadable.Loadable):
 
         return self._compute_model
 
+    @compute_model.setter
+    def compute_model(self, model):
+        self._compute_model = model
+
     @property
     def storage_model(self):
         """Cluster data model
@@ -214,6 +233,10 @@ class BaseStrategy(loadable.Loadable):
 
         return self._storage_model
 
+    @storage_model.setter
+    def storage_model(self, model):
+        self._storage_model = model
+
     @classmethod
     def get_schema(cls):
         """Defines a Schema that the input parameters shall comply to
@@ -16,11 +16,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 #
+from oslo_config import cfg
 from oslo_log import log
 
 from watcher._i18n import _
 from watcher.common import exception as wexc
-from watcher.datasource import ceilometer as ceil
 from watcher.decision_engine.strategy.strategies import base
 
 LOG = log.getLogger(__name__)
@@ -29,8 +29,6 @@ LOG = log.getLogger(__name__)
 class NoisyNeighbor(base.NoisyNeighborBaseStrategy):
 
     MIGRATION = "migrate"
-    # The meter to report L3 cache in ceilometer
-    METER_NAME_L3 = "cpu_l3_cache"
     DEFAULT_WATCHER_PRIORITY = 5
 
     def __init__(self, config, osc=None):
@@ -44,18 +42,8 @@ class NoisyNeighbor(base.NoisyNeighborBaseStrategy):
 
         super(NoisyNeighbor, self).__init__(config, osc)
 
-        self.meter_name = self.METER_NAME_L3
-        self._ceilometer = None
-
-    @property
-    def ceilometer(self):
-        if self._ceilometer is None:
-            self._ceilometer = ceil.CeilometerHelper(osc=self.osc)
-        return self._ceilometer
-
-    @ceilometer.setter
-    def ceilometer(self, c):
-        self._ceilometer = c
+        # L3 cache values of the instances, fetched ahead of time
+        self.instance_caches = {}
 
     @classmethod
     def get_name(cls):
@@ -88,19 +76,54 @@ class NoisyNeighbor(base.NoisyNeighborBaseStrategy):
             },
         }
 
+    @classmethod
+    def get_config_opts(cls):
+        return [
+            cfg.ListOpt(
+                "datasources",
+                help="Datasources to use in order to query the needed "
+                     "metrics, in order of preference. Ceilometer comes "
+                     "first as it used to be the only default datasource "
+                     "of this strategy.",
+                default=["ceilometer", "gnocchi", "monasca"],
+                deprecated_name="datasource")
+        ]
+
+    def fetch_current_and_previous_caches(self, instances):
+        """Fetch the L3 cache values of several instances at once"""
+        resource_ids = [instance.uuid for instance in instances]
+        current_caches, double_period_caches = [
+            self.datasource_manager.statistic_aggregation_bulk(
+                resource_ids=resource_ids,
+                metrics=['instance_l3_cache_usage'],
+                period=period, aggregate='mean')
+            for period in (self.period, 2 * self.period)]
+        for instance in instances:
+            current_cache = current_caches[instance.uuid].get(
+                'instance_l3_cache_usage')
+            double_period_cache = double_period_caches[instance.uuid].get(
+                'instance_l3_cache_usage')
+            # Instances without values are queried again one by one
+            if None not in (current_cache, double_period_cache):
+                self.instance_caches[instance.uuid] = (
+                    current_cache, 2 * double_period_cache - current_cache)
+
     def get_current_and_previous_cache(self, instance):
 
+        if instance.uuid in self.instance_caches:
+            return self.instance_caches[instance.uuid]
+
         try:
-            current_cache = self.ceilometer.statistic_aggregation(
+            current_cache = self.datasource_manager.statistic_aggregation(
                 resource_id=instance.uuid,
-                meter_name=self.meter_name, period=self.period,
-                aggregate='avg')
+                metric='instance_l3_cache_usage', period=self.period,
+                aggregate='mean')
 
             previous_cache = 2 * (
-                self.ceilometer.statistic_aggregation(
+                self.datasource_manager.statistic_aggregation(
                     resource_id=instance.uuid,
-                    meter_name=self.meter_name,
-                    period=2*self.period, aggregate='avg')) - current_cache
+                    metric='instance_l3_cache_usage',
+                    period=2*self.period, aggregate='mean')) - current_cache
 
         except Exception as exc:
             LOG.exception(exc)
@@ -114,7 +137,7 @@ class NoisyNeighbor(base.NoisyNeighborBaseStrategy):
             self.get_current_and_previous_cache(instance)
 
         if None in (current_cache, previous_cache):
-            LOG.warning("Ceilometer unable to pick L3 Cache "
+            LOG.warning("Datasource unable to pick L3 Cache "
                         "values. Skipping the instance")
             return None
 
@@ -130,7 +153,7 @@ class NoisyNeighbor(base.NoisyNeighborBaseStrategy):
             self.get_current_and_previous_cache(instance)
 
         if None in (noisy_current_cache, noisy_previous_cache):
-            LOG.warning("Ceilometer unable to pick "
+            LOG.warning("Datasource unable to pick "
                         "L3 Cache. Skipping the instance")
             return None
 
@@ -150,6 +173,15 @@ class NoisyNeighbor(base.NoisyNeighborBaseStrategy):
         hosts_need_release = {}
         hosts_target = []
 
+        # Only the nodes hosting several instances are looked at
+        instances = []
+        for node in nodes.values():
+            instances_of_node = self.compute_model.get_node_instances(node)
+            if len(instances_of_node) > 1:
+                instances.extend(instances_of_node)
+        self.instance_caches = {}
+        self.fetch_current_and_previous_caches(instances)
+
         for node in nodes.values():
             instances_of_node = self.compute_model.get_node_instances(node)
             node_instance_count = len(instances_of_node)
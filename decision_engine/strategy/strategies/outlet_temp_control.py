@@ -28,14 +28,11 @@ Outlet (Exhaust Air) Temperature is one of the important thermal
 telemetries to measure thermal/workload status of server.
 """
 
-import datetime
-
+from oslo_config import cfg
 from oslo_log import log
 
 from watcher._i18n import _
 from watcher.common import exception as wexc
-from watcher.datasource import ceilometer as ceil
-from watcher.datasource import gnocchi as gnoc
 from watcher.decision_engine.model import element
 from watcher.decision_engine.strategy.strategies import base
 
@@ -76,13 +73,6 @@ class OutletTempControl(base.ThermalOptimizationBaseStrategy):
     # The meter to report outlet temperature in ceilometer
     MIGRATION = "migrate"
 
-    METRIC_NAMES = dict(
-        ceilometer=dict(
-            host_outlet_temp='hardware.ipmi.node.outlet_temperature'),
-        gnocchi=dict(
-            host_outlet_temp='hardware.ipmi.node.outlet_temperature'),
-    )
-
     def __init__(self, config, osc=None):
         """Outlet temperature control using live migration
 
@@ -92,8 +82,6 @@ class OutletTempControl(base.ThermalOptimizationBaseStrategy):
         :type osc: :py:class:`~.OpenStackClients` instance, optional
         """
         super(OutletTempControl, self).__init__(config, osc)
-        self._ceilometer = None
-        self._gnocchi = None
 
     @classmethod
     def get_name(cls):
@@ -136,25 +124,18 @@ class OutletTempControl(base.ThermalOptimizationBaseStrategy):
             },
         }
 
-    @property
-    def ceilometer(self):
-        if self._ceilometer is None:
-            self._ceilometer = ceil.CeilometerHelper(osc=self.osc)
-        return self._ceilometer
-
-    @ceilometer.setter
-    def ceilometer(self, c):
-        self._ceilometer = c
-
-    @property
-    def gnocchi(self):
-        if self._gnocchi is None:
-            self._gnocchi = gnoc.GnocchiHelper(osc=self.osc)
-        return self._gnocchi
-
-    @gnocchi.setter
-    def gnocchi(self, g):
-        self._gnocchi = g
+    @classmethod
+    def get_config_opts(cls):
+        return [
+            cfg.ListOpt(
+                "datasources",
+                help="Datasources to use in order to query the needed "
+                     "metrics, in order of preference. Ceilometer comes "
+                     "first as it used to be the only default datasource "
+                     "of this strategy.",
+                default=["ceilometer", "gnocchi", "monasca"],
+                deprecated_name="datasource")
+        ]
 
     @property
     def granularity(self):
@@ -182,31 +163,16 @@ class OutletTempControl(base.ThermalOptimizationBaseStrategy):
 
         hosts_need_release = []
         hosts_target = []
-        metric_name = self.METRIC_NAMES[
-            self.config.datasource]['host_outlet_temp']
+        outlet_temps = self.datasource_manager.statistic_aggregation_bulk(
+            resource_ids=[node.uuid for node in nodes.values()],
+            metrics=['host_outlet_temp'],
+            period=self.period,
+            aggregate='mean',
+            granularity=self.granularity)
         for node in nodes.values():
             resource_id = node.uuid
-            outlet_temp = None
-
-            if self.config.datasource == "ceilometer":
-                outlet_temp = self.ceilometer.statistic_aggregation(
-                    resource_id=resource_id,
-                    meter_name=metric_name,
-                    period=self.period,
-                    aggregate='avg'
-                )
-            elif self.config.datasource == "gnocchi":
-                stop_time = datetime.datetime.utcnow()
-                start_time = stop_time - datetime.timedelta(
-                    seconds=int(self.period))
-                outlet_temp = self.gnocchi.statistic_aggregation(
-                    resource_id=resource_id,
-                    metric=metric_name,
-                    granularity=self.granularity,
-                    start_time=start_time,
-                    stop_time=stop_time,
-                    aggregation='mean'
-                )
+            outlet_temp = outlet_temps[resource_id].get('host_outlet_temp')
+
             # some hosts may not have outlet temp meters, remove from target
             if outlet_temp is None:
                 LOG.warning("%s: no outlet temp data", resource_id)
@@ -42,15 +42,11 @@ airflow is higher than the specified threshold.
 - It assumes that live migrations are possible.
 """
 
-import datetime
-
 from oslo_config import cfg
 from oslo_log import log
 
 from watcher._i18n import _
 from watcher.common import exception as wexc
-from watcher.datasource import ceilometer as ceil
-from watcher.datasource import gnocchi as gnoc
 from watcher.decision_engine.model import element
 from watcher.decision_engine.strategy.strategies import base
 
@@ -86,25 +82,6 @@ class UniformAirflow(base.BaseStrategy):
     # choose 300 seconds as the default duration of meter aggregation
     PERIOD = 300
 
-    METRIC_NAMES = dict(
-        ceilometer=dict(
-            # The meter to report Airflow of physical server in ceilometer
-            host_airflow='hardware.ipmi.node.airflow',
-            # The meter to report inlet temperature of physical server
-            # in ceilometer
-            host_inlet_temp='hardware.ipmi.node.temperature',
-            # The meter to report system power of physical server in ceilometer
-            host_power='hardware.ipmi.node.power'),
-        gnocchi=dict(
-            # The meter to report Airflow of physical server in gnocchi
-            host_airflow='hardware.ipmi.node.airflow',
-            # The meter to report inlet temperature of physical server
-            # in gnocchi
-            host_inlet_temp='hardware.ipmi.node.temperature',
-            # The meter to report system power of physical server in gnocchi
-            host_power='hardware.ipmi.node.power'),
-    )
-
     MIGRATION = "migrate"
 
     def __init__(self, config, osc=None):
@@ -117,36 +94,8 @@ class UniformAirflow(base.BaseStrategy):
         super(UniformAirflow, self).__init__(config, osc)
         # The migration plan will be triggered when the airflow reaches
         # threshold
-        self.meter_name_airflow = self.METRIC_NAMES[
-            self.config.datasource]['host_airflow']
-        self.meter_name_inlet_t = self.METRIC_NAMES[
-            self.config.datasource]['host_inlet_temp']
-        self.meter_name_power = self.METRIC_NAMES[
-            self.config.datasource]['host_power']
-        self._ceilometer = None
-        self._gnocchi = None
         self._period = self.PERIOD
 
-    @property
-    def ceilometer(self):
-        if self._ceilometer is None:
-            self._ceilometer = ceil.CeilometerHelper(osc=self.osc)
-        return self._ceilometer
-
-    @ceilometer.setter
-    def ceilometer(self, c):
-        self._ceilometer = c
-
-    @property
-    def gnocchi(self):
-        if self._gnocchi is None:
-            self._gnocchi = gnoc.GnocchiHelper(osc=self.osc)
-        return self._gnocchi
-
-    @gnocchi.setter
-    def gnocchi(self, g):
-        self._gnocchi = g
-
     @classmethod
     def get_name(cls):
         return "uniform_airflow"
@@ -207,11 +156,14 @@ class UniformAirflow(base.BaseStrategy):
     @classmethod
     def get_config_opts(cls):
         return [
-            cfg.StrOpt(
-                "datasource",
-                help="Data source to use in order to query the needed metrics",
-                default="ceilometer",
-                choices=["ceilometer", "gnocchi"])
+            cfg.ListOpt(
+                "datasources",
+                help="Datasources to use in order to query the needed "
+                     "metrics, in order of preference. Ceilometer comes "
+                     "first as it used to be the only default datasource "
+                     "of this strategy.",
+                default=["ceilometer", "gnocchi", "monasca"],
+                deprecated_name="datasource")
         ]
 
     def calculate_used_resource(self, node):
@@ -238,35 +190,18 @@ class UniformAirflow(base.BaseStrategy):
             source_instances = self.compute_model.get_node_instances(
                 source_node)
             if source_instances:
-                if self.config.datasource == "ceilometer":
-                    inlet_t = self.ceilometer.statistic_aggregation(
-                        resource_id=source_node.uuid,
-                        meter_name=self.meter_name_inlet_t,
-                        period=self._period,
-                        aggregate='avg')
-                    power = self.ceilometer.statistic_aggregation(
-                        resource_id=source_node.uuid,
-                        meter_name=self.meter_name_power,
-                        period=self._period,
-                        aggregate='avg')
-                elif self.config.datasource == "gnocchi":
-                    stop_time = datetime.datetime.utcnow()
-                    start_time = stop_time - datetime.timedelta(
-                        seconds=int(self._period))
-                    inlet_t = self.gnocchi.statistic_aggregation(
-                        resource_id=source_node.uuid,
-                        metric=self.meter_name_inlet_t,
-                        granularity=self.granularity,
-                        start_time=start_time,
-                        stop_time=stop_time,
-                        aggregation='mean')
-                    power = self.gnocchi.statistic_aggregation(
-                        resource_id=source_node.uuid,
-                        metric=self.meter_name_power,
-                        granularity=self.granularity,
-                        start_time=start_time,
-                        stop_time=stop_time,
-                        aggregation='mean')
+                inlet_t = self.datasource_manager.statistic_aggregation(
+                    resource_id=source_node.uuid,
+                    metric='host_inlet_temp',
+                    period=self._period,
+                    aggregate='mean',
+                    granularity=self.granularity)
+                power = self.datasource_manager.statistic_aggregation(
+                    resource_id=source_node.uuid,
+                    metric='host_power',
+                    period=self._period,
+                    aggregate='mean',
+                    granularity=self.granularity)
                 if (power < self.threshold_power and
                         inlet_t < self.threshold_inlet_t):
                     # hardware issue, migrate all instances from this node
@@ -339,28 +274,17 @@ class UniformAirflow(base.BaseStrategy):
             raise wexc.ClusterEmpty()
         overload_hosts = []
         nonoverload_hosts = []
+        airflows = self.datasource_manager.statistic_aggregation_bulk(
+            resource_ids=[node.uuid for node in nodes.values()],
+            metrics=['host_airflow'],
+            period=self._period,
+            aggregate='mean',
+            granularity=self.granularity)
         for node_id in nodes:
-            airflow = None
             node = self.compute_model.get_node_by_uuid(
                 node_id)
             resource_id = node.uuid
-            if self.config.datasource == "ceilometer":
-                airflow = self.ceilometer.statistic_aggregation(
-                    resource_id=resource_id,
-                    meter_name=self.meter_name_airflow,
-                    period=self._period,
-                    aggregate='avg')
-            elif self.config.datasource == "gnocchi":
-                stop_time = datetime.datetime.utcnow()
-                start_time = stop_time - datetime.timedelta(
-                    seconds=int(self._period))
-                airflow = self.gnocchi.statistic_aggregation(
-                    resource_id=resource_id,
-                    metric=self.meter_name_airflow,
-                    granularity=self.granularity,
-                    start_time=start_time,
-                    stop_time=stop_time,
-                    aggregation='mean')
+            airflow = airflows[resource_id].get('host_airflow')
             # some hosts may not have airflow meter, remove from target
             if airflow is None:
                 LOG.warning("%s: no airflow data", resource_id)
@@ -52,16 +52,12 @@ correctly on all compute nodes within the cluster.
 This strategy assumes it is possible to live migrate any VM from
 an active compute node to any other active compute node.
 """
-import datetime
-
 from oslo_config import cfg
 from oslo_log import log
 import six
 
 from watcher._i18n import _
 from watcher.common import exception
-from watcher.datasource import ceilometer as ceil
-from watcher.datasource import gnocchi as gnoc
 from watcher.decision_engine.model import element
 from watcher.decision_engine.strategy.strategies import base
 
@@ -74,26 +70,11 @@ class VMWorkloadConsolidation(base.ServerConsolidationBaseStrategy):
     HOST_CPU_USAGE_METRIC_NAME = 'compute.node.cpu.percent'
     INSTANCE_CPU_USAGE_METRIC_NAME = 'cpu_util'
 
-    METRIC_NAMES = dict(
-        ceilometer=dict(
-            cpu_util_metric='cpu_util',
-            ram_util_metric='memory.usage',
-            ram_alloc_metric='memory',
-            disk_alloc_metric='disk.root.size'),
-        gnocchi=dict(
-            cpu_util_metric='cpu_util',
-            ram_util_metric='memory.usage',
-            ram_alloc_metric='memory',
-            disk_alloc_metric='disk.root.size'),
-    )
-
     MIGRATION = "migrate"
     CHANGE_NOVA_SERVICE_STATE = "change_nova_service_state"
 
     def __init__(self, config, osc=None):
         super(VMWorkloadConsolidation, self).__init__(config, osc)
-        self._ceilometer = None
-        self._gnocchi = None
         self.number_of_migrations = 0
         self.number_of_released_nodes = 0
         # self.ceilometer_instance_data_cache = dict()
@@ -115,26 +96,6 @@ class VMWorkloadConsolidation(base.ServerConsolidationBaseStrategy):
     def period(self):
         return self.input_parameters.get('period', 3600)
 
-    @property
-    def ceilometer(self):
-        if self._ceilometer is None:
-            self._ceilometer = ceil.CeilometerHelper(osc=self.osc)
-        return self._ceilometer
-
-    @ceilometer.setter
-    def ceilometer(self, ceilometer):
-        self._ceilometer = ceilometer
-
-    @property
-    def gnocchi(self):
-        if self._gnocchi is None:
-            self._gnocchi = gnoc.GnocchiHelper(osc=self.osc)
-        return self._gnocchi
-
-    @gnocchi.setter
-    def gnocchi(self, gnocchi):
-        self._gnocchi = gnocchi
-
     @property
     def granularity(self):
         return self.input_parameters.get('granularity', 300)
@@ -162,11 +123,14 @@ class VMWorkloadConsolidation(base.ServerConsolidationBaseStrategy):
     @classmethod
     def get_config_opts(cls):
         return [
-            cfg.StrOpt(
-                "datasource",
-                help="Data source to use in order to query the needed metrics",
-                default="ceilometer",
-                choices=["ceilometer", "gnocchi"])
+            cfg.ListOpt(
+                "datasources",
+                help="Datasources to use in order to query the needed "
+                     "metrics, in order of preference. Ceilometer comes "
+                     "first as it used to be the only default datasource "
+                     "of this strategy.",
+                default=["ceilometer", "gnocchi", "monasca"],
+                deprecated_name="datasource")
         ]
 
     def get_instance_state_str(self, instance):
@@ -286,93 +250,78 @@ class VMWorkloadConsolidation(base.ServerConsolidationBaseStrategy):
         :param aggr: string
         :return: dict(cpu(number of vcpus used), ram(MB used), disk(B used))
         """
-        instance_cpu_util = None
-        instance_ram_util = None
-        instance_disk_util = None
-
-        if instance.uuid in self.datasource_instance_data_cache.keys():
-            return self.datasource_instance_data_cache.get(instance.uuid)
-
-        cpu_util_metric = self.METRIC_NAMES[
-            self.config.datasource]['cpu_util_metric']
-        ram_util_metric = self.METRIC_NAMES[
-            self.config.datasource]['ram_util_metric']
-        ram_alloc_metric = self.METRIC_NAMES[
-            self.config.datasource]['ram_alloc_metric']
-        disk_alloc_metric = self.METRIC_NAMES[
-            self.config.datasource]['disk_alloc_metric']
-
-        if self.config.datasource == "ceilometer":
-            instance_cpu_util = self.ceilometer.statistic_aggregation(
-                resource_id=instance.uuid, meter_name=cpu_util_metric,
-                period=self.period, aggregate='avg')
-            instance_ram_util = self.ceilometer.statistic_aggregation(
-                resource_id=instance.uuid, meter_name=ram_util_metric,
-                period=self.period, aggregate='avg')
-            if not instance_ram_util:
-                instance_ram_util = self.ceilometer.statistic_aggregation(
-                    resource_id=instance.uuid, meter_name=ram_alloc_metric,
-                    period=self.period, aggregate='avg')
-            instance_disk_util = self.ceilometer.statistic_aggregation(
-                resource_id=instance.uuid, meter_name=disk_alloc_metric,
-                period=self.period, aggregate='avg')
-        elif self.config.datasource == "gnocchi":
-            stop_time = datetime.datetime.utcnow()
-            start_time = stop_time - datetime.timedelta(
-                seconds=int(self.period))
-            instance_cpu_util = self.gnocchi.statistic_aggregation(
-                resource_id=instance.uuid,
-                metric=cpu_util_metric,
-                granularity=self.granularity,
-                start_time=start_time,
-                stop_time=stop_time,
-                aggregation='mean'
-            )
-            instance_ram_util = self.gnocchi.statistic_aggregation(
-                resource_id=instance.uuid,
-                metric=ram_util_metric,
-                granularity=self.granularity,
-                start_time=start_time,
-                stop_time=stop_time,
-                aggregation='mean'
-            )
-            if not instance_ram_util:
-                instance_ram_util = self.gnocchi.statistic_aggregation(
-                    resource_id=instance.uuid,
-                    metric=ram_alloc_metric,
-                    granularity=self.granularity,
-                    start_time=start_time,
-                    stop_time=stop_time,
-                    aggregation='mean'
-                )
-            instance_disk_util = self.gnocchi.statistic_aggregation(
-                resource_id=instance.uuid,
-                metric=disk_alloc_metric,
-                granularity=self.granularity,
-                start_time=start_time,
-                stop_time=stop_time,
-                aggregation='mean'
-            )
-        if instance_cpu_util:
-            total_cpu_utilization = (
-                instance.vcpus * (instance_cpu_util / 100.0))
-        else:
-            total_cpu_utilization = instance.vcpus
+        return self.get_instances_utilization([instance])[instance.uuid]
+
+    def get_instances_utilization(self, instances):
+        """Collect cpu, ram and disk utilization statistics of VMs.
 
-        if not instance_ram_util:
-            instance_ram_util = instance.memory
-            LOG.warning('No values returned by %s for memory.usage, '
-                        'use instance flavor ram value', instance.uuid)
+        The statistics of the VMs which are not cached yet are fetched
+        concurrently from the datasource.
+
+        :param instances: list of instance objects
+        :return: dict mapping the uuid of each instance to its utilization
+                 as returned by :py:meth:`get_instance_utilization`
+        """
+        missing = [instance for instance in instances
+                   if instance.uuid not in self.datasource_instance_data_cache]
+        if missing:
+            self._fetch_instances_utilization(missing)
+        return {instance.uuid:
+                self.datasource_instance_data_cache.get(instance.uuid)
+                for instance in instances}
+
+    def _fetch_instances_utilization(self, instances):
+        resource_ids = [instance.uuid for instance in instances]
+        statistics = self.datasource_manager.statistic_aggregation_bulk(
+            resource_ids=resource_ids,
+            metrics=['instance_cpu_usage', 'instance_ram_usage',
+                     'instance_root_disk_size'],
+            period=self.period,
+            aggregate='mean',
+            granularity=self.granularity)
+        # The allocated memory is only needed when the memory usage is
+        # not available
+        no_ram_usage = [
+            resource_id for resource_id in resource_ids
+            if not statistics[resource_id].get('instance_ram_usage')]
+        if no_ram_usage:
+            ram_allocated = self.datasource_manager.statistic_aggregation_bulk(
+                resource_ids=no_ram_usage,
+                metrics=['instance_ram_allocated'],
+                period=self.period,
+                aggregate='mean',
+                granularity=self.granularity)
+            for resource_id, values in ram_allocated.items():
+                statistics[resource_id].update(values)
+
+        for instance in instances:
+            instance_statistics = statistics[instance.uuid]
+            instance_cpu_util = instance_statistics.get('instance_cpu_usage')
+            instance_ram_util = (
+                instance_statistics.get('instance_ram_usage') or
+                instance_statistics.get('instance_ram_allocated'))
+            instance_disk_util = instance_statistics.get(
+                'instance_root_disk_size')
+
+            if instance_cpu_util:
+                total_cpu_utilization = (
+                    instance.vcpus * (instance_cpu_util / 100.0))
+            else:
+                total_cpu_utilization = instance.vcpus
+
+            if not instance_ram_util:
+                instance_ram_util = instance.memory
+                LOG.warning('No values returned by %s for memory.usage, '
+                            'use instance flavor ram value', instance.uuid)
 
-        if not instance_disk_util:
-            instance_disk_util = instance.disk
-            LOG.warning('No values returned by %s for disk.root.size, '
-                        'use instance flavor disk value', instance.uuid)
+            if not instance_disk_util:
+                instance_disk_util = instance.disk
+                LOG.warning('No values returned by %s for disk.root.size, '
+                            'use instance flavor disk value', instance.uuid)
 
-        self.datasource_instance_data_cache[instance.uuid] = dict(
-            cpu=total_cpu_utilization, ram=instance_ram_util,
-            disk=instance_disk_util)
-        return self.datasource_instance_data_cache.get(instance.uuid)
+            self.datasource_instance_data_cache[instance.uuid] = dict(
+                cpu=total_cpu_utilization, ram=instance_ram_util,
+                disk=instance_disk_util)
 
     def get_node_utilization(self, node):
         """Collect cpu, ram and disk utilization statistics of a node.
@@ -385,9 +334,8 @@ class VMWorkloadConsolidation(base.ServerConsolidationBaseStrategy):
         node_ram_util = 0
         node_disk_util = 0
         node_cpu_util = 0
-        for instance in node_instances:
-            instance_util = self.get_instance_utilization(
-                instance)
+        instances_util = self.get_instances_utilization(node_instances)
+        for instance_util in instances_util.values():
             node_cpu_util += instance_util['cpu']
             node_ram_util += instance_util['ram']
             node_disk_util += instance_util['disk']
@@ -425,6 +373,13 @@ class VMWorkloadConsolidation(base.ServerConsolidationBaseStrategy):
         nodes = self.compute_model.get_all_compute_nodes().values()
         rcu = {}
         counters = {}
+        # Fetch the statistics of all the instances at once rather than
+        # node by node
+        self.get_instances_utilization(
+            [instance for node in nodes
+             if self.get_node_status_str(node) ==
+             element.ServiceState.ENABLED.value
+             for instance in self.compute_model.get_node_instances(node)])
         for node in nodes:
             node_status_str = self.get_node_status_str(node)
             if node_status_str == element.ServiceState.ENABLED.value:
@@ -47,15 +47,11 @@ hosts nodes.
 """
 
 from __future__ import division
-import datetime
-
 from oslo_config import cfg
 from oslo_log import log
 
 from watcher._i18n import _
 from watcher.common import exception as wexc
-from watcher.datasource import ceilometer as ceil
-from watcher.datasource import gnocchi as gnoc
 from watcher.decision_engine.model import element
 from watcher.decision_engine.strategy.strategies import base
 
@@ -90,10 +86,6 @@ class WorkloadBalance(base.WorkloadStabilizationBaseStrategy):
        - It assume that live migrations are possible
     """
 
-    # The meter to report CPU utilization % of VM in ceilometer
-    METER_NAME = "cpu_util"
-    # Unit: %, value range is [0 , 100]
-
     MIGRATION = "migrate"
 
     def __init__(self, config, osc=None):
@@ -104,31 +96,6 @@ class WorkloadBalance(base.WorkloadStabilizationBaseStrategy):
         :param osc: :py:class:`~.OpenStackClients` instance
         """
         super(WorkloadBalance, self).__init__(config, osc)
-        # the migration plan will be triggered when the CPU utilization %
-        # reaches threshold
-        self._meter = self.METER_NAME
-        self._ceilometer = None
-        self._gnocchi = None
-
-    @property
-    def ceilometer(self):
-        if self._ceilometer is None:
-            self._ceilometer = ceil.CeilometerHelper(osc=self.osc)
-        return self._ceilometer
-
-    @ceilometer.setter
-    def ceilometer(self, c):
-        self._ceilometer = c
-
-    @property
-    def gnocchi(self):
-        if self._gnocchi is None:
-            self._gnocchi = gnoc.GnocchiHelper(osc=self.osc)
-        return self._gnocchi
-
-    @gnocchi.setter
-    def gnocchi(self, gnocchi):
-        self._gnocchi = gnocchi
 
     @classmethod
     def get_name(cls):
@@ -173,11 +140,14 @@ class WorkloadBalance(base.WorkloadStabilizationBaseStrategy):
     @classmethod
     def get_config_opts(cls):
         return [
-            cfg.StrOpt(
-                "datasource",
-                help="Data source to use in order to query the needed metrics",
-                default="ceilometer",
-                choices=["ceilometer", "gnocchi"])
+            cfg.ListOpt(
+                "datasources",
+                help="Datasources to use in order to query the needed "
+                     "metrics, in order of preference. Ceilometer comes "
+                     "first as it used to be the only default datasource "
+                     "of this strategy.",
+                default=["ceilometer", "gnocchi", "monasca"],
+                deprecated_name="datasource")
         ]
 
     def calculate_used_resource(self, node):
@@ -288,28 +258,15 @@ class WorkloadBalance(base.WorkloadStabilizationBaseStrategy):
             for instance in instances:
                 cpu_util = None
                 try:
-                    if self.config.datasource == "ceilometer":
-                        cpu_util = self.ceilometer.statistic_aggregation(
-                            resource_id=instance.uuid,
-                            meter_name=self._meter,
-                            period=self._period,
-                            aggregate='avg')
-                    elif self.config.datasource == "gnocchi":
-                        stop_time = datetime.datetime.utcnow()
-                        start_time = stop_time - datetime.timedelta(
-                            seconds=int(self._period))
-                        cpu_util = self.gnocchi.statistic_aggregation(
-                            resource_id=instance.uuid,
-                            metric=self._meter,
-                            granularity=self.granularity,
-                            start_time=start_time,
-                            stop_time=stop_time,
-                            aggregation='mean'
-                        )
+                    cpu_util = self.datasource_manager.statistic_aggregation(
+                        resource_id=instance.uuid,
+                        metric='instance_cpu_usage',
+                        period=self._period,
+                        aggregate='mean',
+                        granularity=self.granularity)
                 except Exception as exc:
                     LOG.exception(exc)
-                    LOG.error("Can not get cpu_util from %s",
-                              self.config.datasource)
+                    LOG.error("Can not get cpu_util from the datasources")
                     continue
                 if cpu_util is None:
                     LOG.debug("Instance (%s): cpu_util is None", instance.uuid)
@@ -373,7 +330,7 @@ class WorkloadBalance(base.WorkloadStabilizationBaseStrategy):
         # choose the server with largest cpu_util
         source_nodes = sorted(source_nodes,
                               reverse=True,
-                              key=lambda x: (x[self.METER_NAME]))
+                              key=lambda x: (x["cpu_util"]))
 
         instance_to_migrate = self.choose_instance_to_migrate(
             source_nodes, avg_workload, workload_cache)
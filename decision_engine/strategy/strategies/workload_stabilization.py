@@ -39,6 +39,11 @@ from oslo_config import cfg
 from oslo_log import log
 import oslo_utils
 
+try:
+    import numpy as np
+except ImportError:  # pragma: nocover
+    np = None
+
 from watcher._i18n import _
 from watcher.common import exception
 from watcher.datasource import ceilometer as ceil
@@ -59,6 +64,192 @@ def _set_memoize(conf):
                                                      'cache')
 
 
+class HostLoadEvaluator(object):
+    """Running standard deviations of the normalized host loads
+
+    The sum and the sum of squares of the loads of each metric are kept up
+    to date, so that scoring or applying the migration of an instance,
+    which only changes the loads of two hosts, is done in constant time
+    whatever the number of hosts.
+    """
+
+    def __init__(self, hosts, metrics, host_memory):
+        """Host load evaluator
+
+        :param hosts: loads of the hosts, as returned by
+                      :py:meth:`~.get_hosts_load`
+        :param metrics: metrics to evaluate
+        :param host_memory: memory of each host, used to normalize the
+                            ``memory.resident`` loads
+        """
+        self.metrics = list(metrics)
+        self.count = float(len(hosts))
+        self.vcpus = {host_id: hosts[host_id]['vcpus'] for host_id in hosts}
+        self.scales = {}
+        self.loads = {}
+        self.sums = {}
+        self.square_sums = {}
+        for metric in self.metrics:
+            self.scales[metric] = {
+                host_id: (float(host_memory[host_id])
+                          if metric == 'memory.resident' else 1.0)
+                for host_id in hosts}
+            normalized = {
+                host_id: hosts[host_id][metric] / self.scales[metric][host_id]
+                for host_id in hosts}
+            # Loads are centered on their mean so that computing variances
+            # from the sums of squares does not suffer from cancellation
+            mean = sum(normalized.values()) / self.count
+            self.loads[metric] = {host_id: value - mean
+                                  for host_id, value in normalized.items()}
+            self.sums[metric] = sum(self.loads[metric].values())
+            self.square_sums[metric] = sum(
+                value ** 2 for value in self.loads[metric].values())
+
+    def _get_sd(self, sum_, square_sum):
+        mean = sum_ / self.count
+        return math.sqrt(max(square_sum / self.count - mean ** 2, 0))
+
+    def get_sds(self):
+        """Standard deviation among hosts of each metric"""
+        return [self._get_sd(self.sums[metric], self.square_sums[metric])
+                for metric in self.metrics]
+
+    def _get_migration_loads(self, instance_load, metric, src_host,
+                             dst_host):
+        if metric == 'cpu_util':
+            src_delta = instance_load['cpu_util'] * (
+                instance_load['vcpus'] / float(self.vcpus[src_host]))
+            dst_delta = instance_load['cpu_util'] * (
+                instance_load['vcpus'] / float(self.vcpus[dst_host]))
+        else:
+            src_delta = dst_delta = instance_load[metric]
+        loads = self.loads[metric]
+        scales = self.scales[metric]
+        return (loads[src_host] - src_delta / scales[src_host],
+                loads[dst_host] + dst_delta / scales[dst_host])
+
+    def get_migration_sds(self, instance_load, src_host, dst_host):
+        """Standard deviations if an instance was migrated
+
+        :param instance_load: load of the instance, as returned by
+                              :py:meth:`~.get_instance_load`
+        :param src_host: uuid of the source host
+        :param dst_host: uuid of the destination host
+        :return: list of standard deviation values, one per metric
+        """
+        sds = []
+        for metric in self.metrics:
+            loads = self.loads[metric]
+            new_src, new_dst = self._get_migration_loads(
+                instance_load, metric, src_host, dst_host)
+            sds.append(self._get_sd(
+                self.sums[metric] - loads[src_host] - loads[dst_host] +
+                new_src + new_dst,
+                self.square_sums[metric] - loads[src_host] ** 2 -
+                loads[dst_host] ** 2 + new_src ** 2 + new_dst ** 2))
+        return sds
+
+    def apply_migration(self, instance_load, src_host, dst_host):
+        """Update the loads after the migration of an instance"""
+        for metric in self.metrics:
+            loads = self.loads[metric]
+            new_src, new_dst = self._get_migration_loads(
+                instance_load, metric, src_host, dst_host)
+            self.sums[metric] += (new_src + new_dst -
+                                  loads[src_host] - loads[dst_host])
+            self.square_sums[metric] += (
+                new_src ** 2 + new_dst ** 2 -
+                loads[src_host] ** 2 - loads[dst_host] ** 2)
+            loads[src_host] = new_src
+            loads[dst_host] = new_dst
+
+
+class HostLoadMatrix(object):
+    """Dense matrix of the normalized host loads, one row per metric
+
+    The migration of an instance only changes the loads of its source and
+    destination hosts, so the standard deviations of all the candidate
+    destinations of an instance are derived at once from the sums and the
+    sums of squares of the loads instead of copying the loads of every host
+    for each candidate.
+    """
+
+    def __init__(self, hosts, metrics, host_memory):
+        """Host load matrix
+
+        :param hosts: loads of the hosts, as returned by
+                      :py:meth:`~.WorkloadStabilization.get_hosts_load`
+        :param metrics: metrics of the rows of the matrix
+        :param host_memory: memory of each host, used to normalize the
+                            ``memory.resident`` loads
+        """
+        self.host_ids = list(hosts)
+        self.host_index = {host_id: index
+                           for index, host_id in enumerate(self.host_ids)}
+        self.metrics = list(metrics)
+        self.vcpus = np.array(
+            [hosts[host_id]['vcpus'] for host_id in self.host_ids],
+            dtype=float)
+        self.scales = np.array(
+            [[float(host_memory[host_id]) if metric == 'memory.resident'
+              else 1.0 for host_id in self.host_ids]
+             for metric in self.metrics])
+        loads = np.array(
+            [[hosts[host_id][metric] for host_id in self.host_ids]
+             for metric in self.metrics], dtype=float)
+        normalized = loads / self.scales
+        # Loads are centered on their mean so that computing variances
+        # from the sums of squares does not suffer from cancellation
+        self.centered = normalized - normalized.mean(
+            axis=1)[:, np.newaxis]
+        self.sums = self.centered.sum(axis=1)
+        self.square_sums = (self.centered ** 2).sum(axis=1)
+
+    def get_migration_sds(self, instance_load, src_host, dst_hosts):
+        """Standard deviations after migrating an instance
+
+        :param instance_load: load of the instance, as returned by
+                              :py:meth:`~.get_instance_load`
+        :param src_host: uuid of the source host
+        :param dst_hosts: uuids of the candidate destination hosts
+        :return: list of arrays, one per metric, of the standard deviation
+                 among hosts for each destination
+        """
+        src = self.host_index[src_host]
+        dst = np.array([self.host_index[host_id] for host_id in dst_hosts],
+                       dtype=int)
+        src_deltas = []
+        dst_deltas = []
+        for metric in self.metrics:
+            if metric == 'cpu_util':
+                src_deltas.append(instance_load['cpu_util'] * (
+                    instance_load['vcpus'] / self.vcpus[src]))
+                dst_deltas.append(instance_load['cpu_util'] * (
+                    instance_load['vcpus'] / self.vcpus[dst]))
+            else:
+                src_deltas.append(instance_load[metric])
+                dst_deltas.append(
+                    np.full(len(dst), instance_load[metric], dtype=float))
+        src_deltas = np.array(src_deltas, dtype=float)
+        dst_deltas = np.array(dst_deltas, dtype=float).reshape(
+            len(self.metrics), len(dst))
+
+        old_src = self.centered[:, src]
+        new_src = old_src - src_deltas / self.scales[:, src]
+        old_dst = self.centered[:, dst]
+        new_dst = old_dst + dst_deltas / self.scales[:, dst]
+        sums = ((self.sums - old_src + new_src)[:, np.newaxis] -
+                old_dst + new_dst)
+        square_sums = (
+            (self.square_sums - old_src ** 2 + new_src ** 2)[:, np.newaxis] -
+            old_dst ** 2 + new_dst ** 2)
+        count = float(len(self.host_ids))
+        variances = np.maximum(
+            square_sums / count - (sums / count) ** 2, 0)
+        return list(np.sqrt(variances))
+
+
 class WorkloadStabilization(base.WorkloadStabilizationBaseStrategy):
     """Workload Stabilization control using live migration"""
 
@@ -267,6 +458,10 @@ class WorkloadStabilization(base.WorkloadStabilizationBaseStrategy):
 
         return normalized_hosts
 
+    def get_hosts_memory(self, hosts):
+        return {host_id: self.compute_model.get_node_by_uuid(host_id).memory
+                for host_id in hosts}
+
     def get_available_nodes(self):
         return {node_uuid: node for node_uuid, node in
                 self.compute_model.get_all_compute_nodes().items()
@@ -365,7 +560,7 @@ class WorkloadStabilization(base.WorkloadStabilizationBaseStrategy):
         s_host_vcpus = new_hosts[src_node.uuid]['vcpus']
         d_host_vcpus = new_hosts[dst_node.uuid]['vcpus']
         for metric in self.metrics:
-            if metric is 'cpu_util':
+            if metric == 'cpu_util':
                 new_hosts[src_node.uuid][metric] -= (
                     self.transform_instance_cpu(instance_load, s_host_vcpus))
                 new_hosts[dst_node.uuid][metric] += (
@@ -379,6 +574,35 @@ class WorkloadStabilization(base.WorkloadStabilizationBaseStrategy):
         migration_case.append(new_hosts)
         return migration_case
 
+    def simulate_instance_migrations(self, load_matrix, instance, src_node,
+                                     dst_hosts):
+        """Evaluate all the destinations of an instance at once
+
+        Vectorized equivalent of calling :py:meth:`calculate_migration_case`
+        for each destination: every destination improving on the previous
+        ones is returned, in the order of ``dst_hosts``.
+
+        :param load_matrix: :py:class:`HostLoadMatrix` of the hosts
+        :param instance: the virtual machine
+        :param src_node: the source node
+        :param dst_hosts: uuids of the candidate destination hosts
+        :return: list of migration cases
+        """
+        if not dst_hosts:
+            return []
+        instance_load = self.get_instance_load(instance)
+        weighted_sds = self.calculate_weighted_sd(
+            load_matrix.get_migration_sds(
+                instance_load, src_node.uuid, dst_hosts))
+        # Minimum of the weighted standard deviations of the previous
+        # destinations, starting from the initial value of the search
+        previous_min = np.minimum.accumulate(
+            np.concatenate(([len(self.metrics)], weighted_sds)))[:-1]
+        return [{'host': dst_hosts[index],
+                 'value': float(weighted_sds[index]),
+                 's_host': src_node.uuid, 'instance': instance.uuid}
+                for index in np.flatnonzero(weighted_sds < previous_min)]
+
     def simulate_migrations(self, hosts):
         """Make sorted list of pairs instance:dst_host"""
         def yield_nodes(nodes):
@@ -394,6 +618,12 @@ class WorkloadStabilization(base.WorkloadStabilizationBaseStrategy):
 
         instance_host_map = []
         nodes = list(self.get_available_nodes())
+        host_memory = self.get_hosts_memory(hosts)
+        load_matrix = evaluator = None
+        if np is not None:
+            load_matrix = HostLoadMatrix(hosts, self.metrics, host_memory)
+        else:
+            evaluator = HostLoadEvaluator(hosts, self.metrics, host_memory)
         for src_host in nodes:
             src_node = self.compute_model.get_node_by_uuid(src_host)
             c_nodes = copy.copy(nodes)
@@ -404,16 +634,19 @@ class WorkloadStabilization(base.WorkloadStabilizationBaseStrategy):
                 if instance.state not in [element.InstanceState.ACTIVE.value,
                                           element.InstanceState.PAUSED.value]:
                     continue
+                if load_matrix is not None:
+                    instance_host_map.extend(self.simulate_instance_migrations(
+                        load_matrix, instance, src_node, next(node_list)))
+                    continue
+                instance_load = self.get_instance_load(instance)
                 for dst_host in next(node_list):
-                    dst_node = self.compute_model.get_node_by_uuid(dst_host)
-                    sd_case = self.calculate_migration_case(
-                        hosts, instance, src_node, dst_node)
-
-                    weighted_sd = self.calculate_weighted_sd(sd_case[:-1])
+                    weighted_sd = self.calculate_weighted_sd(
+                        evaluator.get_migration_sds(
+                            instance_load, src_host, dst_host))
 
                     if weighted_sd < min_sd_case['value']:
                         min_sd_case = {
-                            'host': dst_node.uuid, 'value': weighted_sd,
+                            'host': dst_host, 'value': weighted_sd,
                             's_host': src_node.uuid, 'instance': instance.uuid}
                         instance_host_map.append(min_sd_case)
         return sorted(instance_host_map, key=lambda x: x['value'])
@@ -482,6 +715,8 @@ class WorkloadStabilization(base.WorkloadStabilizationBaseStrategy):
         migration = self.check_threshold()
         if migration:
             hosts_load = self.get_hosts_load()
+            evaluator = HostLoadEvaluator(
+                hosts_load, self.metrics, self.get_hosts_memory(hosts_load))
             min_sd = 1
             balanced = False
             for instance_host in migration:
@@ -493,17 +728,19 @@ class WorkloadStabilization(base.WorkloadStabilizationBaseStrategy):
                     instance_host['host'])
                 if instance.disk > dst_node.disk:
                     continue
-                instance_load = self.calculate_migration_case(
-                    hosts_load, instance, src_node, dst_node)
-                weighted_sd = self.calculate_weighted_sd(instance_load[:-1])
+                instance_load = self.get_instance_load(instance)
+                sd_case = evaluator.get_migration_sds(
+                    instance_load, src_node.uuid, dst_node.uuid)
+                weighted_sd = self.calculate_weighted_sd(sd_case)
                 if weighted_sd < min_sd:
                     min_sd = weighted_sd
-                    hosts_load = instance_load[-1]
+                    evaluator.apply_migration(
+                        instance_load, src_node.uuid, dst_node.uuid)
                     self.migrate(instance_host['instance'],
                                  instance_host['s_host'],
                                  instance_host['host'])
 
-                for metric, value in zip(self.metrics, instance_load[:-1]):
+                for metric, value in zip(self.metrics, sd_case):
                     if value < float(self.thresholds[metric]):
                         balanced = True
                         break
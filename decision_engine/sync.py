@@ -19,6 +19,7 @@ import collections
 
 from oslo_log import log
 
+from watcher.applier import rpcapi
 from watcher.common import context
 from watcher.decision_engine.loading import default
 from watcher.decision_engine.scoring import scoring_factory
@@ -65,6 +66,8 @@ class Syncer(object):
         self.stale_audit_templates_map = {}
         self.stale_audits_map = {}
         self.stale_action_plans_map = {}
+        # UUIDs of the stale action plans cancelled while being executed
+        self.cancelled_active_action_plans = set()
 
     @property
     def available_goals(self):
@@ -282,6 +285,19 @@ class Syncer(object):
             LOG.info("Stale action plan '%s' synced and cancelled",
                      stale_action_plan.uuid)
 
+        # NOTE: push the cancellation of the action plans being executed to
+        # the appliers, so that they stop their actions right away
+        if self.cancelled_active_action_plans:
+            applier_client = rpcapi.ApplierAPI()
+            for action_plan_uuid in self.cancelled_active_action_plans:
+                applier_client.cancel_action_plan(self.ctx, action_plan_uuid)
+
+    def _cancel_action_plan(self, action_plan):
+        if action_plan.state in (objects.action_plan.State.PENDING,
+                                 objects.action_plan.State.ONGOING):
+            self.cancelled_active_action_plans.add(action_plan.uuid)
+        action_plan.state = objects.action_plan.State.CANCELLED
+
     def _find_stale_audit_templates_due_to_goal(self):
         for goal_id, synced_goal in self.goal_mapping.items():
             filters = {"goal_id": goal_id}
@@ -355,14 +371,13 @@ class Syncer(object):
             for action_plan in stale_action_plans:
                 if action_plan.id not in self.stale_action_plans_map:
                     action_plan.strategy_id = synced_strategy.id
-                    action_plan.state = objects.action_plan.State.CANCELLED
+                    self._cancel_action_plan(action_plan)
                     self.stale_action_plans_map[action_plan.id] = action_plan
                 else:
                     self.stale_action_plans_map[
                         action_plan.id].strategy_id = synced_strategy.id
-                    self.stale_action_plans_map[
-                        action_plan.id].state = (
-                            objects.action_plan.State.CANCELLED)
+                    self._cancel_action_plan(
+                        self.stale_action_plans_map[action_plan.id])
 
     def _find_stale_action_plans_due_to_audit(self):
         for audit_id, synced_audit in self.stale_audits_map.items():
@@ -374,14 +389,13 @@ class Syncer(object):
             for action_plan in stale_action_plans:
                 if action_plan.id not in self.stale_action_plans_map:
                     action_plan.audit_id = synced_audit.id
-                    action_plan.state = objects.action_plan.State.CANCELLED
+                    self._cancel_action_plan(action_plan)
                     self.stale_action_plans_map[action_plan.id] = action_plan
                 else:
                     self.stale_action_plans_map[
                         action_plan.id].audit_id = synced_audit.id
-                    self.stale_action_plans_map[
-                        action_plan.id].state = (
-                            objects.action_plan.State.CANCELLED)
+                    self._cancel_action_plan(
+                        self.stale_action_plans_map[action_plan.id])
 
     def _soft_delete_removed_goals(self):
         removed_goals = [
@@ -454,12 +468,11 @@ class Syncer(object):
                     "strategy that does not exist",
                     action_plan=action_plan.uuid)
                 if action_plan.id not in self.stale_action_plans_map:
-                    action_plan.state = objects.action_plan.State.CANCELLED
+                    self._cancel_action_plan(action_plan)
                     self.stale_action_plans_map[action_plan.id] = action_plan
                 else:
-                    self.stale_action_plans_map[
-                        action_plan.id].state = (
-                            objects.action_plan.State.CANCELLED)
+                    self._cancel_action_plan(
+                        self.stale_action_plans_map[action_plan.id])
 
     def _soft_delete_removed_scoringengines(self):
         removed_se = [
@@ -138,6 +138,33 @@ class Action(base.WatcherPersistentObject, base.WatcherObject,
 
         notifications.action.send_create(self.obj_context, self)
 
+    @classmethod
+    def create_all(cls, context, actions):
+        """Create several :class:`Action` records in the DB at once.
+
+        :param context: Security context.
+        :param actions: the :class:`Action` objects to create, which are
+                        updated with their records.
+        :returns: a list of :class:`Action` objects.
+        """
+        db_actions = cls.dbapi.create_actions(
+            [action.obj_get_changes() for action in actions])
+
+        # NOTE: the related action plans are loaded once for all their
+        # actions, for the notifications to contain them
+        action_plans = {}
+        for action, db_action in zip(actions, db_actions):
+            cls._from_db_object(action, db_action)
+            action_plan_id = action.action_plan_id
+            if action_plan_id:
+                if action_plan_id not in action_plans:
+                    action_plans[action_plan_id] = objects.ActionPlan.get(
+                        context, action_plan_id)
+                action.action_plan = action_plans[action_plan_id]
+                action.obj_reset_changes()
+            notifications.action.send_create(context, action)
+        return actions
+
     def destroy(self):
         """Delete the Action from the DB"""
         self.dbapi.destroy_action(self.uuid)
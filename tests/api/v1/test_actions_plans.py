@@ -77,6 +77,14 @@ class TestListActionPlan(api_base.FunctionalTest):
               'unit': '%'}],
             response['efficacy_indicators'])
 
+    def test_get_one_with_expected_makespan(self):
+        critical_path = [utils.generate_uuid(), utils.generate_uuid()]
+        action_plan = obj_utils.create_test_action_plan(
+            self.context, expected_makespan=90.0, critical_path=critical_path)
+        response = self.get_json('/action_plans/%s' % action_plan['uuid'])
+        self.assertEqual(90.0, response['expected_makespan'])
+        self.assertEqual(critical_path, response['critical_path'])
+
     def test_get_one_soft_deleted(self):
         action_plan = obj_utils.create_test_action_plan(self.context)
         action_plan.soft_delete()
@@ -449,6 +457,20 @@ class TestPatch(api_base.FunctionalTest):
         applier_mock.assert_called_once_with(mock.ANY,
                                              self.action_plan.uuid)
 
+    @mock.patch.object(aapi.ApplierAPI, 'cancel_action_plan')
+    def test_replace_state_cancelling_ok(self, applier_mock):
+        self.action_plan.state = objects.action_plan.State.ONGOING
+        self.action_plan.save()
+        new_state = objects.action_plan.State.CANCELLING
+        response = self.patch_json(
+            '/action_plans/%s' % self.action_plan.uuid,
+            [{'path': '/state', 'value': new_state,
+              'op': 'replace'}])
+        self.assertEqual('application/json', response.content_type)
+        self.assertEqual(200, response.status_code)
+        applier_mock.assert_called_once_with(mock.ANY,
+                                             self.action_plan.uuid)
+
 
 ALLOWED_TRANSITIONS = [
     {"original_state": objects.action_plan.State.RECOMMENDED,
@@ -538,6 +560,7 @@ class TestPatchStateTransitionOk(api_base.FunctionalTest):
         db_api.BaseConnection, 'update_action_plan',
         mock.Mock(side_effect=lambda ap: ap.save() or ap))
     @mock.patch.object(aapi.ApplierAPI, 'launch_action_plan', mock.Mock())
+    @mock.patch.object(aapi.ApplierAPI, 'cancel_action_plan', mock.Mock())
     def test_replace_state_pending_ok(self):
         action_plan = obj_utils.create_test_action_plan(
             self.context, state=self.original_state)
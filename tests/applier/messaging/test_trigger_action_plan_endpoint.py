@@ -21,6 +21,7 @@
 import mock
 
 from watcher.applier.messaging import trigger
+from watcher.applier.workflow_engine import base as engine_base
 from watcher.common import utils
 from watcher.tests import base
 
@@ -39,3 +40,11 @@ class TestTriggerActionPlan(base.TestCase):
         expected_uuid = self.endpoint.launch_action_plan(self.context,
                                                          action_plan_uuid)
         self.assertEqual(expected_uuid, action_plan_uuid)
+
+    @mock.patch.object(engine_base.ActionPlanWatchers, 'cancel')
+    def test_cancel_action_plan(self, m_cancel):
+        action_plan_uuid = utils.generate_uuid()
+        expected_uuid = self.endpoint.cancel_action_plan(self.context,
+                                                         action_plan_uuid)
+        self.assertEqual(expected_uuid, action_plan_uuid)
+        m_cancel.assert_called_once_with(action_plan_uuid)
@@ -51,6 +51,16 @@ class TestApplierAPI(base.TestCase):
                 'launch_action_plan',
                 action_plan_uuid=action_plan_uuid)
 
+    def test_cancel_action_plan(self):
+        with mock.patch.object(om.RPCClient, 'prepare') as mock_prepare:
+            action_plan_uuid = utils.generate_uuid()
+            self.api.cancel_action_plan(self.context, action_plan_uuid)
+            mock_prepare.assert_called_once_with(fanout=True)
+            mock_prepare.return_value.cast.assert_called_once_with(
+                self.context,
+                'cancel_action_plan',
+                action_plan_uuid=action_plan_uuid)
+
     def test_execute_action_plan_throw_exception(self):
         action_plan_uuid = "uuid"
         self.assertRaises(exception.InvalidUuidOrName,
@@ -149,6 +149,27 @@ class TestDefaultWorkFlowEngine(base.DbTestCase):
         except Exception as exc:
             self.fail(exc)
 
+    @mock.patch.object(objects.ActionPlan, "get_by_id")
+    @mock.patch.object(notifications.action, 'send_execution_notification')
+    @mock.patch.object(notifications.action, 'send_update')
+    def test_execute_reads_action_plan_once(self, mock_send_update,
+                                            mock_execution_notification,
+                                            m_get_actionplan):
+        m_get_actionplan.return_value = obj_utils.get_test_action_plan(
+            self.context, id=0)
+        first_nop = self.create_action("nop", {'message': 'test'})
+        second_nop = self.create_action("nop", {'message': 'second test'})
+        third_nop = self.create_action("nop", {'message': 'third test'},
+                                       parents=[first_nop.uuid])
+        actions = [first_nop, second_nop, third_nop]
+        m_get_actionplan.reset_mock()
+
+        self.engine.execute(actions)
+
+        self.check_actions_state(actions, objects.action.State.SUCCEEDED)
+        m_get_actionplan.assert_called_once_with(self.context, 0)
+        self.assertEqual({}, self.engine._action_plan_watchers)
+
     @mock.patch.object(objects.ActionPlan, "get_by_id")
     @mock.patch.object(notifications.action, 'send_execution_notification')
     @mock.patch.object(notifications.action, 'send_update')
@@ -16,10 +16,16 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 #
+import threading
+
 import eventlet
 import mock
 
+from watcher.applier.workflow_engine import base as engine_base
 from watcher.applier.workflow_engine import default as tflow
+from watcher.common import exception
+from watcher.common import utils
+from watcher import notifications
 from watcher import objects
 from watcher.tests.db import base
 from watcher.tests.objects import utils as obj_utils
@@ -77,3 +83,140 @@ class TestTaskFlowActionContainer(base.DbTestCase):
         mock_eventlet_spawn.return_value = et
         action_container.execute()
         et.kill.assert_called_with()
+
+    def test_execute_with_cancel_pushed(self):
+        action_plan = obj_utils.create_test_action_plan(
+            self.context, audit_id=self.audit.id,
+            strategy_id=self.strategy.id,
+            state=objects.action_plan.State.ONGOING)
+
+        action = obj_utils.create_test_action(
+            self.context, action_plan_id=action_plan.id,
+            state=objects.action.State.ONGOING,
+            action_type='sleep',
+            input_parameters={'duration': 60})
+        action_container = tflow.TaskFlowActionContainer(
+            db_action=action,
+            engine=self.engine)
+
+        eventlet.spawn_after(
+            0.1, engine_base.ActionPlanWatchers().cancel, action_plan.uuid)
+        self.assertRaises(exception.ActionPlanCancelled,
+                          action_container.execute)
+
+    @mock.patch.object(notifications.action, 'send_execution_notification')
+    @mock.patch.object(objects.ActionPlan, 'get_by_id')
+    def test_execute_shares_action_plan_state(self, m_get_action_plan,
+                                              m_send_notification):
+        action_plan = obj_utils.create_test_action_plan(
+            self.context, audit_id=self.audit.id,
+            strategy_id=self.strategy.id,
+            state=objects.action_plan.State.ONGOING)
+        m_get_action_plan.return_value = action_plan
+
+        action_containers = []
+        for uuid in (utils.generate_uuid(), utils.generate_uuid()):
+            action = obj_utils.create_test_action(
+                self.context, action_plan_id=action_plan.id, uuid=uuid,
+                state=objects.action.State.ONGOING,
+                action_type='nop',
+                input_parameters={'message': 'hello World'})
+            action_containers.append(tflow.TaskFlowActionContainer(
+                db_action=action, engine=self.engine))
+        m_get_action_plan.reset_mock()
+
+        for action_container in action_containers:
+            action_container.execute()
+
+        m_get_action_plan.assert_called_once_with(
+            self.context, action_plan.id)
+
+    def test_pre_execute_with_cancel_pushed(self):
+        action_plan = obj_utils.create_test_action_plan(
+            self.context, audit_id=self.audit.id,
+            strategy_id=self.strategy.id,
+            state=objects.action_plan.State.ONGOING)
+
+        action = obj_utils.create_test_action(
+            self.context, action_plan_id=action_plan.id,
+            state=objects.action.State.PENDING,
+            action_type='nop',
+            input_parameters={'message': 'hello World'})
+        action_container = tflow.TaskFlowActionContainer(
+            db_action=action,
+            engine=self.engine)
+        watcher = self.engine.get_action_plan_watcher(action_plan.id)
+        engine_base.ActionPlanWatchers().cancel(action_plan.uuid)
+
+        with mock.patch.object(objects.ActionPlan, 'get_by_id') as m_get:
+            self.assertRaises(exception.ActionPlanCancelled,
+                              action_container.pre_execute)
+            self.assertFalse(m_get.called)
+        self.assertEqual(1, watcher.reads)
+
+    def test_action_plan_state_refreshed_when_stale(self):
+        self.config(action_plan_refresh_interval=10, group='watcher_applier')
+        action_plan = obj_utils.create_test_action_plan(
+            self.context, audit_id=self.audit.id,
+            strategy_id=self.strategy.id,
+            state=objects.action_plan.State.ONGOING)
+        watcher = self.engine.get_action_plan_watcher(action_plan.id)
+
+        action_plan.state = objects.action_plan.State.CANCELLING
+        action_plan.save()
+        watcher.refresh_if_stale()
+        self.assertFalse(watcher.cancelled)
+
+        watcher.refreshed_at -= 10
+        watcher.refresh_if_stale()
+        self.assertTrue(watcher.cancelled)
+        self.assertEqual(2, watcher.reads)
+
+    def test_action_plan_state_read_without_lock(self):
+        action_plan = obj_utils.create_test_action_plan(
+            self.context, audit_id=self.audit.id,
+            strategy_id=self.strategy.id,
+            state=objects.action_plan.State.ONGOING)
+        watcher = self.engine.get_action_plan_watcher(action_plan.id)
+
+        def get_by_id(context, action_plan_id):
+            # The cancellation is pushed while the database is read
+            cancel = threading.Thread(target=watcher.cancel)
+            cancel.start()
+            cancel.join(1)
+            self.assertFalse(cancel.is_alive())
+            return action_plan
+
+        with mock.patch.object(objects.ActionPlan, 'get_by_id',
+                               side_effect=get_by_id):
+            watcher.refresh()
+
+        self.assertTrue(watcher.cancelled)
+        self.assertEqual(2, watcher.reads)
+
+    def test_revert_reads_action_plan_state(self):
+        self.config(action_plan_refresh_interval=10, group='watcher_applier')
+        action_plan = obj_utils.create_test_action_plan(
+            self.context, audit_id=self.audit.id,
+            strategy_id=self.strategy.id,
+            state=objects.action_plan.State.ONGOING)
+        action = obj_utils.create_test_action(
+            self.context, action_plan_id=action_plan.id,
+            state=objects.action.State.PENDING,
+            action_type='nop',
+            input_parameters={'message': 'hello World'})
+        action_container = tflow.TaskFlowActionContainer(
+            db_action=action,
+            engine=self.engine)
+        watcher = self.engine.get_action_plan_watcher(action_plan.id)
+
+        # The cancellation is not pushed to the applier
+        action_plan.state = objects.action_plan.State.CANCELLING
+        action_plan.save()
+
+        with mock.patch.object(action_container, 'do_revert') as m_revert:
+            action_container.revert()
+            self.assertFalse(m_revert.called)
+        self.assertTrue(watcher.cancelled)
+        action = objects.Action.get_by_uuid(self.context, action.uuid)
+        self.assertEqual(objects.action.State.CANCELLED, action.state)
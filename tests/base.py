@@ -27,6 +27,7 @@ import testscenarios
 
 from watcher.common import context as watcher_context
 from watcher.common import service
+from watcher.datasource import cache
 from watcher.objects import base as objects_base
 from watcher.tests import conf_fixture
 from watcher.tests import policy_fixture
@@ -46,6 +47,9 @@ class BaseTestCase(testscenarios.WithScenarios, base.BaseTestCase):
     def setUp(self):
         super(BaseTestCase, self).setUp()
         self.addCleanup(cfg.CONF.reset)
+        # The metric cache is shared process-wide
+        self.addCleanup(service.Singleton._instances.pop,
+                        cache.MetricCache, None)
 
 
 class TestCase(BaseTestCase):
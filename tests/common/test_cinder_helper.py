@@ -13,6 +13,7 @@
 # limitations under the License.
 #
 
+import datetime
 import mock
 import time
 
@@ -107,6 +108,31 @@ class TestCinderHelper(base.TestCase):
         cinder_util.get_volume_type_list()
         cinder_util.cinder.volume_types.list.assert_called_once_with()
 
+    def test_get_volume_list(self, mock_cinder):
+        cinder_util = cinder_helper.CinderHelper()
+
+        cinder_util.get_volume_list()
+
+        cinder_util.cinder.volumes.list.assert_called_once_with(
+            search_opts={'all_tenants': True})
+
+    def test_is_volume_changed_since(self, mock_cinder):
+        since = datetime.datetime(2017, 1, 1, 12)
+        updated = mock.Mock(updated_at='2017-01-01T12:30:00.000000')
+        unchanged = mock.Mock(updated_at='2017-01-01T11:30:00.000000')
+        created = mock.Mock(updated_at=None,
+                            created_at='2017-01-01T12:30:00.000000')
+
+        self.assertTrue(
+            cinder_helper.CinderHelper.is_volume_changed_since(
+                updated, since))
+        self.assertFalse(
+            cinder_helper.CinderHelper.is_volume_changed_since(
+                unchanged, since))
+        self.assertTrue(
+            cinder_helper.CinderHelper.is_volume_changed_since(
+                created, since))
+
     def test_get_volume_type_by_backendname_with_backend_exist(
             self, mock_cinder):
         volume_type1 = self.fake_volume_type()
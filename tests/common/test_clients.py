@@ -10,6 +10,8 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import datetime
+
 from ceilometerclient import client as ceclient
 import ceilometerclient.v2.client as ceclient_v2
 from cinderclient import client as ciclient
@@ -19,6 +21,7 @@ from gnocchiclient import client as gnclient
 from gnocchiclient.v1 import client as gnclient_v1
 from ironicclient import client as irclient
 from ironicclient.v1 import client as irclient_v1
+from keystoneauth1.identity.generic import password as generic_password
 from keystoneauth1 import loading as ka_loading
 import mock
 from monascaclient import client as monclient
@@ -26,20 +29,24 @@ from monascaclient.v2_0 import client as monclient_v2
 from neutronclient.neutron import client as netclient
 from neutronclient.v2_0 import client as netclient_v2
 from novaclient import client as nvclient
+from oslo_utils import timeutils
 
 from watcher.common import clients
 from watcher import conf
+from watcher.conf import clients_auth
 from watcher.tests import base
 
 CONF = conf.CONF
 
 
-class TestClients(base.TestCase):
+class BaseClientsTestCase(base.TestCase):
 
     def _register_watcher_clients_auth_opts(self):
         _AUTH_CONF_GROUP = 'watcher_clients_auth'
         ka_loading.register_auth_conf_options(CONF, _AUTH_CONF_GROUP)
         ka_loading.register_session_conf_options(CONF, _AUTH_CONF_GROUP)
+        CONF.register_opts(clients_auth.CLIENT_POOL_OPTS,
+                           group=_AUTH_CONF_GROUP)
         CONF.set_override('auth_type', 'password', group=_AUTH_CONF_GROUP)
 
         # ka_loading.load_auth_from_conf_options(CONF, _AUTH_CONF_GROUP)
@@ -92,6 +99,9 @@ class TestClients(base.TestCase):
 
         CONF.register_opts = mock_register_opts
 
+
+class TestClients(BaseClientsTestCase):
+
     def test_get_keystone_session(self):
         self._register_watcher_clients_auth_opts()
 
@@ -430,3 +440,57 @@ class TestClients(base.TestCase):
         ironic = osc.ironic()
         ironic_cached = osc.ironic()
         self.assertEqual(ironic, ironic_cached)
+
+
+class TestClientPool(BaseClientsTestCase):
+
+    def test_session_shared(self):
+        self._register_watcher_clients_auth_opts()
+
+        session = clients.OpenStackClients().session
+        self.assertIs(session, clients.OpenStackClients().session)
+        self.assertEqual(1, clients.ClientPool().sessions_created)
+        adapter = session.session.get_adapter('https://server.ip')
+        self.assertEqual(CONF.watcher_clients_auth.connection_pool_size,
+                         adapter._pool_maxsize)
+
+    @mock.patch.object(nvclient, 'Client')
+    @mock.patch.object(clients.OpenStackClients, 'session')
+    def test_clients_shared(self, mock_session, mock_call):
+        nova = clients.OpenStackClients().nova()
+        self.assertIs(nova, clients.OpenStackClients().nova())
+        self.assertEqual(1, mock_call.call_count)
+        self.assertEqual(1, clients.ClientPool().clients_created)
+
+    @mock.patch.object(nvclient, 'Client')
+    @mock.patch.object(clients.OpenStackClients, 'session')
+    def test_reset_clients(self, mock_session, mock_call):
+        mock_call.side_effect = lambda *args, **kwargs: mock.Mock()
+        osc = clients.OpenStackClients()
+        nova = osc.nova()
+        osc.reset_clients()
+
+        self.assertIsNot(nova, osc.nova())
+        self.assertIsNot(nova, clients.OpenStackClients().nova())
+        self.assertEqual(2, mock_call.call_count)
+
+    @mock.patch.object(clients.threading, 'Timer')
+    @mock.patch.object(generic_password.Password, 'get_auth_ref')
+    def test_token_refreshed_before_expiry(self, m_get_auth_ref, m_timer):
+        self._register_watcher_clients_auth_opts()
+        self.config(token_refresh_margin=300, group='watcher_clients_auth')
+        m_get_auth_ref.side_effect = lambda *args, **kwargs: mock.Mock(
+            expires=timeutils.utcnow() + datetime.timedelta(hours=1))
+        pool = clients.ClientPool()
+        session = pool.get_session()
+
+        auth_ref = session.auth.get_access(session)
+        self.assertEqual(1, pool.tokens_created)
+        delay, refresh = m_timer.call_args[0]
+        self.assertAlmostEqual(3300, delay, delta=5)
+        self.assertEqual(pool.refresh_token, refresh)
+
+        refresh()
+        self.assertEqual(2, pool.tokens_created)
+        self.assertIsNot(auth_ref, session.auth.auth_ref)
+        self.assertEqual(2, m_timer.call_count)
@@ -23,6 +23,8 @@ CONF = cfg.CONF
 CONF.import_opt('host', 'watcher.conf.service')
 CONF.import_opt('connection', 'oslo_db.options', group='database')
 CONF.import_opt('sqlite_synchronous', 'oslo_db.options', group='database')
+CONF.import_opt('model_snapshot_dir', 'watcher.conf.decision_engine',
+                group='watcher_decision_engine')
 
 
 class ConfFixture(fixtures.Fixture):
@@ -36,6 +38,8 @@ class ConfFixture(fixtures.Fixture):
 
         self.conf.set_default('connection', "sqlite://", group='database')
         self.conf.set_default('sqlite_synchronous', False, group='database')
+        self.conf.set_default('model_snapshot_dir', '',
+                              group='watcher_decision_engine')
         config.parse_args([], default_config_files=[])
         self.addCleanup(self.conf.reset)
 
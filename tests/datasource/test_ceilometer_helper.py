@@ -59,6 +59,48 @@ class TestCeilometerHelper(base.BaseTestCase):
         )
         self.assertEqual(expected_result, val)
 
+    def test_statistic_aggregation_bulk(self, mock_ceilometer):
+        ceilometer = mock.MagicMock()
+        statistic_1 = mock.MagicMock()
+        statistic_1._info = {'groupby': {'resource_id': 'INSTANCE_1'},
+                             'aggregate': {'avg': 10}}
+        statistic_2 = mock.MagicMock()
+        statistic_2._info = {'groupby': {'resource_id': 'INSTANCE_2'},
+                             'aggregate': {'avg': 20}}
+        statistic_3 = mock.MagicMock()
+        statistic_3._info = {'groupby': {'resource_id': 'INSTANCE_3'},
+                             'aggregate': {'avg': 30}}
+        ceilometer.statistics.list.return_value = [
+            statistic_1, statistic_2, statistic_3]
+        mock_ceilometer.return_value = ceilometer
+        cm = ceilometer_helper.CeilometerHelper()
+        val = cm.statistic_aggregation_bulk(
+            resource_ids=["INSTANCE_1", "INSTANCE_2", "INSTANCE_4"],
+            metrics=["cpu_util"],
+            period="7300"
+        )
+        self.assertEqual({"INSTANCE_1": {"cpu_util": 10},
+                          "INSTANCE_2": {"cpu_util": 20},
+                          "INSTANCE_4": {"cpu_util": None}}, val)
+        self.assertEqual(1, ceilometer.statistics.list.call_count)
+
+    def test_statistic_aggregation_bulk_fallback(self, mock_ceilometer):
+        ceilometer = mock.MagicMock()
+        statistic = mock.MagicMock()
+        statistic[-1]._info = {'aggregate': {'avg': 100}}
+        ceilometer.statistics.list.side_effect = [
+            Exception("groupby not supported"), statistic, statistic]
+        mock_ceilometer.return_value = ceilometer
+        cm = ceilometer_helper.CeilometerHelper()
+        val = cm.statistic_aggregation_bulk(
+            resource_ids=["INSTANCE_1", "INSTANCE_2"],
+            metrics=["cpu_util"],
+            period="7300"
+        )
+        self.assertEqual({"INSTANCE_1": {"cpu_util": 100},
+                          "INSTANCE_2": {"cpu_util": 100}}, val)
+        self.assertEqual(3, ceilometer.statistics.list.call_count)
+
     def test_get_last_sample(self, mock_ceilometer):
         ceilometer = mock.MagicMock()
         statistic = mock.MagicMock()
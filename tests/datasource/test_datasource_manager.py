@@ -0,0 +1,279 @@
+# -*- encoding: utf-8 -*-
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import datetime
+import time
+
+import mock
+from oslo_config import cfg
+
+from watcher.common import exception
+from watcher.datasource import base as datasource_base
+from watcher.datasource import ceilometer
+from watcher.datasource import gnocchi
+from watcher.datasource import manager
+from watcher.datasource import monasca
+from watcher.tests import base
+
+CONF = cfg.CONF
+
+
+class FakeDriver(datasource_base.BaseDriver):
+
+    NAME = 'fake'
+
+    METRIC_MAP = dict(datasource_base.BaseDriver.METRIC_MAP,
+                      host_cpu_usage='fake.cpu')
+
+    def statistic_aggregation(self, resource_id, metric, period,
+                              aggregate='mean', granularity=300):
+        return 42
+
+
+class TestDataSourceManager(base.BaseTestCase):
+
+    def setUp(self):
+        super(TestDataSourceManager, self).setUp()
+        CONF.set_override('max_latency', 10, group='watcher_datasources')
+        CONF.set_override('failover_backoff', 60,
+                          group='watcher_datasources')
+        self.m_osc = mock.Mock()
+        self.backends = {
+            'gnocchi': gnocchi.GnocchiDriver({}, osc=self.m_osc),
+            'ceilometer': ceilometer.CeilometerDriver({}, osc=self.m_osc),
+            'monasca': monasca.MonascaDriver({}, osc=self.m_osc),
+        }
+        for backend in self.backends.values():
+            backend._helper = mock.Mock()
+        p_loader = mock.patch.object(manager.default,
+                                     'DefaultDataSourceLoader')
+        m_loader = p_loader.start()
+        self.addCleanup(p_loader.stop)
+        m_loader.return_value.list_available.return_value = self.backends
+        m_loader.return_value.load.side_effect = (
+            lambda name, osc: self.backends[name])
+
+    def test_get_backends_keeps_order(self):
+        manager_ = manager.DataSourceManager(
+            datasources=['monasca', 'unknown', 'gnocchi'])
+        self.assertEqual(['monasca', 'gnocchi'],
+                         list(manager_.get_backends()))
+        self.assertEqual(['monasca', 'gnocchi'],
+                         list(manager_.metric_map))
+
+    def test_get_backend_by_metric(self):
+        manager_ = manager.DataSourceManager(
+            datasources=['monasca', 'ceilometer'])
+        self.assertIs(self.backends['monasca'],
+                      manager_.get_backend(['host_cpu_usage']))
+        self.assertIs(self.backends['ceilometer'],
+                      manager_.get_backend(['host_cpu_usage',
+                                            'host_airflow']))
+        self.assertRaises(exception.NoSuchMetric, manager_.get_backend,
+                          ['unknown_metric'])
+
+    def test_statistic_aggregation_ceilometer(self):
+        helper = self.backends['ceilometer'].helper
+        helper.statistic_aggregation.return_value = 10.0
+        manager_ = manager.DataSourceManager(datasources=['ceilometer'])
+        self.assertEqual(10.0, manager_.statistic_aggregation(
+            'INSTANCE_0', 'instance_cpu_usage', 600))
+        helper.statistic_aggregation.assert_called_once_with(
+            resource_id='INSTANCE_0', meter_name='cpu_util', period=600,
+            aggregate='avg')
+
+    @mock.patch.object(gnocchi, 'datetime')
+    def test_statistic_aggregation_gnocchi(self, m_datetime):
+        m_datetime.utcnow.return_value = datetime.datetime(2017, 3, 19, 18)
+        helper = self.backends['gnocchi'].helper
+        helper.statistic_aggregation.return_value = 10.0
+        manager_ = manager.DataSourceManager(datasources=['gnocchi'])
+        self.assertEqual(10.0, manager_.statistic_aggregation(
+            'INSTANCE_0', 'instance_cpu_usage', 600, aggregate='max'))
+        helper.statistic_aggregation.assert_called_once_with(
+            resource_id='INSTANCE_0', metric='cpu_util', granularity=300,
+            start_time=datetime.datetime(2017, 3, 19, 17, 50),
+            stop_time=datetime.datetime(2017, 3, 19, 18),
+            aggregation='max')
+
+    def test_statistic_aggregation_monasca(self):
+        helper = self.backends['monasca'].helper
+        helper.statistic_aggregation.return_value = [
+            {'columns': ['timestamp', 'avg'],
+             'statistics': [[None, 10.0], [None, 20.0]]}]
+        helper._average_statistics = monasca.MonascaHelper._average_statistics
+        manager_ = manager.DataSourceManager(datasources=['monasca'])
+        self.assertEqual(15.0, manager_.statistic_aggregation(
+            'NODE_0', 'host_cpu_usage', 600))
+        helper.statistic_aggregation.assert_called_once_with(
+            meter_name='cpu.percent', dimensions={'hostname': 'NODE_0'},
+            period=600, aggregate='avg')
+
+    def test_statistic_aggregation_no_such_metric(self):
+        manager_ = manager.DataSourceManager(datasources=['monasca'])
+        self.assertRaises(
+            exception.NoSuchMetric, manager_.statistic_aggregation,
+            'NODE_0', 'host_airflow', 600)
+
+    def test_failover_on_error(self):
+        gnocchi_helper = self.backends['gnocchi'].helper
+        gnocchi_helper.statistic_aggregation.side_effect = Exception('Boom')
+        ceilometer_helper = self.backends['ceilometer'].helper
+        ceilometer_helper.statistic_aggregation.return_value = 10.0
+        manager_ = manager.DataSourceManager(
+            datasources=['gnocchi', 'ceilometer'])
+
+        self.assertEqual(10.0, manager_.statistic_aggregation(
+            'INSTANCE_0', 'instance_cpu_usage', 600))
+        self.assertTrue(manager_.is_degraded('gnocchi'))
+        self.assertEqual(
+            [self.backends['ceilometer'], self.backends['gnocchi']],
+            manager_.get_backends_for(['instance_cpu_usage']))
+
+        # The failing datasource is only retried after the others
+        self.assertEqual(10.0, manager_.statistic_aggregation(
+            'INSTANCE_0', 'instance_cpu_usage', 600))
+        self.assertEqual(1, gnocchi_helper.statistic_aggregation.call_count)
+
+    def test_failover_on_latency(self):
+        CONF.set_override('max_latency', 0, group='watcher_datasources')
+
+        def slow_statistic_aggregation(**kwargs):
+            time.sleep(0.01)
+            return 10.0
+
+        gnocchi_helper = self.backends['gnocchi'].helper
+        gnocchi_helper.statistic_aggregation.side_effect = (
+            slow_statistic_aggregation)
+        manager_ = manager.DataSourceManager(
+            datasources=['gnocchi', 'ceilometer'])
+
+        self.assertEqual(10.0, manager_.statistic_aggregation(
+            'INSTANCE_0', 'instance_cpu_usage', 600))
+        self.assertGreaterEqual(manager_.get_latency('gnocchi'), 0.01)
+        self.assertTrue(manager_.is_degraded('gnocchi'))
+        self.assertEqual(
+            [self.backends['ceilometer'], self.backends['gnocchi']],
+            manager_.get_backends_for(['instance_cpu_usage']))
+
+    def test_degraded_datasource_is_preferred_after_backoff(self):
+        CONF.set_override('failover_backoff', 0,
+                          group='watcher_datasources')
+        gnocchi_helper = self.backends['gnocchi'].helper
+        gnocchi_helper.statistic_aggregation.side_effect = [
+            Exception('Boom'), 20.0]
+        ceilometer_helper = self.backends['ceilometer'].helper
+        ceilometer_helper.statistic_aggregation.return_value = 10.0
+        manager_ = manager.DataSourceManager(
+            datasources=['gnocchi', 'ceilometer'])
+
+        self.assertEqual(10.0, manager_.statistic_aggregation(
+            'INSTANCE_0', 'instance_cpu_usage', 600))
+        self.assertFalse(manager_.is_degraded('gnocchi'))
+        self.assertEqual(20.0, manager_.statistic_aggregation(
+            'INSTANCE_0', 'instance_cpu_usage', 600))
+
+    def test_all_datasources_failed(self):
+        for name in ('gnocchi', 'ceilometer'):
+            self.backends[name].helper.statistic_aggregation.side_effect = (
+                Exception('Boom'))
+        manager_ = manager.DataSourceManager(
+            datasources=['gnocchi', 'ceilometer'])
+        self.assertRaises(
+            exception.DataSourceNotAvailable,
+            manager_.statistic_aggregation,
+            'INSTANCE_0', 'instance_cpu_usage', 600)
+
+    def test_ceilometer_and_gnocchi_share_metric_map(self):
+        self.assertIs(ceilometer.CeilometerDriver.METRIC_MAP,
+                      gnocchi.GnocchiDriver.METRIC_MAP)
+
+    def test_statistic_aggregation_bulk_ceilometer(self):
+        helper = self.backends['ceilometer'].helper
+        helper.statistic_aggregation_bulk.return_value = {
+            'INSTANCE_0': {'cpu_util': 10.0, 'memory.usage': 512},
+            'INSTANCE_1': {'cpu_util': None, 'memory.usage': 1024}}
+        manager_ = manager.DataSourceManager(datasources=['ceilometer'])
+        result = manager_.statistic_aggregation_bulk(
+            ['INSTANCE_0', 'INSTANCE_1'],
+            ['instance_cpu_usage', 'instance_ram_usage'], 600)
+        self.assertEqual(
+            {'INSTANCE_0': {'instance_cpu_usage': 10.0,
+                            'instance_ram_usage': 512},
+             'INSTANCE_1': {'instance_cpu_usage': None,
+                            'instance_ram_usage': 1024}},
+            result)
+        helper.statistic_aggregation_bulk.assert_called_once_with(
+            resource_ids=['INSTANCE_0', 'INSTANCE_1'],
+            metrics=mock.ANY, period=600, aggregate='avg')
+        self.assertEqual(
+            ['cpu_util', 'memory.usage'],
+            sorted(helper.statistic_aggregation_bulk.call_args[1]['metrics']))
+
+    def test_statistic_aggregation_bulk_monasca(self):
+        helper = self.backends['monasca'].helper
+        helper.statistic_aggregation_bulk.return_value = {
+            'NODE_0': {'cpu.percent': 10.0}}
+        manager_ = manager.DataSourceManager(datasources=['monasca'])
+        self.assertEqual(
+            {'NODE_0': {'host_cpu_usage': 10.0}},
+            manager_.statistic_aggregation_bulk(
+                ['NODE_0'], ['host_cpu_usage'], 600))
+        helper.statistic_aggregation_bulk.assert_called_once_with(
+            resource_ids=['NODE_0'], metrics=['cpu.percent'], period=600,
+            aggregate='avg', dimension='hostname')
+
+    def test_statistic_aggregation_bulk_failover(self):
+        gnocchi_helper = self.backends['gnocchi'].helper
+        gnocchi_helper.statistic_aggregation_bulk.side_effect = (
+            Exception('Boom'))
+        ceilometer_helper = self.backends['ceilometer'].helper
+        ceilometer_helper.statistic_aggregation_bulk.return_value = {
+            'NODE_0': {'hardware.ipmi.node.airflow': 300}}
+        manager_ = manager.DataSourceManager(
+            datasources=['gnocchi', 'ceilometer'])
+
+        self.assertEqual(
+            {'NODE_0': {'host_airflow': 300}},
+            manager_.statistic_aggregation_bulk(
+                ['NODE_0'], ['host_airflow'], 600))
+        self.assertTrue(manager_.is_degraded('gnocchi'))
+
+    def test_statistic_aggregation_bulk_all_datasources_failed(self):
+        for name in ('gnocchi', 'ceilometer'):
+            helper = self.backends[name].helper
+            helper.statistic_aggregation_bulk.side_effect = Exception('Boom')
+        manager_ = manager.DataSourceManager(
+            datasources=['gnocchi', 'ceilometer'])
+        self.assertRaises(
+            exception.DataSourceNotAvailable,
+            manager_.statistic_aggregation_bulk,
+            ['NODE_0'], ['host_airflow'], 600)
+
+    def test_plugin_backend_bulk(self):
+        self.backends['fake'] = FakeDriver({}, osc=self.m_osc)
+        manager_ = manager.DataSourceManager(datasources=['fake'])
+        self.assertEqual(
+            {'NODE_0': {'host_cpu_usage': 42},
+             'NODE_1': {'host_cpu_usage': 42}},
+            manager_.statistic_aggregation_bulk(
+                ['NODE_0', 'NODE_1'], ['host_cpu_usage'], 600))
+
+    def test_plugin_backend(self):
+        self.backends['fake'] = FakeDriver({}, osc=self.m_osc)
+        manager_ = manager.DataSourceManager(datasources=['fake', 'gnocchi'])
+        self.assertEqual(42, manager_.statistic_aggregation(
+            'NODE_0', 'host_cpu_usage', 600))
@@ -66,3 +66,50 @@ class TestGnocchiHelper(base.BaseTestCase):
             start_time="2017-02-02T09:00:00.000000",
             stop_time=timeutils.parse_isotime("2017-02-02T10:00:00.000000"),
             aggregation='mean')
+
+    def test_gnocchi_statistic_aggregation_bulk(self, mock_gnocchi):
+        gnocchi = mock.MagicMock()
+        gnocchi.metric.aggregation.return_value = [
+            {'group': {'original_resource_id': 'INSTANCE_1'},
+             'measures': [["2017-02-02T09:00:00.000000", 360, 1.5],
+                          ["2017-02-02T09:06:00.000000", 360, 5.5]]},
+            {'group': {'original_resource_id': 'INSTANCE_2'},
+             'measures': [["2017-02-02T09:06:00.000000", 360, 7.5]]},
+        ]
+        mock_gnocchi.return_value = gnocchi
+
+        helper = gnocchi_helper.GnocchiHelper()
+        result = helper.statistic_aggregation_bulk(
+            resource_ids=['INSTANCE_1', 'INSTANCE_2', 'INSTANCE_3'],
+            metrics=['cpu_util'],
+            period=3600,
+            aggregate='mean',
+            granularity=360,
+        )
+        self.assertEqual({'INSTANCE_1': {'cpu_util': 5.5},
+                          'INSTANCE_2': {'cpu_util': 7.5},
+                          'INSTANCE_3': {'cpu_util': None}}, result)
+        self.assertEqual(1, gnocchi.metric.aggregation.call_count)
+        self.assertFalse(gnocchi.metric.get_measures.called)
+
+    def test_gnocchi_statistic_aggregation_bulk_fallback(self, mock_gnocchi):
+        gnocchi = mock.MagicMock()
+        gnocchi.metric.aggregation.side_effect = Exception(
+            "aggregates API not available")
+        gnocchi.metric.get_measures.return_value = [
+            ["2017-02-02T09:00:00.000000", 360, 5.5]]
+        mock_gnocchi.return_value = gnocchi
+
+        helper = gnocchi_helper.GnocchiHelper()
+        result = helper.statistic_aggregation_bulk(
+            resource_ids=['16a86790-327a-45f9-bc82-45839f062fdc',
+                          '2d8d6e12-d57a-4e2b-b4bd-5d8c0e1b7b80'],
+            metrics=['cpu_util'],
+            period=3600,
+            granularity=360,
+        )
+        self.assertEqual(
+            {'16a86790-327a-45f9-bc82-45839f062fdc': {'cpu_util': 5.5},
+             '2d8d6e12-d57a-4e2b-b4bd-5d8c0e1b7b80': {'cpu_util': 5.5}},
+            result)
+        self.assertEqual(2, gnocchi.metric.get_measures.call_count)
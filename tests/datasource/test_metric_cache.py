@@ -0,0 +1,142 @@
+# -*- encoding: utf-8 -*-
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import datetime
+import time
+
+import mock
+from oslo_config import cfg
+
+from watcher.datasource import cache
+from watcher.tests import base
+
+CONF = cfg.CONF
+
+
+class TestMetricCache(base.BaseTestCase):
+
+    def setUp(self):
+        super(TestMetricCache, self).setUp()
+        CONF.set_override('metric_cache_ttl', 300, group='watcher_datasources')
+        CONF.set_override('metric_cache_size', 2, group='watcher_datasources')
+        self.cache = cache.MetricCache()
+
+    def test_is_singleton(self):
+        self.assertIs(self.cache, cache.MetricCache())
+
+    def test_make_key_window_bucket(self):
+        stop_time = datetime.datetime(2017, 2, 2, 9, 0, 10)
+        key1 = cache.make_key('gnocchi', 'INSTANCE_1', 'cpu_util', 'mean',
+                              300, period=3600, stop_time=stop_time)
+        key2 = cache.make_key(
+            'gnocchi', 'INSTANCE_1', 'cpu_util', 'mean', 300, period=3600,
+            stop_time=stop_time + datetime.timedelta(seconds=120))
+        key3 = cache.make_key(
+            'gnocchi', 'INSTANCE_1', 'cpu_util', 'mean', 300, period=3600,
+            stop_time=stop_time + datetime.timedelta(seconds=300))
+
+        self.assertEqual(key1, key2)
+        self.assertNotEqual(key1, key3)
+
+    def test_make_key_datasource(self):
+        stop_time = datetime.datetime(2017, 2, 2, 9, 0, 10)
+        key1 = cache.make_key('ceilometer', 'INSTANCE_1', 'cpu_util', 'avg',
+                              period=3600, stop_time=stop_time)
+        key2 = cache.make_key('monasca', 'INSTANCE_1', 'cpu_util', 'avg',
+                              period=3600, stop_time=stop_time)
+
+        self.assertNotEqual(key1, key2)
+
+    def test_get_or_fetch(self):
+        m_fetch = mock.Mock(return_value=5.5)
+
+        self.assertEqual(5.5, self.cache.get_or_fetch('key', m_fetch))
+        self.assertEqual(5.5, self.cache.get_or_fetch('key', m_fetch))
+
+        self.assertEqual(1, m_fetch.call_count)
+        self.assertEqual(1, self.cache.hits)
+        self.assertEqual(1, self.cache.misses)
+
+    def test_none_values_are_not_cached(self):
+        m_fetch = mock.Mock(side_effect=[None, 5.5])
+
+        self.assertIsNone(self.cache.get_or_fetch('key', m_fetch))
+        self.assertEqual(5.5, self.cache.get_or_fetch('key', m_fetch))
+
+        self.assertEqual(2, m_fetch.call_count)
+
+    @mock.patch('time.time')
+    def test_expiry(self, m_time):
+        m_time.return_value = 1000
+        self.cache.set('key', 5.5)
+
+        m_time.return_value = 1300
+        self.assertEqual(5.5, self.cache.get('key'))
+        m_time.return_value = 1301
+        self.assertIsNone(self.cache.get('key'))
+        self.assertEqual(0, len(self.cache))
+
+    def test_lru_eviction(self):
+        self.cache.set('key1', 1)
+        self.cache.set('key2', 2)
+        # key1 becomes the most recently used entry
+        self.cache.get('key1')
+        self.cache.set('key3', 3)
+
+        self.assertEqual(1, self.cache.get('key1'))
+        self.assertIsNone(self.cache.get('key2'))
+        self.assertEqual(3, self.cache.get('key3'))
+        self.assertEqual(1, self.cache.evictions)
+
+    def test_get_or_fetch_many(self):
+        self.cache.set('key1', 1)
+        m_fetch_many = mock.Mock(return_value={'INSTANCE_2': 2})
+
+        result = self.cache.get_or_fetch_many(
+            {'INSTANCE_1': 'key1', 'INSTANCE_2': 'key2'}, m_fetch_many)
+
+        self.assertEqual({'INSTANCE_1': 1, 'INSTANCE_2': 2}, result)
+        m_fetch_many.assert_called_once_with(['INSTANCE_2'])
+        self.assertEqual(2, self.cache.get('key2'))
+
+    def test_get_or_fetch_many_failed_values_not_cached(self):
+        m_fetch_many = mock.Mock(return_value={'INSTANCE_1': 1})
+
+        result = self.cache.get_or_fetch_many(
+            {'INSTANCE_1': 'key1', 'INSTANCE_2': 'key2'}, m_fetch_many)
+
+        self.assertEqual({'INSTANCE_1': 1, 'INSTANCE_2': None}, result)
+        self.assertEqual(1, len(self.cache))
+        self.cache.get_or_fetch_many({'INSTANCE_2': 'key2'}, m_fetch_many)
+        m_fetch_many.assert_called_with(['INSTANCE_2'])
+
+    def test_ttl_read_on_lookup(self):
+        self.cache.set('key', 1)
+        self.assertEqual(1, self.cache.get('key'))
+
+        CONF.set_override('metric_cache_ttl', 60, group='watcher_datasources')
+        with mock.patch.object(cache.time, 'time',
+                               return_value=time.time() + 120):
+            self.assertIsNone(self.cache.get('key'))
+
+    def test_disabled(self):
+        CONF.set_override('metric_cache_ttl', 0, group='watcher_datasources')
+        m_fetch = mock.Mock(return_value=5.5)
+
+        self.cache.get_or_fetch('key', m_fetch)
+        self.cache.get_or_fetch('key', m_fetch)
+
+        self.assertEqual(2, m_fetch.call_count)
+        self.assertEqual(0, len(self.cache))
@@ -0,0 +1,160 @@
+# -*- encoding: utf-8 -*-
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import threading
+import time
+
+import mock
+from oslo_config import cfg
+
+from watcher.datasource import base as datasource_base
+from watcher.datasource import fetcher
+from watcher.tests import base
+
+CONF = cfg.CONF
+
+
+class TestMetricFetcher(base.BaseTestCase):
+
+    def setUp(self):
+        super(TestMetricFetcher, self).setUp()
+        CONF.set_override('max_concurrency', {'gnocchi': 2},
+                          group='watcher_datasources')
+        CONF.set_override('default_max_concurrency', 3,
+                          group='watcher_datasources')
+        CONF.set_override('request_timeout', 0, group='watcher_datasources')
+        p_semaphores = mock.patch.dict(fetcher.MetricFetcher._semaphores,
+                                       clear=True)
+        p_semaphores.start()
+        self.addCleanup(p_semaphores.stop)
+
+    def test_fetch(self):
+        metric_fetcher = fetcher.MetricFetcher(
+            'gnocchi', lambda request: request[1] * 2)
+        result = metric_fetcher.fetch([('INSTANCE_1', 1), ('INSTANCE_2', 2),
+                                       ('INSTANCE_1', 1)])
+        self.assertEqual({('INSTANCE_1', 1): 2, ('INSTANCE_2', 2): 4},
+                         result)
+
+    def test_fetch_nothing(self):
+        fetch = mock.Mock()
+        self.assertEqual({}, fetcher.MetricFetcher('gnocchi', fetch).fetch(
+            []))
+        self.assertFalse(fetch.called)
+
+    def test_fetch_error(self):
+        def fetch(request):
+            if request == 'INSTANCE_2':
+                raise Exception('Boom')
+            return 1.0
+
+        result = fetcher.MetricFetcher('gnocchi', fetch).fetch(
+            ['INSTANCE_1', 'INSTANCE_2'])
+        self.assertEqual({'INSTANCE_1': 1.0, 'INSTANCE_2': None}, result)
+
+    def test_max_concurrency(self):
+        self.assertEqual(
+            2, fetcher.MetricFetcher.get_max_concurrency('gnocchi'))
+        self.assertEqual(
+            3, fetcher.MetricFetcher.get_max_concurrency('monasca'))
+
+    def test_concurrency_is_bounded_per_datasource(self):
+        lock = threading.Lock()
+        in_flight = []
+        max_in_flight = []
+
+        def fetch(request):
+            with lock:
+                in_flight.append(request)
+                max_in_flight.append(len(in_flight))
+            time.sleep(0.01)
+            with lock:
+                in_flight.remove(request)
+            return request
+
+        requests = ['INSTANCE_%s' % i for i in range(10)]
+        threads = [threading.Thread(
+            target=fetcher.MetricFetcher('gnocchi', fetch).fetch,
+            args=(requests[i::2],)) for i in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(10, len(max_in_flight))
+        self.assertLessEqual(max(max_in_flight), 2)
+        self.assertIs(fetcher.MetricFetcher.get_semaphore('gnocchi'),
+                      fetcher.MetricFetcher.get_semaphore('gnocchi'))
+        self.assertIsNot(fetcher.MetricFetcher.get_semaphore('gnocchi'),
+                         fetcher.MetricFetcher.get_semaphore('ceilometer'))
+
+    def test_fetch_timeout(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+
+        def fetch(request):
+            if request == 'INSTANCE_2':
+                release.wait(5)
+            return 1.0
+
+        result = fetcher.MetricFetcher('gnocchi', fetch, timeout=0.1).fetch(
+            ['INSTANCE_1', 'INSTANCE_2'])
+        self.assertEqual({'INSTANCE_1': 1.0, 'INSTANCE_2': None}, result)
+
+    def test_fetch_timeout_releases_slot(self):
+        CONF.set_override('max_concurrency', {'gnocchi': 1},
+                          group='watcher_datasources')
+        release = threading.Event()
+        self.addCleanup(release.set)
+
+        def fetch(request):
+            if request == 'INSTANCE_1':
+                release.wait(5)
+            return 1.0
+
+        metric_fetcher = fetcher.MetricFetcher('gnocchi', fetch, timeout=0.1)
+        self.assertEqual({'INSTANCE_1': None},
+                         metric_fetcher.fetch(['INSTANCE_1']))
+
+        # The abandoned request still hangs but no longer holds the slot
+        self.assertEqual({'INSTANCE_2': 1.0},
+                         metric_fetcher.fetch(['INSTANCE_2']))
+        release.set()
+
+    def test_nested_fetch(self):
+        CONF.set_override('max_concurrency', {'gnocchi': 1},
+                          group='watcher_datasources')
+
+        def fetch_inner(request):
+            return request * 2
+
+        def fetch_outer(request):
+            return fetcher.MetricFetcher('gnocchi', fetch_inner).fetch(
+                [request, request + 1])
+
+        result = fetcher.MetricFetcher('gnocchi', fetch_outer).fetch(
+            [1, 3])
+        self.assertEqual({1: {1: 2, 2: 4}, 3: {3: 6, 4: 8}}, result)
+
+    def test_fetch_concurrently(self):
+        result = datasource_base.fetch_concurrently(
+            'gnocchi', lambda resource_id, metric: resource_id + metric,
+            ['INSTANCE_1', 'INSTANCE_2'], ['cpu_util', 'memory'])
+        self.assertEqual(
+            {'INSTANCE_1': {'cpu_util': 'INSTANCE_1cpu_util',
+                            'memory': 'INSTANCE_1memory'},
+             'INSTANCE_2': {'cpu_util': 'INSTANCE_2cpu_util',
+                            'memory': 'INSTANCE_2memory'}},
+            result)
@@ -98,3 +98,35 @@ class TestMonascaHelper(base.BaseTestCase):
         helper = monasca_helper.MonascaHelper()
         val = helper.statistics_list(meter_name="cpu.percent", dimensions={})
         self.assertEqual(expected_result, val)
+
+    def test_monasca_statistic_aggregation_bulk(self, mock_monasca):
+        monasca = mock.MagicMock()
+        monasca.metrics.list_statistics.return_value = [
+            {'columns': ['timestamp', 'avg'],
+             'dimensions': {'resource_id': 'INSTANCE_1'},
+             'id': '0',
+             'name': 'vm.cpu.utilization_perc',
+             'statistics': [['2016-07-29T12:45:00Z', 1.0],
+                            ['2016-07-29T12:50:00Z', 2.0]]},
+            {'columns': ['timestamp', 'avg'],
+             'dimensions': {'resource_id': 'INSTANCE_2'},
+             'id': '1',
+             'name': 'vm.cpu.utilization_perc',
+             'statistics': [['2016-07-29T12:45:00Z', 4.0]]},
+        ]
+        mock_monasca.return_value = monasca
+
+        helper = monasca_helper.MonascaHelper()
+        result = helper.statistic_aggregation_bulk(
+            resource_ids=['INSTANCE_1', 'INSTANCE_2', 'INSTANCE_3'],
+            metrics=['vm.cpu.utilization_perc'],
+            period=7200,
+        )
+        self.assertEqual(
+            {'INSTANCE_1': {'vm.cpu.utilization_perc': 1.5},
+             'INSTANCE_2': {'vm.cpu.utilization_perc': 4.0},
+             'INSTANCE_3': {'vm.cpu.utilization_perc': None}},
+            result)
+        monasca.metrics.list_statistics.assert_called_once_with(
+            name='vm.cpu.utilization_perc', start_time=mock.ANY,
+            period=7200, statistics='avg', group_by='resource_id')
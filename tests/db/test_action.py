@@ -392,3 +392,31 @@ class DbActionTestCase(base.DbTestCase):
         self.assertRaises(exception.ActionAlreadyExists,
                           self._create_test_action,
                           id=2, uuid=uuid)
+
+    def test_create_actions(self):
+        values_list = [
+            {'action_plan_id': 1, 'action_type': 'nop'},
+            {'action_plan_id': 1, 'action_type': 'sleep',
+             'uuid': w_utils.generate_uuid(),
+             'state': objects.action.State.CANCELLED},
+        ]
+        actions = self.dbapi.create_actions(values_list)
+
+        self.assertEqual(['nop', 'sleep'],
+                         [action.action_type for action in actions])
+        self.assertTrue(w_utils.is_uuid_like(actions[0].uuid))
+        self.assertEqual(values_list[1]['uuid'], actions[1].uuid)
+        self.assertEqual(objects.action.State.PENDING, actions[0].state)
+        self.assertEqual(objects.action.State.CANCELLED, actions[1].state)
+        res = self.dbapi.get_action_list(self.context)
+        self.assertEqual([action.id for action in actions],
+                         [r.id for r in res])
+
+    def test_create_actions_already_exists(self):
+        uuid = w_utils.generate_uuid()
+        self._create_test_action(id=1, uuid=uuid)
+        self.assertRaises(exception.ActionAlreadyExists,
+                          self.dbapi.create_actions,
+                          [utils.get_test_action(uuid=w_utils.generate_uuid()),
+                           utils.get_test_action(uuid=uuid)])
+        self.assertEqual(1, len(self.dbapi.get_action_list(self.context)))
@@ -408,3 +408,18 @@ class DbEfficacyIndicatorTestCase(base.DbTestCase):
         self.assertRaises(exception.EfficacyIndicatorAlreadyExists,
                           self._create_test_efficacy_indicator,
                           id=2, uuid=uuid)
+
+    def test_create_efficacy_indicators(self):
+        values_list = [
+            {'name': 'indicator_1', 'value': 1, 'action_plan_id': 1},
+            {'name': 'indicator_2', 'value': 2, 'action_plan_id': 1},
+        ]
+        efficacy_indicators = self.dbapi.create_efficacy_indicators(
+            values_list)
+
+        self.assertEqual(['indicator_1', 'indicator_2'],
+                         [indicator.name for indicator in efficacy_indicators])
+        res = self.dbapi.get_efficacy_indicator_list(self.context)
+        self.assertEqual(
+            sorted(indicator.uuid for indicator in efficacy_indicators),
+            sorted(r.uuid for r in res))
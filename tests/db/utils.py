@@ -167,6 +167,8 @@ def get_test_action_plan(**kwargs):
         'audit_id': kwargs.get('audit_id', 1),
         'strategy_id': kwargs.get('strategy_id', 1),
         'global_efficacy': kwargs.get('global_efficacy', {}),
+        'expected_makespan': kwargs.get('expected_makespan'),
+        'critical_path': kwargs.get('critical_path', []),
         'created_at': kwargs.get('created_at'),
         'updated_at': kwargs.get('updated_at'),
         'deleted_at': kwargs.get('deleted_at'),
@@ -15,6 +15,7 @@
 # limitations under the License.
 
 import datetime
+import threading
 
 import mock
 from oslo_utils import uuidutils
@@ -381,6 +382,35 @@ class TestContinuousAuditHandler(base.DbTestCase):
         m_is_inactive.return_value = True
         m_get_jobs.return_value = None
 
-        audit_handler.execute_audit(self.audits[0], self.context)
+        audit_handler.execute_audit(self.audits[0], self.context).result(10)
         m_execute.assert_called_once_with(self.audits[0], self.context)
         self.assertIsNotNone(self.audits[0].next_run_time)
+
+    @mock.patch.object(objects.service.Service, 'list')
+    @mock.patch.object(sq_api, 'get_engine')
+    @mock.patch.object(continuous.ContinuousAuditHandler,
+                       '_is_audit_inactive')
+    @mock.patch.object(continuous.ContinuousAuditHandler, 'execute')
+    def test_execute_audit_previous_run_not_over(
+            self,
+            m_execute,
+            m_is_inactive,
+            m_get_engine,
+            m_service):
+        audit_handler = continuous.ContinuousAuditHandler()
+        m_is_inactive.return_value = False
+        release = threading.Event()
+        self.addCleanup(release.set)
+        m_execute.side_effect = lambda *args: release.wait(10)
+
+        future = audit_handler.execute_audit(self.audits[0], self.context)
+
+        # The job does not wait for the run, and does not start another one
+        self.assertFalse(future.done())
+        self.assertIsNone(
+            audit_handler.execute_audit(self.audits[0], self.context))
+        release.set()
+        future.result(10)
+        self.assertEqual(1, m_execute.call_count)
+        self.assertEqual(
+            set(), continuous.ContinuousAuditHandler._pending_runs)
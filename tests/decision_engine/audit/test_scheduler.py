@@ -0,0 +1,153 @@
+# -*- encoding: utf-8 -*-
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+
+import mock
+
+from watcher.decision_engine.audit import scheduler
+from watcher.decision_engine.strategy.selection import default
+from watcher.tests import base
+
+
+class TestAuditScheduler(base.TestCase):
+
+    def setUp(self):
+        super(TestAuditScheduler, self).setUp()
+        self.executed = []
+        self.release = threading.Event()
+        self.addCleanup(self.release.set)
+        # The audits without any strategy are executed with this one
+        p_select = mock.patch.object(
+            default.DefaultStrategySelector, 'get_strategy_name',
+            return_value='dummy')
+        p_select.start()
+        self.addCleanup(p_select.stop)
+
+    def get_scheduler(self, max_workers, **limits):
+        self.config(max_workers=max_workers, group='watcher_decision_engine',
+                    **limits)
+        return scheduler.AuditScheduler()
+
+    @staticmethod
+    def audit(name, goal_id=1, strategy=None):
+        audit = mock.Mock(uuid=name, goal_id=goal_id, strategy_id=None)
+        if strategy is not None:
+            audit.strategy_id = strategy
+            audit.strategy.name = strategy
+        return audit
+
+    def run_audit(self, name):
+        self.executed.append(name)
+        return name
+
+    def block(self, name):
+        self.executed.append(name)
+        self.release.wait(10)
+
+    def test_submit(self):
+        audit_scheduler = self.get_scheduler(2)
+
+        future = audit_scheduler.submit(
+            self.audit("a1"), self.run_audit, "a1")
+
+        self.assertEqual("a1", future.result(10))
+        self.assertEqual(1, audit_scheduler.executed)
+        self.assertEqual(0, audit_scheduler.running)
+
+    def test_submit_error(self):
+        audit_scheduler = self.get_scheduler(2)
+
+        future = audit_scheduler.submit(
+            self.audit("a1"), mock.Mock(side_effect=ValueError))
+
+        self.assertRaises(ValueError, future.result, 10)
+        self.assertEqual(0, audit_scheduler.running)
+
+    def test_priority(self):
+        audit_scheduler = self.get_scheduler(1)
+        blocking = audit_scheduler.submit(
+            self.audit("a1"), self.block, "a1")
+
+        continuous = audit_scheduler.submit(
+            self.audit("a2"), self.run_audit, "a2",
+            priority=scheduler.PRIORITY_CONTINUOUS)
+        oneshot = audit_scheduler.submit(
+            self.audit("a3"), self.run_audit, "a3",
+            priority=scheduler.PRIORITY_ONESHOT)
+        self.assertEqual(2, audit_scheduler.depth)
+        self.release.set()
+
+        for future in (blocking, continuous, oneshot):
+            future.result(10)
+        self.assertEqual(["a1", "a3", "a2"], self.executed)
+
+    def test_max_audits_per_goal(self):
+        audit_scheduler = self.get_scheduler(4, max_audits_per_goal=1)
+        blocking = audit_scheduler.submit(
+            self.audit("a1", goal_id=1), self.block, "a1")
+
+        same_goal = audit_scheduler.submit(
+            self.audit("a2", goal_id=1), self.run_audit, "a2")
+        other_goal = audit_scheduler.submit(
+            self.audit("a3", goal_id=2), self.run_audit, "a3")
+
+        self.assertEqual("a3", other_goal.result(10))
+        self.assertFalse(same_goal.done())
+        self.assertEqual(1, audit_scheduler.depth)
+        self.release.set()
+        self.assertEqual("a2", same_goal.result(10))
+        blocking.result(10)
+
+    def test_max_audits_per_strategy(self):
+        audit_scheduler = self.get_scheduler(4, max_audits_per_strategy=1)
+        blocking = audit_scheduler.submit(
+            self.audit("a1", strategy="s1"), self.block, "a1")
+
+        same_strategy = audit_scheduler.submit(
+            self.audit("a2", strategy="s1"), self.run_audit, "a2")
+        no_strategy = audit_scheduler.submit(
+            self.audit("a3"), self.run_audit, "a3")
+
+        self.assertEqual("a3", no_strategy.result(10))
+        self.assertFalse(same_strategy.done())
+        self.release.set()
+        self.assertEqual("a2", same_strategy.result(10))
+        blocking.result(10)
+
+    def test_max_audits_per_default_strategy(self):
+        audit_scheduler = self.get_scheduler(4, max_audits_per_strategy=1)
+        blocking = audit_scheduler.submit(
+            self.audit("a1", strategy="dummy"), self.block, "a1")
+
+        default_strategy = audit_scheduler.submit(
+            self.audit("a2"), self.run_audit, "a2")
+
+        self.assertFalse(default_strategy.done())
+        self.assertEqual(1, audit_scheduler.depth)
+        self.release.set()
+        self.assertEqual("a2", default_strategy.result(10))
+        blocking.result(10)
+
+    def test_strategy_selection_error(self):
+        audit_scheduler = self.get_scheduler(4, max_audits_per_strategy=1)
+
+        with mock.patch.object(
+                default.DefaultStrategySelector, 'get_strategy_name',
+                side_effect=Exception):
+            future = audit_scheduler.submit(
+                self.audit("a1"), self.run_audit, "a1")
+
+        self.assertEqual("a1", future.result(10))
@@ -0,0 +1,145 @@
+# -*- encoding: utf-8 -*-
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import datetime
+
+import mock
+
+from watcher.common import cinder_helper
+from watcher.decision_engine.model.collector import cinder
+from watcher.decision_engine.model import element
+from watcher.decision_engine.model import model_root
+from watcher.tests import base
+from watcher.tests import conf_fixture
+
+
+class TestCinderClusterDataModelCollector(base.TestCase):
+
+    def setUp(self):
+        super(TestCinderClusterDataModelCollector, self).setUp()
+        self.useFixture(conf_fixture.ConfReloadFixture())
+
+        self.model = model_root.StorageModelRoot()
+        node = element.StorageNode(host='host@backend', zone='zone',
+                                   volume_type='backend_type')
+        pool = element.Pool(name='host@backend#pool', total_volumes=2,
+                            total_capacity_gb=500, free_capacity_gb=460,
+                            provisioned_capacity_gb=40,
+                            allocated_capacity_gb=40)
+        self.model.add_node(node)
+        self.model.add_pool(pool)
+        self.model.map_pool(pool, node)
+        for index in range(2):
+            volume = element.Volume(uuid='volume_%d' % index, size=20)
+            self.model.add_volume(volume)
+            self.model.map_volume(volume, pool)
+
+    @staticmethod
+    def fake_volume(uuid, size):
+        volume = mock.Mock(
+            id=uuid, size=size, status='available', attachments=[],
+            multiattach=False, snapshot_id=None, metadata={},
+            bootable=False)
+        volume.name = uuid
+        setattr(volume, 'os-vol-host-attr:host', 'host@backend#pool')
+        setattr(volume, 'os-vol-tenant-attr:tenant_id',
+                '6a7b6f04-1d2e-4c19-8d35-26f3d6ac2b52')
+        return volume
+
+    @mock.patch.object(cinder_helper, 'CinderHelper')
+    def test_cinder_cdmc_execute_delta(self, m_cinder_helper_cls):
+        m_cinder_helper = m_cinder_helper_cls.return_value
+        m_cinder_helper.get_storage_node_list.return_value = [mock.Mock(
+            host='host@backend', zone='zone', state='down',
+            status='enabled')]
+        fake_pool = mock.Mock(
+            total_volumes=2, total_capacity_gb=500, free_capacity_gb=440,
+            provisioned_capacity_gb=60, allocated_capacity_gb=60)
+        fake_pool.name = 'host@backend#pool'
+        m_cinder_helper.get_storage_pool_list.return_value = [fake_pool]
+        # volume_0 got deleted, volume_1 extended and volume_2 created
+        volume_1 = self.fake_volume('volume_1', 40)
+        m_cinder_helper.get_volume_list.return_value = [
+            volume_1, self.fake_volume('volume_2', 20)]
+        m_cinder_helper.is_volume_changed_since.return_value = True
+        snapshot = self.model.snapshot()
+        since = datetime.datetime(2017, 1, 1)
+
+        cinder_cdmc = cinder.CinderClusterDataModelCollector(
+            config=mock.Mock(), osc=mock.Mock())
+
+        with mock.patch.object(self.model, 'batch_update',
+                               wraps=self.model.batch_update) as m_batch:
+            self.assertTrue(cinder_cdmc.execute_delta(self.model, since))
+        m_batch.assert_called_once_with()
+        # Only the update time of the known volumes is checked
+        m_cinder_helper.is_volume_changed_since.assert_called_once_with(
+            volume_1, since)
+        self.assertEqual(['volume_1', 'volume_2'],
+                         sorted(self.model.get_all_volumes()))
+        self.assertEqual(
+            40, self.model.get_volume_by_uuid('volume_1').size)
+        pool = self.model.get_pool_by_pool_name('host@backend#pool')
+        self.assertEqual(440, pool.free_capacity_gb)
+        self.assertEqual(
+            ['volume_1', 'volume_2'],
+            sorted(volume.uuid
+                   for volume in self.model.get_pool_volumes(pool)))
+        node = self.model.get_node_by_name('host@backend')
+        self.assertEqual('down', node.state)
+        self.assertEqual('backend_type', node.volume_type)
+        # The snapshots taken beforehand are left untouched
+        self.assertEqual(['volume_0', 'volume_1'],
+                         sorted(snapshot.get_all_volumes()))
+
+    @mock.patch.object(cinder_helper, 'CinderHelper')
+    def test_cinder_cdmc_execute_delta_unchanged(self, m_cinder_helper_cls):
+        m_cinder_helper = m_cinder_helper_cls.return_value
+        m_cinder_helper.get_storage_node_list.return_value = [mock.Mock(
+            host='host@backend', zone='zone', state='up', status='enabled')]
+        fake_pool = mock.Mock(
+            total_volumes=2, total_capacity_gb=500, free_capacity_gb=460,
+            provisioned_capacity_gb=40, allocated_capacity_gb=40)
+        fake_pool.name = 'host@backend#pool'
+        m_cinder_helper.get_storage_pool_list.return_value = [fake_pool]
+        # Listed with a stale size, but not updated since the last sync
+        m_cinder_helper.get_volume_list.return_value = [
+            self.fake_volume('volume_0', 10),
+            self.fake_volume('volume_1', 10)]
+        m_cinder_helper.is_volume_changed_since.return_value = False
+
+        cinder_cdmc = cinder.CinderClusterDataModelCollector(
+            config=mock.Mock(), osc=mock.Mock())
+
+        self.assertTrue(cinder_cdmc.execute_delta(
+            self.model, datetime.datetime(2017, 1, 1)))
+        self.assertEqual(
+            20, self.model.get_volume_by_uuid('volume_0').size)
+
+    @mock.patch.object(cinder_helper, 'CinderHelper')
+    def test_cinder_cdmc_execute_delta_drift(self, m_cinder_helper_cls):
+        m_cinder_helper = m_cinder_helper_cls.return_value
+        m_cinder_helper.get_storage_node_list.return_value = [mock.Mock(
+            host='host@backend', zone='zone', state='up', status='enabled')]
+        fake_pool = mock.Mock()
+        fake_pool.name = 'host@backend#new_pool'
+        m_cinder_helper.get_storage_pool_list.return_value = [fake_pool]
+
+        cinder_cdmc = cinder.CinderClusterDataModelCollector(
+            config=mock.Mock(), osc=mock.Mock())
+
+        self.assertFalse(cinder_cdmc.execute_delta(
+            self.model, datetime.datetime(2017, 1, 1)))
+        self.assertFalse(m_cinder_helper.get_volume_list.called)
@@ -14,9 +14,15 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import datetime
+
+import fixtures
 import mock
+from oslo_config import cfg
+from oslo_service import service
 
 from watcher.decision_engine.model.collector import base
+from watcher.decision_engine.model import element
 from watcher.decision_engine.model import model_root
 from watcher.tests import base as test_base
 
@@ -52,3 +58,138 @@ class TestClusterDataModelCollector(test_base.TestCase):
         self.assertIsNot(
             collector.cluster_data_model,
             collector.get_latest_cluster_data_model())
+
+    def test_in_memory_model_is_deep_copied(self):
+        m_config = mock.Mock()
+        collector = DummyClusterDataModelCollector(config=m_config)
+        collector.config = {'copy_on_write': False}
+        collector.synchronize()
+
+        with mock.patch.object(
+                model_root.ModelRoot, 'snapshot') as m_snapshot:
+            self.assertIsNot(
+                collector.cluster_data_model,
+                collector.get_latest_cluster_data_model())
+            self.assertFalse(m_snapshot.called)
+
+    @mock.patch.object(DummyClusterDataModelCollector, 'execute_delta')
+    def test_synchronize_delta(self, m_execute_delta):
+        m_execute_delta.return_value = True
+        collector = DummyClusterDataModelCollector(config=mock.Mock())
+        collector.config = {'delta_sync': True}
+        collector.synchronize()
+        model = collector.cluster_data_model
+        synchronized_at = collector._synchronized_at
+        self.assertFalse(m_execute_delta.called)
+
+        collector.synchronize()
+
+        self.assertIs(model, collector.cluster_data_model)
+        m_execute_delta.assert_called_once_with(
+            model, synchronized_at - collector.DELTA_SYNC_MARGIN)
+        self.assertGreaterEqual(collector._synchronized_at, synchronized_at)
+
+    @mock.patch.object(DummyClusterDataModelCollector, 'execute_delta')
+    def test_synchronize_delta_drift(self, m_execute_delta):
+        m_execute_delta.return_value = False
+        collector = DummyClusterDataModelCollector(config=mock.Mock())
+        collector.config = {'delta_sync': True}
+        collector.synchronize()
+        model = collector.cluster_data_model
+
+        collector.synchronize()
+
+        self.assertTrue(m_execute_delta.called)
+        self.assertIsNot(model, collector.cluster_data_model)
+        self.assertIsNotNone(collector._synchronized_at)
+
+    @mock.patch.object(DummyClusterDataModelCollector, 'execute_delta')
+    def test_synchronize_delta_stale_model(self, m_execute_delta):
+        collector = DummyClusterDataModelCollector(config=mock.Mock())
+        collector.config = {'delta_sync': True}
+        collector.synchronize()
+        collector.set_cluster_data_model_as_stale()
+
+        collector.synchronize()
+
+        self.assertFalse(m_execute_delta.called)
+        self.assertFalse(collector.cluster_data_model.stale)
+
+    @mock.patch.object(DummyClusterDataModelCollector, 'execute_delta')
+    def test_synchronize_delta_disabled(self, m_execute_delta):
+        collector = DummyClusterDataModelCollector(config=mock.Mock())
+        collector.config = {'delta_sync': False}
+        collector.synchronize()
+        model = collector.cluster_data_model
+
+        collector.synchronize()
+
+        self.assertFalse(m_execute_delta.called)
+        self.assertIsNot(model, collector.cluster_data_model)
+
+    @mock.patch.object(DummyClusterDataModelCollector, 'execute_delta')
+    def test_synchronize_from_snapshot(self, m_execute_delta):
+        m_execute_delta.return_value = True
+        snapshot_dir = self.useFixture(fixtures.TempDir()).path
+        cfg.CONF.set_override('model_snapshot_dir', snapshot_dir,
+                              group='watcher_decision_engine')
+        collector = DummyClusterDataModelCollector(config=mock.Mock())
+        collector.config = {'delta_sync': True}
+        collector.synchronize()
+        collector.cluster_data_model.add_node(
+            element.ComputeNode(uuid='node_1'))
+        synchronized_at = collector._synchronized_at
+        collector.save_snapshot()
+
+        # Restart the collector
+        service.Singleton._instances.clear()
+        collector = DummyClusterDataModelCollector(config=mock.Mock())
+        collector.config = {'delta_sync': True}
+        with mock.patch.object(
+                DummyClusterDataModelCollector, 'execute') as m_execute:
+            collector.synchronize()
+            self.assertFalse(m_execute.called)
+
+        model = collector.cluster_data_model
+        self.assertEqual(['node_1'], list(model.get_all_compute_nodes()))
+        m_execute_delta.assert_called_once_with(
+            model, synchronized_at - collector.DELTA_SYNC_MARGIN)
+
+    @mock.patch.object(DummyClusterDataModelCollector, 'execute_delta')
+    def test_synchronize_from_outdated_snapshot(self, m_execute_delta):
+        snapshot_dir = self.useFixture(fixtures.TempDir()).path
+        cfg.CONF.set_override('model_snapshot_dir', snapshot_dir,
+                              group='watcher_decision_engine')
+        cfg.CONF.set_override('model_snapshot_max_age', 3600,
+                              group='watcher_decision_engine')
+        collector = DummyClusterDataModelCollector(config=mock.Mock())
+        collector.config = {'delta_sync': True}
+        collector.synchronize()
+        collector.cluster_data_model.add_node(
+            element.ComputeNode(uuid='node_1'))
+        collector._synchronized_at -= datetime.timedelta(hours=2)
+        collector.save_snapshot()
+
+        # Restart the collector
+        service.Singleton._instances.clear()
+        collector = DummyClusterDataModelCollector(config=mock.Mock())
+        collector.config = {'delta_sync': True}
+
+        self.assertFalse(collector.load_snapshot())
+        collector.synchronize()
+
+        self.assertFalse(m_execute_delta.called)
+        self.assertEqual(
+            {}, collector.cluster_data_model.get_all_compute_nodes())
+
+    def test_load_corrupted_snapshot(self):
+        snapshot_dir = self.useFixture(fixtures.TempDir()).path
+        cfg.CONF.set_override('model_snapshot_dir', snapshot_dir,
+                              group='watcher_decision_engine')
+        collector = DummyClusterDataModelCollector(config=mock.Mock())
+        with open(collector.snapshot_path, 'wb') as snapshot_file:
+            snapshot_file.write(b'corrupted')
+
+        self.assertFalse(collector.load_snapshot())
+        self.assertIsInstance(
+            collector.cluster_data_model, model_root.ModelRoot)
@@ -16,11 +16,15 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import datetime
+
 import mock
 
 from watcher.common import nova_helper
 from watcher.common import utils
 from watcher.decision_engine.model.collector import nova
+from watcher.decision_engine.model import element
+from watcher.decision_engine.model import model_root
 from watcher.tests import base
 from watcher.tests import conf_fixture
 
@@ -36,8 +40,8 @@ class TestNovaClusterDataModelCollector(base.TestCase):
     def test_nova_cdmc_execute(self, m_nova_helper_cls):
         m_nova_helper = mock.Mock(name="nova_helper")
         m_nova_helper_cls.return_value = m_nova_helper
-        m_nova_helper.get_service.return_value = mock.Mock(
-            host="test_hostname")
+        m_nova_helper.get_service_list.return_value = [mock.Mock(
+            id=123, host="test_hostname")]
 
         fake_compute_node = mock.Mock(
             id=1337,
@@ -60,12 +64,12 @@ class TestNovaClusterDataModelCollector(base.TestCase):
         setattr(fake_instance, 'OS-EXT-SRV-ATTR:host', 'test_hostname')
         m_nova_helper.get_compute_node_list.return_value = [fake_compute_node]
         # m_nova_helper.get_instances_by_node.return_value = [fake_instance]
-        m_nova_helper.get_instance_list.return_value = [fake_instance]
+        m_nova_helper.get_instance_list.side_effect = [[fake_instance], []]
 
-        m_nova_helper.get_flavor.return_value = utils.Struct(**{
-            'ram': 333, 'disk': 222, 'vcpus': 4})
+        m_nova_helper.get_flavor_list.return_value = [utils.Struct(**{
+            'id': 1, 'ram': 333, 'disk': 222, 'vcpus': 4})]
 
-        m_config = mock.Mock()
+        m_config = {'instance_page_size': 1000}
         m_osc = mock.Mock()
 
         nova_cdmc = nova.NovaClusterDataModelCollector(
@@ -84,3 +88,243 @@ class TestNovaClusterDataModelCollector(base.TestCase):
 
         self.assertEqual(node.uuid, 'test_hostname')
         self.assertEqual(instance.uuid, 'ef500f7e-dac8-470f-960c-169486fce71b')
+        self.assertFalse(m_nova_helper.get_service.called)
+        self.assertFalse(m_nova_helper.get_flavor.called)
+
+    @mock.patch('keystoneclient.v3.client.Client', mock.Mock())
+    @mock.patch.object(nova_helper, 'NovaHelper')
+    def test_nova_cdmc_execute_paginated(self, m_nova_helper_cls):
+        m_nova_helper = mock.Mock(name="nova_helper")
+        m_nova_helper_cls.return_value = m_nova_helper
+        m_nova_helper.get_service_list.return_value = [mock.Mock(
+            id=123, host="test_hostname")]
+        m_nova_helper.get_compute_node_list.return_value = [mock.Mock(
+            id=1337,
+            service={'id': 123},
+            hypervisor_hostname='test_hostname',
+            memory_mb=333,
+            free_disk_gb=222,
+            local_gb=111,
+            vcpus=4,
+            state='TEST_STATE',
+            status='TEST_STATUS',
+        )]
+
+        fake_instances = []
+        for index in range(5):
+            fake_instance = mock.Mock(
+                id='instance_%d' % index,
+                human_id='fake_instance_%d' % index,
+                flavor={'id': index % 2},
+                metadata={},
+            )
+            setattr(fake_instance, 'OS-EXT-STS:vm_state', 'active')
+            setattr(fake_instance, 'OS-EXT-SRV-ATTR:host', 'test_hostname')
+            fake_instances.append(fake_instance)
+        m_nova_helper.get_instance_list.side_effect = [
+            fake_instances[:2], fake_instances[2:4], fake_instances[4:], []]
+
+        # The second flavor is deleted so it is not listed
+        m_nova_helper.get_flavor_list.return_value = [utils.Struct(**{
+            'id': 0, 'ram': 333, 'disk': 222, 'vcpus': 4})]
+        m_nova_helper.get_flavor.return_value = utils.Struct(**{
+            'id': 1, 'ram': 444, 'disk': 111, 'vcpus': 2})
+
+        nova_cdmc = nova.NovaClusterDataModelCollector(
+            config={'instance_page_size': 2}, osc=mock.Mock())
+
+        model = nova_cdmc.execute()
+
+        node = model.get_node_by_uuid('test_hostname')
+        self.assertEqual(
+            ['instance_%d' % index for index in range(5)],
+            sorted(instance.uuid
+                   for instance in model.get_node_instances(node)))
+        self.assertEqual(2, model.get_instance_by_uuid('instance_1').vcpus)
+        self.assertEqual(4, model.get_instance_by_uuid('instance_2').vcpus)
+        m_nova_helper.get_instance_list.assert_has_calls([
+            mock.call(limit=2),
+            mock.call(marker='instance_1', limit=2),
+            mock.call(marker='instance_3', limit=2),
+            mock.call(marker='instance_4', limit=2)])
+        m_nova_helper.get_flavor.assert_called_once_with(1)
+
+    @mock.patch('keystoneclient.v3.client.Client', mock.Mock())
+    @mock.patch.object(nova_helper, 'NovaHelper')
+    def test_nova_cdmc_execute_paginated_above_nova_limit(
+            self, m_nova_helper_cls):
+        m_nova_helper = mock.Mock(name="nova_helper")
+        m_nova_helper_cls.return_value = m_nova_helper
+        m_nova_helper.get_service_list.return_value = []
+        m_nova_helper.get_compute_node_list.return_value = []
+        m_nova_helper.get_flavor_list.return_value = [utils.Struct(**{
+            'id': 0, 'ram': 333, 'disk': 222, 'vcpus': 4})]
+
+        fake_instances = []
+        for index in range(3):
+            fake_instance = mock.Mock(
+                id='instance_%d' % index,
+                human_id='fake_instance_%d' % index,
+                flavor={'id': 0},
+                metadata={},
+            )
+            setattr(fake_instance, 'OS-EXT-STS:vm_state', 'active')
+            setattr(fake_instance, 'OS-EXT-SRV-ATTR:host', None)
+            fake_instances.append(fake_instance)
+        # Nova returns at most 2 instances per page, below the page size
+        m_nova_helper.get_instance_list.side_effect = [
+            fake_instances[:2], fake_instances[2:], []]
+
+        nova_cdmc = nova.NovaClusterDataModelCollector(
+            config={'instance_page_size': 1000}, osc=mock.Mock())
+
+        model = nova_cdmc.execute()
+
+        self.assertEqual(
+            ['instance_%d' % index for index in range(3)],
+            sorted(model.get_all_instances()))
+        self.assertEqual(3, m_nova_helper.get_instance_list.call_count)
+
+    @mock.patch('keystoneclient.v3.client.Client', mock.Mock())
+    @mock.patch.object(nova_helper, 'NovaHelper')
+    def test_nova_cdmc_execute_delta(self, m_nova_helper_cls):
+        m_nova_helper = mock.Mock(name="nova_helper")
+        m_nova_helper_cls.return_value = m_nova_helper
+        m_nova_helper.get_service_list.return_value = [
+            mock.Mock(id=123, host="hostname_0"),
+            mock.Mock(id=456, host="hostname_1")]
+        fake_compute_nodes = [
+            mock.Mock(
+                id=1337 + index,
+                service={'id': service_id},
+                hypervisor_hostname='hostname_%d' % index,
+                memory_mb=333,
+                free_disk_gb=222,
+                local_gb=111,
+                vcpus=4,
+                state='up',
+                status='enabled',
+            ) for index, service_id in enumerate((123, 456))]
+        m_nova_helper.get_compute_node_list.return_value = fake_compute_nodes
+        m_nova_helper.get_flavor_list.return_value = [utils.Struct(**{
+            'id': 1, 'ram': 333, 'disk': 222, 'vcpus': 4})]
+
+        def fake_instance(index, host, vm_state='active'):
+            instance = mock.Mock(
+                id='instance_%d' % index,
+                human_id='fake_instance_%d' % index,
+                flavor={'id': 1},
+                metadata={},
+            )
+            setattr(instance, 'OS-EXT-STS:vm_state', vm_state)
+            setattr(instance, 'OS-EXT-SRV-ATTR:host', host)
+            return instance
+
+        m_nova_helper.get_instance_list.side_effect = [
+            [fake_instance(0, 'hostname_0'), fake_instance(1, 'hostname_0')],
+            []]
+        nova_cdmc = nova.NovaClusterDataModelCollector(
+            config={'instance_page_size': 1000}, osc=mock.Mock())
+        model = nova_cdmc.execute()
+        snapshot = model.snapshot()
+
+        # instance_0 got deleted, instance_1 migrated and instance_2 created
+        fake_compute_nodes[0].status = 'disabled'
+        m_nova_helper.get_instance_list.reset_mock()
+        m_nova_helper.get_instance_list.side_effect = [
+            [fake_instance(0, None, vm_state='deleted'),
+             fake_instance(1, 'hostname_1'),
+             fake_instance(2, 'hostname_1')],
+            []]
+        m_nova_helper.get_instance_id_list.return_value = [
+            'instance_1', 'instance_2']
+        since = datetime.datetime(2017, 1, 1)
+
+        with mock.patch.object(model, 'batch_update',
+                               wraps=model.batch_update) as m_batch_update:
+            self.assertTrue(nova_cdmc.execute_delta(model, since))
+        m_batch_update.assert_called_once_with()
+
+        m_nova_helper.get_instance_list.assert_has_calls([
+            mock.call(limit=1000, changes_since=since),
+            mock.call(marker='instance_2', limit=1000, changes_since=since)])
+        self.assertEqual(
+            ['instance_1', 'instance_2'], sorted(model.get_all_instances()))
+        self.assertEqual(
+            'hostname_1', model.get_node_by_instance_uuid('instance_1').uuid)
+        self.assertEqual(
+            'disabled', model.get_node_by_uuid('hostname_0').status)
+        # The snapshots taken beforehand are left untouched
+        self.assertEqual(
+            ['instance_0', 'instance_1'],
+            sorted(snapshot.get_all_instances()))
+        self.assertEqual(
+            'enabled', snapshot.get_node_by_uuid('hostname_0').status)
+
+    @mock.patch('keystoneclient.v3.client.Client', mock.Mock())
+    @mock.patch.object(nova_helper, 'NovaHelper')
+    def test_nova_cdmc_execute_delta_purged_instances(self, m_nova_helper_cls):
+        m_nova_helper = mock.Mock(name="nova_helper")
+        m_nova_helper_cls.return_value = m_nova_helper
+        m_nova_helper.get_service_list.return_value = [mock.Mock(
+            id=123, host="hostname_0")]
+        m_nova_helper.get_compute_node_list.return_value = [mock.Mock(
+            id=1337,
+            service={'id': 123},
+            hypervisor_hostname='hostname_0',
+            memory_mb=333,
+            free_disk_gb=222,
+            local_gb=111,
+            vcpus=4,
+            state='up',
+            status='enabled',
+        )]
+        m_nova_helper.get_flavor_list.return_value = []
+        # instance_0 was deleted and purged before the last synchronization
+        # ended, so it is not listed among the changes anymore
+        m_nova_helper.get_instance_list.return_value = []
+        m_nova_helper.get_instance_id_list.return_value = ['instance_1']
+        model = model_root.ModelRoot()
+        node = element.ComputeNode(uuid='hostname_0')
+        model.add_node(node)
+        for index in range(2):
+            instance = element.Instance(uuid='instance_%d' % index)
+            model.add_instance(instance)
+            model.map_instance(instance, node)
+
+        nova_cdmc = nova.NovaClusterDataModelCollector(
+            config={'instance_page_size': 1000}, osc=mock.Mock())
+
+        self.assertTrue(
+            nova_cdmc.execute_delta(model, datetime.datetime(2017, 1, 1)))
+        self.assertEqual(['instance_1'], list(model.get_all_instances()))
+
+    @mock.patch('keystoneclient.v3.client.Client', mock.Mock())
+    @mock.patch.object(nova_helper, 'NovaHelper')
+    def test_nova_cdmc_execute_delta_drift(self, m_nova_helper_cls):
+        m_nova_helper = mock.Mock(name="nova_helper")
+        m_nova_helper_cls.return_value = m_nova_helper
+        m_nova_helper.get_service_list.return_value = [mock.Mock(
+            id=123, host="new_hostname")]
+        m_nova_helper.get_compute_node_list.return_value = [mock.Mock(
+            id=1337,
+            service={'id': 123},
+            hypervisor_hostname='new_hostname',
+            memory_mb=333,
+            free_disk_gb=222,
+            local_gb=111,
+            vcpus=4,
+            state='up',
+            status='enabled',
+        )]
+        m_nova_helper.get_instance_list.return_value = []
+        m_nova_helper.get_flavor_list.return_value = []
+        model = model_root.ModelRoot()
+        model.add_node(element.ComputeNode(uuid='hostname_0'))
+
+        nova_cdmc = nova.NovaClusterDataModelCollector(
+            config={'instance_page_size': 1000}, osc=mock.Mock())
+
+        self.assertFalse(
+            nova_cdmc.execute_delta(model, datetime.datetime(2017, 1, 1)))
+        self.assertEqual(['hostname_0'], list(model.get_all_compute_nodes()))
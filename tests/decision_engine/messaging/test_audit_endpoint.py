@@ -18,6 +18,7 @@ import mock
 
 from watcher.decision_engine.audit import continuous as continuous_handler
 from watcher.decision_engine.audit import oneshot as oneshot_handler
+from watcher.decision_engine.audit import scheduler
 from watcher.decision_engine.messaging import audit_endpoint
 from watcher.decision_engine.model.collector import manager
 from watcher.tests.db import base
@@ -43,12 +44,17 @@ class TestAuditEndpoint(base.DbTestCase):
         audit_handler = oneshot_handler.OneShotAuditHandler
         endpoint = audit_endpoint.AuditEndpoint(audit_handler)
 
-        with mock.patch.object(oneshot_handler.OneShotAuditHandler,
-                               'execute') as mock_call:
-            mock_call.return_value = 0
+        with mock.patch.object(endpoint.scheduler, 'submit') as mock_call:
             endpoint.do_trigger_audit(self.context, self.audit.uuid)
 
         self.assertEqual(mock_call.call_count, 1)
+        audit = mock_call.call_args[0][0]
+        self.assertEqual(self.audit.uuid, audit.uuid)
+        self.assertEqual(
+            mock.call(audit, endpoint._oneshot_handler.execute,
+                      audit, self.context,
+                      priority=scheduler.PRIORITY_ONESHOT),
+            mock_call.call_args)
 
     @mock.patch.object(continuous_handler.ContinuousAuditHandler, 'start')
     @mock.patch.object(manager.CollectorManager, "get_cluster_model_collector")
@@ -58,11 +64,10 @@ class TestAuditEndpoint(base.DbTestCase):
         audit_handler = oneshot_handler.OneShotAuditHandler
         endpoint = audit_endpoint.AuditEndpoint(audit_handler)
 
-        with mock.patch.object(endpoint.executor, 'submit') as mock_call:
-            mock_execute = mock.call(endpoint.do_trigger_audit,
-                                     self.context,
-                                     self.audit.uuid)
-            endpoint.trigger_audit(self.context, self.audit.uuid)
+        with mock.patch.object(endpoint.scheduler, 'submit') as mock_call:
+            with mock.patch.object(endpoint, '_loader') as mock_loader:
+                endpoint.trigger_audit(self.context, self.audit.uuid)
 
-        mock_call.assert_has_calls([mock_execute])
-        self.assertEqual(mock_call.call_count, 1)
+        mock_loader.submit.assert_called_once_with(
+            endpoint.do_trigger_audit, self.context, self.audit.uuid)
+        self.assertFalse(mock_call.called)
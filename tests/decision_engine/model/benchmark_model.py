@@ -0,0 +1,329 @@
+# -*- encoding: utf-8 -*-
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Benchmarks of the cluster data model
+
+Run with::
+
+    python -m watcher.tests.decision_engine.model.benchmark_model audits
+    python -m watcher.tests.decision_engine.model.benchmark_model \
+        --nodes 5000 memory
+    python -m watcher.tests.decision_engine.model.benchmark_model \
+        --nodes 500 collector
+    python -m watcher.tests.decision_engine.model.benchmark_model \
+        --nodes 5000 serialization
+"""
+
+from __future__ import print_function
+
+import argparse
+from concurrent import futures
+import copy
+import gc
+import resource
+import threading
+import time
+
+import mock
+
+from watcher.common import utils
+from watcher.decision_engine.model.collector import nova
+from watcher.decision_engine.model import element
+from watcher.decision_engine.model import model_root
+
+
+class _NoLock(object):
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+def generate_model(node_count, instances_per_node, metadata=None):
+    """Build a model with the given number of nodes and instances per node
+
+    :param metadata: metadata of the instances, each instance getting its
+                     own copy (defaults to ``{"optimize": True}``)
+    """
+    if metadata is None:
+        metadata = {"optimize": True}
+    model = model_root.ModelRoot()
+    for node_id in range(node_count):
+        node = element.ComputeNode(
+            id=node_id, uuid="Node_{0}".format(node_id),
+            hostname="hostname_{0}".format(node_id),
+            memory=132, disk=250, disk_capacity=250, vcpus=40)
+        model.add_node(node)
+        for index in range(instances_per_node):
+            instance = element.Instance(
+                uuid="INSTANCE_{0}_{1}".format(node_id, index),
+                memory=2, disk=20, disk_capacity=20, vcpus=1,
+                metadata=dict(metadata))
+            model.add_instance(instance)
+            model.map_instance(instance, node)
+    return model
+
+
+def audit(model, lock):
+    """Emulate the model accesses of an audit
+
+    The audit works on its own snapshot of the model, which it walks through
+    before simulating the migration of one instance.
+    """
+    with lock:
+        snapshot = model.snapshot()
+    with lock:
+        nodes = snapshot.get_all_compute_nodes()
+    for node in nodes.values():
+        with lock:
+            instances = snapshot.get_node_instances(node)
+        for instance in instances:
+            with lock:
+                snapshot.get_node_by_instance_uuid(instance.uuid)
+    source, destination = list(nodes.values())[:2]
+    with lock:
+        instance = snapshot.get_node_instances(source)[0]
+    with lock:
+        snapshot.migrate_instance(instance, source, destination)
+
+
+def run_audits(model, concurrency, audit_count, global_lock=False):
+    """Run the audits concurrently and return their throughput per second
+
+    :param global_lock: serialize every model access on a single
+                        process-wide lock, as done before the models had a
+                        lock of their own
+    """
+    lock = threading.Lock() if global_lock else _NoLock()
+    executor = futures.ThreadPoolExecutor(max_workers=concurrency)
+    started_at = time.time()
+    try:
+        for future in [executor.submit(audit, model, lock)
+                       for _ in range(audit_count)]:
+            future.result()
+    finally:
+        executor.shutdown()
+    return audit_count / (time.time() - started_at)
+
+
+def measure_memory(node_count, instances_per_node):
+    """Build a model and return its memory footprint and copy timings"""
+    try:
+        import tracemalloc
+    except ImportError:
+        # Python 2: fall back on the growth of the maximum resident set size
+        tracemalloc = None
+
+    gc.collect()
+    if tracemalloc:
+        tracemalloc.start()
+    else:
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    model = generate_model(node_count, instances_per_node)
+    gc.collect()
+    if tracemalloc:
+        used = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+    else:
+        used = (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss -
+                max_rss) * 1024
+
+    started_at = time.time()
+    model.snapshot()
+    snapshot_time = time.time() - started_at
+
+    started_at = time.time()
+    copy.deepcopy(model)
+    deepcopy_time = time.time() - started_at
+
+    return used, snapshot_time, deepcopy_time
+
+
+class FakeNovaHelper(object):
+    """Nova helper answering each request after the given latency"""
+
+    def __init__(self, node_count, instances_per_node, latency,
+                 flavor_count=10):
+        self.latency = latency
+        self.nodes = [
+            utils.Struct(
+                id=node_id, service={'id': node_id},
+                hypervisor_hostname="hostname_{0}".format(node_id),
+                memory_mb=132 * 1024, free_disk_gb=250, local_gb=250,
+                vcpus=40, state='up', status='enabled')
+            for node_id in range(node_count)]
+        self.services = [
+            utils.Struct(id=node_id, host="hostname_{0}".format(node_id))
+            for node_id in range(node_count)]
+        self.flavors = [
+            utils.Struct(id=flavor_id, ram=2048, disk=20, vcpus=1)
+            for flavor_id in range(flavor_count)]
+        self.instances = []
+        for node_id in range(node_count):
+            for index in range(instances_per_node):
+                instance = utils.Struct(
+                    id="INSTANCE_{0}_{1}".format(node_id, index),
+                    human_id="instance_{0}_{1}".format(node_id, index),
+                    flavor={'id': index % flavor_count},
+                    metadata={"optimize": True})
+                setattr(instance, 'OS-EXT-STS:vm_state', 'active')
+                setattr(instance, 'OS-EXT-SRV-ATTR:host',
+                        "hostname_{0}".format(node_id))
+                self.instances.append(instance)
+        self.requests = 0
+
+    def _request(self, result):
+        self.requests += 1
+        time.sleep(self.latency)
+        return result
+
+    def get_compute_node_list(self):
+        return self._request(self.nodes)
+
+    def get_service(self, service_id):
+        return self._request(self.services[service_id])
+
+    def get_service_list(self):
+        return self._request(self.services)
+
+    def get_flavor(self, flavor_id):
+        return self._request(self.flavors[flavor_id])
+
+    def get_flavor_list(self):
+        return self._request(self.flavors)
+
+    def get_instance_list(self, marker=None, limit=-1):
+        start = 0
+        if marker is not None:
+            start = [instance.id for instance in self.instances].index(
+                marker) + 1
+        end = len(self.instances) if limit == -1 else start + limit
+        return self._request(self.instances[start:end])
+
+
+def measure_collector(node_count, instances_per_node, latency, page_size):
+    """Build the model with the Nova collector and return its build time"""
+    nova_helper = FakeNovaHelper(node_count, instances_per_node, latency)
+    with mock.patch.object(nova.nova_helper, 'NovaHelper',
+                           return_value=nova_helper):
+        builder = nova.ModelBuilder(mock.Mock(), page_size=page_size)
+        started_at = time.time()
+        builder.execute()
+        return time.time() - started_at, nova_helper.requests
+
+
+def measure_serialization(node_count, instances_per_node):
+    """Serialize a model back and forth in the XML and msgpack formats
+
+    :return: dict of (size, serialization time, deserialization time) by
+             format
+    """
+    # The metadata is written in XML as the Python representation of the
+    # dict, which from_xml cannot parse back unless it is empty
+    model = generate_model(node_count, instances_per_node, metadata={})
+    results = {}
+    for name, dump, load in (
+            ("xml", model.to_xml, model_root.ModelRoot.from_xml),
+            ("msgpack", model.to_msgpack, model_root.ModelRoot.from_msgpack)):
+        started_at = time.time()
+        data = dump()
+        dump_time = time.time() - started_at
+        started_at = time.time()
+        load(data)
+        load_time = time.time() - started_at
+        results[name] = (len(data), dump_time, load_time)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the cluster data model.")
+    parser.add_argument("--nodes", type=int, default=100)
+    parser.add_argument("--instances-per-node", type=int, default=20)
+    subparsers = parser.add_subparsers(dest="benchmark")
+
+    audits_parser = subparsers.add_parser(
+        "audits", help="Measure the throughput of concurrent audits reading "
+                       "the model.")
+    audits_parser.add_argument("--audits", type=int, default=64)
+    audits_parser.add_argument("--concurrency", type=int, nargs="+",
+                               default=[1, 2, 4, 8, 16])
+
+    subparsers.add_parser(
+        "memory", help="Measure the memory footprint of the model, as well "
+                       "as the time it takes to snapshot and to deep copy "
+                       "it. Use --nodes 5000 for a 100k instance model.")
+
+    collector_parser = subparsers.add_parser(
+        "collector", help="Measure the time it takes to build the model "
+                          "with the Nova collector.")
+    collector_parser.add_argument("--latency", type=float, default=0.05,
+                                  help="Latency of the Nova API in seconds.")
+    collector_parser.add_argument("--page-size", type=int, default=1000)
+
+    subparsers.add_parser(
+        "serialization", help="Measure the size of the serialized model and "
+                              "the time it takes to serialize and to "
+                              "deserialize it, in XML and with msgpack. Use "
+                              "--nodes 5000 for a 100k instance model.")
+    args = parser.parse_args()
+
+    if args.benchmark == "serialization":
+        results = measure_serialization(args.nodes, args.instances_per_node)
+        print("%-10s %12s %12s %12s" % (
+            "format", "size (MiB)", "dump (s)", "load (s)"))
+        for name in ("xml", "msgpack"):
+            size, dump_time, load_time = results[name]
+            print("%-10s %12.1f %12.3f %12.3f" % (
+                name, size / 1024.0 / 1024.0, dump_time, load_time))
+        return
+
+    if args.benchmark == "collector":
+        instance_count = args.nodes * args.instances_per_node
+        build_time, requests = measure_collector(
+            args.nodes, args.instances_per_node, args.latency,
+            args.page_size)
+        print("instances:      %d" % instance_count)
+        print("requests:       %d" % requests)
+        print("build time:     %.3f s (%.3f s per 10k instances)" % (
+            build_time, build_time * 10000 / instance_count))
+        return
+
+    if args.benchmark == "memory":
+        instance_count = args.nodes * args.instances_per_node
+        used, snapshot_time, deepcopy_time = measure_memory(
+            args.nodes, args.instances_per_node)
+        print("instances:      %d" % instance_count)
+        print("memory:         %.1f MiB (%d bytes per instance)" % (
+            used / 1024.0 / 1024.0, used // instance_count))
+        print("snapshot time:  %.3f s" % snapshot_time)
+        print("deepcopy time:  %.3f s" % deepcopy_time)
+        return
+
+    model = generate_model(args.nodes, args.instances_per_node)
+    print("%-12s %20s %20s" % (
+        "concurrency", "global lock (aud/s)", "model lock (aud/s)"))
+    for concurrency in args.concurrency:
+        print("%-12d %20.2f %20.2f" % (
+            concurrency,
+            run_audits(model, concurrency, args.audits, global_lock=True),
+            run_audits(model, concurrency, args.audits)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+# -*- encoding: utf-8 -*-
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from watcher.datasource import base
+
+
+class FakeDataSourceManager(object):
+    """Datasource manager answering with the fake metrics of a datasource
+
+    :param datasource: name of the faked datasource, either 'ceilometer'
+                       or 'gnocchi'
+    :param get_statistics: ``mock_get_statistics`` method of the fake
+                           metrics of this datasource
+    """
+
+    def __init__(self, datasource, get_statistics):
+        self.datasource = datasource
+        self.get_statistics = get_statistics
+
+    def statistic_aggregation(self, resource_id, metric, period,
+                              aggregate='mean', granularity=300):
+        metric_name = base.CEILOMETER_METRIC_MAP[metric]
+        if self.datasource == 'gnocchi':
+            return self.get_statistics(
+                resource_id=resource_id, metric=metric_name,
+                granularity=granularity, start_time=None, stop_time=None,
+                aggregation=aggregate)
+        return self.get_statistics(
+            resource_id=resource_id, meter_name=metric_name, period=period,
+            aggregate=aggregate)
+
+    def statistic_aggregation_bulk(self, resource_ids, metrics, period,
+                                   aggregate='mean', granularity=300):
+        return {resource_id: {metric: self.statistic_aggregation(
+                resource_id, metric, period, aggregate, granularity)
+                for metric in metrics}
+                for resource_id in resource_ids}
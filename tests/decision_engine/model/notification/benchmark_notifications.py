@@ -0,0 +1,167 @@
+# -*- encoding: utf-8 -*-
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Benchmark of the dispatching of the notifications to the model endpoints
+
+Run with::
+
+    python -m \
+        watcher.tests.decision_engine.model.notification.\
+benchmark_notifications --notifications 100000
+"""
+
+from __future__ import print_function
+
+import argparse
+import collections
+import os
+import random
+import time
+
+import mock
+from oslo_messaging.notify import dispatcher
+from oslo_serialization import jsonutils
+
+from watcher.decision_engine.model.notification import cinder as cnotification
+from watcher.decision_engine.model.notification import filtering
+from watcher.decision_engine.model.notification import nova as novanotification
+
+# Share of each kind of notification in the stream, the ones matching no
+# endpoint being sent on the same topic by the other services
+STREAM = (
+    (30, "instance-update.json"),
+    (5, "instance-create.json"),
+    (5, "instance-delete-end.json"),
+    (10, "scenario3_legacy_instance-update.json"),
+    (2, "scenario3_legacy_instance-create-end.json"),
+    (2, "scenario3_legacy_instance-delete-end.json"),
+    (1, "scenario3_legacy_livemigration-post-dest-end.json"),
+    (5, "service-update.json"),
+    (10, "capacity.json"),
+    (3, "scenario_1_volume-create.json"),
+    (3, "scenario_1_volume-attach.json"),
+    (2, "scenario_1_volume-detach.json"),
+    (2, "scenario_1_volume-delete.json"),
+    (5, {"event_type": "compute.instance.exists",
+         "publisher_id": "nova-compute:host1"}),
+    (5, {"event_type": "compute.metrics.update",
+         "publisher_id": "nova-compute:host1"}),
+    (5, {"event_type": "scheduler.select_destinations.end",
+         "publisher_id": "scheduler.host1"}),
+    (5, {"event_type": "volume.usage",
+         "publisher_id": "volume.host_0@backend_0#pool_0"}),
+)
+
+
+class Incoming(object):
+
+    def __init__(self, message):
+        self.ctxt = {}
+        self.message = message
+
+
+def load_message(filename):
+    data_folder = os.path.join(
+        os.path.abspath(os.path.dirname(__file__)), "data")
+    with open(os.path.join(data_folder, filename), 'rb') as json_file:
+        message = jsonutils.load(json_file)
+    message.setdefault('priority', 'INFO')
+    return message
+
+
+def generate_stream(count, seed=0):
+    """Build a shuffled stream of notifications following STREAM"""
+    messages = []
+    for weight, message in STREAM:
+        if not isinstance(message, dict):
+            message = load_message(message)
+        else:
+            message = dict(message, payload={}, priority='INFO')
+        messages.extend([message] * weight)
+    rand = random.Random(seed)
+    return [Incoming(rand.choice(messages)) for _ in range(count)]
+
+
+def get_endpoints(handled):
+    """The endpoints of the Nova and Cinder collectors
+
+    :param handled: counter of the notifications handled by each endpoint
+    """
+    collector = mock.Mock()
+    endpoints = [
+        novanotification.ServiceUpdated(collector),
+        novanotification.InstanceCreated(collector),
+        novanotification.InstanceUpdated(collector),
+        novanotification.InstanceDeletedEnd(collector),
+        novanotification.LegacyInstanceCreatedEnd(collector),
+        novanotification.LegacyInstanceUpdated(collector),
+        novanotification.LegacyInstanceDeletedEnd(collector),
+        novanotification.LegacyLiveMigratedEnd(collector),
+        cnotification.CapacityNotificationEndpoint(collector),
+        cnotification.VolumeCreateEnd(collector),
+        cnotification.VolumeDeleteEnd(collector),
+        cnotification.VolumeUpdateEnd(collector),
+        cnotification.VolumeAttachEnd(collector),
+        cnotification.VolumeDetachEnd(collector),
+        cnotification.VolumeResizeEnd(collector),
+    ]
+    for endpoint in endpoints:
+        # Only the dispatching is measured, not the model updates
+        def info(ctxt, publisher_id, event_type, payload, metadata,
+                 name=type(endpoint).__name__):
+            handled[name] += 1
+        endpoint.info = info
+    return endpoints
+
+
+def measure_dispatch(stream, indexed):
+    """Dispatch the stream and return the time it took per notification"""
+    handled = collections.Counter()
+    endpoints = get_endpoints(handled)
+    if indexed:
+        endpoints = [filtering.NotificationDispatchIndex(endpoints)]
+    notification_dispatcher = dispatcher.NotificationDispatcher(
+        endpoints, serializer=None)
+
+    started_at = time.time()
+    for incoming in stream:
+        notification_dispatcher.dispatch(incoming)
+    return (time.time() - started_at) / len(stream), handled
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the dispatching of the notifications.")
+    parser.add_argument("--notifications", type=int, default=100000)
+    args = parser.parse_args()
+
+    stream = generate_stream(args.notifications)
+    results = {}
+    for name, indexed in (("filters", False), ("index", True)):
+        results[name] = measure_dispatch(stream, indexed)
+
+    if results["filters"][1] != results["index"][1]:
+        raise AssertionError("The notifications were not dispatched to the "
+                             "same endpoints")
+    print("notifications:  %d (%d handled)" % (
+        args.notifications, sum(results["index"][1].values())))
+    for name in ("filters", "index"):
+        print("%-15s %.2f us per notification" % (
+            name + ":", results[name][0] * 1e6))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+# -*- encoding: utf-8 -*-
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+
+import mock
+
+from watcher.decision_engine.model import model_root
+from watcher.decision_engine.model.notification import batching
+from watcher.decision_engine.model.notification import nova as novanotification
+from watcher.tests import base
+
+
+class TestNotificationBuffer(base.TestCase):
+
+    def setUp(self):
+        super(TestNotificationBuffer, self).setUp()
+        self.model = model_root.ModelRoot()
+        self.collector = mock.Mock(cluster_data_model=self.model)
+        self.buffer = batching.NotificationBuffer(self.collector)
+        self.endpoint = mock.Mock(spec=novanotification.InstanceUpdated)
+        self.endpoint.get_resource_key.side_effect = (
+            lambda payload: payload.get('uuid'))
+        # Flush the buffer on demand only
+        self.config(notification_batch_window=60,
+                    group='watcher_decision_engine')
+        self.addCleanup(self.buffer.flush)
+
+    def put(self, payload):
+        self.buffer.put(self.endpoint, mock.Mock(), 'nova-compute',
+                        'instance.update', payload, {})
+
+    def test_wrap(self):
+        endpoints = self.buffer.wrap([self.endpoint])
+
+        self.assertEqual(1, len(endpoints))
+        self.assertIsInstance(
+            endpoints[0], batching.BufferedNotificationEndpoint)
+        self.assertEqual(self.endpoint.filter_rule, endpoints[0].filter_rule)
+        endpoints[0].info(mock.Mock(), 'nova-compute', 'instance.update',
+                          {'uuid': 'instance_1'}, {})
+        self.assertEqual(1, self.buffer.depth)
+        self.assertFalse(self.endpoint.info.called)
+
+    def test_wrap_disabled(self):
+        self.config(notification_batch_window=0,
+                    group='watcher_decision_engine')
+
+        self.assertEqual([self.endpoint], self.buffer.wrap([self.endpoint]))
+
+    def test_coalesce(self):
+        self.put({'uuid': 'instance_1', 'state': 'building'})
+        self.put({'uuid': 'instance_2', 'state': 'active'})
+        self.put({'uuid': 'instance_1', 'state': 'active'})
+        self.put({'state': 'unknown'})
+        self.put({'state': 'unknown'})
+
+        self.assertEqual(4, self.buffer.depth)
+        self.assertGreaterEqual(self.buffer.lag, 0)
+
+        self.buffer.flush()
+
+        self.assertEqual(
+            [{'uuid': 'instance_2', 'state': 'active'},
+             {'uuid': 'instance_1', 'state': 'active'},
+             {'state': 'unknown'},
+             {'state': 'unknown'}],
+            [call[0][3] for call in self.endpoint.info.call_args_list])
+        self.assertEqual(0, self.buffer.depth)
+        self.assertEqual(0, self.buffer.lag)
+        stats = self.buffer.get_stats()
+        self.assertEqual(5, stats['received'])
+        self.assertEqual(1, stats['coalesced'])
+        self.assertEqual(4, stats['applied'])
+        self.assertEqual(4, stats['last_batch_size'])
+
+    def test_coalesce_per_endpoint(self):
+        endpoint = mock.Mock(spec=novanotification.InstanceDeletedEnd)
+        endpoint.get_resource_key.side_effect = (
+            lambda payload: payload.get('uuid'))
+        self.put({'uuid': 'instance_1'})
+        self.buffer.put(endpoint, mock.Mock(), 'nova-compute',
+                        'instance.delete.end', {'uuid': 'instance_1'}, {})
+
+        self.assertEqual(2, self.buffer.depth)
+
+        self.buffer.flush()
+
+        self.assertEqual(1, self.endpoint.info.call_count)
+        self.assertEqual(1, endpoint.info.call_count)
+        self.assertEqual(0, self.buffer.get_stats()['coalesced'])
+
+    def test_flush_prefetches_before_locking(self):
+        def prefetch(*args):
+            self.assertFalse(self.model._lock.is_writer())
+        self.endpoint.prefetch.side_effect = prefetch
+        self.put({'uuid': 'instance_1'})
+        self.put({'uuid': 'instance_2'})
+
+        self.buffer.flush()
+
+        self.assertEqual(2, self.endpoint.prefetch.call_count)
+        self.assertEqual(2, self.endpoint.info.call_count)
+        self.endpoint.clear_prefetched.assert_called_once_with()
+
+    def test_flush_holds_model_lock(self):
+        def info(*args):
+            self.assertTrue(self.model._lock.is_writer())
+        self.endpoint.info.side_effect = info
+        self.put({'uuid': 'instance_1'})
+
+        self.buffer.flush()
+
+        self.assertEqual(1, self.endpoint.info.call_count)
+        self.assertFalse(self.model._lock.is_writer())
+
+    def test_flush_error(self):
+        self.endpoint.info.side_effect = [Exception, None]
+        self.put({'uuid': 'instance_1'})
+        self.put({'uuid': 'instance_2'})
+
+        self.buffer.flush()
+
+        self.assertEqual(2, self.endpoint.info.call_count)
+        self.assertEqual(0, self.buffer.depth)
+
+    def test_flush_model_error(self):
+        self.put({'uuid': 'instance_1', 'state': 'building'})
+        self.put({'uuid': 'instance_2', 'state': 'active'})
+
+        with mock.patch.object(self.model, 'batch_update',
+                               side_effect=Exception):
+            self.buffer.flush()
+
+        self.assertFalse(self.endpoint.info.called)
+        self.assertEqual(2, self.buffer.depth)
+        self.assertIsNotNone(self.buffer._timer)
+
+        self.put({'uuid': 'instance_1', 'state': 'active'})
+        self.buffer.flush()
+
+        self.assertEqual(
+            [{'uuid': 'instance_2', 'state': 'active'},
+             {'uuid': 'instance_1', 'state': 'active'}],
+            [call[0][3] for call in self.endpoint.info.call_args_list])
+        self.assertEqual(0, self.buffer.depth)
+
+    def test_put_malformed_payload(self):
+        self.endpoint.get_resource_key.side_effect = KeyError('uuid')
+        self.put({})
+        self.put({})
+
+        self.assertEqual(2, self.buffer.depth)
+
+        self.buffer.flush()
+
+        self.assertEqual(2, self.endpoint.info.call_count)
+
+    def test_flush_when_full(self):
+        self.config(notification_batch_size=2,
+                    group='watcher_decision_engine')
+        self.put({'uuid': 'instance_1'})
+        self.assertFalse(self.endpoint.info.called)
+
+        self.put({'uuid': 'instance_2'})
+
+        self.assertEqual(2, self.endpoint.info.call_count)
+        self.assertEqual(0, self.buffer.depth)
+
+    def test_flush_after_window(self):
+        self.config(notification_batch_window=0.01,
+                    group='watcher_decision_engine')
+        self.put({'uuid': 'instance_1'})
+
+        for _ in range(100):
+            if self.endpoint.info.called:
+                break
+            time.sleep(0.01)
+
+        self.assertEqual(1, self.endpoint.info.call_count)
+        self.assertEqual(0, self.buffer.depth)
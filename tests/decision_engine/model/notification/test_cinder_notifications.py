@@ -325,6 +325,61 @@ class TestCinderNotifications(NotificationTestCase):
         self.assertEqual(40, pool_1.allocated_capacity_gb)
         self.assertEqual(40, pool_1.provisioned_capacity_gb)
 
+    @mock.patch.object(cinder_helper, 'CinderHelper')
+    def test_cinder_capacity_node_notfound_prefetched(self, m_cinder_helper):
+        """test consuming capacity, new node queried before processing"""
+
+        return_pool_mock = mock.Mock()
+        return_pool_mock.configure_mock(
+            name='host_2@backend_2#pool_0',
+            total_volumes='2',
+            total_capacity_gb='500',
+            free_capacity_gb='460',
+            provisioned_capacity_gb='40',
+            allocated_capacity_gb='40')
+        return_node_mock = mock.Mock()
+        return_node_mock.configure_mock(
+            host='host_2@backend_2',
+            zone='nova',
+            state='up',
+            status='enabled')
+        m_cinder = mock.Mock()
+        m_cinder.get_storage_pool_by_name.return_value = return_pool_mock
+        m_cinder.get_storage_node_by_name.return_value = return_node_mock
+        m_cinder.get_volume_type_by_backendname.return_value = 'backend_2'
+        m_cinder_helper.return_value = m_cinder
+
+        storage_model = self.fake_cdmc.generate_scenario_1()
+        self.fake_cdmc.cluster_data_model = storage_model
+        handler = cnotification.CapacityNotificationEndpoint(self.fake_cdmc)
+
+        message = self.load_message('scenario_1_capacity_node_notfound.json')
+        args = (self.context, message['publisher_id'],
+                message['event_type'], message['payload'],
+                self.FAKE_METADATA)
+        handler.prefetch(*args)
+
+        pool_1_name = 'host_2@backend_2#pool_0'
+        m_cinder.get_storage_pool_by_name.assert_called_once_with(
+            pool_1_name)
+        m_cinder.get_storage_node_by_name.assert_called_once_with(
+            'host_2@backend_2')
+        m_cinder.reset_mock()
+
+        handler.info(*args)
+        handler.clear_prefetched()
+
+        # the model was updated without querying the API again
+        self.assertFalse(m_cinder.get_storage_pool_by_name.called)
+        self.assertFalse(m_cinder.get_storage_node_by_name.called)
+        self.assertFalse(m_cinder.get_volume_type_by_backendname.called)
+        storage_node = storage_model.get_node_by_pool_name(pool_1_name)
+        self.assertEqual('host_2@backend_2', storage_node.host)
+        self.assertEqual('backend_2', storage_node.volume_type)
+        pool_1 = storage_model.get_pool_by_pool_name(pool_1_name)
+        self.assertEqual(500, pool_1.total_capacity_gb)
+        self.assertEqual({}, handler._prefetched)
+
     @mock.patch.object(cinder_helper, 'CinderHelper')
     def test_cinder_volume_create(self, m_cinder_helper):
         """test creating volume in existing pool and node"""
@@ -19,6 +19,7 @@
 import os
 
 import mock
+import oslo_messaging as om
 from oslo_serialization import jsonutils
 
 from watcher.common import context
@@ -36,6 +37,15 @@ class DummyManager(fake_managers.FakeManager):
         return [DummyNotification(self.fake_cdmc)]
 
 
+class IndexedDummyManager(DummyManager):
+
+    @property
+    def notification_endpoints(self):
+        return [filtering.NotificationDispatchIndex(
+            [DummyNotification(self.fake_cdmc),
+             OtherDummyNotification(self.fake_cdmc)])]
+
+
 class DummyNotification(base.NotificationEndpoint):
 
     @property
@@ -50,6 +60,16 @@ class DummyNotification(base.NotificationEndpoint):
         pass
 
 
+class OtherDummyNotification(DummyNotification):
+
+    @property
+    def filter_rule(self):
+        return filtering.NotificationFilter(
+            publisher_id=r'.*',
+            event_type=r'compute.other',
+        )
+
+
 class NotificationTestCase(base_test.TestCase):
 
     def load_message(self, filename):
@@ -106,3 +126,116 @@ class TestReceiveNotifications(NotificationTestCase):
         de_service.notification_handler.dispatcher.dispatch(incoming)
 
         self.assertEqual(0, m_info.call_count)
+
+    @mock.patch.object(watcher_service.ServiceHeartbeat, 'send_beat')
+    @mock.patch.object(OtherDummyNotification, 'info')
+    @mock.patch.object(DummyNotification, 'info')
+    def test_receive_indexed_notification(self, m_info, m_other_info,
+                                          m_heartbeat):
+        message = {
+            'publisher_id': 'nova-compute',
+            'event_type': 'compute.dummy',
+            'payload': {'data': {'nested': 'TEST'}},
+            'priority': 'INFO',
+        }
+        de_service = watcher_service.Service(IndexedDummyManager)
+        incoming = mock.Mock(ctxt=self.context.to_dict(), message=message)
+
+        de_service.notification_handler.dispatcher.dispatch(incoming)
+
+        m_info.assert_called_once_with(
+            self.context, 'nova-compute', 'compute.dummy',
+            {'data': {'nested': 'TEST'}},
+            {'message_id': None, 'timestamp': None})
+        self.assertEqual(0, m_other_info.call_count)
+
+
+class TestNotificationDispatchIndex(NotificationTestCase):
+
+    def setUp(self):
+        super(TestNotificationDispatchIndex, self).setUp()
+        self.dummy = DummyNotification(mock.Mock())
+        self.other = OtherDummyNotification(mock.Mock())
+        self.index = filtering.NotificationDispatchIndex(
+            [self.dummy, self.other])
+
+    def test_get_candidates(self):
+        candidates = self.index.get_candidates('compute.other')
+
+        self.assertEqual([self.other], [ep for _, ep in candidates])
+        self.assertEqual((), self.index.get_candidates('compute.unknown'))
+        self.assertIs(candidates, self.index.get_candidates('compute.other'))
+
+    def test_endpoint_without_filter_is_always_candidate(self):
+        endpoint = mock.Mock(spec=['info'])
+        index = filtering.NotificationDispatchIndex([endpoint, self.other])
+
+        candidates = index.get_candidates('compute.unknown')
+
+        self.assertEqual([(None, endpoint)], list(candidates))
+
+    @mock.patch.object(OtherDummyNotification, 'info')
+    @mock.patch.object(DummyNotification, 'info')
+    def test_only_candidates_are_screened(self, m_info, m_other_info):
+        with mock.patch.object(filtering.NotificationFilter, 'match',
+                               return_value=True) as m_match:
+            index = filtering.NotificationDispatchIndex(
+                [self.dummy, self.other])
+            index.info(self.context, 'nova-compute', 'compute.other',
+                       {}, {'message_id': None})
+
+        self.assertEqual(1, m_match.call_count)
+        self.assertEqual(0, m_info.call_count)
+        m_other_info.assert_called_once_with(
+            self.context, 'nova-compute', 'compute.other',
+            {}, {'message_id': None})
+
+    def test_requeue_stops_dispatching(self):
+        requeue = mock.Mock(spec=['info'])
+        requeue.info.return_value = om.NotificationResult.REQUEUE
+        endpoint = mock.Mock(spec=['info'])
+        index = filtering.NotificationDispatchIndex([requeue, endpoint])
+
+        result = index.info(self.context, 'nova-compute', 'compute.dummy',
+                            {}, {})
+
+        self.assertEqual(om.NotificationResult.REQUEUE, result)
+        self.assertEqual(0, endpoint.info.call_count)
+
+    def test_error_does_not_stop_dispatching(self):
+        failing = mock.Mock(spec=['info'])
+        failing.info.side_effect = Exception
+        endpoint = mock.Mock(spec=['info'])
+        index = filtering.NotificationDispatchIndex([failing, endpoint])
+
+        index.info(self.context, 'nova-compute', 'compute.dummy', {}, {})
+
+        self.assertEqual(1, failing.info.call_count)
+        endpoint.info.assert_called_once_with(
+            self.context, 'nova-compute', 'compute.dummy', {}, {})
+
+
+class TestNotificationFilter(base_test.TestCase):
+
+    def test_match_event_type(self):
+        notification_filter = filtering.NotificationFilter(
+            event_type='compute.instance.update')
+
+        self.assertTrue(
+            notification_filter.match_event_type('compute.instance.update'))
+        self.assertFalse(
+            notification_filter.match_event_type('instance.update'))
+        self.assertFalse(notification_filter.match_event_type(None))
+        self.assertTrue(
+            filtering.NotificationFilter().match_event_type('anything'))
+
+    def test_match_callable(self):
+        notification_filter = filtering.NotificationFilter(
+            payload={'data': {'state': lambda state: state != 'active'}})
+
+        self.assertTrue(notification_filter.match(
+            {}, 'nova-compute', 'compute.dummy', {},
+            {'data': {'state': 'active'}}))
+        self.assertFalse(notification_filter.match(
+            {}, 'nova-compute', 'compute.dummy', {},
+            {'data': {'state': 'error'}}))
@@ -17,6 +17,7 @@
 # limitations under the License.
 
 import os
+import time
 
 import mock
 from oslo_serialization import jsonutils
@@ -323,6 +324,27 @@ class TestNovaNotifications(NotificationTestCase):
             exception.InstanceNotFound,
             compute_model.get_instance_by_uuid, instance0_uuid)
 
+    def test_nova_resource_keys(self):
+        service_update = self.load_message(
+            'scenario3_service-update-disabled.json')
+        instance_update = self.load_message('scenario3_instance-update.json')
+        legacy_instance_update = self.load_message(
+            'scenario3_legacy_instance-update.json')
+
+        self.assertEqual(
+            ('compute_node', 'Node_0'),
+            novanotification.ServiceUpdated(
+                self.fake_cdmc).get_resource_key(service_update['payload']))
+        self.assertEqual(
+            ('instance', '73b09e16-35b7-4922-804e-e8f5d9b740fc'),
+            novanotification.InstanceUpdated(
+                self.fake_cdmc).get_resource_key(instance_update['payload']))
+        self.assertEqual(
+            ('instance', '73b09e16-35b7-4922-804e-e8f5d9b740fc'),
+            novanotification.LegacyInstanceUpdated(
+                self.fake_cdmc).get_resource_key(
+                    legacy_instance_update['payload']))
+
 
 class TestLegacyNovaNotifications(NotificationTestCase):
 
@@ -521,3 +543,157 @@ class TestLegacyNovaNotifications(NotificationTestCase):
         self.assertRaises(
             exception.InstanceNotFound,
             compute_model.get_instance_by_uuid, instance0_uuid)
+
+
+class TestComputeNodeResolver(NotificationTestCase):
+
+    FAKE_METADATA = {'message_id': None, 'timestamp': None}
+
+    def setUp(self):
+        super(TestComputeNodeResolver, self).setUp()
+        self.fake_cdmc = faker_cluster_state.FakerModelCollector()
+        self.compute_model = self.fake_cdmc.generate_scenario_3_with_2_nodes()
+        self.collector = mock.Mock(
+            cluster_data_model=self.compute_model,
+            config={'node_resolution_interval': 0})
+        self.resolver = novanotification.ComputeNodeResolver(self.collector)
+        self.collector.node_resolver = self.resolver
+        p_start_worker = mock.patch.object(self.resolver, '_start_worker')
+        self.m_start_worker = p_start_worker.start()
+        self.addCleanup(p_start_worker.stop)
+        p_nova_helper = mock.patch.object(nova_helper, "NovaHelper")
+        self.m_nova_helper = p_nova_helper.start().return_value
+        self.addCleanup(p_nova_helper.stop)
+
+    @staticmethod
+    def fake_compute_node(hostname):
+        return mock.Mock(
+            id=3, hypervisor_hostname=hostname, state='up',
+            status='enabled', memory_mb=7777, vcpus=42, free_disk_gb=974,
+            local_gb=1337, service={'host': hostname})
+
+    def send_instance_update(self):
+        handler = novanotification.InstanceUpdated(self.collector)
+        message = self.load_message('scenario3_notfound_instance-update.json')
+        handler.info(
+            ctxt=self.context,
+            publisher_id=message['publisher_id'],
+            event_type=message['event_type'],
+            payload=message['payload'],
+            metadata=self.FAKE_METADATA,
+        )
+
+    def test_unknown_node_placeholder_resolved(self):
+        self.m_nova_helper.get_compute_node_by_hostname.side_effect = (
+            self.fake_compute_node)
+        instance0_uuid = '9966d6bd-a45c-4e1c-9d57-3054899a3ec7'
+
+        self.send_instance_update()
+
+        m_get_compute_node_by_hostname = (
+            self.m_nova_helper.get_compute_node_by_hostname)
+        self.assertFalse(m_get_compute_node_by_hostname.called)
+        self.m_start_worker.assert_called_once_with()
+        self.assertEqual(1, self.resolver.depth)
+        node_2 = self.compute_model.get_node_by_uuid('Node_2')
+        self.assertEqual(element.ServiceState.DISABLED.value, node_2.status)
+        self.assertEqual(0, node_2.memory)
+        self.assertEqual(
+            node_2, self.compute_model.get_node_by_instance_uuid(
+                instance0_uuid))
+
+        self.resolver.resolve_pending()
+
+        m_get_compute_node_by_hostname.assert_called_once_with('Node_2')
+        self.assertEqual(0, self.resolver.depth)
+        node_2 = self.compute_model.get_node_by_uuid('Node_2')
+        self.assertEqual(element.ServiceState.ENABLED.value, node_2.status)
+        self.assertEqual(7777, node_2.memory)
+        self.assertEqual(42, node_2.vcpus)
+        self.assertEqual(974, node_2.disk)
+        self.assertEqual(1337, node_2.disk_capacity)
+        self.assertEqual(
+            node_2, self.compute_model.get_node_by_instance_uuid(
+                instance0_uuid))
+
+    def test_unknown_node_not_found_removed(self):
+        self.m_nova_helper.get_compute_node_by_hostname.side_effect = (
+            exception.ComputeNodeNotFound(name="Node_2"))
+        instance0_uuid = '9966d6bd-a45c-4e1c-9d57-3054899a3ec7'
+
+        self.send_instance_update()
+        self.resolver.resolve_pending()
+
+        self.assertEqual(1, self.resolver.failed)
+        self.assertRaises(
+            exception.ComputeNodeNotFound,
+            self.compute_model.get_node_by_uuid, 'Node_2')
+        instance0 = self.compute_model.get_instance_by_uuid(instance0_uuid)
+        self.assertEqual(element.InstanceState.PAUSED.value, instance0.state)
+        self.assertRaises(
+            exception.ComputeNodeNotFound,
+            self.compute_model.get_node_by_instance_uuid, instance0_uuid)
+
+    def test_lookup_error_retried(self):
+        self.m_nova_helper.get_compute_node_by_hostname.side_effect = [
+            Exception, self.fake_compute_node('Node_2')]
+
+        self.send_instance_update()
+        self.resolver.resolve_pending()
+
+        self.assertEqual(0, self.resolver.failed)
+        self.assertEqual(1, self.resolver.depth)
+        node_2 = self.compute_model.get_node_by_uuid('Node_2')
+        self.assertEqual(0, node_2.memory)
+
+        self.resolver.resolve_pending()
+
+        self.assertEqual(2, self.resolver.lookups)
+        self.assertEqual(1, self.resolver.resolved)
+        self.assertEqual(0, self.resolver.depth)
+        self.assertEqual(
+            7777, self.compute_model.get_node_by_uuid('Node_2').memory)
+
+    def test_lookups_coalesced(self):
+        self.m_nova_helper.get_compute_node_list.return_value = [
+            self.fake_compute_node('Node_2'), self.fake_compute_node('Node_3')]
+
+        self.send_instance_update()
+        self.send_instance_update()
+        self.resolver.add_placeholder('Node_3')
+        self.resolver.resolve_pending()
+
+        self.assertEqual(1, self.resolver.lookups)
+        self.assertEqual(2, self.resolver.resolved)
+        self.m_nova_helper.get_compute_node_list.assert_called_once_with()
+        m_get_compute_node_by_hostname = (
+            self.m_nova_helper.get_compute_node_by_hostname)
+        self.assertFalse(m_get_compute_node_by_hostname.called)
+        self.assertEqual(
+            7777, self.compute_model.get_node_by_uuid('Node_3').memory)
+
+    def test_resolution_skipped_on_new_model(self):
+        self.send_instance_update()
+        self.collector.cluster_data_model = (
+            self.fake_cdmc.generate_scenario_3_with_2_nodes())
+
+        self.resolver.resolve_pending()
+
+        self.assertEqual(0, self.resolver.resolved)
+        self.assertEqual(0, self.resolver.failed)
+
+    def test_worker(self):
+        self.m_nova_helper.get_compute_node_by_hostname.side_effect = (
+            self.fake_compute_node)
+        resolver = novanotification.ComputeNodeResolver(self.collector)
+
+        resolver.add_placeholder('Node_2')
+        for _ in range(100):
+            if resolver._worker is None:
+                break
+            time.sleep(0.05)
+
+        self.assertIsNone(resolver._worker)
+        self.assertEqual(1, resolver.resolved)
+        self.assertEqual(
+            7777, self.compute_model.get_node_by_uuid('Node_2').memory)
@@ -16,6 +16,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import copy
+
 from watcher.decision_engine.model import element
 from watcher.tests import base
 
@@ -72,6 +74,63 @@ class TestElement(base.TestCase):
         el.as_xml_element()
 
 
+class TestCompactElement(base.TestCase):
+
+    def test_slots(self):
+        instance = element.Instance(uuid='FAKE_UUID')
+        self.assertFalse(hasattr(instance, '__dict__'))
+        self.assertRaises(AttributeError, setattr, instance, 'foo', 'bar')
+
+    def test_coerce_fields(self):
+        instance = element.Instance(
+            uuid='FAKE_UUID', memory='111', metadata='{"optimize": true}')
+        self.assertEqual(111, instance.memory)
+        self.assertEqual({'optimize': True}, instance.metadata)
+        self.assertEqual(element.InstanceState.ACTIVE.value, instance.state)
+        self.assertRaises(ValueError, setattr, instance, 'memory', -1)
+
+    def test_unset_field(self):
+        instance = element.Instance(uuid='FAKE_UUID')
+        self.assertFalse(instance.obj_attr_is_set('memory'))
+        self.assertNotIn('memory', instance)
+        self.assertIsNone(instance.get('memory', None))
+        self.assertRaises(NotImplementedError, getattr, instance, 'memory')
+
+    def test_dict_compat(self):
+        node = element.ComputeNode(uuid='FAKE_UUID', id=1)
+        node.update({'hostname': 'hostname', 'unknown': 'ignored'})
+        node['vcpus'] = 40
+
+        self.assertEqual('hostname', node['hostname'])
+        self.assertEqual(
+            {'uuid': 'FAKE_UUID', 'human_id': '', 'id': 1,
+             'hostname': 'hostname', 'vcpus': 40,
+             'status': element.ServiceState.ENABLED.value,
+             'state': element.ServiceState.ONLINE.value},
+            node.as_dict())
+
+    def test_deepcopy(self):
+        instance = element.Instance(
+            uuid='FAKE_UUID', metadata={'optimize': True})
+        instance_copy = copy.deepcopy(instance)
+
+        self.assertEqual(instance, instance_copy)
+        self.assertIsNot(instance.metadata, instance_copy.metadata)
+        instance_copy.state = element.InstanceState.ERROR.value
+        self.assertNotEqual(instance, instance_copy)
+
+    def test_primitive(self):
+        instance = element.Instance(
+            uuid='FAKE_UUID', memory=111, metadata={'optimize': True})
+        primitive = instance.obj_to_primitive()
+
+        self.assertEqual('Instance', primitive['watcher_object.name'])
+        self.assertEqual('{"optimize": true}',
+                         primitive['watcher_object.data']['metadata'])
+        self.assertEqual(
+            instance, element.Instance.obj_from_primitive(primitive))
+
+
 class TestStorageElement(base.TestCase):
 
     scenarios = [
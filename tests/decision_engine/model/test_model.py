@@ -16,7 +16,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import copy
 import os
+import threading
 
 from oslo_utils import uuidutils
 
@@ -167,6 +169,180 @@ class TestModel(base.TestCase):
         self.assertRaises(exception.IllegalArgumentException,
                           model.assert_instance, "valeur_qcq")
 
+    def test_snapshot_shares_elements(self):
+        fake_cluster = faker_cluster_state.FakerModelCollector()
+        model = fake_cluster.generate_scenario_1()
+        snapshot = model.snapshot()
+
+        self.assertIsNot(model, snapshot)
+        self.assertEqual(model.to_string(), snapshot.to_string())
+        self.assertIs(model.get_instance_by_uuid("INSTANCE_0"),
+                      snapshot.get_instance_by_uuid("INSTANCE_0"))
+
+    def test_snapshot_migrate_instance(self):
+        fake_cluster = faker_cluster_state.FakerModelCollector()
+        model = fake_cluster.generate_scenario_1()
+        expected_struct_str = model.to_string()
+        snapshot = model.snapshot()
+
+        instance = snapshot.get_instance_by_uuid("INSTANCE_0")
+        source = snapshot.get_node_by_instance_uuid("INSTANCE_0")
+        destination = snapshot.get_node_by_uuid("Node_1")
+        self.assertTrue(
+            snapshot.migrate_instance(instance, source, destination))
+
+        self.assertEqual(
+            destination, snapshot.get_node_by_instance_uuid("INSTANCE_0"))
+        self.assertEqual(
+            source, model.get_node_by_instance_uuid("INSTANCE_0"))
+        self.assertEqual(expected_struct_str, model.to_string())
+
+    def test_snapshot_remove_node(self):
+        fake_cluster = faker_cluster_state.FakerModelCollector()
+        model = fake_cluster.generate_scenario_1()
+        expected_struct_str = model.to_string()
+        snapshot = model.snapshot()
+
+        node = snapshot.get_node_by_uuid("Node_0")
+        for instance in snapshot.get_node_instances(node):
+            snapshot.delete_instance(instance)
+        snapshot.remove_node(node)
+
+        self.assertRaises(exception.ComputeNodeNotFound,
+                          snapshot.get_node_by_uuid, "Node_0")
+        self.assertEqual(node, model.get_node_by_uuid("Node_0"))
+        self.assertEqual(expected_struct_str, model.to_string())
+
+    def test_materialize_after_snapshot(self):
+        fake_cluster = faker_cluster_state.FakerModelCollector()
+        model = fake_cluster.generate_scenario_1()
+        snapshot = model.snapshot()
+
+        instance = model.materialize("INSTANCE_0")
+        instance.state = element.InstanceState.ERROR.value
+
+        self.assertIs(instance, model.get_instance_by_uuid("INSTANCE_0"))
+        self.assertIs(instance, model.materialize("INSTANCE_0"))
+        self.assertEqual(
+            element.InstanceState.ACTIVE.value,
+            snapshot.get_instance_by_uuid("INSTANCE_0").state)
+
+    def test_get_instances_by_state(self):
+        fake_cluster = faker_cluster_state.FakerModelCollector()
+        model = fake_cluster.generate_scenario_1()
+        active = element.InstanceState.ACTIVE.value
+        error = element.InstanceState.ERROR.value
+        all_instances = model.get_all_instances()
+        self.assertEqual(all_instances, model.get_instances_by_state(active))
+        self.assertEqual({}, model.get_instances_by_state(error))
+
+        snapshot = model.snapshot()
+        instance = model.materialize("INSTANCE_0")
+        instance.state = error
+
+        self.assertEqual({"INSTANCE_0": instance},
+                         model.get_instances_by_state(error))
+        self.assertNotIn("INSTANCE_0", model.get_instances_by_state(active))
+        self.assertEqual(all_instances,
+                         snapshot.get_instances_by_state(active))
+
+        model.remove_instance(instance)
+        self.assertEqual({}, model.get_instances_by_state(error))
+
+    def test_get_instances_by_metadata_key(self):
+        model = model_root.ModelRoot()
+        instance = element.Instance(
+            uuid=uuidutils.generate_uuid(), state="active",
+            metadata={"optimize": True})
+        model.add_instance(instance)
+
+        self.assertEqual({instance.uuid: instance},
+                         model.get_instances_by_metadata_key("optimize"))
+        self.assertEqual({}, model.get_instances_by_metadata_key("other"))
+
+        model.materialize(instance.uuid).metadata = {"other": False}
+
+        self.assertEqual({}, model.get_instances_by_metadata_key("optimize"))
+        self.assertEqual([instance.uuid],
+                         list(model.get_instances_by_metadata_key("other")))
+
+    def test_concurrent_reads(self):
+        fake_cluster = faker_cluster_state.FakerModelCollector()
+        model = fake_cluster.generate_scenario_1()
+        node = element.ComputeNode(uuid=uuidutils.generate_uuid())
+        result = {}
+
+        def read():
+            result['instances'] = model.get_all_instances()
+
+        def write():
+            model.add_node(node)
+
+        with model._lock.read_lock():
+            reader = threading.Thread(target=read)
+            reader.start()
+            reader.join(5)
+            self.assertFalse(reader.is_alive())
+            self.assertEqual(35, len(result['instances']))
+
+            writer = threading.Thread(target=write)
+            writer.start()
+            writer.join(0.1)
+            self.assertTrue(writer.is_alive())
+            self.assertNotIn(node.uuid, model.get_all_compute_nodes())
+
+        writer.join(5)
+        self.assertFalse(writer.is_alive())
+        self.assertIn(node.uuid, model.get_all_compute_nodes())
+
+    def test_reentrant_write(self):
+        fake_cluster = faker_cluster_state.FakerModelCollector()
+        model = fake_cluster.generate_scenario_1()
+        instance = element.Instance(uuid=uuidutils.generate_uuid())
+        model.add_instance(instance)
+
+        model.map_instance(instance.uuid, "Node_0")
+
+        self.assertEqual(model.get_node_by_uuid("Node_0"),
+                         model.get_node_by_instance_uuid(instance.uuid))
+
+    def test_deepcopy(self):
+        fake_cluster = faker_cluster_state.FakerModelCollector()
+        model = fake_cluster.generate_scenario_1()
+        model_copy = copy.deepcopy(model)
+
+        self.assertIsNot(model._lock, model_copy._lock)
+        self.assertEqual(model.to_string(), model_copy.to_string())
+
+    def test_msgpack_round_trip(self):
+        fake_cluster = faker_cluster_state.FakerModelCollector()
+        model = fake_cluster.generate_scenario_1()
+        # An unmapped instance with some unset fields
+        model.add_instance(element.Instance(
+            uuid=uuidutils.generate_uuid(), metadata={'optimize': True}))
+
+        model_copy = model_root.ModelRoot.from_msgpack(model.to_msgpack())
+
+        self.assertEqual(model.to_string(), model_copy.to_string())
+        self.assertEqual(model.get_all_instances(),
+                         model_copy.get_all_instances())
+        self.assertEqual(model.get_all_compute_nodes(),
+                         model_copy.get_all_compute_nodes())
+        self.assertEqual(sorted(model.edges()), sorted(model_copy.edges()))
+        self.assertEqual(
+            sorted(model.get_instances_by_metadata_key('optimize')),
+            sorted(model_copy.get_instances_by_metadata_key('optimize')))
+
+    def test_get_node_by_instance_uuid_unmapped(self):
+        model = model_root.ModelRoot()
+        instance = element.Instance(uuid=uuidutils.generate_uuid())
+        model.add_instance(instance)
+
+        self.assertRaises(exception.ComputeNodeNotFound,
+                          model.get_node_by_instance_uuid, instance.uuid)
+        self.assertRaises(exception.ComputeResourceNotFound,
+                          model.get_node_by_instance_uuid, "valeur_qcq")
+
 
 class TestStorageModel(base.TestCase):
 
@@ -355,6 +531,20 @@ class TestStorageModel(base.TestCase):
         model.map_volume(volume, pool)
         self.assertEqual(pool, model.get_pool_by_volume(volume))
 
+    def test_snapshot_unmap_volume(self):
+        fake_cluster = faker_cluster_state.FakerStorageModelCollector()
+        model = fake_cluster.generate_scenario_1()
+        expected_struct_str = model.to_string()
+        snapshot = model.snapshot()
+
+        volume = snapshot.get_volume_by_uuid("VOLUME_0")
+        pool = snapshot.get_pool_by_volume(volume)
+        snapshot.unmap_volume(volume, pool)
+
+        self.assertNotIn(volume, snapshot.get_pool_volumes(pool))
+        self.assertIn(volume, model.get_pool_volumes(pool))
+        self.assertEqual(expected_struct_str, model.to_string())
+
     def test_get_pool_volumes(self):
         model = model_root.StorageModelRoot()
         pool_name = "host@backend#pool"
@@ -367,3 +557,17 @@ class TestStorageModel(base.TestCase):
         self.assertEqual(volume, model.get_volume_by_uuid(uuid_))
         model.map_volume(volume, pool)
         self.assertEqual([volume], model.get_pool_volumes(pool))
+
+    def test_msgpack_round_trip(self):
+        fake_cluster = faker_cluster_state.FakerStorageModelCollector()
+        model = fake_cluster.generate_scenario_1()
+        model.add_volume(element.Volume(uuid=uuidutils.generate_uuid()))
+
+        model_copy = model_root.StorageModelRoot.from_msgpack(
+            model.to_msgpack())
+
+        self.assertEqual(model.to_string(), model_copy.to_string())
+        self.assertEqual(model.get_all_volumes(),
+                         model_copy.get_all_volumes())
+        self.assertEqual(model.get_all_pools(), model_copy.get_all_pools())
+        self.assertEqual(sorted(model.edges()), sorted(model_copy.edges()))
@@ -0,0 +1,130 @@
+# -*- encoding: utf-8 -*-
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import mock
+
+from watcher.common import utils
+from watcher.decision_engine.planner import duration
+from watcher import objects
+from watcher.tests import base
+from watcher.tests.decision_engine.model import faker_cluster_state
+
+
+class TestActionDurationModel(base.TestCase):
+
+    def setUp(self):
+        super(TestActionDurationModel, self).setUp()
+        self.config(action_durations={'nop': 0, 'sleep': 1, 'migrate': 30,
+                                      'resize': 120},
+                    default_action_duration=60,
+                    migration_bandwidth=64,
+                    group='watcher_planner')
+        self.compute_model = (
+            faker_cluster_state.FakerModelCollector().generate_scenario_1())
+        self.model = duration.ActionDurationModel(self.compute_model)
+
+    def make_action(self, action_type, parents=None, **parameters):
+        return objects.Action(
+            self.context, uuid=utils.generate_uuid(),
+            action_type=action_type, input_parameters=parameters,
+            parents=parents or [])
+
+    def test_estimate_by_action_type(self):
+        self.assertEqual(0, self.model.estimate(self.make_action('nop')))
+        self.assertEqual(120, self.model.estimate(
+            self.make_action('resize', resource_id='INSTANCE_0')))
+        self.assertEqual(60, self.model.estimate(
+            self.make_action('volume_migrate', resource_id='VOLUME_0')))
+
+    def test_estimate_sleep(self):
+        self.assertEqual(5, self.model.estimate(
+            self.make_action('sleep', duration=5)))
+        self.assertEqual(1, self.model.estimate(self.make_action('sleep')))
+
+    def test_estimate_migration(self):
+        instance = self.compute_model.get_instance_by_uuid('INSTANCE_0')
+        instance.memory = 2048
+        instance.disk = 20
+
+        live_migration = self.make_action(
+            'migrate', resource_id='INSTANCE_0', migration_type='live')
+        cold_migration = self.make_action(
+            'migrate', resource_id='INSTANCE_0', migration_type='cold')
+        unknown_instance = self.make_action(
+            'migrate', resource_id='UNKNOWN', migration_type='live')
+
+        self.assertEqual(30 + 2048 / 64., self.model.estimate(live_migration))
+        self.assertEqual(30 + 20 * 1024 / 64.,
+                         self.model.estimate(cold_migration))
+        self.assertEqual(30, self.model.estimate(unknown_instance))
+
+    def test_from_solution(self):
+        instance = self.compute_model.get_instance_by_uuid('INSTANCE_0')
+        instance.memory = 2048
+        strategy = mock.Mock(_compute_model=self.compute_model)
+
+        model = duration.ActionDurationModel.from_solution(
+            mock.Mock(strategy=strategy))
+
+        self.assertEqual(30 + 2048 / 64., model.estimate(self.make_action(
+            'migrate', resource_id='INSTANCE_0', migration_type='live')))
+
+    def test_from_solution_without_compute_model(self):
+        strategy = mock.Mock(_compute_model=None)
+        type(strategy).compute_model = mock.PropertyMock()
+
+        model = duration.ActionDurationModel.from_solution(
+            mock.Mock(strategy=strategy))
+
+        self.assertEqual(30, model.estimate(self.make_action(
+            'migrate', resource_id='INSTANCE_0', migration_type='live')))
+        # No compute model is built for the occasion
+        self.assertFalse(type(strategy).compute_model.called)
+
+    def test_sort_longest_first(self):
+        nop = self.make_action('nop')
+        resize = self.make_action('resize')
+        sleep = self.make_action('sleep', duration=10)
+
+        self.assertEqual([resize, sleep, nop],
+                         self.model.sort_longest_first([nop, resize, sleep]))
+
+    def test_get_critical_path(self):
+        # nop --> resize (120) --> sleep (5)
+        #    \--> sleep (50) --/
+        nop = self.make_action('nop')
+        resize = self.make_action('resize', parents=[nop.uuid])
+        sleep1 = self.make_action('sleep', parents=[nop.uuid], duration=50)
+        sleep2 = self.make_action('sleep', parents=[resize.uuid, sleep1.uuid],
+                                  duration=5)
+
+        makespan, critical_path = self.model.get_critical_path(
+            [sleep2, sleep1, resize, nop])
+
+        self.assertEqual(125, makespan)
+        self.assertEqual([nop.uuid, resize.uuid, sleep2.uuid], critical_path)
+
+    def test_get_critical_path_of_independent_actions(self):
+        sleep1 = self.make_action('sleep', duration=50)
+        sleep2 = self.make_action('sleep', duration=70)
+
+        makespan, critical_path = self.model.get_critical_path(
+            [sleep1, sleep2])
+
+        self.assertEqual(70, makespan)
+        self.assertEqual([sleep2.uuid], critical_path)
+
+    def test_get_critical_path_without_action(self):
+        self.assertEqual((0.0, []), self.model.get_critical_path([]))
@@ -0,0 +1,164 @@
+# -*- encoding: utf-8 -*-
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import mock
+
+from watcher.common import utils
+from watcher.decision_engine.planner import resource_aware
+from watcher.decision_engine.solution import default as dsol
+from watcher import objects
+from watcher.tests.db import base
+from watcher.tests.db import utils as db_utils
+
+
+class TestResourceAwarePlanner(base.DbTestCase):
+
+    def setUp(self):
+        super(TestResourceAwarePlanner, self).setUp()
+        self.goal = db_utils.create_test_goal(name="dummy")
+        self.strategy = db_utils.create_test_strategy(name="dummy")
+        self.audit = db_utils.create_test_audit(
+            uuid=utils.generate_uuid(), strategy_id=self.strategy.id)
+        self.planner = resource_aware.ResourceAwarePlanner(
+            mock.Mock(
+                weights={
+                    'nop': 70,
+                    'change_nova_service_state': 50,
+                    'sleep': 40,
+                    'migrate': 30,
+                    'resize': 20,
+                    'change_node_power_state': 9,
+                },
+                max_host_concurrency=0,
+                max_link_concurrency=0,
+            ))
+        self.solution = dsol.DefaultSolution(
+            goal=mock.Mock(), strategy=self.strategy)
+
+    def add_migration(self, instance, source_node, destination_node):
+        self.solution.add_action(
+            action_type="migrate", resource_id=instance,
+            input_parameters={"migration_type": "live",
+                              "source_node": source_node,
+                              "destination_node": destination_node})
+
+    def compute_action_graph(self):
+        action_plan = mock.Mock(id=1)
+        sorted_actions = self.planner.get_sorted_actions_by_weight(
+            self.context, action_plan, self.solution)
+        graph = self.planner.compute_action_graph(sorted_actions)
+        names = {}
+        for action in graph.nodes():
+            names[action] = "%s:%s" % (
+                action.action_type,
+                action.input_parameters.get("resource_id"))
+        return set((names[src], names[dst]) for src, dst in graph.edges())
+
+    def test_independent_migrations(self):
+        self.add_migration("server1", "node1", "node2")
+        self.add_migration("server2", "node3", "node4")
+        self.add_migration("server3", "node5", "node6")
+
+        self.assertEqual(set(), self.compute_action_graph())
+
+    def test_migrations_of_the_same_instance(self):
+        self.add_migration("server1", "node1", "node2")
+        self.solution.add_action(action_type="resize",
+                                 resource_id="server1",
+                                 input_parameters={"flavor": "x1"})
+        self.add_migration("server2", "node1", "node2")
+
+        self.assertEqual(
+            {("migrate:server1", "resize:server1")},
+            self.compute_action_graph())
+
+    def test_host_concurrency(self):
+        self.planner.config.max_host_concurrency = 2
+        self.add_migration("server1", "node1", "node2")
+        self.add_migration("server2", "node1", "node3")
+        self.add_migration("server3", "node1", "node4")
+        self.add_migration("server4", "node1", "node5")
+        self.add_migration("server5", "node6", "node7")
+
+        self.assertEqual(
+            {("migrate:server1", "migrate:server3"),
+             ("migrate:server2", "migrate:server4")},
+            self.compute_action_graph())
+
+    def test_link_concurrency(self):
+        self.planner.config.max_link_concurrency = 1
+        self.add_migration("server1", "node1", "node2")
+        self.add_migration("server2", "node2", "node1")
+        self.add_migration("server3", "node1", "node3")
+
+        self.assertEqual(
+            {("migrate:server1", "migrate:server2")},
+            self.compute_action_graph())
+
+    def test_node_state_changes(self):
+        self.solution.add_action(action_type="change_nova_service_state",
+                                 resource_id="node2",
+                                 input_parameters={"state": "enabled"})
+        self.add_migration("server1", "node1", "node2")
+        self.add_migration("server2", "node1", "node2")
+        self.add_migration("server3", "node3", "node4")
+        self.solution.add_action(action_type="change_node_power_state",
+                                 resource_id="node1",
+                                 input_parameters={"state": "off"})
+
+        self.assertEqual(
+            {("change_nova_service_state:node2", "migrate:server1"),
+             ("change_nova_service_state:node2", "migrate:server2"),
+             ("migrate:server1", "change_node_power_state:node1"),
+             ("migrate:server2", "change_node_power_state:node1")},
+            self.compute_action_graph())
+
+    def test_actions_without_resource(self):
+        self.planner.config.weights["sleep"] = 25
+        self.solution.add_action(action_type="nop",
+                                 input_parameters={"message": "hello"})
+        self.add_migration("server1", "node1", "node2")
+        self.add_migration("server2", "node3", "node4")
+        self.solution.add_action(action_type="sleep",
+                                 input_parameters={"duration": 1.0})
+        self.solution.add_action(action_type="resize",
+                                 resource_id="server3",
+                                 input_parameters={"flavor": "x1"})
+
+        self.assertEqual(
+            {("nop:None", "migrate:server1"),
+             ("nop:None", "migrate:server2"),
+             ("migrate:server1", "sleep:None"),
+             ("migrate:server2", "sleep:None"),
+             ("sleep:None", "resize:server3")},
+            self.compute_action_graph())
+
+    def test_schedule(self):
+        self.add_migration("server1", "node1", "node2")
+        self.add_migration("server2", "node1", "node3")
+        self.planner.config.max_host_concurrency = 1
+
+        action_plan = self.planner.schedule(
+            self.context, self.audit.id, self.solution)
+
+        actions = objects.Action.list(
+            self.context, filters={'action_plan_id': action_plan.id})
+        self.assertEqual(2, len(actions))
+        parents = {action.input_parameters["resource_id"]: action.parents
+                   for action in actions}
+        uuids = {action.input_parameters["resource_id"]: action.uuid
+                 for action in actions}
+        self.assertEqual([], parents["server1"])
+        self.assertEqual([uuids["server1"]], parents["server2"])
@@ -893,6 +893,54 @@ class TestActionScheduling(base.DbTestCase):
         for pair in expected_edges:
             self.assertIn(pair, edges)
 
+    def test_schedule_creates_actions_at_once(self):
+        solution = dsol.DefaultSolution(
+            goal=mock.Mock(), strategy=self.strategy)
+        for resource_id in ("server1", "server2", "server3"):
+            solution.add_action(action_type="nop",
+                                resource_id=resource_id,
+                                input_parameters={"message": "test"})
+
+        with mock.patch.object(
+            objects.Action.dbapi, "create_actions",
+            wraps=objects.Action.dbapi.create_actions
+        ) as m_create_actions:
+            with mock.patch.object(
+                objects.Action.dbapi, "create_action"
+            ) as m_create_action:
+                action_plan = self.planner.schedule(
+                    self.context, self.audit.id, solution)
+
+        self.assertFalse(m_create_action.called)
+        self.assertEqual(1, m_create_actions.call_count)
+        actions = objects.Action.list(
+            self.context, filters={'action_plan_id': action_plan.id})
+        self.assertEqual(3, len(actions))
+
+    def test_schedule_estimates_makespan(self):
+        solution = dsol.DefaultSolution(
+            goal=mock.Mock(), strategy=self.strategy)
+        solution.add_action(action_type="nop",
+                            input_parameters={"message": "test"})
+        for duration in (10, 30, 20):
+            solution.add_action(action_type="sleep",
+                                input_parameters={"duration": duration})
+
+        action_plan = self.planner.schedule(
+            self.context, self.audit.id, solution)
+
+        action_plan = objects.ActionPlan.get_by_id(
+            self.context, action_plan.id)
+        actions = objects.Action.list(
+            self.context, filters={'action_plan_id': action_plan.id})
+        sleeps = {action.input_parameters["duration"]: action
+                  for action in actions if action.action_type == "sleep"}
+        # nop --> sleep (30) --> sleep (20) --> sleep (10)
+        self.assertEqual(60, action_plan.expected_makespan)
+        self.assertEqual(4, len(action_plan.critical_path))
+        self.assertEqual([sleeps[30].uuid, sleeps[20].uuid, sleeps[10].uuid],
+                         action_plan.critical_path[1:])
+
 
 class TestWeightPlanner(base.DbTestCase):
 
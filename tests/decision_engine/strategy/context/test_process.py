@@ -0,0 +1,158 @@
+# -*- encoding: utf-8 -*-
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import mock
+import six
+
+from watcher.common import exception
+from watcher.common import utils
+from watcher.decision_engine.model.collector import manager
+from watcher.decision_engine.strategy.context import default as d_strategy_ctx
+from watcher.decision_engine.strategy.context import process
+from watcher.decision_engine.strategy import strategies
+from watcher.tests.db import base
+from watcher.tests.decision_engine.model import faker_cluster_state
+from watcher.tests.objects import utils as obj_utils
+
+DUMMY_PARAMETERS = {'para1': 4.0, 'para2': 'hi'}
+
+
+class TestStrategyProcessExecutor(base.DbTestCase):
+
+    def setUp(self):
+        super(TestStrategyProcessExecutor, self).setUp()
+        self.fake_cdmc = faker_cluster_state.FakerModelCollector()
+        self.model = self.fake_cdmc.generate_scenario_1()
+        self.fake_cdmc.cluster_data_model = self.model
+        self.fake_storage_cdmc = (
+            faker_cluster_state.FakerStorageModelCollector())
+        self.storage_model = self.fake_storage_cdmc.generate_scenario_1()
+        self.fake_storage_cdmc.cluster_data_model = self.storage_model
+        collectors = {'compute': self.fake_cdmc,
+                      'storage': self.fake_storage_cdmc}
+        p_collector = mock.patch.object(
+            manager.CollectorManager, "get_cluster_model_collector",
+            mock.Mock(side_effect=lambda name, osc=None: collectors[name]))
+        p_collector.start()
+        self.addCleanup(p_collector.stop)
+        self.config(process_strategies=['dummy'], strategy_processes=1,
+                    group='watcher_decision_engine')
+
+    def test_execute_strategy(self):
+        actions, indicators = process.execute_strategy(
+            'dummy', DUMMY_PARAMETERS, [], self.model.to_msgpack())
+
+        self.assertEqual(3, len(actions))
+        self.assertEqual(
+            {'action_type': 'nop', 'input_parameters': {'message': 'hi'}},
+            actions[1])
+        self.assertEqual({}, indicators)
+
+    @mock.patch.object(process.loading.DefaultStrategyLoader, 'load')
+    def test_execute_strategy_with_storage_model(self, m_load):
+        m_load.return_value.execute.return_value = mock.Mock(actions=[])
+
+        process.execute_strategy(
+            'dummy', DUMMY_PARAMETERS, [], self.model.to_msgpack(),
+            self.storage_model.to_msgpack())
+
+        strategy = m_load.return_value
+        self.assertEqual(
+            sorted(self.model.get_all_compute_nodes()),
+            sorted(strategy.compute_model.get_all_compute_nodes()))
+        self.assertEqual(
+            sorted(self.storage_model.get_all_storage_nodes()),
+            sorted(strategy.storage_model.get_all_storage_nodes()))
+
+    @mock.patch.object(process, 'CONF')
+    def test_config_args(self, m_conf):
+        m_conf.config_file = ['/etc/watcher/watcher.conf']
+        m_conf.config_dir = '/etc/watcher/watcher.conf.d'
+
+        self.assertEqual(
+            ['--config-file', '/etc/watcher/watcher.conf',
+             '--config-dir', '/etc/watcher/watcher.conf.d'],
+            process._get_config_args())
+
+    def test_execute_in_worker_process(self):
+        strategy = strategies.DummyStrategy(config=mock.Mock())
+        strategy.audit_scope = []
+        strategy.compute_model = self.model
+        strategy.storage_model = self.storage_model
+        strategy.input_parameters.update(DUMMY_PARAMETERS)
+
+        solution = process.StrategyProcessExecutor().execute(strategy)
+
+        self.assertIs(strategy.solution, solution)
+        self.assertEqual(3, len(solution.actions))
+        self.assertEqual(
+            {'action_type': 'sleep', 'input_parameters': {'duration': 4.0}},
+            solution.actions[2])
+        self.assertEqual(1, process.StrategyProcessExecutor().executed)
+
+    @mock.patch.object(process.StrategyProcessExecutor, 'execute')
+    def test_strategy_context(self, m_execute):
+        goal = obj_utils.create_test_goal(
+            self.context, id=50, uuid=utils.generate_uuid(), name="my_goal")
+        strategy = obj_utils.create_test_strategy(
+            self.context, id=42, uuid=utils.generate_uuid(), name="dummy",
+            goal_id=goal.id)
+        audit = obj_utils.create_test_audit(
+            self.context, id=2, goal_id=goal.id, strategy_id=strategy.id,
+            uuid=utils.generate_uuid())
+        strategy_context = d_strategy_ctx.DefaultStrategyContext()
+
+        solution = strategy_context.execute_strategy(audit, self.context)
+
+        self.assertEqual(m_execute.return_value, solution)
+        self.assertEqual('dummy', m_execute.call_args[0][0].name)
+
+        self.config(process_strategies=[], group='watcher_decision_engine')
+        solution = strategy_context.execute_strategy(audit, self.context)
+
+        self.assertEqual(1, m_execute.call_count)
+        self.assertEqual(3, len(solution.actions))
+
+    def test_execute_in_worker_process_error(self):
+        strategy = strategies.DummyStrategy(config=mock.Mock())
+        strategy.audit_scope = []
+        strategy.compute_model = self.model
+        # The worker process does not share the mocks of the test, so it is
+        # made to fail on a strategy it cannot load
+        strategy._name = 'unknown'
+
+        exc = self.assertRaises(
+            exception.WatcherException,
+            process.StrategyProcessExecutor().execute, strategy)
+        self.assertIn("unknown", six.text_type(exc))
+        self.assertEqual([], strategy.solution.actions)
+
+    @mock.patch.object(process.select, 'select')
+    def test_execute_in_worker_process_timeout(self, m_select):
+        m_select.return_value = ([], [], [])
+        self.config(strategy_process_timeout=1,
+                    group='watcher_decision_engine')
+        strategy = strategies.DummyStrategy(config=mock.Mock())
+        strategy.audit_scope = []
+        strategy.compute_model = self.model
+        executor = process.StrategyProcessExecutor()
+
+        exc = self.assertRaises(
+            exception.WatcherException, executor.execute, strategy)
+        self.assertIn("timed out", six.text_type(exc))
+        self.assertEqual(1, m_select.call_args[0][3])
+        # The slot of the terminated worker process is released
+        self.assertTrue(executor._slots.acquire(False))
+        executor._slots.release()
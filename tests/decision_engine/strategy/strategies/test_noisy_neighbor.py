@@ -26,6 +26,7 @@ from watcher.decision_engine.model import model_root
 from watcher.decision_engine.strategy import strategies
 from watcher.tests import base
 from watcher.tests.decision_engine.model import ceilometer_metrics
+from watcher.tests.decision_engine.model import datasource_metrics
 from watcher.tests.decision_engine.model import faker_cluster_state
 
 
@@ -44,11 +45,11 @@ class TestNoisyNeighbor(base.TestCase):
         self.m_model = p_model.start()
         self.addCleanup(p_model.stop)
 
-        p_ceilometer = mock.patch.object(
-            strategies.NoisyNeighbor, "ceilometer",
+        p_datasource_manager = mock.patch.object(
+            strategies.NoisyNeighbor, "datasource_manager",
             new_callable=mock.PropertyMock)
-        self.m_ceilometer = p_ceilometer.start()
-        self.addCleanup(p_ceilometer.stop)
+        self.m_datasource_manager = p_datasource_manager.start()
+        self.addCleanup(p_datasource_manager.stop)
 
         p_audit_scope = mock.patch.object(
             strategies.NoisyNeighbor, "audit_scope",
@@ -60,8 +61,9 @@ class TestNoisyNeighbor(base.TestCase):
         self.m_audit_scope.return_value = mock.Mock()
 
         self.m_model.return_value = model_root.ModelRoot()
-        self.m_ceilometer.return_value = mock.Mock(
-            statistic_aggregation=self.fake_metrics.mock_get_statistics_nn)
+        self.m_datasource_manager.return_value = mock.Mock(
+            wraps=datasource_metrics.FakeDataSourceManager(
+                'ceilometer', self.fake_metrics.mock_get_statistics_nn))
         self.strategy = strategies.NoisyNeighbor(config=mock.Mock())
 
         self.strategy.input_parameters = utils.Struct()
@@ -168,6 +170,12 @@ class TestNoisyNeighbor(base.TestCase):
         num_migrations = actions_counter.get("migrate", 0)
         self.assertEqual(1, num_migrations)
 
+    def test_ceilometer_is_the_default_datasource(self):
+        datasources_opt = strategies.NoisyNeighbor.get_config_opts()[0]
+
+        self.assertEqual('datasources', datasources_opt.name)
+        self.assertEqual('ceilometer', datasources_opt.default[0])
+
     def test_check_parameters(self):
         model = self.fake_cluster.generate_scenario_3_with_2_nodes()
         self.m_model.return_value = model
@@ -17,7 +17,6 @@
 # limitations under the License.
 #
 import collections
-import datetime
 import mock
 
 from watcher.applier.loading import default
@@ -27,6 +26,7 @@ from watcher.decision_engine.model import model_root
 from watcher.decision_engine.strategy import strategies
 from watcher.tests import base
 from watcher.tests.decision_engine.model import ceilometer_metrics
+from watcher.tests.decision_engine.model import datasource_metrics
 from watcher.tests.decision_engine.model import faker_cluster_state
 from watcher.tests.decision_engine.model import gnocchi_metrics
 
@@ -55,11 +55,11 @@ class TestUniformAirflow(base.TestCase):
         self.m_model = p_model.start()
         self.addCleanup(p_model.stop)
 
-        p_datasource = mock.patch.object(
-            strategies.UniformAirflow, self.datasource,
+        p_datasource_manager = mock.patch.object(
+            strategies.UniformAirflow, "datasource_manager",
             new_callable=mock.PropertyMock)
-        self.m_datasource = p_datasource.start()
-        self.addCleanup(p_datasource.stop)
+        self.m_datasource_manager = p_datasource_manager.start()
+        self.addCleanup(p_datasource_manager.stop)
 
         p_audit_scope = mock.patch.object(
             strategies.UniformAirflow, "audit_scope",
@@ -71,10 +71,10 @@ class TestUniformAirflow(base.TestCase):
         self.m_audit_scope.return_value = mock.Mock()
 
         self.m_model.return_value = model_root.ModelRoot()
-        self.m_datasource.return_value = mock.Mock(
-            statistic_aggregation=self.fake_metrics.mock_get_statistics)
-        self.strategy = strategies.UniformAirflow(
-            config=mock.Mock(datasource=self.datasource))
+        self.m_datasource_manager.return_value = mock.Mock(
+            wraps=datasource_metrics.FakeDataSourceManager(
+                self.datasource, self.fake_metrics.mock_get_statistics))
+        self.strategy = strategies.UniformAirflow(config=mock.Mock())
         self.strategy.input_parameters = utils.Struct()
         self.strategy.input_parameters.update({'threshold_airflow': 400.0,
                                                'threshold_inlet_t': 28.0,
@@ -212,38 +212,17 @@ class TestUniformAirflow(base.TestCase):
             loaded_action.input_parameters = action['input_parameters']
             loaded_action.validate_parameters()
 
+    def test_ceilometer_is_the_default_datasource(self):
+        datasources_opt = strategies.UniformAirflow.get_config_opts()[0]
+
+        self.assertEqual('datasources', datasources_opt.name)
+        self.assertEqual('ceilometer', datasources_opt.default[0])
+
     def test_periods(self):
         model = self.fake_cluster.generate_scenario_7_with_2_nodes()
         self.m_model.return_value = model
-        p_ceilometer = mock.patch.object(
-            strategies.UniformAirflow, "ceilometer")
-        m_ceilometer = p_ceilometer.start()
-        self.addCleanup(p_ceilometer.stop)
-        p_gnocchi = mock.patch.object(strategies.UniformAirflow, "gnocchi")
-        m_gnocchi = p_gnocchi.start()
-        self.addCleanup(p_gnocchi.stop)
-        datetime_patcher = mock.patch.object(
-            datetime, 'datetime',
-            mock.Mock(wraps=datetime.datetime)
-        )
-        mocked_datetime = datetime_patcher.start()
-        mocked_datetime.utcnow.return_value = datetime.datetime(
-            2017, 3, 19, 18, 53, 11, 657417)
-        self.addCleanup(datetime_patcher.stop)
-        m_ceilometer.statistic_aggregation = mock.Mock(
-            side_effect=self.fake_metrics.mock_get_statistics)
-        m_gnocchi.statistic_aggregation = mock.Mock(
-            side_effect=self.fake_metrics.mock_get_statistics)
+        m_datasource_manager = self.m_datasource_manager.return_value
         self.strategy.group_hosts_by_airflow()
-        if self.strategy.config.datasource == "ceilometer":
-            m_ceilometer.statistic_aggregation.assert_any_call(
-                aggregate='avg', meter_name='hardware.ipmi.node.airflow',
-                period=300, resource_id=mock.ANY)
-        elif self.strategy.config.datasource == "gnocchi":
-            stop_time = datetime.datetime.utcnow()
-            start_time = stop_time - datetime.timedelta(
-                seconds=int('300'))
-            m_gnocchi.statistic_aggregation.assert_called_with(
-                resource_id=mock.ANY, metric='hardware.ipmi.node.airflow',
-                granularity=300, start_time=start_time, stop_time=stop_time,
-                aggregation='mean')
+        m_datasource_manager.statistic_aggregation_bulk.assert_called_with(
+            resource_ids=mock.ANY, metrics=['host_airflow'], period=300,
+            aggregate='mean', granularity=300)
@@ -18,13 +18,13 @@
 # limitations under the License.
 #
 
-import datetime
 import mock
 
 from watcher.common import exception
 from watcher.decision_engine.model import model_root
 from watcher.decision_engine.strategy import strategies
 from watcher.tests import base
+from watcher.tests.decision_engine.model import datasource_metrics
 from watcher.tests.decision_engine.model import faker_cluster_and_metrics
 
 
@@ -53,11 +53,11 @@ class TestVMWorkloadConsolidation(base.TestCase):
         self.m_model = p_model.start()
         self.addCleanup(p_model.stop)
 
-        p_datasource = mock.patch.object(
-            strategies.VMWorkloadConsolidation, self.datasource,
+        p_datasource_manager = mock.patch.object(
+            strategies.VMWorkloadConsolidation, "datasource_manager",
             new_callable=mock.PropertyMock)
-        self.m_datasource = p_datasource.start()
-        self.addCleanup(p_datasource.stop)
+        self.m_datasource_manager = p_datasource_manager.start()
+        self.addCleanup(p_datasource_manager.stop)
 
         p_audit_scope = mock.patch.object(
             strategies.VMWorkloadConsolidation, "audit_scope",
@@ -73,10 +73,11 @@ class TestVMWorkloadConsolidation(base.TestCase):
             self.m_model.return_value)
 
         self.m_model.return_value = model_root.ModelRoot()
-        self.m_datasource.return_value = mock.Mock(
-            statistic_aggregation=self.fake_metrics.mock_get_statistics)
+        self.m_datasource_manager.return_value = mock.Mock(
+            wraps=datasource_metrics.FakeDataSourceManager(
+                self.datasource, self.fake_metrics.mock_get_statistics))
         self.strategy = strategies.VMWorkloadConsolidation(
-            config=mock.Mock(datasource=self.datasource))
+            config=mock.Mock())
 
     def test_exception_stale_cdm(self):
         self.fake_cluster.set_cluster_data_model_as_stale()
@@ -307,40 +308,20 @@ class TestVMWorkloadConsolidation(base.TestCase):
         del expected[1]
         self.assertEqual(expected, self.strategy.solution.actions)
 
+    def test_ceilometer_is_the_default_datasource(self):
+        datasources_opt = strategies.VMWorkloadConsolidation.get_config_opts()[0]
+
+        self.assertEqual('datasources', datasources_opt.name)
+        self.assertEqual('ceilometer', datasources_opt.default[0])
+
     def test_periods(self):
         model = self.fake_cluster.generate_scenario_1()
         self.m_model.return_value = model
-        p_ceilometer = mock.patch.object(
-            strategies.VMWorkloadConsolidation, "ceilometer")
-        m_ceilometer = p_ceilometer.start()
-        self.addCleanup(p_ceilometer.stop)
-        p_gnocchi = mock.patch.object(
-            strategies.VMWorkloadConsolidation, "gnocchi")
-        m_gnocchi = p_gnocchi.start()
-        self.addCleanup(p_gnocchi.stop)
-        datetime_patcher = mock.patch.object(
-            datetime, 'datetime',
-            mock.Mock(wraps=datetime.datetime)
-        )
-        mocked_datetime = datetime_patcher.start()
-        mocked_datetime.utcnow.return_value = datetime.datetime(
-            2017, 3, 19, 18, 53, 11, 657417)
-        self.addCleanup(datetime_patcher.stop)
-        m_ceilometer.return_value = mock.Mock(
-            statistic_aggregation=self.fake_metrics.mock_get_statistics)
-        m_gnocchi.return_value = mock.Mock(
-            statistic_aggregation=self.fake_metrics.mock_get_statistics)
+        m_datasource_manager = self.m_datasource_manager.return_value
         instance0 = model.get_instance_by_uuid("INSTANCE_0")
         self.strategy.get_instance_utilization(instance0)
-        if self.strategy.config.datasource == "ceilometer":
-            m_ceilometer.statistic_aggregation.assert_any_call(
-                aggregate='avg', meter_name='disk.root.size',
-                period=3600, resource_id=instance0.uuid)
-        elif self.strategy.config.datasource == "gnocchi":
-            stop_time = datetime.datetime.utcnow()
-            start_time = stop_time - datetime.timedelta(
-                seconds=int('3600'))
-            m_gnocchi.statistic_aggregation.assert_called_with(
-                resource_id=instance0.uuid, metric='disk.root.size',
-                granularity=300, start_time=start_time, stop_time=stop_time,
-                aggregation='mean')
+        m_datasource_manager.statistic_aggregation_bulk.assert_any_call(
+            resource_ids=[instance0.uuid],
+            metrics=['instance_cpu_usage', 'instance_ram_usage',
+                     'instance_root_disk_size'],
+            period=3600, aggregate='mean', granularity=300)
@@ -24,6 +24,7 @@ from watcher.common import clients
 from watcher.common import utils
 from watcher.decision_engine.model import model_root
 from watcher.decision_engine.strategy import strategies
+from watcher.decision_engine.strategy.strategies import workload_stabilization
 from watcher.tests import base
 from watcher.tests.decision_engine.model import ceilometer_metrics
 from watcher.tests.decision_engine.model import faker_cluster_state
@@ -233,6 +234,70 @@ class TestWorkloadStabilization(base.TestCase):
             8,
             len(self.strategy.simulate_migrations(self.hosts_load_assert)))
 
+    def test_host_load_matrix(self):
+        model = self.fake_cluster.generate_scenario_1()
+        self.m_model.return_value = model
+        instance = model.get_instance_by_uuid("INSTANCE_5")
+        src_node = model.get_node_by_uuid("Node_2")
+        load_matrix = workload_stabilization.HostLoadMatrix(
+            self.hosts_load_assert, self.strategy.metrics,
+            {node_id: model.get_node_by_uuid(node_id).memory
+             for node_id in self.hosts_load_assert})
+        dst_hosts = ['Node_0', 'Node_1', 'Node_3']
+        sds = load_matrix.get_migration_sds(
+            self.strategy.get_instance_load(instance), src_node.uuid,
+            dst_hosts)
+        for index, dst_host in enumerate(dst_hosts):
+            migration_case = self.strategy.calculate_migration_case(
+                self.hosts_load_assert, instance, src_node,
+                model.get_node_by_uuid(dst_host))
+            for metric_index, sd in enumerate(migration_case[:-1]):
+                self.assertAlmostEqual(sd, sds[metric_index][index])
+
+    def test_host_load_evaluator(self):
+        model = self.fake_cluster.generate_scenario_1()
+        self.m_model.return_value = model
+        instance = model.get_instance_by_uuid("INSTANCE_5")
+        src_node = model.get_node_by_uuid("Node_2")
+        dst_node = model.get_node_by_uuid("Node_1")
+        evaluator = workload_stabilization.HostLoadEvaluator(
+            self.hosts_load_assert, self.strategy.metrics,
+            self.strategy.get_hosts_memory(self.hosts_load_assert))
+        normalized_load = self.strategy.normalize_hosts_load(
+            self.hosts_load_assert)
+        for metric, sd in zip(self.strategy.metrics, evaluator.get_sds()):
+            self.assertAlmostEqual(
+                self.strategy.get_sd(normalized_load, metric), sd)
+
+        migration_case = self.strategy.calculate_migration_case(
+            self.hosts_load_assert, instance, src_node, dst_node)
+        instance_load = self.strategy.get_instance_load(instance)
+        sds = evaluator.get_migration_sds(
+            instance_load, src_node.uuid, dst_node.uuid)
+        for expected, sd in zip(migration_case[:-1], sds):
+            self.assertAlmostEqual(expected, sd)
+
+        evaluator.apply_migration(
+            instance_load, src_node.uuid, dst_node.uuid)
+        for expected, sd in zip(migration_case[:-1], evaluator.get_sds()):
+            self.assertAlmostEqual(expected, sd)
+
+    def test_simulate_migrations_vectorized(self):
+        model = self.fake_cluster.generate_scenario_1()
+        self.m_model.return_value = model
+        self.strategy.host_choice = 'fullsearch'
+        migrations = self.strategy.simulate_migrations(
+            self.hosts_load_assert)
+        with mock.patch.object(workload_stabilization, 'np', None):
+            expected_migrations = self.strategy.simulate_migrations(
+                self.hosts_load_assert)
+        self.assertEqual(
+            [(m['instance'], m['s_host'], m['host'])
+             for m in expected_migrations],
+            [(m['instance'], m['s_host'], m['host']) for m in migrations])
+        for migration, expected in zip(migrations, expected_migrations):
+            self.assertAlmostEqual(expected['value'], migration['value'])
+
     def test_check_threshold(self):
         self.m_model.return_value = self.fake_cluster.generate_scenario_1()
         self.strategy.thresholds = {'cpu_util': 0.001, 'memory.resident': 0.2}
@@ -18,6 +18,8 @@
 
 import mock
 
+from watcher.datasource import cache
+from watcher.decision_engine.audit import scheduler
 from watcher.decision_engine import gmr
 from watcher.decision_engine.model.collector import manager
 from watcher.tests import base
@@ -34,3 +36,37 @@ class TestGmrPlugin(base.TestCase):
         output = gmr.show_models()
         self.assertEqual(1, m_to_string.call_count)
         self.assertIn("<TESTMODEL />", output)
+
+    def test_show_metric_cache(self):
+        metric_cache = cache.MetricCache()
+        metric_cache.set("key", 1.0)
+        metric_cache.get("key")
+        metric_cache.get("unknown_key")
+
+        output = gmr.show_metric_cache()
+        self.assertIn("size = 1", output)
+        self.assertIn("hits = 1", output)
+        self.assertIn("misses = 1", output)
+
+    @mock.patch.object(manager.CollectorManager, "get_collectors")
+    def test_show_notification_buffers(self, m_get_collectors):
+        m_get_collectors.return_value = {
+            "test_model": mock.Mock(notification_buffer=mock.Mock(
+                get_stats=mock.Mock(return_value={"depth": 3})))}
+
+        output = gmr.show_notification_buffers()
+        self.assertIn("test_model", output)
+        self.assertIn("depth = 3", output)
+
+    def test_show_audit_scheduler(self):
+        audit_scheduler = scheduler.AuditScheduler()
+        audit_scheduler.submit(mock.Mock(), lambda: None).result()
+
+        output = gmr.show_audit_scheduler()
+        self.assertIn("waiting = 0", output)
+        self.assertIn("executed = 1", output)
+
+    def test_show_clients(self):
+        output = gmr.show_clients()
+        self.assertIn("sessions_created = 0", output)
+        self.assertIn("tokens_created = 0", output)
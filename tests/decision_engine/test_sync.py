@@ -253,6 +253,25 @@ class TestSyncer(base.DbTestCase):
         self.assertEqual(0, m_s_save.call_count)
         self.assertEqual(1, m_s_soft_delete.call_count)
 
+    @mock.patch.object(sync.rpcapi, 'ApplierAPI')
+    def test_sync_objects_pushes_cancellation(self, m_applier_api):
+        action_plans = [
+            mock.Mock(uuid=utils.generate_uuid(), state=state)
+            for state in (objects.action_plan.State.ONGOING,
+                          objects.action_plan.State.RECOMMENDED)]
+        for action_plan in action_plans:
+            self.syncer._cancel_action_plan(action_plan)
+            self.syncer.stale_action_plans_map[action_plan.uuid] = action_plan
+
+        self.syncer._sync_objects()
+
+        for action_plan in action_plans:
+            self.assertEqual(
+                objects.action_plan.State.CANCELLED, action_plan.state)
+            action_plan.save.assert_called_once_with()
+        m_applier_api.return_value.cancel_action_plan.assert_called_once_with(
+            self.syncer.ctx, action_plans[0].uuid)
+
     def test_end2end_sync_goals_with_modified_goal_and_strategy(self):
         # ### Setup ### #
 
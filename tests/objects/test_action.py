@@ -185,6 +185,30 @@ class TestCreateDeleteActionObject(base.DbTestCase):
         mock_create_action.assert_called_once_with(expected_action)
         self.assertEqual(self.context, action._context)
 
+    @mock.patch.object(notifications.action, 'send_create')
+    @mock.patch.object(db_api.Connection, 'create_actions')
+    def test_create_all(self, mock_create_actions, mock_send_create):
+        fake_actions = [
+            dict(self.fake_action, id=1, uuid=c_utils.generate_uuid()),
+            dict(self.fake_action, id=2, uuid=c_utils.generate_uuid())]
+        mock_create_actions.return_value = fake_actions
+        actions = [objects.Action(self.context, **fake_action)
+                   for fake_action in fake_actions]
+
+        with mock.patch.object(
+                objects.ActionPlan, 'get',
+                wraps=objects.ActionPlan.get) as m_get_action_plan:
+            created = objects.Action.create_all(self.context, actions)
+
+        self.assertEqual(actions, created)
+        self.assertEqual(1, mock_create_actions.call_count)
+        self.assertEqual(2, len(mock_create_actions.call_args[0][0]))
+        m_get_action_plan.assert_called_once_with(
+            self.context, self.fake_action['action_plan_id'])
+        self.assertEqual(self.fake_action_plan.id,
+                         created[1].action_plan.id)
+        self.assertEqual(2, mock_send_create.call_count)
+
     @mock.patch.object(notifications.action, 'send_delete')
     @mock.patch.object(notifications.action, 'send_update')
     @mock.patch.object(db_api.Connection, 'update_action')
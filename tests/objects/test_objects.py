@@ -413,7 +413,7 @@ expected_object_fingerprints = {
     'Strategy': '1.1-73f164491bdd4c034f48083a51bdeb7b',
     'AuditTemplate': '1.1-b291973ffc5efa2c61b24fe34fdccc0b',
     'Audit': '1.3-f47ffb1ee79d8248eb991674bda565ce',
-    'ActionPlan': '2.0-394f1abbf5d73d7b6675a118fe1a0284',
+    'ActionPlan': '2.1-cfdcf5b2ba556ede86ae32de949e4020',
     'Action': '2.0-1dd4959a7e7ac30c62ef170fe08dd935',
     'EfficacyIndicator': '1.0-655b71234a82bc7478aff964639c4bb0',
     'ScoringEngine': '1.0-4abbe833544000728e17bd9e83f97576',